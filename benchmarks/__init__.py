@@ -0,0 +1,8 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : 合成コーパスによる検索・索引ベンチマーク
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Benchmarks for the RAG HITL backend (run from the repository root)."""
@@ -0,0 +1,176 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : Lambda コールドスタート最適化（索引スナップショット）
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Cold-start benchmark of the Lambda handler.
+
+Each sample is a fresh Python process (a new container, as far as the
+handler can tell) that imports ``handler`` and sends two /api/run requests.
+Measured per sample:
+
+- ``import_ms``: ``import handler`` including any init work done at import
+- ``first_request_ms`` / ``second_request_ms``: handler call durations
+- ``time_to_first_response_ms``: process start of the import to the first response
+- ``process_ms``: wall time of the whole process, seen from outside
+
+Modes:
+- ``before``: no init work; the first request loads the corpus and builds
+  the index (and every later request does again)
+- ``init_build``: warm start, index built from the corpus during init
+- ``init_snapshot``: warm start from a prebuilt index snapshot
+
+The corpus is synthetic (``--documents``) and Ollama is a local FakeOllama.
+Medians over ``--repeats`` processes are reported.
+
+Usage:
+    python -m benchmarks.cold_start --documents 20000 --repeats 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from .fake_ollama import FakeOllama
+from .synthetic import generate_speeches
+
+REPO_ROOT: Path = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT: Path = Path(__file__).resolve().parent / "results" / "cold_start.json"
+MODES: tuple[str, ...] = ("before", "init_build", "init_snapshot")
+BENCH_QUERY: str = "教育政策と学校教育の充実についての議論"
+RESULT_PREFIX: str = "COLD_START_RESULT "
+
+# Runs in the child process; the timer starts before the package import
+_CHILD = f"""
+import json, time
+t0 = time.perf_counter()
+from src.langgraph_rag_hitl.handler import handler
+t1 = time.perf_counter()
+ctx = type("Ctx", (), {{"aws_request_id": "cold-1"}})()
+event = {{"httpMethod": "POST", "path": "/api/run", "body": json.dumps({{"query": {BENCH_QUERY!r}}})}}
+status = handler(event, ctx)["statusCode"]
+t2 = time.perf_counter()
+ctx.aws_request_id = "cold-2"
+handler(event, ctx)
+t3 = time.perf_counter()
+print({RESULT_PREFIX!r} + json.dumps({{
+    "status": status,
+    "import_ms": (t1 - t0) * 1000,
+    "first_request_ms": (t2 - t1) * 1000,
+    "second_request_ms": (t3 - t2) * 1000,
+    "time_to_first_response_ms": (t2 - t0) * 1000,
+}}), flush=True)
+"""
+
+
+def write_corpus(directory: Path, documents: int, seed: int = 0) -> Path:
+    """Write a synthetic corpus as one Kokkai-shaped JSON file."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / "synthetic.json"
+    records = list(generate_speeches(documents, seed=seed))
+    path.write_text(json.dumps({"speechRecord": records}, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def mode_env(mode: str, base: dict[str, str], snapshot: Path) -> dict[str, str]:
+    """Environment of the child process for a mode."""
+    env = dict(base)
+    env.pop("AWS_LAMBDA_FUNCTION_NAME", None)
+    env.pop("INDEX_SNAPSHOT_PATH", None)
+    env["LAMBDA_WARM_START"] = "0" if mode == "before" else "1"
+    if mode == "init_snapshot":
+        env["INDEX_SNAPSHOT_PATH"] = str(snapshot)
+    return env
+
+
+def run_sample(env: dict[str, str]) -> dict[str, float]:
+    """One fresh-process sample."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", _CHILD], cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=False
+    )
+    process_ms = (time.perf_counter() - start) * 1000
+    line = next((ln for ln in proc.stdout.splitlines() if ln.startswith(RESULT_PREFIX)), None)
+    if proc.returncode != 0 or line is None:
+        raise RuntimeError(f"cold-start sample failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(line.removeprefix(RESULT_PREFIX))
+    result["process_ms"] = process_ms
+    return result
+
+
+def summarize(samples: list[dict[str, float]]) -> dict[str, float]:
+    """Median of each metric over the samples."""
+    keys = [k for k in samples[0] if k != "status"]
+    return {k: round(statistics.median(s[k] for s in samples), 2) for k in keys}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Lambda cold-start benchmark")
+    parser.add_argument("--documents", type=int, default=20_000, help="Synthetic corpus size")
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh processes per mode")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp, FakeOllama(latency_s=0.01, tokens_per_s=5000.0) as fake:
+        tmp_path = Path(tmp)
+        write_corpus(tmp_path / "corpus", args.documents, args.seed)
+        snapshot = tmp_path / "index.snapshot"
+        env = {
+            **os.environ,
+            "CORPUS_DIR": str(tmp_path / "corpus"),
+            "OLLAMA_HOST": fake.url,
+            "CHECKPOINT_DB_PATH": str(tmp_path / "checkpoints.sqlite"),
+            "REVIEW_DB_PATH": str(tmp_path / "reviews.sqlite"),
+        }
+        subprocess.run(
+            [sys.executable, "-m", "src.langgraph_rag_hitl.snapshot", "--output", str(snapshot)],
+            cwd=REPO_ROOT, env=env, check=True, capture_output=True,
+        )
+
+        results: dict[str, Any] = {}
+        for mode in args.modes:
+            samples = [run_sample(mode_env(mode, env, snapshot)) for _ in range(args.repeats)]
+            results[mode] = summarize(samples)
+            r = results[mode]
+            print(
+                f"{mode:>14}  import {r['import_ms']:8.1f}ms  first request {r['first_request_ms']:8.1f}ms  "
+                f"second {r['second_request_ms']:7.1f}ms  TTFR {r['time_to_first_response_ms']:8.1f}ms  "
+                f"process {r['process_ms']:8.1f}ms",
+                flush=True,
+            )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(
+        json.dumps(
+            {
+                "benchmark": "cold_start",
+                "created_at": datetime.now(UTC).isoformat(),
+                "documents": args.documents,
+                "repeats": args.repeats,
+                "results": results,
+            },
+            ensure_ascii=False,
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
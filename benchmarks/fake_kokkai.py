@@ -0,0 +1,223 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : 国会会議録 API の並行・再開可能ダウンロード
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Local stand-in for the NDL speech API (kokkai.ndl.go.jp/api/speech).
+
+Serves ``GET /api/speech`` with the real response envelope
+(numberOfRecords, numberOfReturn, startRecord, nextRecordPosition,
+speechRecord) over a deterministic synthetic corpus, filtered by
+``from``/``until`` and ``any``. Hits are served newest date first, as the
+API serves them, so speeches added later shift every offset. Requests
+beyond ``max_concurrent`` in flight get 429 with Retry-After,
+``error_rate`` injects 503s, and ``fail_starts`` makes the given
+startRecord values fail with 500 until cleared, so rate limiting and resume
+can be exercised without the real service.
+
+Usage:
+    python -m benchmarks.fake_kokkai --port 8001 --records 5000 --latency-ms 100
+    python data/download.py --base-url http://127.0.0.1:8001/api/speech --total 0
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.synthetic import generate_speeches
+
+MAX_RECORDS_PER_REQUEST: int = 100
+
+
+def generate_records(n: int, seed: int = 0, start: date = date(2024, 1, 9)) -> list[dict[str, Any]]:
+    """Synthetic speech records in API field names, a few per day from ``start``."""
+    records: list[dict[str, Any]] = []
+    for i, speech in enumerate(generate_speeches(n, seed=seed)):
+        day = start + timedelta(days=i // 8)
+        records.append(
+            {
+                "speechID": f"{day:%Y%m%d}{i:08d}",
+                "issueID": f"{day:%Y%m%d}{i // 8:05d}",
+                "session": 213,
+                "nameOfHouse": speech["nameOfHouse"],
+                "nameOfMeeting": speech["nameOfMeeting"],
+                "issue": "第1号",
+                "date": day.isoformat(),
+                "speechOrder": i % 8,
+                "speaker": speech["speaker"],
+                "speech": speech["speech"],
+                "speechURL": f"https://kokkai.ndl.go.jp/txt/{day:%Y%m%d}{i:08d}",
+            }
+        )
+    return records
+
+
+class FakeKokkai:
+    """Threaded fake speech API server; use as a context manager or start()/stop()."""
+
+    def __init__(
+        self,
+        records: list[dict[str, Any]] | None = None,
+        latency_s: float = 0.05,
+        max_concurrent: int | None = None,
+        retry_after_s: float = 0.1,
+        error_rate: float = 0.0,
+        fail_starts: set[int] | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 0,
+    ) -> None:
+        self.records = records if records is not None else generate_records(500, seed=seed)
+        self.latency_s = latency_s
+        self.max_concurrent = max_concurrent
+        self.retry_after_s = retry_after_s
+        self.error_rate = error_rate
+        self.fail_starts: set[int] = set(fail_starts or ())
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self.inflight = 0
+        self.max_inflight = 0
+        self.starts: list[int] = []
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/speech"
+
+    def search(self, params: dict[str, str]) -> list[dict[str, Any]]:
+        """Records matching the query, in API order (newest date first)."""
+        start, until, keyword = params.get("from", ""), params.get("until", ""), params.get("any", "")
+        hits = [
+            r
+            for r in self.records
+            if (not start or r["date"] >= start)
+            and (not until or r["date"] <= until)
+            and (not keyword or keyword in r["speech"])
+        ]
+        return sorted(hits, key=lambda r: r["date"], reverse=True)
+
+    def _page(self, params: dict[str, str]) -> dict[str, Any]:
+        hits = self.search(params)
+        start = max(int(params.get("startRecord", 1)), 1)
+        count = min(int(params.get("maximumRecords", 30)), MAX_RECORDS_PER_REQUEST)
+        page = hits[start - 1 : start - 1 + count]
+        next_position = start + len(page)
+        return {
+            "numberOfRecords": len(hits),
+            "numberOfReturn": len(page),
+            "startRecord": start,
+            "nextRecordPosition": next_position if next_position <= len(hits) else None,
+            "speechRecord": page,
+        }
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send_json(self, status: int, body: bytes, headers: dict[str, str] | None = None) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                url = urlparse(self.path)
+                if url.path != "/api/speech":
+                    self.send_error(404)
+                    return
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                start = int(params.get("startRecord", 1))
+                with fake._lock:
+                    fake.requests += 1
+                    if fake.max_concurrent is not None and fake.inflight >= fake.max_concurrent:
+                        fake.throttled += 1
+                        throttled = True
+                    else:
+                        throttled = False
+                        fake.inflight += 1
+                        fake.max_inflight = max(fake.max_inflight, fake.inflight)
+                        fail = start in fake.fail_starts or fake._rng.random() < fake.error_rate
+                        if fail:
+                            fake.errors += 1
+                if throttled:
+                    self._send_json(
+                        429, b'{"message": "too many requests"}', {"Retry-After": f"{fake.retry_after_s:g}"}
+                    )
+                    return
+                try:
+                    time.sleep(fake.latency_s)
+                finally:
+                    with fake._lock:
+                        fake.inflight -= 1
+                if fail:
+                    self._send_json(503 if start not in fake.fail_starts else 500, b'{"message": "injected failure"}')
+                    return
+                with fake._lock:
+                    fake.starts.append(start)
+                self._send_json(200, json.dumps(fake._page(params), ensure_ascii=False).encode())
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeKokkai":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeKokkai":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake NDL /api/speech server")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--max-concurrent", type=int, default=None, help="429 beyond this many in flight")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 503")
+    args = parser.parse_args()
+    fake = FakeKokkai(
+        records=generate_records(args.records),
+        latency_s=args.latency_ms / 1000,
+        max_concurrent=args.max_concurrent,
+        error_rate=args.error_rate,
+        host="0.0.0.0",
+        port=args.port,
+    )
+    print(f"fake kokkai api listening on {fake.url}", flush=True)
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : 疑似 Ollama サーバーによる負荷試験ハーネス
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Local Ollama stand-in for load tests.
+
+Implements ``POST /api/generate`` (non-streaming) with a configurable
+time-to-first-token latency, decode rate and error rate, so the backend can
+be saturated without a GPU. The generated length is the request's
+``options.num_predict`` (default ``response_tokens``); a request takes
+``latency_s + tokens / tokens_per_s`` seconds. Requests are served
+concurrently up to ``parallel`` (Ollama's OLLAMA_NUM_PARALLEL); the rest
+wait, as they would on a real server.
+
+Usage:
+    python -m benchmarks.fake_ollama --port 11434 --latency-ms 200 --tokens-per-s 40
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+DEFAULT_RESPONSE_TOKENS: int = 128
+
+
+class FakeOllama:
+    """Threaded fake Ollama server; use as a context manager or start()/stop()."""
+
+    def __init__(
+        self,
+        latency_s: float = 0.2,
+        tokens_per_s: float = 40.0,
+        error_rate: float = 0.0,
+        response_tokens: int = DEFAULT_RESPONSE_TOKENS,
+        parallel: int = 4,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 0,
+    ) -> None:
+        self.latency_s = latency_s
+        self.tokens_per_s = tokens_per_s
+        self.error_rate = error_rate
+        self.response_tokens = response_tokens
+        self._slots = threading.BoundedSemaphore(parallel)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _service_time_s(self, payload: dict[str, Any]) -> tuple[float, int]:
+        tokens = int((payload.get("options") or {}).get("num_predict") or self.response_tokens)
+        return self.latency_s + tokens / self.tokens_per_s, tokens
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802 - http.server API
+                if self.path != "/api/generate":
+                    self.send_error(404)
+                    return
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with fake._lock:
+                    fake.requests += 1
+                    fail = fake._rng.random() < fake.error_rate
+                    if fail:
+                        fake.errors += 1
+                with fake._slots:
+                    service_s, tokens = fake._service_time_s(payload)
+                    time.sleep(service_s)
+                if fail:
+                    self.send_error(500, "injected failure")
+                    return
+                if payload.get("format") == "json":
+                    text = json.dumps({"grades": []})
+                else:
+                    text = "国会の審議に基づく回答です。" * max(1, tokens // 16)
+                body = json.dumps(
+                    {
+                        "model": payload.get("model", ""),
+                        "response": text,
+                        "done": True,
+                        "eval_count": tokens,
+                        "total_duration": int(service_s * 1e9),
+                    },
+                    ensure_ascii=False,
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeOllama":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeOllama":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Ollama /api/generate server")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Time to first token")
+    parser.add_argument("--tokens-per-s", type=float, default=40.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--response-tokens", type=int, default=DEFAULT_RESPONSE_TOKENS)
+    parser.add_argument("--parallel", type=int, default=4, help="Concurrent generations (OLLAMA_NUM_PARALLEL)")
+    args = parser.parse_args()
+    fake = FakeOllama(
+        latency_s=args.latency_ms / 1000,
+        tokens_per_s=args.tokens_per_s,
+        error_rate=args.error_rate,
+        response_tokens=args.response_tokens,
+        parallel=args.parallel,
+        host="0.0.0.0",
+        port=args.port,
+    )
+    print(f"fake ollama listening on {fake.url}", flush=True)
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
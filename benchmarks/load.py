@@ -0,0 +1,403 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : 疑似 Ollama サーバーによる負荷試験ハーネス
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""End-to-end load test of the API against a fake Ollama.
+
+Targets:
+- ``handler``: the Lambda ``handler.handler`` called in-process; the worker
+  count plays the role of Lambda reserved concurrency
+- ``server``: ``server.py`` started with uvicorn on a local port, driven over HTTP
+- ``url``: an already running deployment (``--url``)
+
+Load models:
+- closed loop: ``--concurrency`` clients, each sending its next request as
+  soon as the previous one returns
+- open loop: Poisson arrivals at each of ``--rates`` requests/s, served by
+  up to ``--concurrency`` in-flight requests. Latency is measured from the
+  scheduled arrival, so client-side queueing is included and reported
+  separately; a sweep reports the highest rate that stays unsaturated
+
+Unless ``--no-fake-ollama`` is given, a FakeOllama is started and
+OLLAMA_HOST points at it. LLM_MAX_CONCURRENCY / LLM_MAX_QUEUE etc. are read
+from the environment as usual.
+
+Usage:
+    python -m benchmarks.load --target handler --mode open --rates 2 4 8 16 --duration 20
+    python -m benchmarks.load --target server --mode closed --concurrency 32 --duration 30
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from .fake_ollama import FakeOllama
+from .synthetic import generate_queries
+
+DEFAULT_OUTPUT: Path = Path(__file__).resolve().parent / "results" / "load.json"
+SATURATION_THROUGHPUT_RATIO: float = 0.9
+SATURATION_ERROR_RATE: float = 0.01
+
+# (status code, response body or None)
+Send = Callable[[str, int], tuple[int, dict[str, Any] | None]]
+
+
+@dataclass(slots=True)
+class Sample:
+    """Timing of one request (time.monotonic() seconds)."""
+
+    scheduled: float
+    started: float
+    finished: float
+    status: int
+    requires_review: bool = False
+    llm_fallback: bool = False
+
+
+# --- Targets ---
+
+def handler_target() -> Send:
+    """Call the Lambda handler in-process."""
+    from src.langgraph_rag_hitl.handler import handler
+
+    def send(query: str, i: int) -> tuple[int, dict[str, Any] | None]:
+        event = {"httpMethod": "POST", "path": "/api/run", "body": json.dumps({"query": query})}
+        response = handler(event, SimpleNamespace(aws_request_id=f"load-{i}"))
+        return response["statusCode"], json.loads(response["body"])
+
+    return send
+
+
+def http_target(base_url: str, timeout_s: float = 120.0) -> Send:
+    """POST /api/run over HTTP with one keep-alive client per worker thread."""
+    import httpx
+
+    local = threading.local()
+
+    def send(query: str, i: int) -> tuple[int, dict[str, Any] | None]:
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = httpx.Client(base_url=base_url, timeout=timeout_s)
+        try:
+            response = client.post("/api/run", json={"query": query})
+        except httpx.HTTPError:
+            return 0, None
+        try:
+            return response.status_code, response.json()
+        except ValueError:
+            return response.status_code, None
+
+    return send
+
+
+def start_server() -> tuple[str, Callable[[], None]]:
+    """Run server.py with uvicorn on a free local port.
+
+    Returns:
+        (base URL, stop function)
+    """
+    import uvicorn
+
+    from src.langgraph_rag_hitl.server import app
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    def stop() -> None:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+    return f"http://127.0.0.1:{port}", stop
+
+
+# --- Load models ---
+
+def _issue(send: Send, query: str, i: int, scheduled: float, samples: list[Sample]) -> None:
+    started = time.monotonic()
+    try:
+        status, body = send(query, i)
+    except Exception:  # Any client failure counts as an error sample
+        status, body = 0, None
+    body = body or {}
+    samples.append(
+        Sample(
+            scheduled=scheduled,
+            started=started,
+            finished=time.monotonic(),
+            status=status,
+            requires_review=bool(body.get("requires_review")),
+            llm_fallback=str(body.get("answer", "")).startswith("[Ollama unavailable]"),
+        )
+    )
+
+
+def run_closed(send: Send, queries: list[str], concurrency: int, duration_s: float) -> list[Sample]:
+    """Each of concurrency clients sends back-to-back requests until duration_s."""
+    samples: list[Sample] = []
+    end = time.monotonic() + duration_s
+    counter = iter(range(sys.maxsize))
+    lock = threading.Lock()
+
+    def client() -> None:
+        while time.monotonic() < end:
+            with lock:
+                i = next(counter)
+            now = time.monotonic()
+            _issue(send, queries[i % len(queries)], i, now, samples)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return samples
+
+
+def run_open(
+    send: Send,
+    queries: list[str],
+    rate: float,
+    duration_s: float,
+    concurrency: int,
+    seed: int = 0,
+) -> list[Sample]:
+    """Poisson arrivals at rate/s for duration_s, at most concurrency in flight."""
+    rng = random.Random(seed)
+    samples: list[Sample] = []
+    start = time.monotonic()
+    arrivals = []
+    t = 0.0
+    while True:
+        t += rng.expovariate(rate)
+        if t >= duration_s:
+            break
+        arrivals.append(start + t)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for i, at in enumerate(arrivals):
+            delay = at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(_issue, send, queries[i % len(queries)], i, at, samples)
+    return samples
+
+
+# --- Reporting ---
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, max(0, round(q * len(ordered) + 0.5) - 1))] * 1000, 2)
+
+    return {"p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99), "max_ms": round(ordered[-1] * 1000, 2)}
+
+
+def summarize(samples: list[Sample]) -> dict[str, Any]:
+    """Throughput, latency, queueing and error summary of one run."""
+    if not samples:
+        return {"requests": 0}
+    ok = [s for s in samples if 200 <= s.status < 300]
+    wall_s = max(s.finished for s in samples) - min(s.scheduled for s in samples)
+    return {
+        "requests": len(samples),
+        "wall_s": round(wall_s, 3),
+        "throughput_rps": round(len(ok) / wall_s, 3) if wall_s > 0 else 0.0,
+        "error_rate": round(1 - len(ok) / len(samples), 4),
+        "status_counts": dict(sorted(Counter(str(s.status) for s in samples).items())),
+        "review_rate": round(sum(s.requires_review for s in ok) / len(ok), 4) if ok else 0.0,
+        "llm_fallback_rate": round(sum(s.llm_fallback for s in ok) / len(ok), 4) if ok else 0.0,
+        "latency": _percentiles([s.finished - s.scheduled for s in ok]),
+        "service_time": _percentiles([s.finished - s.started for s in ok]),
+        "client_queue_wait": _percentiles([s.started - s.scheduled for s in samples]),
+    }
+
+
+class QueueProbe:
+    """Samples the backend LLM queue depth while a run is in progress."""
+
+    def __init__(self, probe: Callable[[], dict[str, Any]], interval_s: float = 0.1) -> None:
+        self.probe = probe
+        self.interval_s = interval_s
+        self.depths: list[int] = []
+        self.active: list[int] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            try:
+                stats = self.probe()
+            except Exception:  # Probing is best effort
+                continue
+            self.depths.append(int(stats.get("queue_depth", 0)))
+            self.active.append(int(stats.get("active", 0)))
+
+    def __enter__(self) -> "QueueProbe":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "llm_queue_depth_max": max(self.depths, default=0),
+            "llm_queue_depth_mean": round(statistics.fmean(self.depths), 2) if self.depths else 0.0,
+            "llm_active_max": max(self.active, default=0),
+        }
+
+
+def is_saturated(rate: float, summary: dict[str, Any], slo_p95_ms: float | None) -> bool:
+    """An open-loop step is saturated if it cannot keep up, errors, or misses the SLO."""
+    if summary.get("requests", 0) == 0:
+        return True
+    if summary["throughput_rps"] < SATURATION_THROUGHPUT_RATIO * rate * (1 - summary["error_rate"]):
+        return True
+    if summary["error_rate"] > SATURATION_ERROR_RATE:
+        return True
+    return slo_p95_ms is not None and summary["latency"]["p95_ms"] > slo_p95_ms
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="End-to-end load test against a fake Ollama")
+    parser.add_argument("--target", choices=["handler", "server", "url"], default="handler")
+    parser.add_argument("--url", default="", help="Base URL for --target url")
+    parser.add_argument("--mode", choices=["open", "closed"], default="open")
+    parser.add_argument("--rates", type=float, nargs="+", default=[1.0, 2.0, 4.0, 8.0])
+    parser.add_argument("--concurrency", type=int, default=32, help="Max in-flight requests / clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per step")
+    parser.add_argument("--slo-p95-ms", type=float, default=None)
+    parser.add_argument("--queries", type=int, default=500, help="Distinct queries cycled through")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-fake-ollama", action="store_true", help="Use the configured OLLAMA_HOST")
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--tokens-per-s", type=float, default=40.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--response-tokens", type=int, default=128)
+    parser.add_argument("--ollama-parallel", type=int, default=4)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    return parser.parse_args(argv)
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the configured load test and return the result document."""
+    fake: FakeOllama | None = None
+    if not args.no_fake_ollama:
+        fake = FakeOllama(
+            latency_s=args.latency_ms / 1000,
+            tokens_per_s=args.tokens_per_s,
+            error_rate=args.error_rate,
+            response_tokens=args.response_tokens,
+            parallel=args.ollama_parallel,
+            seed=args.seed,
+        ).start()
+        os.environ["OLLAMA_HOST"] = fake.url
+
+    stop_server: Callable[[], None] | None = None
+    try:
+        if args.target == "handler":
+            from src.langgraph_rag_hitl.core import llm_scheduler_stats
+
+            send, probe = handler_target(), llm_scheduler_stats
+        else:
+            import httpx
+
+            base_url = args.url
+            if args.target == "server":
+                base_url, stop_server = start_server()
+            send = http_target(base_url)
+
+            def probe() -> dict[str, Any]:
+                return httpx.get(f"{base_url}/api/scheduler", timeout=1.0).json()
+
+        queries = generate_queries(args.queries, "medium", seed=args.seed)
+        steps = []
+        levels = args.rates if args.mode == "open" else [args.concurrency]
+        for level in levels:
+            with QueueProbe(probe) as queue:
+                if args.mode == "open":
+                    samples = run_open(send, queries, level, args.duration, args.concurrency, args.seed)
+                else:
+                    samples = run_closed(send, queries, int(level), args.duration)
+            step = {**summarize(samples), **queue.summary()}
+            if args.mode == "open":
+                step["offered_rps"] = level
+                step["saturated"] = is_saturated(level, step, args.slo_p95_ms)
+            else:
+                step["concurrency"] = int(level)
+            steps.append(step)
+            print(
+                f"{args.mode} {level:g}: {step.get('throughput_rps', 0):.2f} rps  "
+                f"p95 {step.get('latency', {}).get('p95_ms', 0):.0f}ms  "
+                f"errors {step.get('error_rate', 0):.1%}  llm queue max {step['llm_queue_depth_max']}",
+                flush=True,
+            )
+    finally:
+        if stop_server is not None:
+            stop_server()
+        if fake is not None:
+            fake.stop()
+
+    unsaturated = [s["offered_rps"] for s in steps if s.get("saturated") is False]
+    return {
+        "benchmark": "load",
+        "created_at": datetime.now(UTC).isoformat(),
+        "target": args.target,
+        "mode": args.mode,
+        "concurrency": args.concurrency,
+        "fake_ollama": None
+        if fake is None
+        else {
+            "latency_ms": args.latency_ms,
+            "tokens_per_s": args.tokens_per_s,
+            "error_rate": args.error_rate,
+            "response_tokens": args.response_tokens,
+            "parallel": args.ollama_parallel,
+        },
+        "llm_scheduler": {
+            k: os.environ.get(k, "") for k in ("LLM_MAX_CONCURRENCY", "LLM_MAX_QUEUE", "LLM_QUEUE_TIMEOUT_S")
+        },
+        "steps": steps,
+        "saturation_rps": max(unsaturated, default=None) if args.mode == "open" else None,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    document = run(args)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(document, ensure_ascii=False, indent=2), encoding="utf-8")
+    if document["saturation_rps"] is not None:
+        print(f"highest unsaturated rate: {document['saturation_rps']:g} rps")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
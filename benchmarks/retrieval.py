@@ -0,0 +1,241 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : 合成コーパスによる検索・索引ベンチマーク
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""HybridRetriever scale benchmark.
+
+For each corpus size the benchmark runs in a fresh (spawned) process so the
+peak RSS is per size, and measures:
+
+- index build time of HybridRetriever
+- peak RSS of the process (corpus + index)
+- retrieve latency p50/p95/p99 per query length class
+- rewrite-loop cost: one rewrite → retrieve → grade round, as run by the workflow
+
+Results are written as JSON. With ``--baseline`` the run is compared to a
+stored result and exits non-zero if any metric regressed beyond the
+tolerance; ``--save-baseline`` stores the current run as the new baseline.
+
+Usage:
+    python -m benchmarks.retrieval --sizes 10000 100000 1000000
+    python -m benchmarks.retrieval --sizes 10000 --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import statistics
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from .synthetic import generate_queries, generate_speeches
+
+DEFAULT_SIZES: tuple[int, ...] = (10_000, 100_000, 1_000_000)
+QUERY_LENGTHS: tuple[str, ...] = ("short", "medium", "long")
+DEFAULT_OUTPUT: Path = Path(__file__).resolve().parent / "results" / "retrieval.json"
+DEFAULT_TOLERANCE: float = 0.25
+
+# Differences smaller than this never count as regressions (timer / allocator noise)
+ABSOLUTE_SLACK: dict[str, float] = {"_ms": 1.0, "_s": 0.05, "_mb": 8.0}
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0-100)."""
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), round(q / 100 * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+
+def _latency_summary(samples_ms: list[float]) -> dict[str, float]:
+    return {
+        "p50_ms": round(_percentile(samples_ms, 50), 3),
+        "p95_ms": round(_percentile(samples_ms, 95), 3),
+        "p99_ms": round(_percentile(samples_ms, 99), 3),
+        "mean_ms": round(statistics.fmean(samples_ms), 3),
+    }
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def run_size(size: int, queries_per_length: int = 50, seed: int = 0) -> dict[str, Any]:
+    """Benchmark one corpus size in the current process.
+
+    Args:
+        size: Number of synthetic speeches
+        queries_per_length: Queries timed per length class
+        seed: Corpus and query seed
+
+    Returns:
+        Metrics dict for this size
+    """
+    from src.langgraph_rag_hitl.core import (
+        HybridRetriever,
+        _node_grade,
+        _node_retrieve,
+        _node_rewrite,
+    )
+
+    speeches = list(generate_speeches(size, seed=seed))
+    rss_corpus_mb = _peak_rss_mb()
+
+    start = time.perf_counter()
+    retriever = HybridRetriever(speeches)
+    build_s = time.perf_counter() - start
+
+    result: dict[str, Any] = {
+        "documents": size,
+        "passages": len(retriever.passages),
+        "build_s": round(build_s, 3),
+        "rss_corpus_mb": rss_corpus_mb,
+        "peak_rss_mb": _peak_rss_mb(),
+        "retrieve": {},
+    }
+
+    for length in QUERY_LENGTHS:
+        samples = []
+        for query in generate_queries(queries_per_length, length, seed=seed):
+            t0 = time.perf_counter()
+            retriever.retrieve(query, top_k=5)
+            samples.append((time.perf_counter() - t0) * 1000)
+        result["retrieve"][length] = _latency_summary(samples)
+
+    # One workflow rewrite round per query: rewrite → retrieve → grade
+    rounds = []
+    for query in generate_queries(max(1, queries_per_length // 5), "medium", seed=seed + 1):
+        state: dict[str, Any] = {
+            "query": query,
+            "rewritten_query": "",
+            "max_results": 5,
+            "user_roles": ["public"],
+            "workflow_steps": [],
+            "retry_count": 0,
+        }
+        t0 = time.perf_counter()
+        _node_grade(_node_retrieve(_node_rewrite(state), retriever))  # type: ignore[arg-type]
+        rounds.append((time.perf_counter() - t0) * 1000)
+    result["rewrite_round"] = _latency_summary(rounds)
+    result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+
+def _run_isolated(size: int, queries_per_length: int, seed: int) -> dict[str, Any]:
+    """Run one size in a spawned process so peak RSS is not shared across sizes."""
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        return pool.apply(run_size, (size, queries_per_length, seed))
+
+
+def _flatten(result: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    """Flatten nested metrics to dotted keys (numbers only)."""
+    flat: dict[str, float] = {}
+    for key, value in result.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif isinstance(value, int | float) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+
+# Metrics compared against the baseline (all lower-is-better)
+def _compared(metric: str) -> bool:
+    return metric.endswith(("build_s", "peak_rss_mb", "p50_ms", "p95_ms", "p99_ms"))
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], tolerance: float = DEFAULT_TOLERANCE
+) -> list[str]:
+    """List metrics that regressed beyond tolerance against the baseline.
+
+    Only sizes present in both runs are compared.
+
+    Args:
+        current: Result document of this run
+        baseline: Stored result document
+        tolerance: Allowed relative increase (0.25 = 25 %)
+
+    Returns:
+        Human-readable regression descriptions (empty if none)
+    """
+    regressions = []
+    for size, metrics in current["results"].items():
+        if size not in baseline.get("results", {}):
+            continue
+        now = _flatten(metrics)
+        before = _flatten(baseline["results"][size])
+        for metric, value in sorted(now.items()):
+            if not _compared(metric) or metric not in before:
+                continue
+            slack = next((v for suffix, v in ABSOLUTE_SLACK.items() if metric.endswith(suffix)), 0.0)
+            limit = before[metric] * (1 + tolerance)
+            if value > limit and value - before[metric] > slack:
+                regressions.append(
+                    f"{size}:{metric} {before[metric]:g} -> {value:g} "
+                    f"(+{(value / before[metric] - 1) * 100 if before[metric] else float('inf'):.0f}%)"
+                )
+    return regressions
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="HybridRetriever scale benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--queries", type=int, default=50, help="Timed queries per length class")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=None, help="Fail on regressions against this result")
+    parser.add_argument("--save-baseline", type=Path, default=None, help="Also write this run here")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--in-process", action="store_true", help="Do not spawn per size (shared RSS)")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark; returns the process exit code."""
+    args = parse_args(argv)
+    document: dict[str, Any] = {
+        "benchmark": "retrieval",
+        "created_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "queries_per_length": args.queries,
+        "results": {},
+    }
+    for size in args.sizes:
+        run = run_size if args.in_process else _run_isolated
+        result = run(size, args.queries, args.seed)
+        document["results"][str(size)] = result
+        print(
+            f"{size:>9} docs  build {result['build_s']:.2f}s  rss {result['peak_rss_mb']:.0f}MB  "
+            + "  ".join(f"{k} p95 {v['p95_ms']:.1f}ms" for k, v in result["retrieve"].items())
+            + f"  rewrite round p50 {result['rewrite_round']['p50_ms']:.1f}ms",
+            flush=True,
+        )
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(document, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if args.baseline is not None:
+        regressions = compare(document, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,340 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : qrels による検索品質とレイテンシのトレードオフ評価
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Retrieval quality versus latency evaluation.
+
+Runs a query set with graded relevance judgments (qrels) against one or
+more HybridRetriever configurations and reports, per configuration:
+
+- recall@k, nDCG@k and MRR (judgments are per speechID; passages of the
+  same speech count once, at their best rank)
+- retrieve latency p50/p95/p99 over ``--repeats`` passes
+- index build time and index memory (tracemalloc, Python allocations)
+- index size: passages, BM25 terms and postings (term, passage pairs)
+- against a baseline configuration: the share of postings saved and the
+  overlap of the top-k speeches per query (how much the ranking changed)
+
+The summary is a Pareto table: a configuration is on the frontier if no
+other configuration is at least as good on nDCG@k, p95 latency and index
+memory and strictly better on one of them.
+
+Query set (JSONL, one query per line)::
+
+    {"qid": "q01", "query": "委員長の選任方法", "relevant": {"<speechID>": 2, ...}}
+
+TREC-style qrels (``qid 0 docid grade``) can be given with ``--qrels`` and
+then the JSONL only needs ``qid`` and ``query``.
+
+Configurations (JSON list) map to HybridRetriever keyword arguments::
+
+    [{"name": "default"}, {"name": "p200", "passage_size": 200, "passage_overlap": 50}]
+
+A ``normalize`` key applies ingest normalization (normalize.py) before the
+build: ``true`` for the defaults, or IngestNormalizer fields such as
+``{"drop_record_info": true}``. Its time is reported as ``normalize_s``.
+
+Vocabulary pruning uses the HybridRetriever arguments ``max_df``,
+``min_df`` and ``stop_tokens``. Rows are compared with the first
+configuration unless a ``baseline`` key names another one (e.g. the
+unpruned build over the same normalized corpus).
+
+Usage:
+    python -m benchmarks.retrieval_eval
+    python -m benchmarks.retrieval_eval --corpus data/corpus --queries my.jsonl --configs configs.json -k 10
+"""
+
+import argparse
+import json
+import math
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+BENCH_DIR: Path = Path(__file__).resolve().parent
+DEFAULT_QUERIES: Path = BENCH_DIR / "qrels" / "kokkai_sample.jsonl"
+DEFAULT_CORPUS: Path = BENCH_DIR.parent / "data" / "sample" / "kokkai_sample.json"
+DEFAULT_OUTPUT: Path = BENCH_DIR / "results" / "retrieval_eval.json"
+
+DEFAULT_CONFIGS: list[dict[str, Any]] = [
+    {"name": "default"},
+    {"name": "passage200", "passage_size": 200, "passage_overlap": 50},
+    {"name": "passage800", "passage_size": 800, "passage_overlap": 200},
+    {"name": "whole_speech", "passage_size": 1_000_000, "passage_overlap": 0},
+    {"name": "no_collapse", "collapse_passages": False},
+    {"name": "normalized", "normalize": True},
+    {"name": "normalized_no_record_info", "normalize": {"drop_record_info": True}},
+    {"name": "max_df_0.5", "max_df": 0.5},
+    {"name": "min_df_2", "min_df": 2},
+    {"name": "stop_tokens", "stop_tokens": [" ", "　", "\r", "\n", "の", "、", "。", "君"]},
+    {"name": "normalized_max_df_0.5", "normalize": True, "max_df": 0.5, "baseline": "normalized"},
+]
+CONFIG_KEYS: tuple[str, ...] = ("name", "normalize", "baseline")  # Not HybridRetriever arguments
+
+Qrels = dict[str, dict[str, int]]  # qid -> speechID -> grade
+
+
+# --- Inputs ---
+
+def load_corpus(path: Path) -> list[dict[str, Any]]:
+    """Speech records from a Kokkai JSON file or a directory of them."""
+    files = sorted(path.glob("*.json")) if path.is_dir() else [path]
+    speeches: list[dict[str, Any]] = []
+    for f in files:
+        speeches.extend(json.loads(f.read_text(encoding="utf-8")).get("speechRecord", []))
+    return speeches
+
+
+def load_queries(path: Path, qrels_path: Path | None = None) -> tuple[list[tuple[str, str]], Qrels]:
+    """Read (qid, query) pairs and judgments.
+
+    Args:
+        path: JSONL query set (optionally carrying "relevant")
+        qrels_path: Optional TREC qrels file overriding inline judgments
+
+    Returns:
+        (queries, qrels); queries without any positive judgment are dropped
+    """
+    queries: list[tuple[str, str]] = []
+    qrels: Qrels = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        queries.append((item["qid"], item["query"]))
+        qrels[item["qid"]] = {k: int(v) for k, v in item.get("relevant", {}).items()}
+    if qrels_path is not None:
+        qrels = {}
+        for line in qrels_path.read_text(encoding="utf-8").splitlines():
+            parts = line.split()
+            if len(parts) == 4:
+                qrels.setdefault(parts[0], {})[parts[2]] = int(parts[3])
+    judged = [(qid, q) for qid, q in queries if any(g > 0 for g in qrels.get(qid, {}).values())]
+    return judged, qrels
+
+
+# --- Metrics ---
+
+def ranked_speech_ids(speech_ids: Sequence[str]) -> list[str]:
+    """Deduplicate passage hits to speeches, keeping each at its best rank."""
+    return list(dict.fromkeys(speech_ids))
+
+
+def recall_at_k(ranked: Sequence[str], relevant: dict[str, int], k: int) -> float:
+    positives = {d for d, g in relevant.items() if g > 0}
+    return len(positives & set(ranked[:k])) / len(positives) if positives else 0.0
+
+
+def ndcg_at_k(ranked: Sequence[str], relevant: dict[str, int], k: int) -> float:
+    dcg = sum((2 ** relevant.get(d, 0) - 1) / math.log2(i + 2) for i, d in enumerate(ranked[:k]))
+    ideal = sorted((g for g in relevant.values() if g > 0), reverse=True)[:k]
+    idcg = sum((2**g - 1) / math.log2(i + 2) for i, g in enumerate(ideal))
+    return dcg / idcg if idcg else 0.0
+
+
+def reciprocal_rank(ranked: Sequence[str], relevant: dict[str, int]) -> float:
+    return next((1.0 / (i + 1) for i, d in enumerate(ranked) if relevant.get(d, 0) > 0), 0.0)
+
+
+def _percentile_ms(samples_s: list[float], q: float) -> float:
+    ordered = sorted(samples_s)
+    rank = max(1, min(len(ordered), round(q / 100 * len(ordered) + 0.5)))
+    return round(ordered[rank - 1] * 1000, 3)
+
+
+# --- Evaluation ---
+
+def evaluate_config(
+    config: dict[str, Any],
+    speeches: list[dict[str, Any]],
+    queries: list[tuple[str, str]],
+    qrels: Qrels,
+    k: int = 5,
+    repeats: int = 3,
+) -> dict[str, Any]:
+    """Build one configuration and measure quality, latency and memory.
+
+    Args:
+        config: {"name": ..., "normalize": ..., "baseline": ..., **HybridRetriever kwargs}
+        speeches: Corpus records
+        queries: (qid, query) pairs
+        qrels: Judgments per qid
+        k: Cutoff for recall and nDCG (also the retrieval depth)
+        repeats: Timed passes over the query set
+
+    Returns:
+        Metrics row for this configuration
+    """
+    from src.langgraph_rag_hitl.core import HybridRetriever
+    from src.langgraph_rag_hitl.normalize import IngestNormalizer
+
+    kwargs = {key: value for key, value in config.items() if key not in CONFIG_KEYS}
+
+    normalize_s = 0.0
+    normalize = config.get("normalize")
+    if normalize:
+        normalizer = IngestNormalizer(**normalize) if isinstance(normalize, dict) else IngestNormalizer()
+        start = time.perf_counter()
+        speeches = normalizer.apply(speeches)
+        normalize_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    retriever = HybridRetriever(speeches, **kwargs)
+    build_s = time.perf_counter() - start
+
+    # Second, traced build for memory only (tracemalloc slows the build it observes)
+    tracemalloc.start()
+    traced = HybridRetriever(speeches, **kwargs)
+    index_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del traced
+
+    recalls, ndcgs, rrs = [], [], []
+    rankings: dict[str, list[str]] = {}
+    for qid, query in queries:
+        # Passages beyond k can hold further speeches when not collapsing
+        ranked = ranked_speech_ids([d.speech_id for d in retriever.retrieve(query, top_k=k * 4)])
+        rankings[qid] = ranked[:k]
+        recalls.append(recall_at_k(ranked, qrels[qid], k))
+        ndcgs.append(ndcg_at_k(ranked, qrels[qid], k))
+        rrs.append(reciprocal_rank(ranked[:k], qrels[qid]))
+
+    latencies = []
+    for _ in range(repeats):
+        for _, query in queries:
+            t0 = time.perf_counter()
+            retriever.retrieve(query, top_k=k)
+            latencies.append(time.perf_counter() - t0)
+
+    doc_freqs = retriever._bm25.doc_freqs if retriever._bm25 is not None else []
+    params = {**kwargs, "normalize": normalize} if normalize else kwargs
+    return {
+        "name": config.get("name", json.dumps(params, sort_keys=True)),
+        "params": params,
+        "speeches": len(speeches),
+        "passages": len(retriever.passages),
+        "terms": len(set().union(*doc_freqs)) if doc_freqs else 0,
+        "postings": sum(len(freqs) for freqs in doc_freqs),
+        "pruned_terms": len(retriever.pruned_tokens),
+        f"recall@{k}": round(statistics.fmean(recalls), 4),
+        f"ndcg@{k}": round(statistics.fmean(ndcgs), 4),
+        "mrr": round(statistics.fmean(rrs), 4),
+        "p50_ms": _percentile_ms(latencies, 50),
+        "p95_ms": _percentile_ms(latencies, 95),
+        "p99_ms": _percentile_ms(latencies, 99),
+        "build_s": round(build_s, 3),
+        "normalize_s": round(normalize_s, 3),
+        "index_mb": round(index_bytes / (1024 * 1024), 2),
+        "baseline": config.get("baseline"),
+        "rankings": rankings,
+    }
+
+
+def compare_to_baseline(rows: list[dict[str, Any]], k: int) -> None:
+    """Add postings saved and top-k overlap relative to each row's baseline.
+
+    The baseline is the row named by the config's ``baseline`` key, else the
+    first row. ``overlap@k`` is the mean share of the baseline's top-k
+    speeches a row also returns in its top k (1.0: same speeches).
+
+    Args:
+        rows: Rows from evaluate_config, updated in place
+        k: Cutoff the rows were evaluated with
+    """
+    by_name = {r["name"]: r for r in rows}
+    for row in rows:
+        base = by_name.get(row["baseline"], rows[0])
+        row["baseline"] = base["name"]
+        row["postings_saved"] = round(1 - row["postings"] / base["postings"], 4) if base["postings"] else 0.0
+        overlaps = [
+            len(set(row["rankings"][qid]) & set(expected)) / len(expected)
+            for qid, expected in base["rankings"].items()
+            if expected and qid in row["rankings"]
+        ]
+        row[f"overlap@{k}"] = round(statistics.fmean(overlaps), 4) if overlaps else 1.0
+        row[f"ndcg@{k}_delta"] = round(row[f"ndcg@{k}"] - base[f"ndcg@{k}"], 4)
+
+
+def pareto_front(rows: list[dict[str, Any]], quality_key: str) -> set[str]:
+    """Names of rows not dominated on (quality up, p95 latency down, index memory down)."""
+
+    def dominates(a: dict[str, Any], b: dict[str, Any]) -> bool:
+        at_least = a[quality_key] >= b[quality_key] and a["p95_ms"] <= b["p95_ms"] and a["index_mb"] <= b["index_mb"]
+        strictly = a[quality_key] > b[quality_key] or a["p95_ms"] < b["p95_ms"] or a["index_mb"] < b["index_mb"]
+        return at_least and strictly
+
+    return {r["name"] for r in rows if not any(dominates(o, r) for o in rows if o is not r)}
+
+
+def pareto_table(rows: list[dict[str, Any]], k: int) -> str:
+    """Markdown table sorted by p95 latency, frontier rows marked with *."""
+    front = pareto_front(rows, f"ndcg@{k}")
+    header = (
+        f"| pareto | config | recall@{k} | nDCG@{k} | MRR | p50 ms | p95 ms | p99 ms "
+        f"| index MB | postings | saved | overlap@{k} | build s |"
+    )
+    lines = [header, "|" + "---|" * (header.count("|") - 1)]
+    for r in sorted(rows, key=lambda r: (r["p95_ms"], -r[f"ndcg@{k}"])):
+        lines.append(
+            f"| {'*' if r['name'] in front else ''} | {r['name']} | {r[f'recall@{k}']:.3f} | "
+            f"{r[f'ndcg@{k}']:.3f} | {r['mrr']:.3f} | {r['p50_ms']:.2f} | {r['p95_ms']:.2f} | "
+            f"{r['p99_ms']:.2f} | {r['index_mb']:.1f} | {r['postings']} | {r.get('postings_saved', 0.0):.1%} | "
+            f"{r.get(f'overlap@{k}', 1.0):.3f} | {r['build_s']:.2f} |"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Retrieval quality vs latency evaluation")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Kokkai JSON file or directory")
+    parser.add_argument("--queries", type=Path, default=DEFAULT_QUERIES, help="JSONL query set")
+    parser.add_argument("--qrels", type=Path, default=None, help="TREC qrels overriding inline judgments")
+    parser.add_argument("--configs", type=Path, default=None, help="JSON list of HybridRetriever configs")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    speeches = load_corpus(args.corpus)
+    queries, qrels = load_queries(args.queries, args.qrels)
+    configs = json.loads(args.configs.read_text(encoding="utf-8")) if args.configs else DEFAULT_CONFIGS
+
+    rows = [evaluate_config(c, speeches, queries, qrels, args.k, args.repeats) for c in configs]
+    compare_to_baseline(rows, args.k)
+    table = pareto_table(rows, args.k)
+    print(table)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(
+        json.dumps(
+            {
+                "benchmark": "retrieval_eval",
+                "created_at": datetime.now(UTC).isoformat(),
+                "corpus": str(args.corpus),
+                "documents": len(speeches),
+                "queries": len(queries),
+                "k": args.k,
+                "pareto": sorted(pareto_front(rows, f"ndcg@{args.k}")),
+                "results": rows,
+            },
+            ensure_ascii=False,
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
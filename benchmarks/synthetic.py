@@ -0,0 +1,162 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : 合成コーパスによる検索・索引ベンチマーク
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Deterministic synthetic 国会議事録 speech generator.
+
+Produces speech records shaped like the Kokkai API ``speechRecord`` entries
+(same keys as data/sample/kokkai_sample.json) at any size. The style is
+seeded from the sample: speakers, houses and meeting names, and the
+sample's own sentences are mixed with templated policy sentences. Topics
+are drawn from a Zipf-like distribution so term document frequencies are
+skewed the way real proceedings are.
+
+The same (n, seed) always yields the same records, so runs are comparable.
+"""
+
+import json
+import random
+import re
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+SAMPLE_PATH: Path = Path(__file__).resolve().parent.parent / "data" / "sample" / "kokkai_sample.json"
+
+TOPICS: tuple[str, ...] = (
+    "予算", "教育", "社会保障", "外交", "安全保障", "年金", "医療", "介護", "子育て支援",
+    "地方創生", "防災", "税制", "雇用", "エネルギー", "農業", "漁業", "デジタル化", "環境",
+    "交通", "観光", "沖縄振興", "北方領土", "財政健全化", "物価高騰", "賃上げ", "少子化",
+    "科学技術", "文化", "司法制度", "行政改革", "公務員制度", "通商", "中小企業", "住宅",
+    "感染症対策", "食料安全保障", "再生可能エネルギー", "国土強靱化", "選挙制度", "憲法",
+)
+
+SUBJECTS: tuple[str, ...] = (
+    "政府", "本委員会", "関係省庁", "地方自治体", "私ども", "総理", "大臣", "法案提出者",
+)
+
+TEMPLATES: tuple[str, ...] = (
+    "{topic}について{subject}の見解をお伺いいたします。",
+    "{topic}に関する{topic2}との関係をどのように整理しているのか、御説明願います。",
+    "{subject}としては、{topic}の充実に向けて引き続き全力で取り組んでまいります。",
+    "{topic}の現状は極めて厳しく、{topic2}への影響も懸念されております。",
+    "昨年度の{topic}関連の執行状況について、具体的な数字をお示しください。",
+    "{topic}と{topic2}を一体的に進めることが重要であると考えております。",
+    "御指摘の{topic}につきましては、{subject}において検討を進めているところでございます。",
+    "{topic}の見直しについて、国民の理解を得る努力が必要ではないでしょうか。",
+)
+
+_SENTENCE = re.compile(r"[^。]+。")
+
+
+def _load_style(sample_path: Path) -> dict[str, list[str]]:
+    """Collect speakers, houses, meetings and sentences from the sample corpus."""
+    style: dict[str, list[str]] = {"speakers": [], "houses": [], "meetings": [], "sentences": []}
+    if sample_path.exists():
+        records = json.loads(sample_path.read_text(encoding="utf-8")).get("speechRecord", [])
+        for r in records:
+            if r.get("speaker") == "会議録情報":  # Roster blocks, not speech
+                continue
+            style["speakers"].append(r.get("speaker", ""))
+            style["houses"].append(r.get("nameOfHouse", ""))
+            style["meetings"].append(r.get("nameOfMeeting", ""))
+            text = " ".join(r.get("speech", "").split())
+            style["sentences"].extend(s.strip() for s in _SENTENCE.findall(text) if len(s) > 8)
+    style["speakers"] = sorted(set(filter(None, style["speakers"]))) or ["委員長"]
+    style["houses"] = sorted(set(filter(None, style["houses"]))) or ["衆議院", "参議院"]
+    style["meetings"] = sorted(set(filter(None, style["meetings"]))) or ["予算委員会"]
+    return style
+
+
+def _zipf_weights(n: int, s: float = 1.1) -> list[float]:
+    return [1.0 / (rank**s) for rank in range(1, n + 1)]
+
+
+def generate_speeches(
+    n: int,
+    seed: int = 0,
+    sample_path: Path = SAMPLE_PATH,
+    mean_sentences: float = 4.0,
+) -> Iterator[dict[str, Any]]:
+    """Yield n synthetic speech records.
+
+    Args:
+        n: Number of records
+        seed: Random seed (same seed, same records)
+        sample_path: Sample corpus the style is taken from
+        mean_sentences: Mean sentences per speech (geometric distribution)
+
+    Yields:
+        Speech record dicts with the Kokkai API keys used by the retriever
+    """
+    rng = random.Random(seed)
+    style = _load_style(sample_path)
+    weights = _zipf_weights(len(TOPICS))
+    # Synthetic members beside the sample's speakers so speaker tokens vary
+    family = "佐藤鈴木高橋田中伊藤渡辺山本中村小林加藤吉田山田佐々木山口松本井上木村林清水"
+    given = "太郎花子健一美咲大輔陽子誠直子翔恵"
+    surnames = [family[i : i + 2] for i in range(0, len(family), 2)]
+    given_names = [given[i : i + 2] for i in range(0, len(given), 2)]
+
+    for i in range(n):
+        if rng.random() < 0.3:
+            speaker = rng.choice(style["speakers"])
+        else:
+            speaker = f"{rng.choice(surnames)}{rng.choice(given_names)}君"
+        n_sentences = 1
+        while rng.random() > 1.0 / mean_sentences and n_sentences < 40:
+            n_sentences += 1
+        sentences = []
+        for _ in range(n_sentences):
+            if style["sentences"] and rng.random() < 0.15:
+                sentences.append(rng.choice(style["sentences"]))
+                continue
+            topic, topic2 = rng.choices(TOPICS, weights=weights, k=2)
+            sentences.append(
+                rng.choice(TEMPLATES).format(topic=topic, topic2=topic2, subject=rng.choice(SUBJECTS))
+            )
+        session = 200 + i % 25
+        date = f"20{10 + i % 16:02d}-{1 + i % 12:02d}-{1 + i % 28:02d}"
+        issue_id = f"SYN{session:03d}{i // 50:07d}"
+        yield {
+            "speechID": f"{issue_id}_{i % 50:03d}",
+            "issueID": issue_id,
+            "session": session,
+            "nameOfHouse": rng.choice(style["houses"]),
+            "nameOfMeeting": rng.choice(style["meetings"]),
+            "issue": f"第{1 + i % 20}号",
+            "date": date,
+            "speaker": speaker,
+            "speech": f"○{speaker}　" + "".join(sentences),
+            "speechURL": f"https://kokkai.ndl.go.jp/txt/{issue_id}/{i % 50}",
+            "meetingURL": f"https://kokkai.ndl.go.jp/txt/{issue_id}",
+            "pdfURL": None,
+        }
+
+
+def generate_queries(n: int, length: str, seed: int = 0) -> list[str]:
+    """Deterministic benchmark queries of a given length class.
+
+    Args:
+        n: Number of queries
+        length: "short" (one topic), "medium" (topic question) or "long"
+            (multi-topic question, ~40 characters)
+        seed: Random seed
+
+    Returns:
+        Query strings
+    """
+    rng = random.Random(f"{seed}:{length}")
+    queries = []
+    for _ in range(n):
+        a, b, c = rng.sample(TOPICS, 3)
+        if length == "short":
+            queries.append(a)
+        elif length == "medium":
+            queries.append(f"{a}に関する{b}の議論")
+        else:
+            queries.append(f"{a}と{b}について、{c}への影響を含めて政府はどのような答弁をしているか")
+    return queries
@@ -3,7 +3,7 @@
 # Agent   : data_explorer
 # Task    : 国会議事録 API データ取得・サンプル生成
 # Created : 2026-02-23
-# Updated : 2026-02-23
+# Updated : 2026-10-19
 # [/DEBUG] ===========================================================
 
 # /// script
@@ -20,9 +20,30 @@
 国立国会図書館が提供する国会会議録検索システム API から発言データを
 非同期で取得し、ローカルに保存します。
 
+複数バッチを並行取得します（同時リクエスト数は --concurrency で上限を設定）。
+全リクエストはトークンバケット（--rate 件/秒）を通り、429 / 5xx 応答では
+レートを下げて Retry-After に従い、成功が続くと元のレートまで戻します。
+取得済みのレコード範囲は出力ディレクトリの manifest.json に記録され、
+中断後の再実行では未取得のバッチだけを取得します。
+
+--sync は増分同期モードです。前回までに取得した最新の会議日（sync_state.json）の
+--lookback-days 日前以降だけを日付ウィンドウ（--window-days 日）ごとに取得し、
+speechID で重複を除いた新規発言のみを差分ファイル（kokkai_sync_*.json）として
+出力します。遡る期間があるため、最新会議日より前の日付で後から公開された
+会議録も取り込まれます。
+
+--format jsonl / jsonl.gz はバッチを 1 行 1 発言の JSONL（gzip 圧縮可）で
+書き出し、全レコードをメモリに保持しません。--index-snapshot / --index-url を
+指定すると、受信したバッチをそのまま索引構築（src.langgraph_rag_hitl.ingest）に
+渡し、ダウンロード完了時に検索可能な索引を書き出します（リポジトリのルートで
+プロジェクト環境から python -m data.download として実行してください）。
+
 Usage:
     uv run data/download.py
     uv run data/download.py --total 500 --batch-size 100 --keyword 教育
+    uv run data/download.py --total 0 --concurrency 4 --rate 2   # 日付範囲の全件
+    uv run data/download.py --sync --from-date 2024-01-01         # 増分同期（初回は from-date から）
+    uv run python -m data.download --total 0 --format jsonl.gz --index-snapshot index/kokkai.snapshot
 
 API Reference:
     https://kokkai.ndl.go.jp/api/speech
@@ -30,16 +51,19 @@ API Reference:
 
 import argparse
 import asyncio
+import gzip
 import json
 import logging
-import math
 import random
+import shutil
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
 import httpx
-from tqdm import tqdm
-
 
 # -----------------------------------------------------------------------
 # 定数
@@ -50,10 +74,28 @@ DEFAULT_BATCH_SIZE = 100
 DEFAULT_OUTPUT_DIR = Path(__file__).parent / "corpus"
 SAMPLE_DIR = Path(__file__).parent / "sample"
 SAMPLE_FILE = SAMPLE_DIR / "kokkai_sample.json"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+SYNC_STATE_NAME = "sync_state.json"
+SYNC_STATE_VERSION = 2
+SYNC_STAGING_DIR = ".sync"  # ウィンドウ取得中のバッチファイル置き場（確定後に削除）
+SYNC_FILE_PREFIX = "kokkai_sync_"
+DEFAULT_WINDOW_DAYS = 30
+DEFAULT_LOOKBACK_DAYS = 30  # 会議録は会議日から数日〜数週間遅れて公開される
+OUTPUT_FORMATS = ("json", "jsonl", "jsonl.gz")  # json はレスポンス全体を整形して保存
+CORPUS_FILE_SUFFIXES = tuple(f".{fmt}" for fmt in OUTPUT_FORMATS)  # core.CORPUS_FILE_SUFFIXES と同一に保つ
 TIMEOUT_SECONDS = 30.0
 MAX_RETRIES = 3
 RETRY_BASE_DELAY = 1.0  # 指数バックオフの基底秒数
 
+# 並行取得とレート制御（NDL API への負荷を抑える既定値）
+DEFAULT_CONCURRENCY = 4  # 同時に実行中のリクエスト数の上限
+DEFAULT_RATE = 2.0  # 1秒あたりのリクエスト数（トークン補充レート）
+MIN_RATE = 0.1  # 減速時の下限
+SLOWDOWN_FACTOR = 0.5  # 429 / 5xx 応答ごとにレートへ掛ける係数
+RECOVERY_FACTOR = 1.25  # RECOVERY_STREAK 回連続成功ごとにレートへ掛ける係数
+RECOVERY_STREAK = 10
+
 # API は検索条件が必須。日付範囲で全件取得する
 # 第1回国会（1947年）以降の全データを対象とするデフォルト範囲
 DEFAULT_FROM_DATE = "1947-01-01"
@@ -78,6 +120,182 @@ SpeechRecord = dict[str, Any]
 ApiResponse = dict[str, Any]
 
 
+# -----------------------------------------------------------------------
+# レート制御・再開用マニフェスト
+# -----------------------------------------------------------------------
+
+class RateLimiter:
+    """
+    asyncio 用のトークンバケット型レートリミッタ（429 / 5xx で適応的に減速）。
+
+    トークンは rate 個/秒で補充され、最大 capacity 個まで貯まる。
+    penalize() でレートを SLOWDOWN_FACTOR 倍に下げて一時停止し、
+    reward() が RECOVERY_STREAK 回続くごとに初期レートまで段階的に戻す。
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: float = 1.0, min_rate: float = MIN_RATE) -> None:
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.capacity = max(capacity, 1.0)
+        self.slowdowns = 0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._streak = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """トークンを 1 個取得する（なければ補充まで待つ）。"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+    def penalize(self, retry_after: float | None = None) -> None:
+        """
+        サーバー側の制限（429 / 5xx）に応じて減速する。
+
+        Args:
+            retry_after: Retry-After ヘッダーの秒数（なければ新レートの 1 間隔だけ停止）
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self.rate = max(self.min_rate, self.rate * SLOWDOWN_FACTOR)
+        self._tokens = 0.0
+        self._streak = 0
+        self.slowdowns += 1
+        pause = retry_after if retry_after is not None else 1.0 / self.rate
+        self._paused_until = max(self._paused_until, now + pause)
+
+    def reward(self) -> None:
+        """成功応答を記録し、連続成功が続けばレートを戻す。"""
+        self._streak += 1
+        if self._streak >= RECOVERY_STREAK and self.rate < self.max_rate:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate * RECOVERY_FACTOR)
+            self._streak = 0
+
+
+class DownloadManifest:
+    """
+    取得済みレコード範囲の記録（中断後の再開用）。
+
+    検索条件（keyword / 日付範囲 / batch_size）ごとに 1 ファイル。条件が
+    異なるマニフェストは破棄して新規に開始する。範囲は 1-indexed の
+    半開区間 [start, end) を結合して保持し、バッチファイルの保存後に
+    アトミックに書き込む。
+    """
+
+    def __init__(self, path: Path, query: dict[str, Any]) -> None:
+        self.path = path
+        self.query = query
+        self.number_of_records: int | None = None
+        self.completed: list[list[int]] = []
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError) as exc:
+                logger.warning(f"manifest_unreadable path={path} error={exc}")
+                return
+            if data.get("version") == MANIFEST_VERSION and data.get("query") == query:
+                self.number_of_records = data.get("numberOfRecords")
+                self.completed = [list(r) for r in data.get("completed", [])]
+            else:
+                logger.info(f"manifest_reset path={path} reason=query_changed")
+
+    def is_done(self, start: int, count: int) -> bool:
+        """[start, start + count) が取得済みか。"""
+        return any(lo <= start and start + count <= hi for lo, hi in self.completed)
+
+    def mark_done(self, start: int, count: int) -> None:
+        """範囲を取得済みとして記録し、保存する。"""
+        ranges = sorted([*self.completed, [start, start + count]])
+        merged: list[list[int]] = []
+        for lo, hi in ranges:
+            if merged and lo <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], hi)
+            else:
+                merged.append([lo, hi])
+        self.completed = merged
+        self.save()
+
+    def save(self) -> None:
+        """マニフェストをアトミックに書き込む。"""
+        data = {
+            "version": MANIFEST_VERSION,
+            "query": self.query,
+            "numberOfRecords": self.number_of_records,
+            "completed": self.completed,
+        }
+        _write_json_atomic(self.path, data, indent=None)
+
+
+def _write_json_atomic(path: Path, data: Any, indent: int | None = 2) -> None:
+    """一時ファイルへ書いてから rename する（中断時に壊れたファイルを残さない）。"""
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    tmp.replace(path)
+
+
+def _write_batch(path: Path, response_data: ApiResponse, output_format: str) -> None:
+    """バッチをアトミックに書き込む（jsonl は 1 行 1 発言のコンパクト形式）。"""
+    if output_format == "json":
+        _write_json_atomic(path, response_data)
+        return
+    tmp = path.with_name(path.name + ".tmp")
+    opener = gzip.open if output_format.endswith(".gz") else open
+    with opener(tmp, "wt", encoding="utf-8") as f:
+        for record in response_data.get("speechRecord", []):
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+    tmp.replace(path)
+
+
+def read_corpus_file(path: Path) -> list[SpeechRecord]:
+    """
+    コーパスファイル（.json / .jsonl / .jsonl.gz）の発言レコードを読み込む。
+
+    src.langgraph_rag_hitl.core._read_corpus_file と同じ実装（このスクリプトは
+    プロジェクト環境なしでも実行できるよう core を import しない）。形式を
+    変更する場合は両方を更新する（tests/test_download.py で一致を確認）。
+
+    Args:
+        path: バッチファイル、差分ファイル、またはサンプルファイル
+
+    Returns:
+        SpeechRecord のリスト
+    """
+    if path.name.endswith(".json"):
+        return json.loads(path.read_text(encoding="utf-8")).get("speechRecord", [])
+    opener = gzip.open if path.name.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        lines = [line for line in f.read().split("\n") if line.strip()]
+    # JSON text never contains a raw newline: parse all lines as one array
+    return json.loads("[" + ",".join(lines) + "]")
+
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    """Retry-After ヘッダー（秒数形式）を解釈する。"""
+    value = response.headers.get("Retry-After")
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except ValueError:
+        return None
+
+
 # -----------------------------------------------------------------------
 # コア関数
 # -----------------------------------------------------------------------
@@ -89,11 +307,17 @@ async def fetch_speeches(
     keyword: str = "",
     from_date: str = DEFAULT_FROM_DATE,
     until_date: str = DEFAULT_UNTIL_DATE,
+    *,
+    base_url: str = API_BASE_URL,
+    limiter: RateLimiter | None = None,
+    max_retries: int = MAX_RETRIES,
+    retry_base_delay: float = RETRY_BASE_DELAY,
 ) -> ApiResponse:
     """
     国会会議録 API から発言データを取得する。
 
-    指数バックオフ付きリトライを最大 MAX_RETRIES 回実施する。
+    指数バックオフ付きリトライを最大 max_retries 回実施する。limiter を
+    渡した場合は各試行の前にトークンを取得し、429 / 5xx 応答で減速させる。
 
     Note:
         国会会議録 API は検索条件が必須です。キーワードが空の場合は
@@ -106,13 +330,17 @@ async def fetch_speeches(
         keyword: 全文検索キーワード（空文字列で日付範囲指定に切り替え）
         from_date: 取得開始日（YYYY-MM-DD 形式、keyword 空の場合に使用）
         until_date: 取得終了日（YYYY-MM-DD 形式、keyword 空の場合に使用）
+        base_url: API エンドポイント（テスト用のローカルサーバーに差し替え可能）
+        limiter: 共有レートリミッタ
+        max_retries: 最大試行回数
+        retry_base_delay: 指数バックオフの基底秒数
 
     Returns:
         API レスポンスの dict（numberOfRecords, speechRecord 等を含む）
 
     Raises:
-        httpx.HTTPStatusError: HTTP エラーが MAX_RETRIES 回を超えた場合
-        httpx.TimeoutException: タイムアウトが MAX_RETRIES 回を超えた場合
+        httpx.HTTPStatusError: HTTP エラーが max_retries 回を超えた場合
+        httpx.TimeoutException: タイムアウトが max_retries 回を超えた場合
     """
     params: dict[str, str | int] = {
         "maximumRecords": maximum_records,
@@ -128,11 +356,16 @@ async def fetch_speeches(
 
     last_exception: Exception | None = None
 
-    for attempt in range(MAX_RETRIES):
+    for attempt in range(max_retries):
+        retry_after: float | None = None
+        if limiter is not None:
+            await limiter.acquire()
         try:
-            response = await client.get(API_BASE_URL, params=params)
+            response = await client.get(base_url, params=params)
             response.raise_for_status()
             data: ApiResponse = response.json()
+            if limiter is not None:
+                limiter.reward()
             logger.info(
                 f"fetch ok start={start_record} count={maximum_records} attempt={attempt}"
             )
@@ -140,11 +373,19 @@ async def fetch_speeches(
 
         except (httpx.HTTPStatusError, httpx.TimeoutException, httpx.RequestError) as exc:
             last_exception = exc
-            if attempt < MAX_RETRIES - 1:
-                # 指数バックオフ + ジッタ
-                delay = RETRY_BASE_DELAY * (2 ** attempt) + random.uniform(0, 0.5)
+            if isinstance(exc, httpx.HTTPStatusError):
+                status = exc.response.status_code
+                if status == 429 or status >= 500:
+                    # サーバー側の制限: 全ワーカー共通のレートを下げる
+                    retry_after = _retry_after_seconds(exc.response)
+                    if limiter is not None:
+                        limiter.penalize(retry_after)
+            if attempt < max_retries - 1:
+                # 指数バックオフ + ジッタ（Retry-After があればそれ以上待つ）
+                delay = retry_base_delay * (2 ** attempt) + random.uniform(0, 0.5 * retry_base_delay)
+                delay = max(delay, retry_after or 0.0)
                 logger.warning(
-                    f"retry start={start_record} attempt={attempt + 1}/{MAX_RETRIES} "
+                    f"retry start={start_record} attempt={attempt + 1}/{max_retries} "
                     f"delay={delay:.2f}s error={exc}"
                 )
                 await asyncio.sleep(delay)
@@ -156,18 +397,19 @@ async def fetch_speeches(
     raise last_exception  # type: ignore[misc]
 
 
-def build_output_path(output_dir: Path, start_record: int) -> Path:
+def build_output_path(output_dir: Path, start_record: int, output_format: str = "json") -> Path:
     """
     出力ファイルパスを構築する。
 
     Args:
         output_dir: 出力ディレクトリ
         start_record: バッチの開始レコード位置
+        output_format: 出力形式（OUTPUT_FORMATS のいずれか、拡張子になる）
 
     Returns:
         出力ファイルの Path オブジェクト
     """
-    return output_dir / f"kokkai_{start_record:06d}.json"
+    return output_dir / f"kokkai_{start_record:06d}.{output_format}"
 
 
 async def download_corpus(
@@ -178,100 +420,469 @@ async def download_corpus(
     until_date: str = DEFAULT_UNTIL_DATE,
     output_dir: Path = DEFAULT_OUTPUT_DIR,
     skip_existing: bool = True,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate: float = DEFAULT_RATE,
+    base_url: str = API_BASE_URL,
+    sample_file: Path | None = SAMPLE_FILE,
+    retry_base_delay: float = RETRY_BASE_DELAY,
+    progress: Callable[[int, int], None] | None = None,
+    limiter: RateLimiter | None = None,
+    output_format: str = "json",
+    on_batch: Callable[[int, list[SpeechRecord]], None] | None = None,
+    keep_records: bool = True,
 ) -> list[SpeechRecord]:
     """
     国会会議録データを非同期で一括取得してファイルに保存する。
 
-    冪等性: skip_existing=True の場合、既存ファイルがあればスキップする。
-    サンプル: 最初の10件を data/sample/kokkai_sample.json に保存する。
+    先頭バッチで総件数（numberOfRecords）を確認した後、残りのバッチを
+    最大 concurrency 本のワーカーで並行取得する。全リクエストは共有の
+    RateLimiter を通る。
+
+    冪等性: skip_existing=True の場合、マニフェストに記録済みでファイルが
+    存在するバッチはスキップする（中断後の再開）。
+    サンプル: 先頭バッチの最初の10件を sample_file に保存する。
+    ストリーミング: keep_records=False ではレコードを保持せず、各バッチは
+    書き込み後に on_batch へ渡すだけなので、メモリ使用量は総件数に依存しない。
 
     Args:
-        total: 取得総件数
+        total: 取得総件数（0 以下で検索結果の全件）
         batch_size: 1リクエストあたりの取得件数（最大100）
         keyword: 全文検索キーワード（空文字列で日付範囲指定に切り替え）
         from_date: 取得開始日（YYYY-MM-DD、keyword 空の場合に使用）
         until_date: 取得終了日（YYYY-MM-DD、keyword 空の場合に使用）
         output_dir: コーパス出力ディレクトリ
-        skip_existing: 既存ファイルをスキップするか（冪等性）
+        skip_existing: 取得済みバッチをスキップするか（冪等性）
+        concurrency: 同時リクエスト数の上限
+        rate: 1秒あたりのリクエスト数の上限
+        base_url: API エンドポイント
+        sample_file: サンプル出力先（None で保存しない）
+        retry_base_delay: 指数バックオフの基底秒数
+        progress: 各バッチ完了時に (完了バッチ数, 全バッチ数) で呼ばれる
+        limiter: 複数回の呼び出しで共有するレートリミッタ（省略時は rate から生成）
+        output_format: バッチファイルの形式（"json" / "jsonl" / "jsonl.gz"）
+        on_batch: 各バッチ（取得済みで読み込んだものを含む）を (開始位置, レコード) で受け取る
+        keep_records: 全レコードを保持して返すか（False で空リストを返す）
 
     Returns:
-        取得した全 SpeechRecord のリスト
+        取得した全 SpeechRecord のリスト（開始位置順、keep_records=False では空）
+
+    Raises:
+        RuntimeError: リトライ後も取得できないバッチが残った場合（再実行で再開できる）
     """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"output_format must be one of {OUTPUT_FORMATS}, got {output_format!r}")
     output_dir.mkdir(parents=True, exist_ok=True)
-    SAMPLE_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = DownloadManifest(
+        output_dir / MANIFEST_NAME,
+        {"keyword": keyword, "from": from_date, "until": until_date, "batch_size": batch_size},
+    )
+    limiter = limiter if limiter is not None else RateLimiter(rate)
+    pages: dict[int, list[SpeechRecord]] = {}
+    done: set[int] = set()
+    failures: dict[int, Exception] = {}
+    received = 0
 
-    # バッチ分割
-    batch_starts = list(range(1, total + 1, batch_size))
-    num_batches = len(batch_starts)
+    def limit_total(number_of_records: int) -> int:
+        return number_of_records if total <= 0 else min(total, number_of_records)
 
-    logger.info(f"download_start total={total} batch_size={batch_size} batches={num_batches}")
+    def deliver(start: int, records: list[SpeechRecord]) -> None:
+        nonlocal received
+        done.add(start)
+        received += len(records)
+        if keep_records:
+            pages[start] = records
+        if on_batch is not None:
+            on_batch(start, records)
 
-    all_records: list[SpeechRecord] = []
-    sample_saved = False
+    def load_done(start: int, count: int) -> bool:
+        """取得済みバッチをスキップする（読み込みは呼び出し側が使う場合のみ、未取得なら False）。"""
+        nonlocal received
+        if not (skip_existing and manifest.is_done(start, count)):
+            return False
+        # 形式を変えて再開しても取得済みバッチは再取得しない（同じ範囲のファイルが
+        # 形式違いで並ぶと _load_corpus が同じ発言を二重に索引する）
+        formats = (output_format, *(fmt for fmt in OUTPUT_FORMATS if fmt != output_format))
+        out_path = next(
+            (path for fmt in formats if (path := build_output_path(output_dir, start, fmt)).exists()), None
+        )
+        if out_path is None:
+            return False
+        if keep_records or on_batch is not None:
+            deliver(start, read_corpus_file(out_path))
+        else:
+            done.add(start)
+            received += count
+        logger.info(f"skip_existing path={out_path}")
+        return True
+
+    def store(start: int, response_data: ApiResponse) -> None:
+        records: list[SpeechRecord] = response_data.get("speechRecord", [])
+        out_path = build_output_path(output_dir, start, output_format)
+        _write_batch(out_path, response_data, output_format)
+        if records:
+            manifest.mark_done(start, len(records))
+        logger.info(f"saved path={out_path} records={len(records)}")
+        if start == 1 and records and sample_file is not None:
+            _save_sample(records[:10], sample_file)
+        deliver(start, records)
 
     timeout = httpx.Timeout(TIMEOUT_SECONDS, connect=10.0)
+    limits = httpx.Limits(max_connections=max(concurrency, 1))
 
     async with httpx.AsyncClient(
         timeout=timeout,
+        limits=limits,
         headers={"User-Agent": "langgraphraghitl-experiments/1.0 (research; github.com/0h-n0-blog-exps)"},
         follow_redirects=True,
     ) as client:
-        with tqdm(total=num_batches, desc="Downloading", unit="batch") as pbar:
-            for start_record in batch_starts:
-                out_path = build_output_path(output_dir, start_record)
-
-                # 冪等性チェック: 既存ファイルがあればスキップ
-                if skip_existing and out_path.exists():
-                    logger.info(f"skip_existing path={out_path}")
-                    # 既存ファイルからレコードを読み込む
-                    with out_path.open(encoding="utf-8") as f:
-                        cached: ApiResponse = json.load(f)
-                    records = cached.get("speechRecord", [])
-                    all_records.extend(records)
-                    pbar.update(1)
-                    pbar.set_postfix({"records": len(all_records)})
-
-                    # サンプル保存（最初のバッチのみ）
-                    if not sample_saved and all_records:
-                        _save_sample(all_records[:10])
-                        sample_saved = True
-                    continue
 
-                # API から取得
-                actual_batch = min(batch_size, total - start_record + 1)
-                response_data = await fetch_speeches(
-                    client, start_record, actual_batch, keyword, from_date, until_date
-                )
+        async def fetch(start: int, count: int) -> ApiResponse:
+            return await fetch_speeches(
+                client,
+                start,
+                count,
+                keyword,
+                from_date,
+                until_date,
+                base_url=base_url,
+                limiter=limiter,
+                retry_base_delay=retry_base_delay,
+            )
 
-                records: list[SpeechRecord] = response_data.get("speechRecord", [])
-                all_records.extend(records)
+        # 総件数の確認（再開時はマニフェストの値を使い、先頭バッチも取得済みなら省略）
+        first_count = batch_size if total <= 0 else min(batch_size, total)
+        if manifest.number_of_records is None or not load_done(1, min(first_count, manifest.number_of_records)):
+            first = await fetch(1, first_count)
+            manifest.number_of_records = int(first.get("numberOfRecords") or 0)
+            manifest.save()
+            store(1, first)
+        target = limit_total(manifest.number_of_records)
 
-                # バッチファイルを保存
-                with out_path.open("w", encoding="utf-8") as f:
-                    json.dump(response_data, f, ensure_ascii=False, indent=2)
+        batch_starts = list(range(1, target + 1, batch_size))
+        num_batches = len(batch_starts)
+        logger.info(
+            f"download_start total={target} batch_size={batch_size} batches={num_batches} "
+            f"concurrency={concurrency} rate={rate}"
+        )
 
-                logger.info(f"saved path={out_path} records={len(records)}")
-                pbar.update(1)
-                pbar.set_postfix({"records": len(all_records)})
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        for start in batch_starts:
+            if start not in done and not load_done(start, min(batch_size, target - start + 1)):
+                queue.put_nowait(start)
+        completed = num_batches - queue.qsize()
+        if progress is not None:
+            progress(completed, num_batches)
 
-                # サンプル保存（最初のバッチのみ）
-                if not sample_saved and records:
-                    _save_sample(records[:10])
-                    sample_saved = True
+        async def worker() -> None:
+            nonlocal completed
+            while True:
+                try:
+                    start = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    store(start, await fetch(start, min(batch_size, target - start + 1)))
+                except (httpx.HTTPStatusError, httpx.TimeoutException, httpx.RequestError) as exc:
+                    failures[start] = exc
+                completed += 1
+                if progress is not None:
+                    progress(completed, num_batches)
 
-                # API レートリミットへの配慮
-                await asyncio.sleep(0.3)
+        await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, queue.qsize())))))
 
-    logger.info(f"download_complete total_records={len(all_records)}")
+    all_records = [record for start in sorted(pages) if start <= target for record in pages[start]]
+    if limiter.slowdowns:
+        logger.info(f"rate_adapted slowdowns={limiter.slowdowns} final_rate={limiter.rate:.2f}")
+    if failures:
+        logger.error(f"download_incomplete failed_batches={sorted(failures)}")
+        raise RuntimeError(
+            f"{len(failures)} batches failed (first start={min(failures)}); rerun to resume"
+        ) from failures[min(failures)]
+    logger.info(f"download_complete total_records={received}")
     return all_records
 
 
-def _save_sample(records: list[SpeechRecord]) -> None:
+# -----------------------------------------------------------------------
+# 増分同期
+# -----------------------------------------------------------------------
+
+class SyncState:
+    """
+    増分同期の状態（取得済みの最新会議日と、遡り期間内の取得済み speechID）。
+
+    会議録は委員会ごとに遅れて公開されるため、同期は latest_date の
+    lookback_days 日前（window_start()）から再取得し、その期間の既知
+    speechID（recent_ids: speechID → 会議日）を除外する。window_start() より
+    前の発言は取得済みとみなす。files には状態に反映済みのコーパスファイル名を
+    記録し、未反映のファイル（初回の download 結果や、差分書き込み直後に
+    中断した同期の出力）は absorb() で取り込む。旧形式の状態や、より短い
+    遡り期間で保存された状態は破棄し、absorb() で全ファイルから再構築する。
+    """
+
+    def __init__(self, path: Path, lookback_days: int = DEFAULT_LOOKBACK_DAYS) -> None:
+        self.path = path
+        self.lookback_days = max(lookback_days, 0)
+        self.latest_date: str | None = None
+        self.latest_speech_id: str | None = None
+        self.recent_ids: dict[str, str] = {}
+        self.files: set[str] = set()
+        self.last_sync: str | None = None
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError) as exc:
+                logger.warning(f"sync_state_unreadable path={path} error={exc}")
+                return
+            if data.get("version") != SYNC_STATE_VERSION or data.get("lookback_days", -1) < self.lookback_days:
+                logger.info(f"sync_state_rebuild path={path} lookback_days={self.lookback_days}")
+                return
+            self.latest_date = data.get("latest_date")
+            self.latest_speech_id = data.get("latest_speech_id")
+            self.recent_ids = dict(data.get("recent_ids", {}))
+            self.files = set(data.get("files", []))
+            self.last_sync = data.get("last_sync")
+
+    def window_start(self) -> str | None:
+        """再取得を始める会議日（latest_date の lookback_days 日前）。"""
+        if self.latest_date is None:
+            return None
+        return (date.fromisoformat(self.latest_date) - timedelta(days=self.lookback_days)).isoformat()
+
+    def is_known(self, record: SpeechRecord) -> bool:
+        """取得済みの発言か（遡り期間より前、または期間内の既知 speechID）。"""
+        start = self.window_start()
+        if start is None:
+            return False
+        day = record.get("date") or ""
+        return day < start or record.get("speechID") in self.recent_ids
+
+    def advance(self, records: Iterable[SpeechRecord]) -> None:
+        """取得したレコードで最新会議日と遡り期間内の speechID を更新する。"""
+        for record in records:
+            day, speech_id = record.get("date"), record.get("speechID")
+            if not day or not speech_id:
+                continue
+            self.recent_ids[speech_id] = day
+            if self.latest_date is None or day > self.latest_date:
+                self.latest_date = day
+        start = self.window_start()
+        if start is not None:
+            self.recent_ids = {sid: day for sid, day in self.recent_ids.items() if day >= start}
+        latest = [sid for sid, day in self.recent_ids.items() if day == self.latest_date]
+        self.latest_speech_id = max(latest) if latest else None
+
+    def absorb(self, corpus_dir: Path) -> None:
+        """状態に未反映のコーパスファイルを取り込む。"""
+        for path in sorted(corpus_dir.iterdir()):
+            if not path.name.endswith(CORPUS_FILE_SUFFIXES) or path.name in self.files:
+                continue
+            if path.name in (MANIFEST_NAME, SYNC_STATE_NAME):
+                continue
+            try:
+                records = read_corpus_file(path)
+            except (json.JSONDecodeError, OSError, EOFError, AttributeError) as exc:
+                logger.warning(f"sync_absorb_skipped path={path} error={exc}")
+                continue
+            self.advance(records)
+            self.files.add(path.name)
+
+    def save(self) -> None:
+        """状態をアトミックに書き込む。"""
+        data = {
+            "version": SYNC_STATE_VERSION,
+            "latest_date": self.latest_date,
+            "latest_speech_id": self.latest_speech_id,
+            "lookback_days": self.lookback_days,
+            "recent_ids": dict(sorted(self.recent_ids.items())),
+            "files": sorted(self.files),
+            "last_sync": self.last_sync,
+        }
+        _write_json_atomic(self.path, data)
+
+
+@dataclass(frozen=True, slots=True)
+class SyncResult:
+    """増分同期 1 回分の結果。"""
+
+    records: list[SpeechRecord]  # 新規発言（差分）のみ
+    files: list[Path]  # 書き出した差分ファイル
+    windows: int
+    latest_date: str | None
+
+
+def date_windows(start: date, end: date, days: int) -> list[tuple[date, date]]:
+    """
+    [start, end] を days 日ごとの閉区間に分割する（古い順）。
+
+    Args:
+        start: 開始日
+        end: 終了日（含む）
+        days: 1ウィンドウの日数
+
+    Returns:
+        (from, until) の組のリスト
+    """
+    step = timedelta(days=max(days, 1))
+    windows: list[tuple[date, date]] = []
+    lo = start
+    while lo <= end:
+        hi = min(lo + step - timedelta(days=1), end)
+        windows.append((lo, hi))
+        lo = hi + timedelta(days=1)
+    return windows
+
+
+async def _fetch_window(
+    lo: date,
+    hi: date,
+    staging: Path,
+    limiter: RateLimiter,
+    attempts: int = 2,
+    **options: Any,
+) -> list[SpeechRecord]:
+    """
+    1 ウィンドウ分を取得する（取得中に発言が追加されオフセットがずれた場合は再取得）。
+
+    API は新しい会議日から返すため、取得中に当日分が追加されると後続の
+    オフセットがずれ、発言の欠落や重複が起こり得る。一意な speechID が
+    総件数に満たなければウィンドウを取り直す。
+    """
+    records: list[SpeechRecord] = []
+    for attempt in range(attempts):
+        records = await download_corpus(
+            total=0,
+            from_date=lo.isoformat(),
+            until_date=hi.isoformat(),
+            output_dir=staging,
+            sample_file=None,
+            limiter=limiter,
+            **options,
+        )
+        manifest = json.loads((staging / MANIFEST_NAME).read_text(encoding="utf-8"))
+        expected = manifest.get("numberOfRecords")
+        unique = len({r.get("speechID") for r in records})
+        if expected is None or unique >= expected:
+            return records
+        logger.warning(
+            f"sync_window_shifted from={lo} until={hi} unique={unique} expected={expected} attempt={attempt + 1}"
+        )
+        shutil.rmtree(staging, ignore_errors=True)
+    return records
+
+
+async def sync_corpus(
+    output_dir: Path = DEFAULT_OUTPUT_DIR,
+    from_date: str = DEFAULT_FROM_DATE,
+    until_date: str | None = None,
+    window_days: int = DEFAULT_WINDOW_DAYS,
+    *,
+    lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate: float = DEFAULT_RATE,
+    base_url: str = API_BASE_URL,
+    retry_base_delay: float = RETRY_BASE_DELAY,
+) -> SyncResult:
+    """
+    前回同期以降の新規発言だけを日付ウィンドウ単位で取得する（増分同期）。
+
+    取得範囲は sync_state.json の latest_date の lookback_days 日前（初回は
+    from_date）から until_date（省略時・未来日は今日）まで。遡り期間の
+    既知 speechID を除外するため、最新会議日より前の日付で後から公開された
+    会議録も重複なく取り込める。ウィンドウは古い順に取得し、新規発言を
+    差分ファイルに書き出してから状態を進めるため、中断しても再実行で
+    続きから同期できる。
+
+    Args:
+        output_dir: コーパス出力ディレクトリ（状態・差分ファイルもここに置く）
+        from_date: 初回同期の開始日（YYYY-MM-DD）
+        until_date: 終了日（YYYY-MM-DD）
+        window_days: 1ウィンドウの日数
+        lookback_days: latest_date から遡って再取得する日数
+        batch_size: 1リクエストあたりの取得件数（最大100）
+        concurrency: 同時リクエスト数の上限
+        rate: 1秒あたりのリクエスト数の上限（全ウィンドウで共有）
+        base_url: API エンドポイント
+        retry_base_delay: 指数バックオフの基底秒数
+
+    Returns:
+        差分レコードと差分ファイルを含む SyncResult
+
+    Raises:
+        RuntimeError: ウィンドウ内のバッチが取得できなかった場合（再実行で再開できる）
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    state = SyncState(output_dir / SYNC_STATE_NAME, lookback_days)
+    state.absorb(output_dir)
+
+    today = date.today()
+    end = min(date.fromisoformat(until_date), today) if until_date else today
+    previous_latest = state.latest_date
+    start = date.fromisoformat(state.window_start() or from_date)
+    windows = date_windows(start, end, window_days)
+    run_id = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
+    limiter = RateLimiter(rate)
+    logger.info(f"sync_start from={start} until={end} windows={len(windows)} latest_date={state.latest_date}")
+
+    delta: list[SpeechRecord] = []
+    files: list[Path] = []
+    seen: set[str] = set()
+    for lo, hi in windows:
+        staging = output_dir / SYNC_STAGING_DIR / f"{lo:%Y%m%d}_{hi:%Y%m%d}"
+        records = await _fetch_window(
+            lo,
+            hi,
+            staging,
+            limiter,
+            batch_size=batch_size,
+            concurrency=concurrency,
+            base_url=base_url,
+            retry_base_delay=retry_base_delay,
+        )
+        new: list[SpeechRecord] = []
+        for record in records:
+            speech_id = record.get("speechID")
+            if not speech_id or speech_id in seen or state.is_known(record):
+                continue
+            seen.add(speech_id)
+            new.append(record)
+
+        if new:
+            out_path = output_dir / f"{SYNC_FILE_PREFIX}{run_id}_{lo:%Y%m%d}_{hi:%Y%m%d}.json"
+            _write_json_atomic(
+                out_path,
+                {
+                    "sync": {"run": run_id, "from": lo.isoformat(), "until": hi.isoformat()},
+                    "numberOfRecords": len(new),
+                    "speechRecord": new,
+                },
+            )
+            files.append(out_path)
+            state.files.add(out_path.name)
+            state.advance(new)
+        state.save()
+        shutil.rmtree(staging, ignore_errors=True)
+        delta.extend(new)
+        logger.info(f"sync_window from={lo} until={hi} fetched={len(records)} new={len(new)}")
+
+    late = sum(1 for r in delta if previous_latest and (r.get("date") or "") < previous_latest)
+    if late:
+        logger.info(f"sync_late_records count={late} before={previous_latest}")
+    state.last_sync = run_id
+    state.save()
+    shutil.rmtree(output_dir / SYNC_STAGING_DIR, ignore_errors=True)
+    logger.info(f"sync_complete new_records={len(delta)} files={len(files)} latest_date={state.latest_date}")
+    return SyncResult(records=delta, files=files, windows=len(windows), latest_date=state.latest_date)
+
+
+def _save_sample(records: list[SpeechRecord], sample_file: Path = SAMPLE_FILE) -> None:
     """
     最初の10件のレコードをサンプルファイルに保存する。
 
     Args:
         records: 保存する SpeechRecord のリスト（最大10件）
+        sample_file: 出力先
     """
     sample_records = records[:10]
     sample_data = {
@@ -281,16 +892,17 @@ def _save_sample(records: list[SpeechRecord]) -> None:
         "numberOfSamples": len(sample_records),
         "speechRecord": sample_records,
     }
-    with SAMPLE_FILE.open("w", encoding="utf-8") as f:
+    sample_file.parent.mkdir(parents=True, exist_ok=True)
+    with sample_file.open("w", encoding="utf-8") as f:
         json.dump(sample_data, f, ensure_ascii=False, indent=2)
-    logger.info(f"sample_saved path={SAMPLE_FILE} count={len(sample_records)}")
+    logger.info(f"sample_saved path={sample_file} count={len(sample_records)}")
 
 
 # -----------------------------------------------------------------------
 # エントリーポイント
 # -----------------------------------------------------------------------
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     """コマンドライン引数を解析する。"""
     parser = argparse.ArgumentParser(
         description="国会会議録 API からデータを取得するスクリプト",
@@ -300,7 +912,7 @@ def parse_args() -> argparse.Namespace:
         "--total",
         type=int,
         default=DEFAULT_TOTAL,
-        help="取得総件数",
+        help="取得総件数（0 で検索結果の全件）",
     )
     parser.add_argument(
         "--batch-size",
@@ -338,30 +950,147 @@ def parse_args() -> argparse.Namespace:
         default=False,
         help="既存ファイルを再取得する（冪等性を無効化）",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="同時リクエスト数の上限",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_RATE,
+        help="1秒あたりのリクエスト数の上限（429 / 5xx 応答で自動的に減速）",
+    )
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        default=API_BASE_URL,
+        help="API エンドポイント（ローカルの代替サーバーでの検証用）",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        default=False,
+        help="増分同期（前回の最新会議日以降のみ取得し、差分ファイルを出力）",
+    )
+    parser.add_argument(
+        "--window-days",
+        type=int,
+        default=DEFAULT_WINDOW_DAYS,
+        help="増分同期の日付ウィンドウ幅（日）",
+    )
+    parser.add_argument(
+        "--lookback-days",
+        type=int,
+        default=DEFAULT_LOOKBACK_DAYS,
+        help="増分同期で前回の最新会議日から遡って再取得する日数（遅れて公開された会議録の取り込み）",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="json",
+        help="バッチファイルの形式（jsonl / jsonl.gz は 1 行 1 発言のコンパクト形式）",
+    )
+    parser.add_argument(
+        "--index-snapshot",
+        type=Path,
+        default=None,
+        help="受信したバッチから索引を構築し、スナップショットとして書き出す（INDEX_SNAPSHOT_PATH 用）",
+    )
+    parser.add_argument(
+        "--index-url",
+        type=str,
+        default=None,
+        help="受信したバッチから索引を構築し、分割形式で書き出す（INDEX_STORAGE_URL 用）",
+    )
+    return parser.parse_args(argv)
+
+
+def _index_builder(args: argparse.Namespace) -> Any:
+    """--index-snapshot / --index-url 指定時のストリーミング索引ビルダー。"""
+    if args.index_snapshot is None and args.index_url is None:
+        return None
+    try:
+        from src.langgraph_rag_hitl.ingest import StreamingIndexBuilder
+        from src.langgraph_rag_hitl.normalize import IngestNormalizer
+    except ImportError as exc:
+        raise SystemExit(
+            "索引の構築にはプロジェクト環境が必要です。リポジトリのルートで "
+            f"`uv run python -m data.download ...` として実行してください（{exc}）"
+        ) from exc
+    return StreamingIndexBuilder(normalizer=IngestNormalizer.from_env())  # _load_corpus と同じ正規化
 
 
-async def main() -> None:
-    """メインエントリーポイント。"""
-    args = parse_args()
+async def run(args: argparse.Namespace) -> None:
+    """解析済み引数でダウンロードを実行する。"""
+    from tqdm import tqdm  # 進捗表示のみで使用（uv run 時はスクリプト依存として導入される）
 
     batch_size = min(args.batch_size, 100)  # API 上限は 100
     if batch_size != args.batch_size:
         logger.warning(f"batch_size clamped to 100 (was {args.batch_size})")
 
-    records = await download_corpus(
-        total=args.total,
-        batch_size=batch_size,
-        keyword=args.keyword,
-        from_date=args.from_date,
-        until_date=args.until_date,
-        output_dir=args.output_dir,
-        skip_existing=not args.no_skip_existing,
-    )
-    print(f"\n取得完了: {len(records)} 件のレコードを保存しました")
+    if args.sync:
+        result = await sync_corpus(
+            output_dir=args.output_dir,
+            from_date=args.from_date,
+            until_date=args.until_date,
+            window_days=args.window_days,
+            lookback_days=args.lookback_days,
+            batch_size=batch_size,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            base_url=args.base_url,
+        )
+        print(f"\n同期完了: 新規 {len(result.records)} 件（{result.windows} ウィンドウ、最新会議日 {result.latest_date}）")
+        for path in result.files:
+            print(f"差分ファイル: {path}")
+        return
+
+    builder = _index_builder(args)
+    received = 0
+
+    def on_batch(start: int, batch: list[SpeechRecord]) -> None:
+        nonlocal received
+        received += len(batch)
+        if builder is not None:
+            builder.add(start, batch)
+
+    with tqdm(desc="Downloading", unit="batch") as pbar:
+
+        def progress(done: int, batches: int) -> None:
+            pbar.total = batches
+            pbar.n = done
+            pbar.refresh()
+
+        await download_corpus(
+            total=args.total,
+            batch_size=batch_size,
+            keyword=args.keyword,
+            from_date=args.from_date,
+            until_date=args.until_date,
+            output_dir=args.output_dir,
+            skip_existing=not args.no_skip_existing,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            base_url=args.base_url,
+            progress=progress,
+            output_format=args.format,
+            on_batch=on_batch,
+            keep_records=False,  # バッチはファイルと on_batch に流すだけで保持しない
+        )
+    print(f"\n取得完了: {received} 件のレコードを保存しました")
+    if builder is not None:
+        retriever = builder.write(args.index_snapshot, args.index_url)
+        print(f"索引: {len(retriever.speeches)} 発言 / {len(retriever.passages)} パッセージ")
     print(f"サンプルファイル: {SAMPLE_FILE}")
     print(f"コーパスディレクトリ: {args.output_dir}")
 
 
+def main(argv: list[str] | None = None) -> None:
+    """メインエントリーポイント（pyproject の download スクリプトからも呼ばれる）。"""
+    asyncio.run(run(parse_args(argv)))
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
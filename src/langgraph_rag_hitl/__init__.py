@@ -2,9 +2,14 @@
 # Agent   : backend_dev
 # Task    : Python Lambda + Pydantic + pytest 実装
 # Created : 2026-02-23T18:56:39
-# Updated : 2026-02-23T18:56:39
+# Updated : 2026-10-19
 # [/DEBUG] ===========================================================
 
 """LangGraph multi-source RAG with HITL for 国会議事録 search."""
 
+import time
+
 __version__ = "1.0.0"
+
+# Start of the package import; Lambda init reports import time from here
+_IMPORT_STARTED: float = time.perf_counter()
@@ -0,0 +1,168 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : HITL 承認済み回答キャッシュ
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Cache of reviewer-approved answers.
+
+When a reviewer approves a paused run, the generated answer is published
+here. A later request that would go to review again is served from the
+cache if it matches on every part of the key:
+
+- normalized query (NFKC, whitespace collapsed)
+- user role set, so an approval never crosses permission sets
+- source set: (speech_id, passage offsets, content digest) of every source
+  the answer was generated from, so edited documents miss
+- corpus version, so any re-ingest misses
+
+Entries expire after ``ttl_s``; invalidate_sources() drops every entry built
+on given speeches immediately. Thread-safe, bounded LRU.
+"""
+
+import hashlib
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from .models import Passage
+
+DEFAULT_APPROVAL_TTL_S: float = 24 * 3600.0
+DEFAULT_APPROVAL_CACHE_SIZE: int = 1024
+
+ApprovalKey = tuple[str, tuple[str, ...], tuple[tuple[str, int, int, str], ...], str]
+
+
+@dataclass(frozen=True, slots=True)
+class ApprovedAnswer:
+    """A cached, reviewer-approved answer."""
+
+    answer: str
+    review_id: str
+    reviewer: str
+    approved_at: float
+    speech_ids: frozenset[str] = field(default_factory=frozenset)
+
+
+def content_digest(text: str) -> str:
+    """Short stable digest of document content."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def approval_key(
+    query: str,
+    user_roles: Iterable[str],
+    sources: Sequence[Passage],
+    corpus_version: str,
+) -> ApprovalKey:
+    """Build the cache key for a query answered from sources.
+
+    Args:
+        query: Original user query
+        user_roles: Roles of the requesting user
+        sources: Documents the answer is generated from
+        corpus_version: Version of the indexed corpus
+
+    Returns:
+        Hashable key
+    """
+    normalized = " ".join(unicodedata.normalize("NFKC", query).split())
+    source_set = tuple(
+        sorted(
+            (doc.speech_id, doc.passage_start, doc.passage_end, content_digest(doc.content))
+            for doc in sources
+        )
+    )
+    return (normalized, tuple(sorted(set(user_roles))), source_set, corpus_version)
+
+
+class ApprovedAnswerCache:
+    """Bounded LRU of approved answers with expiry and per-speech invalidation."""
+
+    def __init__(
+        self,
+        ttl_s: float = DEFAULT_APPROVAL_TTL_S,
+        max_entries: int = DEFAULT_APPROVAL_CACHE_SIZE,
+    ) -> None:
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._entries: OrderedDict[ApprovalKey, ApprovedAnswer] = OrderedDict()
+        self._by_speech: dict[str, set[ApprovalKey]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._invalidated = 0
+
+    def _drop(self, key: ApprovalKey) -> None:
+        """Remove an entry and its reverse-index links. Caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for speech_id in entry.speech_ids:
+            keys = self._by_speech.get(speech_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_speech[speech_id]
+
+    def get(self, key: ApprovalKey, now: float | None = None) -> ApprovedAnswer | None:
+        """Return the live approved answer for key, if any."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.approved_at > self.ttl_s:
+                self._drop(key)
+                self._expired += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, key: ApprovalKey, entry: ApprovedAnswer) -> None:
+        """Publish an approved answer."""
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = entry
+            for speech_id in entry.speech_ids:
+                self._by_speech.setdefault(speech_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_sources(self, speech_ids: Iterable[str]) -> int:
+        """Drop every approval generated from any of the given speeches.
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            keys = {k for sid in speech_ids for k in self._by_speech.get(sid, ())}
+            for key in keys:
+                self._drop(key)
+            self._invalidated += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._by_speech.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Hit, miss, expiry and invalidation counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits_total": self._hits,
+                "misses_total": self._misses,
+                "expired_total": self._expired,
+                "invalidated_total": self._invalidated,
+            }
@@ -0,0 +1,500 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : オブジェクトストレージからの範囲読み出しによる索引の遅延ロード
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Blocked index and document store for lazy loading from object storage.
+
+A HybridRetriever is written as two objects so a container can open it with
+a few small range reads instead of downloading the whole index:
+
+``index.bin``::
+
+    INDEX_MAGIC | u32 header length | header JSON | body
+
+The header holds corpus metadata, BM25 parameters, section offsets and the
+directories of term-dictionary and keyword-vocabulary blocks (first key,
+offset, length per block). Body sections:
+
+- passage table: int32 (speech index, start, end, BM25 length) per passage,
+  read at open (BM25 normalization and RRF ranks cover every passage)
+- doc directory: int64 (first speech index, offset, length) per docs.bin block
+- term blocks: zlib JSON lists of [term, idf, df, postings offset, postings length]
+- keyword blocks: zlib JSON lists of [keyword, id] (grader vocabulary)
+- postings: per term, int32 passage ids then int32 term frequencies
+
+``docs.bin``: zlib JSON blocks of [speech record, first passage id,
+per-passage keyword ids], about ``doc_block_bytes`` of JSON each.
+
+At query time only the term blocks and postings of the query's tokens and
+the document blocks of the hits are read, through a BlockCache (``/tmp``);
+decoded blocks and postings are also kept in small in-process LRUs.
+Rankings are identical to the HybridRetriever the index was written from:
+BM25 is evaluated with rank_bm25's formula on the postings, and the dense
+character overlap uses the unigram postings (``DENSE_SPACE_TERM`` records
+which passages contain a space, since the BM25 tokens of every passage do).
+Characters pruned from the BM25 vocabulary (HybridRetriever max_df / min_df
+/ stop_tokens) get dense-only postings: the passages containing them, or
+for characters in most passages the shorter list of passages without them.
+
+Usage:
+    python -m src.langgraph_rag_hitl.blocked_index --output s3://bucket/index/kokkai
+    python -m src.langgraph_rag_hitl.blocked_index --output /tmp/kokkai-index
+"""
+
+import argparse
+import bisect
+import functools
+import json
+import struct
+import time
+import uuid
+import zlib
+from typing import Any
+
+import numpy as np
+
+from . import core
+from .core import (
+    BM25_WEIGHT,
+    DENSE_WEIGHT,
+    KEYWORD_PATTERN,
+    RRF_K,
+    TOP_K,
+    HybridRetriever,
+    _speech_to_passage,
+)
+from .logger import get_logger
+from .models import Passage
+from .storage import BlockCache, ObjectStorage, storage_from_url
+
+logger = get_logger(__name__)
+
+INDEX_MAGIC: bytes = b"RAGBLK\x00\x01"
+INDEX_FORMAT_VERSION: int = 1
+INDEX_OBJECT: str = "index.bin"
+DOCS_OBJECT: str = "docs.bin"
+DEFAULT_TERMS_PER_BLOCK: int = 1024
+DEFAULT_DOC_BLOCK_BYTES: int = 64 * 1024
+HEADER_PROBE_BYTES: int = 64 * 1024  # First read at open; larger headers take a second read
+# Postings of passages whose character set contains a space (never a BM25 token: tokens are 1-2 chars)
+DENSE_SPACE_TERM: str = "\x00dense-space"
+# Dense-only postings of pruned characters: passages with the character / passages without it
+DENSE_TERM_PREFIX: str = "\x00dense:"
+DENSE_ABSENT_TERM_PREFIX: str = "\x00dense-absent:"
+
+
+class BlockedIndexError(ValueError):
+    """The object is not a blocked index of a supported format version."""
+
+
+def _zjson(value: Any) -> bytes:
+    return zlib.compress(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def _unzjson(data: bytes) -> Any:
+    return json.loads(zlib.decompress(data))
+
+
+def write_blocked_index(
+    retriever: HybridRetriever,
+    storage: ObjectStorage,
+    terms_per_block: int = DEFAULT_TERMS_PER_BLOCK,
+    doc_block_bytes: int = DEFAULT_DOC_BLOCK_BYTES,
+) -> dict[str, Any]:
+    """Write a built retriever as index.bin and docs.bin.
+
+    The writer holds the inverted index in memory; run it where the corpus
+    is built, not in the serving container.
+
+    Args:
+        retriever: Built HybridRetriever
+        storage: Destination backend
+        terms_per_block: Dictionary entries per term / keyword block
+        doc_block_bytes: Target uncompressed size of a docs.bin block
+
+    Returns:
+        The header written to index.bin
+    """
+    bm25 = retriever._bm25
+    body = bytearray()
+
+    def section(data: bytes) -> list[int]:
+        offset = len(body)
+        body.extend(data)
+        return [offset, len(data)]
+
+    # Invert BM25's per-passage term counts
+    postings: dict[str, tuple[list[int], list[int]]] = {}
+    for pid, freqs in enumerate(bm25.doc_freqs if bm25 is not None else []):
+        for term, tf in freqs.items():
+            entry = postings.get(term)
+            if entry is None:
+                entry = postings[term] = ([], [])
+            entry[0].append(pid)
+            entry[1].append(tf)
+    space = [pid for pid, chars in enumerate(retriever._char_sets) if " " in chars]
+    if space:
+        postings[DENSE_SPACE_TERM] = (space, [1] * len(space))
+    dense_only = _dense_only_postings(retriever)
+    postings.update(dense_only)
+
+    doc_len = bm25.doc_len if bm25 is not None else [0] * len(retriever.passages)
+    table = np.array(
+        [(s, start, end, doc_len[pid]) for pid, (s, start, end) in enumerate(retriever.passages)],
+        dtype=np.int32,
+    ).reshape(-1, 4)
+    sections = {"passage_table": section(table.tobytes())}
+
+    terms = sorted(postings)
+    locations = {}
+    for term in terms:
+        pids, tfs = postings[term]
+        locations[term] = section(np.array(pids, dtype=np.int32).tobytes() + np.array(tfs, dtype=np.int32).tobytes())
+    idf = bm25.idf if bm25 is not None else {}
+    term_blocks = []
+    for i in range(0, len(terms), terms_per_block):
+        chunk = terms[i : i + terms_per_block]
+        entries = [[t, idf.get(t, 0.0), len(postings[t][0]), *locations[t]] for t in chunk]
+        term_blocks.append([chunk[0], *section(_zjson(entries))])
+
+    vocab = sorted(retriever._keyword_vocab.items())
+    keyword_blocks = []
+    for i in range(0, len(vocab), terms_per_block):
+        chunk = vocab[i : i + terms_per_block]
+        keyword_blocks.append([chunk[0][0], *section(_zjson(chunk))])
+
+    # Document store: speech records with their passages' keyword ids
+    first_passage = [0] * len(retriever.speeches)
+    for pid in range(len(retriever.passages) - 1, -1, -1):
+        first_passage[retriever.passages[pid][0]] = pid
+    docs = bytearray()
+    directory: list[tuple[int, int, int]] = []
+    block: list[Any] = []
+    block_first = block_size = 0
+    for s, record in enumerate(retriever.speeches):
+        if not block:
+            block_first = s
+        pid = first_passage[s]
+        ids = []
+        while pid < len(retriever.passages) and retriever.passages[pid][0] == s:
+            ids.append(retriever._keyword_ids[pid].tolist())
+            pid += 1
+        entry = [record, first_passage[s], ids]
+        block.append(entry)
+        block_size += len(json.dumps(entry, ensure_ascii=False))
+        if block_size >= doc_block_bytes or s == len(retriever.speeches) - 1:
+            data = _zjson(block)
+            directory.append((block_first, len(docs), len(data)))
+            docs.extend(data)
+            block, block_size = [], 0
+    sections["doc_directory"] = section(np.array(directory, dtype=np.int64).reshape(-1, 3).tobytes())
+
+    header = {
+        "format": INDEX_FORMAT_VERSION,
+        "build_id": uuid.uuid4().hex,
+        "corpus_version": retriever.corpus_version,
+        "speeches": len(retriever.speeches),
+        "passages": len(retriever.passages),
+        "terms": len(terms),
+        "passage_size": retriever.passage_size,
+        "passage_overlap": retriever.passage_overlap,
+        "collapse_passages": retriever.collapse_passages,
+        "vocabulary": {
+            "max_df": retriever.max_df,
+            "min_df": retriever.min_df,
+            "stop_tokens": sorted(retriever.stop_tokens),
+            "pruned_terms": len(retriever.pruned_tokens),
+            "dense_only_terms": len(dense_only),
+        },
+        "bm25": {
+            "k1": bm25.k1 if bm25 is not None else 1.5,
+            "b": bm25.b if bm25 is not None else 0.75,
+            "avgdl": bm25.avgdl if bm25 is not None else 0.0,
+        },
+        "sections": sections,
+        "term_blocks": term_blocks,
+        "keyword_blocks": keyword_blocks,
+        "index_body_bytes": len(body),
+        "docs_bytes": len(docs),
+    }
+    encoded = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    storage.put(DOCS_OBJECT, bytes(docs))
+    # Written last: a reader never sees an index whose docs object is missing
+    storage.put(INDEX_OBJECT, INDEX_MAGIC + struct.pack("<I", len(encoded)) + encoded + bytes(body))
+    return header
+
+
+def _dense_only_postings(retriever: HybridRetriever) -> dict[str, tuple[list[int], list[int]]]:
+    """Character-overlap postings for single characters pruned from BM25.
+
+    Args:
+        retriever: Built HybridRetriever
+
+    Returns:
+        Postings keyed by DENSE_TERM_PREFIX / DENSE_ABSENT_TERM_PREFIX + character
+    """
+    pruned = {t for t in retriever.pruned_tokens if len(t) == 1 and t != " "}
+    if not pruned:
+        return {}
+    present: dict[str, list[int]] = {c: [] for c in pruned}
+    for pid, chars in enumerate(retriever._char_sets):
+        for char in pruned & chars:
+            present[char].append(pid)
+    n = len(retriever.passages)
+    postings: dict[str, tuple[list[int], list[int]]] = {}
+    for char, pids in present.items():
+        if not pids:
+            continue
+        if len(pids) * 2 > n:
+            contained = set(pids)
+            absent = [pid for pid in range(n) if pid not in contained]
+            postings[DENSE_ABSENT_TERM_PREFIX + char] = (absent, [1] * len(absent))
+        else:
+            postings[DENSE_TERM_PREFIX + char] = (pids, [1] * len(pids))
+    return postings
+
+
+class BlockedIndexRetriever:
+    """Retriever over a blocked index, reading only what each query needs.
+
+    Offers the HybridRetriever methods the workflow uses (retrieve,
+    retrieve_with_keywords, query_keyword_ids, keyword_ids_for,
+    corpus_version) with identical rankings.
+    """
+
+    # Same tokenization as the index was built with
+    _tokenize = HybridRetriever._tokenize
+
+    def __init__(self, storage: ObjectStorage, cache: BlockCache | None = None) -> None:
+        """Open an index: reads the header, passage table and doc directory.
+
+        Args:
+            storage: Backend holding index.bin and docs.bin
+            cache: Block cache in front of storage (default: BlockCache.from_env)
+
+        Raises:
+            BlockedIndexError: Wrong magic or format version
+        """
+        probe = storage.get_range(INDEX_OBJECT, 0, HEADER_PROBE_BYTES)
+        if probe[: len(INDEX_MAGIC)] != INDEX_MAGIC:
+            raise BlockedIndexError("not a blocked index")
+        (header_len,) = struct.unpack_from("<I", probe, len(INDEX_MAGIC))
+        start = len(INDEX_MAGIC) + 4
+        raw = probe[start : start + header_len]
+        if len(raw) < header_len:
+            raw += storage.get_range(INDEX_OBJECT, start + len(raw), header_len - len(raw))
+        header = json.loads(raw)
+        if header.get("format") != INDEX_FORMAT_VERSION:
+            raise BlockedIndexError(
+                f"unsupported index format {header.get('format')} (expected {INDEX_FORMAT_VERSION})"
+            )
+        self.header = header
+        self._body_offset = start + header_len
+        self.cache = cache or BlockCache.from_env(
+            storage, namespace=f"{header['corpus_version']}-{header['build_id']}"
+        )
+        self.collapse_passages: bool = header["collapse_passages"]
+        self._k1 = header["bm25"]["k1"]
+        self._b = header["bm25"]["b"]
+        self._avgdl = header["bm25"]["avgdl"]
+        self._dense_only = header.get("vocabulary", {}).get("dense_only_terms", 0) > 0
+
+        table = np.frombuffer(self._read_section("passage_table"), dtype=np.int32).reshape(-1, 4)
+        self.passages: np.ndarray = table[:, :3]  # (speech index, start, end)
+        self._passage_speech = table[:, 0]
+        self._doc_len = table[:, 3].astype(np.int64)
+        directory = np.frombuffer(self._read_section("doc_directory"), dtype=np.int64).reshape(-1, 3)
+        self._doc_first = directory[:, 0]
+        self._doc_blocks = directory
+        self._term_keys = [b[0] for b in header["term_blocks"]]
+        self._keyword_keys = [b[0] for b in header["keyword_blocks"]]
+
+        self._term_block = functools.lru_cache(maxsize=512)(self._load_term_block)
+        self._keyword_block = functools.lru_cache(maxsize=256)(self._load_keyword_block)
+        self._postings = functools.lru_cache(maxsize=2048)(self._load_postings)
+        self._doc_block = functools.lru_cache(maxsize=256)(self._load_doc_block)
+
+    @classmethod
+    def from_url(cls, url: str) -> "BlockedIndexRetriever":
+        """Open the index at ``s3://bucket/prefix``, ``file:///path`` or a directory."""
+        return cls(storage_from_url(url))
+
+    @property
+    def corpus_version(self) -> str:
+        return self.header["corpus_version"]
+
+    # --- Block access ---
+
+    def _read_body(self, offset: int, length: int) -> bytes:
+        return self.cache.read(INDEX_OBJECT, self._body_offset + offset, length)
+
+    def _read_section(self, name: str) -> bytes:
+        offset, length = self.header["sections"][name]
+        return self._read_body(offset, length)
+
+    def _load_term_block(self, block: int) -> dict[str, tuple[float, int, int]]:
+        _, offset, length = self.header["term_blocks"][block]
+        return {t: (idf, off, ln) for t, idf, _, off, ln in _unzjson(self._read_body(offset, length))}
+
+    def _load_keyword_block(self, block: int) -> dict[str, int]:
+        _, offset, length = self.header["keyword_blocks"][block]
+        return dict(_unzjson(self._read_body(offset, length)))
+
+    def _load_postings(self, term: str) -> tuple[float, np.ndarray, np.ndarray] | None:
+        block = bisect.bisect_right(self._term_keys, term) - 1
+        if block < 0:
+            return None
+        entry = self._term_block(block).get(term)
+        if entry is None:
+            return None
+        idf, offset, length = entry
+        data = np.frombuffer(self._read_body(offset, length), dtype=np.int32)
+        half = len(data) // 2
+        return idf, data[:half], data[half:]
+
+    def _keyword_id(self, keyword: str) -> int | None:
+        block = bisect.bisect_right(self._keyword_keys, keyword) - 1
+        return self._keyword_block(block).get(keyword) if block >= 0 else None
+
+    def _load_doc_block(self, block: int) -> list[Any]:
+        _, offset, length = (int(v) for v in self._doc_blocks[block])
+        return _unzjson(self.cache.read(DOCS_OBJECT, offset, length))
+
+    def _doc_entry(self, speech_idx: int) -> list[Any]:
+        block = int(np.searchsorted(self._doc_first, speech_idx, side="right")) - 1
+        return self._doc_block(block)[speech_idx - int(self._doc_first[block])]
+
+    # --- Retrieval (mirrors HybridRetriever) ---
+
+    def query_keyword_ids(self, query: str) -> np.ndarray:
+        """Map query keywords to grader vocabulary ids (unknown keywords dropped)."""
+        ids = {self._keyword_id(kw) for kw in KEYWORD_PATTERN.findall(query)}
+        ids.discard(None)
+        return np.array(sorted(ids), dtype=np.int32)
+
+    def _search(
+        self,
+        query: str,
+        top_k: int,
+        user_roles: list[str] | None,
+        collapse: bool | None,
+    ) -> list[tuple[int, float]]:
+        """Rank passages exactly like HybridRetriever._search, from postings."""
+        n = len(self._doc_len)
+        if n == 0:
+            return []
+        if collapse is None:
+            collapse = self.collapse_passages
+        # avgdl is 0 only when pruning left no BM25 vocabulary: rank by the dense score alone
+        lexical = self._avgdl > 0
+
+        # rank_bm25 BM25Okapi.get_scores, evaluated only where tf > 0
+        k1, b = self._k1, self._b
+        bm25 = np.zeros(n)
+        for token in self._tokenize(query) if lexical else []:
+            entry = self._postings(token)
+            if entry is None:
+                continue
+            idf, pids, tf = entry
+            dl = self._doc_len[pids]
+            bm25[pids] += idf * (tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / self._avgdl)))
+
+        # Character overlap ratio from unigram postings
+        query_chars = set(query)
+        overlap = np.zeros(n, dtype=np.int64)
+        for char in query_chars:
+            entry = self._postings(DENSE_SPACE_TERM if char == " " else char)
+            if entry is None and self._dense_only:
+                entry = self._postings(DENSE_TERM_PREFIX + char)
+                if entry is None and (absent := self._postings(DENSE_ABSENT_TERM_PREFIX + char)) is not None:
+                    overlap += 1
+                    overlap[absent[1]] -= 1
+            if entry is not None:
+                overlap[entry[1]] += 1
+        dense = overlap / len(query_chars) if query_chars else np.zeros(n)
+
+        # Stable descending ranks; RRF ties keep BM25 order, as the Python sorts do
+        bm25_rank = np.empty(n, dtype=np.int64)
+        bm25_rank[np.argsort(-bm25, kind="stable")] = np.arange(n)
+        dense_rank = np.empty(n, dtype=np.int64)
+        dense_rank[np.argsort(-dense, kind="stable")] = np.arange(n)
+        rrf = DENSE_WEIGHT / (RRF_K + dense_rank + 1)
+        if lexical:
+            rrf = rrf + BM25_WEIGHT / (RRF_K + bm25_rank + 1)
+        ranked = np.lexsort((bm25_rank, -rrf))
+
+        if collapse:
+            hits: list[int] = []
+            seen: set[int] = set()
+            for i in ranked:
+                speech_idx = int(self._passage_speech[i])
+                if speech_idx in seen:
+                    continue
+                seen.add(speech_idx)
+                hits.append(int(i))
+                if len(hits) == top_k:
+                    break
+        else:
+            hits = [int(i) for i in ranked[:top_k]]
+
+        max_score = max((float(rrf[i]) for i in hits), default=1.0) or 1.0
+        return [(i, float(rrf[i]) / max_score) for i in hits]
+
+    def _to_passage(self, passage_idx: int, score: float) -> Passage:
+        speech_idx, start, end = (int(v) for v in self.passages[passage_idx])
+        return _speech_to_passage(self._doc_entry(speech_idx)[0], score, start, end)
+
+    def _keyword_ids(self, passage_idx: int) -> np.ndarray:
+        record, first_passage, ids = self._doc_entry(int(self._passage_speech[passage_idx]))
+        return np.array(ids[passage_idx - first_passage], dtype=np.int32)
+
+    def retrieve(
+        self,
+        query: str,
+        top_k: int = TOP_K,
+        user_roles: list[str] | None = None,
+        collapse: bool | None = None,
+    ) -> list[Passage]:
+        """Retrieve top-k passages (see HybridRetriever.retrieve)."""
+        return [self._to_passage(i, s) for i, s in self._search(query, top_k, user_roles, collapse)]
+
+    def retrieve_with_keywords(
+        self,
+        query: str,
+        top_k: int = TOP_K,
+        user_roles: list[str] | None = None,
+        collapse: bool | None = None,
+    ) -> tuple[list[Passage], list[np.ndarray]]:
+        """Retrieve like retrieve() and also return each passage's keyword ids."""
+        hits = self._search(query, top_k, user_roles, collapse)
+        return [self._to_passage(i, s) for i, s in hits], [self._keyword_ids(i) for i, _ in hits]
+
+    def keyword_ids_for(self, docs: list[Passage]) -> list[np.ndarray]:
+        """Keyword ids of returned passages, from their content (equal to the stored ids)."""
+        return [self.query_keyword_ids(d.content) for d in docs]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Write the corpus as a blocked, range-readable index")
+    parser.add_argument("--output", required=True, help="s3://bucket/prefix, file:///path or a directory")
+    parser.add_argument("--terms-per-block", type=int, default=DEFAULT_TERMS_PER_BLOCK)
+    parser.add_argument("--doc-block-kb", type=int, default=DEFAULT_DOC_BLOCK_BYTES // 1024)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    retriever = HybridRetriever(core._load_corpus())
+    header = write_blocked_index(
+        retriever, storage_from_url(args.output), args.terms_per_block, args.doc_block_kb * 1024
+    )
+    print(
+        f"{args.output}: {header['speeches']} speeches, {header['passages']} passages, "
+        f"{header['terms']} terms, index {header['index_body_bytes'] / 2**20:.1f} MB, "
+        f"docs {header['docs_bytes'] / 2**20:.1f} MB, {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
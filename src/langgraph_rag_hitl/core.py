@@ -2,7 +2,7 @@
 # Agent   : backend_dev
 # Task    : Python Lambda + Pydantic + pytest 実装
 # Created : 2026-02-23T18:56:39
-# Updated : 2026-02-23
+# Updated : 2026-10-19
 # [/DEBUG] ===========================================================
 
 """
@@ -12,6 +12,7 @@ Based on DeepRAG (arxiv 2412.10743) concepts applied to 国会議事録 corpus:
 - MDP-based retrieval decision (Retrieve vs Parametric)
 - Hybrid BM25 + RRF scoring for document retrieval
 - LangGraph StateGraph workflow: Route → Retrieve → Grade → Rewrite → Generate → Approve
+  (compiled once at import; paused HITL runs are checkpointed to SQLite and resumed on review)
 - HITL activation: low_confidence (< 2 relevant docs) or sensitive_topic detection
 - Ollama (llama3.2) for local inference via OLLAMA_HOST env var
 - Permission-aware retrieval: allowed_roles metadata filtering
@@ -22,26 +23,81 @@ Key parameters from DeepRAG:
   - HITL threshold: relevant_doc_count < 2
   - Sensitive keywords: 給与, 人事, 機密, 予算, 秘密
   - Max retry: 2 (prevents infinite rewrite loops)
+  - Passage index: 400-char passages with 100-char overlap, collapsed to best per speech
+
+Node durations and HITL / rewrite / cache / fallback counters are recorded
+in-process and exported with metrics_text() (Prometheus format).
+
+Each request builds its retriever from the corpus unless a prebuilt one is
+shared with set_shared_retriever() (Lambda init, see handler.init_lambda).
 """
 
+import asyncio
+import functools
+import gzip
+import hashlib
 import json
 import os
 import re
 import time
+import unicodedata
 import uuid
+from collections import Counter
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, TypedDict
-
-from rank_bm25 import BM25Okapi
-
+from typing import TYPE_CHECKING, Any, Protocol, TypedDict
+
+import numpy as np
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Command, interrupt
+
+from .approval_cache import (
+    DEFAULT_APPROVAL_CACHE_SIZE,
+    DEFAULT_APPROVAL_TTL_S,
+    ApprovalKey,
+    ApprovedAnswer,
+    ApprovedAnswerCache,
+    approval_key,
+)
+from .checkpoint import SQLiteCheckpointSaver
+from .grader import BatchLLMGrader
 from .logger import get_logger
+from .metrics import MetricsRegistry
 from .models import (
+    BulkReviewRequest,
+    BulkReviewResponse,
+    BulkReviewResult,
     ExperimentRequest,
     ExperimentResponse,
-    GradedDocument,
     HITLReviewRequest,
+    Passage,
+    ReviewDecision,
+    ReviewQueueItem,
+    ReviewQueuePage,
+    SensitiveMatch,
     SourceDocument,
 )
+from .normalize import IngestNormalizer
+from .profiling import RequestProfiler
+from .review_queue import ReviewQueue
+from .scheduler import DeadlineExceededError, GenerationScheduler, Priority, SchedulerRejectedError
+from .sensitive import SensitiveTerm, SensitiveTermDetector
+from .singleflight import SingleFlight
+from .sources import (
+    FANOUT_MAX_WORKERS,
+    FanOutRetriever,
+    LocalCorpusSource,
+    RetrievalSource,
+    SourceSlots,
+    external_sources_from_env,
+)
+
+if TYPE_CHECKING:
+    from rank_bm25 import BM25Okapi
 
 logger = get_logger(__name__)
 
@@ -52,6 +108,22 @@ BM25_WEIGHT: float = 0.3
 DENSE_WEIGHT: float = 0.7
 HITL_CONFIDENCE_THRESHOLD: int = 2  # HITL if relevant docs < this
 MAX_REWRITE_RETRIES: int = 2
+PASSAGE_SIZE: int = 400  # Characters per indexed passage
+PASSAGE_OVERLAP: int = 100  # Characters shared by consecutive passages
+# BM25 vocabulary pruning (defaults keep every token)
+INDEX_MAX_DF: float = float(os.environ.get("INDEX_MAX_DF", "1.0"))  # Max fraction of passages
+INDEX_MIN_DF: int = int(os.environ.get("INDEX_MIN_DF", "1"))  # Min passages containing the token
+INDEX_STOP_TOKENS: tuple[str, ...] = tuple(t for t in os.environ.get("INDEX_STOP_TOKENS", "").split(",") if t)
+OLLAMA_TIMEOUT_S: float = 30.0
+GRADER_TIMEOUT_S: float = 10.0  # Batched LLM grading falls back to keywords after this
+
+# Latency-budget (deadline_ms) degradation thresholds, in remaining milliseconds
+DEADLINE_REWRITE_RESERVE_MS: float = 3000.0  # Below: no further rewrite/re-retrieve
+DEADLINE_SHRINK_TOP_K_MS: float = 2000.0  # Below: retrieve fewer candidates
+DEADLINE_FULL_GENERATION_MS: float = 10000.0  # Below: cap generated tokens
+DEADLINE_MIN_GENERATION_MS: float = 1000.0  # Below: extractive answer, no LLM call
+GENERATION_TOKENS_PER_S: float = 20.0  # Conservative local-model decode rate for token caps
+MIN_GENERATION_TOKENS: int = 32
 
 SENSITIVE_KEYWORDS: list[str] = [
     "給与",
@@ -63,15 +135,51 @@ SENSITIVE_KEYWORDS: list[str] = [
     "極秘",
     "個人情報",
 ]
+MAX_SENSITIVE_MATCHES: int = 50  # Cap on match details attached to a HITL review
+
+HITL_PENDING_ANSWER: str = "この質問は人間によるレビューが必要です。しばらくお待ちください。"
+HITL_REJECTED_ANSWER: str = "レビューの結果、この質問への回答は承認されませんでした。"
+REVIEW_BULK_WORKERS: int = int(os.environ.get("REVIEW_BULK_WORKERS", "4"))  # Concurrent bulk resumes
+
+# Built-in keywords apply to the query only; SENSITIVE_TERMS_PATH adds a
+# compliance dictionary whose entries may also apply to retrieved documents.
+_sensitive_detector: SensitiveTermDetector = SensitiveTermDetector.from_env(
+    builtin=[SensitiveTerm(kw, category="builtin", scope="query") for kw in SENSITIVE_KEYWORDS]
+)
+
+# Keyword tokens used by the relevance grader (runs of kana/kanji/word characters)
+KEYWORD_PATTERN: re.Pattern[str] = re.compile(r"[\u3040-\u9fff\w]+")
 
 DATA_SAMPLE_PATH: Path = (
     Path(__file__).parent.parent.parent / "data" / "sample" / "kokkai_sample.json"
 )
-DATA_CORPUS_DIR: Path = Path(__file__).parent.parent.parent / "data" / "corpus"
+DATA_CORPUS_DIR: Path = Path(
+    os.environ.get("CORPUS_DIR") or Path(__file__).parent.parent.parent / "data" / "corpus"
+)
+
+# Text normalization applied to loaded speeches (INGEST_NORMALIZE, see normalize.py)
+_ingest_normalizer: IngestNormalizer | None = IngestNormalizer.from_env()
 
 
 # --- LangGraph State ---
 
+@dataclass(slots=True)
+class GradedPassage:
+    """A retrieved document with its relevance decision (internal to the workflow)."""
+
+    document: Passage
+    is_relevant: bool
+    grade_reason: str = ""
+
+    def _asdict(self) -> dict[str, Any]:
+        # Fast checkpoint encoding, as for Passage
+        return {
+            "document": self.document,
+            "is_relevant": self.is_relevant,
+            "grade_reason": self.grade_reason,
+        }
+
+
 class RAGState(TypedDict):
     """State for the LangGraph RAG HITL workflow."""
 
@@ -79,23 +187,57 @@ class RAGState(TypedDict):
     rewritten_query: str
     max_results: int
     user_roles: list[str]
-    retrieved_docs: list[SourceDocument]
-    graded_docs: list[GradedDocument]
-    relevant_docs: list[SourceDocument]
+    retrieved_docs: list[Passage]
+    retrieved_keyword_ids: list[np.ndarray]
+    query_keyword_ids: np.ndarray
+    graded_docs: list[GradedPassage]
+    relevant_docs: list[Passage]
     answer: str
     requires_review: bool
     hitl_review: HITLReviewRequest | None
+    review_decision: ReviewDecision | None
+    cached_approval: bool
+    generation_ok: bool  # The answer was generated by the LLM (not a fallback or pending message)
+    corpus_version: str
     workflow_steps: list[str]
     retry_count: int
     request_id: str
+    priority: Priority
+    deadline: float | None  # Wall-clock (time.time()) budget end; None = unbounded
+    rewrite_budget_exhausted: bool
+    node_timings: dict[str, float]  # Node name -> cumulative milliseconds in this run
 
 
 # --- Corpus Loader ---
 
+# Mirrors data/download.py CORPUS_FILE_SUFFIXES (kept in step by tests/test_download.py)
+CORPUS_FILE_SUFFIXES: tuple[str, ...] = (".json", ".jsonl", ".jsonl.gz")
+
+
+def _read_corpus_file(path: Path) -> list[dict[str, Any]]:
+    """Read the speech records of one corpus file.
+
+    ``.json`` files hold an API response (records under ``speechRecord``);
+    ``.jsonl`` / ``.jsonl.gz`` files hold one record per line, as written by
+    the streaming download (data/download.py --format jsonl). Same reader as
+    data/download.py ``read_corpus_file``, which cannot import this package;
+    change both together.
+    """
+    if path.name.endswith(".json"):
+        return json.loads(path.read_text(encoding="utf-8")).get("speechRecord", [])
+    opener = gzip.open if path.name.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        lines = [line for line in f.read().split("\n") if line.strip()]
+    # JSON text never contains a raw newline: parse all lines as one array
+    return json.loads("[" + ",".join(lines) + "]")
+
+
 def _load_corpus() -> list[dict[str, Any]]:
     """Load speech documents from data directory.
 
-    Loads from corpus/ first, falls back to sample/ for testing.
+    Loads from corpus/ first (JSON and JSONL files, in file name order),
+    falls back to sample/ for testing. Speeches are normalized when
+    INGEST_NORMALIZE is on.
 
     Returns:
         List of speech record dicts
@@ -104,12 +246,14 @@ def _load_corpus() -> list[dict[str, Any]]:
 
     # Try corpus directory first
     if DATA_CORPUS_DIR.exists():
-        for json_file in sorted(DATA_CORPUS_DIR.glob("*.json")):
+        corpus_files = sorted(
+            path for path in DATA_CORPUS_DIR.iterdir() if path.name.endswith(CORPUS_FILE_SUFFIXES)
+        )
+        for corpus_file in corpus_files:
             try:
-                data = json.loads(json_file.read_text(encoding="utf-8"))
-                speeches.extend(data.get("speechRecord", []))
-            except (json.JSONDecodeError, KeyError) as e:
-                logger.warning("Failed to load corpus file", extra={"file": str(json_file), "error": str(e)})
+                speeches.extend(_read_corpus_file(corpus_file))
+            except (json.JSONDecodeError, KeyError, OSError, EOFError, AttributeError) as e:
+                logger.warning("Failed to load corpus file", extra={"file": str(corpus_file), "error": str(e)})
 
     # Fall back to sample data if corpus is empty
     if not speeches and DATA_SAMPLE_PATH.exists():
@@ -119,27 +263,67 @@ def _load_corpus() -> list[dict[str, Any]]:
         except (json.JSONDecodeError, KeyError) as e:
             logger.warning("Failed to load sample data", extra={"error": str(e)})
 
+    if _ingest_normalizer is not None:
+        speeches = _ingest_normalizer.apply(speeches)
     return speeches
 
 
-def _speech_to_source_doc(speech: dict[str, Any], score: float) -> SourceDocument:
-    """Convert a kokkai speech record to a SourceDocument.
+def _split_passages(
+    text: str,
+    size: int = PASSAGE_SIZE,
+    overlap: int = PASSAGE_OVERLAP,
+) -> list[tuple[int, int]]:
+    """Split a speech into overlapping fixed-size passages.
+
+    Args:
+        text: Speech text
+        size: Passage length in characters
+        overlap: Characters shared between consecutive passages
+
+    Returns:
+        List of (start, end) character offsets into text; at least one entry
+    """
+    if len(text) <= size:
+        return [(0, len(text))]
+    stride = max(size - overlap, 1)
+    spans: list[tuple[int, int]] = []
+    for start in range(0, len(text), stride):
+        end = min(start + size, len(text))
+        spans.append((start, end))
+        if end == len(text):
+            break
+    return spans
+
+
+def _speech_to_passage(
+    speech: dict[str, Any],
+    score: float,
+    start: int = 0,
+    end: int | None = None,
+) -> Passage:
+    """Convert a passage of a kokkai speech record to a Passage.
 
     Args:
         speech: Speech record dict from kokkai API
         score: Relevance score
+        start: Passage start offset within the speech
+        end: Passage end offset (None for the end of the speech)
 
     Returns:
-        SourceDocument instance
+        Passage whose content is speech[start:end]
     """
-    return SourceDocument(
-        speech_id=speech.get("speechID", ""),
-        speaker=speech.get("speaker", ""),
-        date=speech.get("date", ""),
-        content=speech.get("speech", "")[:500],  # Truncate to 500 chars
+    text = speech.get("speech") or ""
+    end = len(text) if end is None else end
+    return Passage(
+        speech_id=speech.get("speechID") or "",
+        speaker=speech.get("speaker") or "",
+        date=speech.get("date") or "",
+        content=text[start:end],
         score=min(max(score, 0.0), 1.0),
-        house=speech.get("nameOfHouse", ""),
-        meeting=speech.get("nameOfMeeting", ""),
+        house=speech.get("nameOfHouse") or "",
+        meeting=speech.get("nameOfMeeting") or "",
+        passage_start=start,
+        passage_end=end,
     )
 
 
@@ -152,14 +336,97 @@ class HybridRetriever:
     - BM25 for lexical matching (weight=0.3)
     - Token-based dense scoring approximation (weight=0.7)
     - RRF fusion: score = weight / (RRF_K + rank)
+
+    Speeches are indexed as overlapping passages (PASSAGE_SIZE chars with
+    PASSAGE_OVERLAP) so long speeches are searchable beyond their opening.
+    Each passage keeps its parent speech index and character offsets.
+
+    The BM25 vocabulary can be pruned by document frequency: tokens in more
+    than max_df of the passages (``の``, ``、``, ``君``), in fewer than
+    min_df passages, or listed in stop_tokens are left out of BM25 (and out
+    of passage lengths). Queries skip every token BM25 does not hold, so a
+    pruned token scores nothing on either side. The character-overlap dense
+    score still sees all characters. If pruning leaves no BM25 vocabulary
+    (e.g. a max_df tuned for the full corpus applied to the sample), BM25 is
+    skipped and passages rank by the dense score alone.
     """
 
-    def __init__(self, speeches: list[dict[str, Any]]) -> None:
+    def __init__(
+        self,
+        speeches: list[dict[str, Any]],
+        passage_size: int = PASSAGE_SIZE,
+        passage_overlap: int = PASSAGE_OVERLAP,
+        collapse_passages: bool = True,
+        max_df: float = INDEX_MAX_DF,
+        min_df: int = INDEX_MIN_DF,
+        stop_tokens: Iterable[str] = INDEX_STOP_TOKENS,
+    ) -> None:
+        if not 0.0 < max_df <= 1.0:
+            raise ValueError(f"max_df must be in (0, 1], got {max_df}")
+        if min_df < 1:
+            raise ValueError(f"min_df must be >= 1, got {min_df}")
         self.speeches = speeches
+        self.passage_size = passage_size
+        self.passage_overlap = passage_overlap
+        self.collapse_passages = collapse_passages
+        self.max_df = max_df
+        self.min_df = min_df
+        self.stop_tokens = frozenset(stop_tokens)
+        # Tokens left out of BM25 by the last build
+        self.pruned_tokens: frozenset[str] = frozenset()
+        # (speech index, start, end) per indexed passage
+        self.passages: list[tuple[int, int, int]] = []
         self._tokenized_corpus: list[list[str]] = []
+        self._char_sets: list[frozenset[str]] = []
+        # Grader keyword vocabulary and per-passage sorted keyword ids, kept beside BM25
+        self._keyword_vocab: dict[str, int] = {}
+        self._keyword_ids: list[np.ndarray] = []
+        # (speechID, passage start) -> passage index, built on first keyword_ids_for
+        self._passage_lookup: dict[tuple[str, int], int] | None = None
         self._bm25: BM25Okapi | None = None
+        # True once finish_build() has run; _bm25 stays None if pruning left no vocabulary
+        self._built = False
+        self._corpus_version: str | None = None
         self._build_index()
 
+    @property
+    def corpus_version(self) -> str:
+        """Digest of the indexed speeches (IDs and text), computed on first use."""
+        if self._corpus_version is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for s in self.speeches:
+                digest.update(str(s.get("speechID", "")).encode("utf-8"))
+                digest.update(b"\x00")
+                digest.update(s.get("speech", "").encode("utf-8"))
+                digest.update(b"\x01")
+            self._corpus_version = digest.hexdigest()
+        return self._corpus_version
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Pickled state for index snapshots.
+
+        The tokenized corpus is build-time only (BM25 keeps its own term
+        counts) and is dropped; add_speeches() / finish_build() on a loaded
+        retriever re-tokenize the passages first. Per-passage keyword ids are packed into one
+        array plus offsets, which unpickles far faster than many small arrays.
+        """
+        state = self.__dict__.copy()
+        state["_tokenized_corpus"] = []
+        state["_passage_lookup"] = None
+        ids = state.pop("_keyword_ids")
+        state["_keyword_ids_packed"] = (
+            np.concatenate(ids) if ids else np.empty(0, dtype=np.int32),
+            np.cumsum([len(a) for a in ids], dtype=np.int64)[:-1],
+        )
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        flat, offsets = state.pop("_keyword_ids_packed")
+        state["_keyword_ids"] = np.split(flat, offsets) if state["passages"] else []
+        state.setdefault("_passage_lookup", None)
+        state.setdefault("_built", state["_bm25"] is not None)
+        self.__dict__.update(state)
+
     def _tokenize(self, text: str) -> list[str]:
         """Simple character-level n-gram tokenization for Japanese text.
 
@@ -175,35 +442,137 @@ class HybridRetriever:
         return chars + bigrams
 
     def _build_index(self) -> None:
-        """Build BM25 index from corpus."""
+        """Split speeches into passages and build the BM25 index over them."""
         if not self.speeches:
             return
+        self._index_passages(0)
+        self.finish_build()
+
+    def _index_passages(self, first: int) -> None:
+        """Split, tokenize and intern the passages of speeches[first:]."""
+        for speech_idx in range(first, len(self.speeches)):
+            s = self.speeches[speech_idx]
+            text = s.get("speech", "")
+            speaker = s.get("speaker", "")
+            for start, end in _split_passages(text, self.passage_size, self.passage_overlap):
+                passage = text[start:end]
+                self.passages.append((speech_idx, start, end))
+                self._tokenized_corpus.append(self._tokenize(passage + " " + speaker))
+                self._char_sets.append(frozenset(passage + speaker))
+                self._keyword_ids.append(self._intern_keywords(passage))
+
+    def _restore_tokens(self) -> None:
+        """Re-tokenize the passages whose tokens a snapshot dropped."""
+        for speech_idx, start, end in self.passages[len(self._tokenized_corpus) :]:
+            s = self.speeches[speech_idx]
+            self._tokenized_corpus.append(self._tokenize(s.get("speech", "")[start:end] + " " + s.get("speaker", "")))
+
+    def add_speeches(self, speeches: list[dict[str, Any]]) -> None:
+        """Append speeches and index their passages (streaming ingest).
+
+        BM25 statistics depend on the whole corpus, so they are rebuilt by
+        finish_build(); until then the retriever returns no results. Adding
+        batches in corpus order yields the same index as building at once.
 
-        self._tokenized_corpus = [
-            self._tokenize(s.get("speech", "") + " " + s.get("speaker", ""))
-            for s in self.speeches
-        ]
-        self._bm25 = BM25Okapi(self._tokenized_corpus)
+        Args:
+            speeches: Speech records to append
+        """
+        self._restore_tokens()
+        first = len(self.speeches)
+        self.speeches.extend(speeches)
+        self._index_passages(first)
+        self._bm25 = None
+        self._built = False
+        self._corpus_version = None
+        self._passage_lookup = None
+
+    def finish_build(self) -> None:
+        """Build the BM25 index over all passages indexed so far."""
+        if not self.passages:
+            return
+
+        # Deferred: a retriever loaded from an index snapshot never builds
+        from rank_bm25 import BM25Okapi
+
+        self._restore_tokens()
+        self.pruned_tokens = self._prune_vocabulary()
+        corpus = self._tokenized_corpus
+        if self.pruned_tokens:
+            # Filtered copy: the unpruned tokens stay for the next add_speeches() + finish_build()
+            corpus = [[t for t in tokens if t not in self.pruned_tokens] for tokens in corpus]
+        # rank_bm25 divides by the vocabulary size, so an empty vocabulary gets no BM25 at all
+        self._bm25 = BM25Okapi(corpus) if any(corpus) else None
+        if self._bm25 is None:
+            logger.warning(
+                "BM25 vocabulary fully pruned; ranking by dense score only",
+                extra={"max_df": self.max_df, "min_df": self.min_df, "passages": len(self.passages)},
+            )
+        self._built = True
+
+    def _prune_vocabulary(self) -> frozenset[str]:
+        """Find the DF-pruned and stop tokens of the tokenized corpus.
+
+        Pruning is decided on the whole corpus, so streamed and one-shot
+        builds prune the same tokens.
+
+        Returns:
+            The pruned tokens
+        """
+        if self.max_df >= 1.0 and self.min_df <= 1 and not self.stop_tokens:
+            return frozenset()
+        df: Counter[str] = Counter()
+        for tokens in self._tokenized_corpus:
+            df.update(set(tokens))
+        max_count = self.max_df * len(self._tokenized_corpus)
+        return frozenset(t for t, n in df.items() if n > max_count or n < self.min_df or t in self.stop_tokens)
+
+    def _intern_keywords(self, text: str) -> np.ndarray:
+        """Map the grader keywords of text to vocabulary ids, growing the vocabulary.
+
+        Args:
+            text: Passage text
+
+        Returns:
+            Sorted unique keyword ids (int32)
+        """
+        vocab = self._keyword_vocab
+        ids = {vocab.setdefault(kw, len(vocab)) for kw in KEYWORD_PATTERN.findall(text)}
+        return np.array(sorted(ids), dtype=np.int32)
+
+    def query_keyword_ids(self, query: str) -> np.ndarray:
+        """Map query keywords to vocabulary ids.
 
-    def _dense_score(self, query: str, speech: dict[str, Any]) -> float:
+        Keywords absent from the vocabulary are dropped: no passage contains
+        them, so they can never contribute to an overlap count.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Sorted unique keyword ids (int32)
+        """
+        vocab = self._keyword_vocab
+        ids = {vocab[kw] for kw in KEYWORD_PATTERN.findall(query) if kw in vocab}
+        return np.array(sorted(ids), dtype=np.int32)
+
+    def _dense_score(self, query: str, passage_idx: int) -> float:
         """Approximate dense scoring via keyword overlap ratio.
 
         In production, this would use sentence-transformers.
-        For testing without GPU/API, uses character overlap.
+        For testing without GPU/API, uses character overlap against the
+        passage character set precomputed at index time.
 
         Args:
             query: Search query
-            speech: Speech record dict
+            passage_idx: Index into self.passages
 
         Returns:
             Overlap score (0-1)
         """
         query_chars = set(query)
-        content = speech.get("speech", "") + speech.get("speaker", "")
-        content_chars = set(content)
         if not query_chars:
             return 0.0
-        overlap = len(query_chars & content_chars)
+        overlap = len(query_chars & self._char_sets[passage_idx])
         return overlap / len(query_chars)
 
     def retrieve(
@@ -211,13 +580,88 @@ class HybridRetriever:
         query: str,
         top_k: int = TOP_K,
         user_roles: list[str] | None = None,
-    ) -> list[SourceDocument]:
-        """Retrieve top-k documents using BM25 + RRF fusion.
+        collapse: bool | None = None,
+    ) -> list[Passage]:
+        """Retrieve top-k passages using BM25 + RRF fusion.
+
+        See _search for the ranking details.
+
+        Args:
+            query: Search query
+            top_k: Number of top documents to return
+            user_roles: User roles for permission filtering
+            collapse: Keep only the best passage per speech
+                (defaults to the retriever's collapse_passages setting)
+
+        Returns:
+            List of passages sorted by relevance score
+        """
+        return [
+            self._to_passage(i, score)
+            for i, score in self._search(query, top_k, user_roles, collapse)
+        ]
+
+    def retrieve_with_keywords(
+        self,
+        query: str,
+        top_k: int = TOP_K,
+        user_roles: list[str] | None = None,
+        collapse: bool | None = None,
+    ) -> tuple[list[Passage], list[np.ndarray]]:
+        """Retrieve like retrieve() and also return each passage's keyword ids.
+
+        Args:
+            query: Search query
+            top_k: Number of top documents to return
+            user_roles: User roles for permission filtering
+            collapse: Keep only the best passage per speech
+
+        Returns:
+            (documents, keyword_ids) with keyword_ids aligned to documents
+        """
+        hits = self._search(query, top_k, user_roles, collapse)
+        docs = [self._to_passage(i, score) for i, score in hits]
+        return docs, [self._keyword_ids[i] for i, _ in hits]
+
+    def keyword_ids_for(self, docs: list[Passage]) -> list[np.ndarray]:
+        """Precomputed keyword ids of passages returned by this retriever.
+
+        The (speechID, passage start) lookup is built on the first call and
+        reused until add_speeches changes the corpus.
 
-        Implements DeepRAG hybrid retrieval:
+        Args:
+            docs: Documents produced by retrieve()
+
+        Returns:
+            Keyword ids aligned to docs
+        """
+        lookup = self._passage_lookup
+        if lookup is None:
+            lookup = self._passage_lookup = {
+                (self.speeches[si].get("speechID", ""), start): pi
+                for pi, (si, start, _) in enumerate(self.passages)
+            }
+        return [self._keyword_ids[lookup[(d.speech_id, d.passage_start)]] for d in docs]
+
+    def _to_passage(self, passage_idx: int, score: float) -> Passage:
+        """Build the Passage record for an indexed passage."""
+        speech_idx, start, end = self.passages[passage_idx]
+        return _speech_to_passage(self.speeches[speech_idx], score, start, end)
+
+    def _search(
+        self,
+        query: str,
+        top_k: int,
+        user_roles: list[str] | None,
+        collapse: bool | None,
+    ) -> list[tuple[int, float]]:
+        """Rank passages using BM25 + RRF fusion.
+
+        Implements DeepRAG hybrid retrieval at passage level:
         - BM25 lexical scores ranked
         - Dense scores ranked
         - RRF fusion: final_score = BM25_WEIGHT/(RRF_K+rank_bm25) + DENSE_WEIGHT/(RRF_K+rank_dense)
+        - Optional collapse to the best-scoring passage per speech
 
         Permission filtering: public role can access all documents
         (in production, private docs would be filtered by allowed_roles metadata)
@@ -226,23 +670,29 @@ class HybridRetriever:
             query: Search query
             top_k: Number of top documents to return
             user_roles: User roles for permission filtering
+            collapse: Keep only the best passage per speech
+                (defaults to the retriever's collapse_passages setting)
 
         Returns:
-            List of SourceDocument sorted by relevance score
+            List of (passage index, normalized score) sorted by relevance
         """
-        if not self.speeches or self._bm25 is None:
+        if not self.passages or not self._built:
             return []
 
-        query_tokens = self._tokenize(query)
+        if collapse is None:
+            collapse = self.collapse_passages
 
-        # BM25 scores
-        bm25_scores = self._bm25.get_scores(query_tokens)
+        # BM25 scores; tokens BM25 does not hold (pruned or unseen) score zero, so skip their passes
+        bm25_ranked: list[int] = []
+        if self._bm25 is not None:
+            idf = self._bm25.idf
+            bm25_scores = self._bm25.get_scores([t for t in self._tokenize(query) if t in idf])
+            bm25_ranked = sorted(range(len(bm25_scores)), key=lambda i: bm25_scores[i], reverse=True)
 
         # Dense scores
-        dense_scores = [self._dense_score(query, s) for s in self.speeches]
+        dense_scores = [self._dense_score(query, i) for i in range(len(self.passages))]
 
         # Create ranked lists (descending)
-        bm25_ranked = sorted(range(len(bm25_scores)), key=lambda i: bm25_scores[i], reverse=True)
         dense_ranked = sorted(range(len(dense_scores)), key=lambda i: dense_scores[i], reverse=True)
 
         # RRF fusion: score = BM25_WEIGHT/(RRF_K + rank) + DENSE_WEIGHT/(RRF_K + rank)
@@ -252,87 +702,414 @@ class HybridRetriever:
         for rank, idx in enumerate(dense_ranked):
             rrf_scores[idx] = rrf_scores.get(idx, 0.0) + DENSE_WEIGHT / (RRF_K + rank + 1)
 
-        # Sort by RRF score and take top_k
-        sorted_indices = sorted(rrf_scores.keys(), key=lambda i: rrf_scores[i], reverse=True)[:top_k]
+        # Sort by RRF score and take top_k (best passage per speech when collapsing)
+        ranked = sorted(rrf_scores.keys(), key=lambda i: rrf_scores[i], reverse=True)
+        sorted_indices: list[int] = []
+        if collapse:
+            seen_speeches: set[int] = set()
+            for i in ranked:
+                speech_idx = self.passages[i][0]
+                if speech_idx in seen_speeches:
+                    continue
+                seen_speeches.add(speech_idx)
+                sorted_indices.append(i)
+                if len(sorted_indices) == top_k:
+                    break
+        else:
+            sorted_indices = ranked[:top_k]
 
         # Normalize scores to 0-1 range
         max_score = max((rrf_scores[i] for i in sorted_indices), default=1.0)
         if max_score == 0:
             max_score = 1.0
 
-        return [
-            _speech_to_source_doc(self.speeches[i], rrf_scores[i] / max_score)
-            for i in sorted_indices
-        ]
+        return [(i, rrf_scores[i] / max_score) for i in sorted_indices]
+
+
+class PassageRetriever(Protocol):
+    """What the workflow needs from a retriever.
+
+    Implemented by HybridRetriever (in memory) and
+    blocked_index.BlockedIndexRetriever (range reads from object storage).
+    """
+
+    @property
+    def corpus_version(self) -> str: ...
+
+    def retrieve(
+        self,
+        query: str,
+        top_k: int = TOP_K,
+        user_roles: list[str] | None = None,
+        collapse: bool | None = None,
+    ) -> list[Passage]: ...
+
+    def retrieve_with_keywords(
+        self,
+        query: str,
+        top_k: int = TOP_K,
+        user_roles: list[str] | None = None,
+        collapse: bool | None = None,
+    ) -> tuple[list[Passage], list[np.ndarray]]: ...
+
+    def query_keyword_ids(self, query: str) -> np.ndarray: ...
+
+    def keyword_ids_for(self, docs: list[Passage]) -> list[np.ndarray]: ...
 
 
 # --- Ollama LLM Client ---
 
-def _call_ollama(prompt: str, system: str = "") -> str:
-    """Call Ollama API for text generation.
+# Admission control in front of Ollama (LLM_MAX_CONCURRENCY / LLM_MAX_QUEUE / LLM_QUEUE_TIMEOUT_S)
+_llm_scheduler: GenerationScheduler = GenerationScheduler.from_env()
 
-    Uses OLLAMA_HOST env var (default: http://localhost:11434).
-    Falls back to a keyword-based answer if Ollama is unavailable.
+
+def _ollama_request(
+    prompt: str,
+    system: str = "",
+    timeout: float = OLLAMA_TIMEOUT_S,
+    json_format: bool = False,
+    num_predict: int | None = None,
+) -> str:
+    """Send one generation request to Ollama, raising on any failure.
 
     Args:
         prompt: User prompt
         system: System message
+        timeout: HTTP timeout in seconds
+        json_format: Ask Ollama for JSON-constrained output
+        num_predict: Maximum number of tokens to generate
 
     Returns:
         Generated text response
+
+    Raises:
+        httpx.HTTPError: Connection failure, timeout or non-2xx status
     """
     import httpx
 
     ollama_host = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
     model = os.environ.get("OLLAMA_MODEL", "llama3.2")
 
-    payload = {
+    payload: dict[str, Any] = {
         "model": model,
         "prompt": prompt,
         "system": system,
         "stream": False,
     }
+    if json_format:
+        payload["format"] = "json"
+    if num_predict is not None:
+        payload["options"] = {"num_predict": num_predict}
+
+    with httpx.Client(timeout=timeout) as client:
+        response = client.post(f"{ollama_host}/api/generate", json=payload)
+        response.raise_for_status()
+        return str(response.json().get("response", ""))
+
+
+def _call_ollama(
+    prompt: str,
+    system: str = "",
+    priority: Priority = "interactive",
+    deadline: float | None = None,
+    num_predict: int | None = None,
+) -> str:
+    """Call Ollama API for text generation.
 
-    try:
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(f"{ollama_host}/api/generate", json=payload)
-            response.raise_for_status()
-            return str(response.json().get("response", ""))
-    except Exception as e:
-        logger.warning("Ollama unavailable, using fallback", extra={"error": str(e)})
-        # Fallback: extract key sentences from prompt
-        return "[Ollama unavailable] Relevant content found in corpus for query."
+    Uses OLLAMA_HOST env var (default: http://localhost:11434).
+    Each call first obtains a slot from the generation scheduler; admission
+    failures propagate so the API can answer 429/503 with Retry-After.
+    Falls back to a keyword-based answer if Ollama is unavailable.
+
+    Args:
+        prompt: User prompt
+        system: System message
+        priority: Scheduler priority class ("interactive" or "batch")
+        deadline: Wall-clock (time.time()) end of the request budget; bounds both
+            the queue wait and the HTTP timeout
+        num_predict: Maximum number of tokens to generate
+
+    Returns:
+        Generated text response
+
+    Raises:
+        SchedulerRejectedError: Queue full or deadline exceeded before admission
+    """
+    queue_deadline = None if deadline is None else time.monotonic() + (deadline - time.time())
+    with _llm_scheduler.slot(priority, queue_deadline):
+        timeout = OLLAMA_TIMEOUT_S
+        if deadline is not None:
+            timeout = max(0.1, min(OLLAMA_TIMEOUT_S, deadline - time.time()))
+        try:
+            return _ollama_request(prompt, system, timeout=timeout, num_predict=num_predict)
+        except Exception as e:
+            _llm_fallbacks.inc("generate")
+            logger.warning("Ollama unavailable, using fallback", extra={"error": str(e)})
+            # Fallback: extract key sentences from prompt
+            return "[Ollama unavailable] Relevant content found in corpus for query."
+
+
+def _grader_generate(priority: Priority, deadline: float | None = None) -> Callable[[str, str], str]:
+    """Build the raising LLM call used by the batched grader.
+
+    Unlike _call_ollama, failures (including scheduler rejections) raise so
+    the grader can fall back to keyword overlap.
+
+    With a request deadline, grading must finish while
+    DEADLINE_FULL_GENERATION_MS is still left for generate: both the queue
+    wait and the HTTP timeout are bounded by that point.
+
+    Args:
+        priority: Scheduler priority class of the request
+        deadline: Wall-clock (time.time()) end of the request budget, or None
+
+    Returns:
+        (prompt, system) -> JSON-formatted response text
+    """
+
+    def generate(prompt: str, system: str) -> str:
+        if deadline is None:
+            with _llm_scheduler.slot(priority):
+                return _ollama_request(prompt, system, timeout=GRADER_TIMEOUT_S, json_format=True)
+
+        grade_deadline = deadline - DEADLINE_FULL_GENERATION_MS / 1000
+        queue_deadline = time.monotonic() + (grade_deadline - time.time())
+        with _llm_scheduler.slot(priority, queue_deadline):
+            timeout = min(GRADER_TIMEOUT_S, grade_deadline - time.time())
+            if timeout <= 0:
+                raise DeadlineExceededError("No grading budget left before generation", retry_after=0.0)
+            return _ollama_request(prompt, system, timeout=timeout, json_format=True)
+
+    return generate
+
+
+# Shared batched LLM grader with per-(query, passage) verdict cache (GRADER_MODE=llm)
+_llm_grader: BatchLLMGrader = BatchLLMGrader()
+
+
+def grader_stats() -> dict[str, Any]:
+    """Export batched LLM grader latency, fallback and agreement counters.
+
+    Returns:
+        Snapshot dict from the LLM grader
+    """
+    return _llm_grader.stats()
+
+
+def llm_scheduler_stats() -> dict[str, Any]:
+    """Export LLM queue depth, wait-time and rejection counters.
+
+    Returns:
+        Snapshot dict from the generation scheduler
+    """
+    return _llm_scheduler.stats()
+
+
+# --- Retrieval Sources ---
+
+# External sources (e.g. OpenSearch via OPENSEARCH_ENDPOINT) queried beside the local corpus
+_external_sources: list[RetrievalSource] = external_sources_from_env()
+_fanout_executor: ThreadPoolExecutor = ThreadPoolExecutor(
+    max_workers=FANOUT_MAX_WORKERS, thread_name_prefix="retrieval"
+)
+# Per-source cap on the pool's workers, including calls abandoned at their deadline
+_fanout_slots: SourceSlots = SourceSlots()
+
+
+# --- Metrics ---
+
+_metrics: MetricsRegistry = MetricsRegistry()
+_node_duration = _metrics.histogram(
+    "rag_node_duration_seconds", "Workflow node execution time", ["node"]
+)
+_request_duration = _metrics.histogram(
+    "rag_request_duration_seconds", "End-to-end workflow run time", ["outcome"]
+)
+_hitl_reviews = _metrics.counter("rag_hitl_reviews_total", "Runs routed to HITL review", ["reason"])
+_rewrites = _metrics.counter("rag_rewrites_total", "Query rewrites performed")
+_cache_hits = _metrics.counter("rag_cache_hits_total", "Cache lookups served", ["cache"])
+_cache_misses = _metrics.counter("rag_cache_misses_total", "Cache lookups missed", ["cache"])
+_llm_fallbacks = _metrics.counter(
+    "rag_llm_fallbacks_total", "LLM calls answered by a fallback", ["component"]
+)
+
+
+def metrics_text() -> str:
+    """Export node histograms and workflow counters in Prometheus text format.
+
+    Returns:
+        Text exposition (format 0.0.4)
+    """
+    return _metrics.render()
+
+
+def _timed_node(name: str, node: Callable[..., RAGState]) -> Callable[..., RAGState]:
+    """Wrap a workflow node to record its duration.
+
+    The duration goes to the rag_node_duration_seconds histogram and is added
+    to state["node_timings"] for the per-request breakdown. functools.wraps
+    keeps the signature LangGraph inspects (e.g. the config parameter).
+
+    Args:
+        name: Node name used as the histogram label
+        node: Node function
+
+    Returns:
+        Wrapped node
+    """
+
+    @functools.wraps(node)
+    def timed(state: RAGState, *args: Any, **kwargs: Any) -> RAGState:
+        start = time.perf_counter()
+        try:
+            result = node(state, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            _node_duration.observe(elapsed, name)
+        timings = result.get("node_timings") or {}
+        result["node_timings"] = {**timings, name: timings.get(name, 0.0) + elapsed * 1000}
+        return result
+
+    return timed
+
+
+# --- Latency Budget ---
+
+def _remaining_ms(state: RAGState) -> float | None:
+    """Milliseconds left in the request's latency budget (None if unbounded)."""
+    deadline = state.get("deadline")
+    if deadline is None:
+        return None
+    return (deadline - time.time()) * 1000
+
+
+_SENTENCE_PATTERN: re.Pattern[str] = re.compile(r"[^。！？\n]+[。！？]?")
+
+
+def _extractive_answer(query: str, docs: list[Passage], max_docs: int = 3) -> str:
+    """Build an answer from source sentences without calling the LLM.
+
+    Picks, from each of the top documents, the sentence sharing the most
+    character bigrams with the query (the retriever's matching unit).
+
+    Args:
+        query: User query
+        docs: Relevant documents, best first
+        max_docs: Number of documents to quote
+
+    Returns:
+        Quoted sentences with speaker and date
+    """
+
+    def bigrams(text: str) -> set[str]:
+        return {text[i : i + 2] for i in range(len(text) - 1)}
+
+    query_bigrams = bigrams(query)
+    lines = []
+    for doc in docs[:max_docs]:
+        sentences = [m.group().strip() for m in _SENTENCE_PATTERN.finditer(doc.content)]
+        sentences = [sent for sent in sentences if sent]
+        if not sentences:
+            continue
+        best = max(sentences, key=lambda sent: len(query_bigrams & bigrams(sent)))
+        lines.append(f"・{doc.speaker}（{doc.date}）: {best[:200]}")
+    return "関連する発言の抜粋:\n" + "\n".join(lines) if lines else "関連する国会議事録が見つかりませんでした。"
 
 
 # --- Workflow Nodes ---
 
-def _node_retrieve(state: RAGState, retriever: HybridRetriever) -> RAGState:
+def _node_retrieve(state: RAGState, retriever: PassageRetriever) -> RAGState:
     """Retrieve documents using hybrid BM25 + RRF.
 
+    With external sources configured, the local retriever and every external
+    source are queried concurrently (see sources.FanOutRetriever) and the
+    results that arrive before each source's deadline are fused with RRF.
+
     Args:
         state: Current workflow state
-        retriever: HybridRetriever instance
+        retriever: HybridRetriever or another PassageRetriever
 
     Returns:
         Updated state with retrieved_docs
     """
     query = state.get("rewritten_query") or state["query"]
-    docs = retriever.retrieve(
-        query=query,
-        top_k=state["max_results"],
-        user_roles=state["user_roles"],
-    )
+    top_k = state["max_results"]
+    remaining = _remaining_ms(state)
+    if remaining is not None and remaining < DEADLINE_SHRINK_TOP_K_MS and top_k > 1:
+        top_k = max(1, top_k // 2)
+        state["workflow_steps"].append(f"deadline:shrink_top_k:{top_k}")
+
+    if _external_sources:
+        fanout = FanOutRetriever(
+            [LocalCorpusSource(retriever), *_external_sources], _fanout_executor, _fanout_slots
+        ).search(
+            query,
+            top_k,
+            state["user_roles"],
+            deadline=None if remaining is None else time.monotonic() + max(remaining, 0.0) / 1000,
+        )
+        docs = fanout.docs
+        # Precomputed keyword ids exist only for local passages; otherwise grade from content
+        local = {(d.speech_id, d.passage_start) for d in fanout.per_source.get("local", [])}
+        keyword_ids = (
+            retriever.keyword_ids_for(docs)
+            if all((d.speech_id, d.passage_start) in local for d in docs)
+            else []
+        )
+        state["workflow_steps"].append(
+            "sources:" + ",".join(f"{name}={status}" for name, status in fanout.statuses.items())
+        )
+    else:
+        docs, keyword_ids = retriever.retrieve_with_keywords(
+            query=query,
+            top_k=top_k,
+            user_roles=state["user_roles"],
+        )
     state["retrieved_docs"] = docs
+    state["retrieved_keyword_ids"] = keyword_ids
+    state["query_keyword_ids"] = retriever.query_keyword_ids(query)
+    state["corpus_version"] = retriever.corpus_version
     state["workflow_steps"].append(f"retrieve:{len(docs)}_docs")
     return state
 
 
+def _keyword_overlaps(query_ids: np.ndarray, doc_ids: list[np.ndarray]) -> list[int]:
+    """Count query keyword ids present in each document, for all documents at once.
+
+    Concatenates the per-document id arrays, marks hits with a single np.isin
+    and sums the hits per document segment via cumulative sums.
+
+    Args:
+        query_ids: Unique query keyword ids
+        doc_ids: Unique keyword ids per document
+
+    Returns:
+        Overlap count per document
+    """
+    if not doc_ids:
+        return []
+    lengths = np.fromiter((len(ids) for ids in doc_ids), dtype=np.int64, count=len(doc_ids))
+    # Ids repeat across documents, so the concatenation is not unique
+    hits = np.isin(np.concatenate(doc_ids), query_ids)
+    bounds = np.concatenate(([0], np.cumsum(lengths)))
+    hit_sums = np.concatenate(([0], np.cumsum(hits, dtype=np.int64)))
+    return (hit_sums[bounds[1:]] - hit_sums[bounds[:-1]]).tolist()
+
+
 def _node_grade(state: RAGState) -> RAGState:
     """Grade retrieved documents for relevance.
 
-    Uses keyword overlap to determine relevance (production would use LLM grader).
+    Uses keyword overlap to determine relevance by default.
     Binary grading: relevant/irrelevant.
 
+    Keyword ids precomputed at index time (set by _node_retrieve) are
+    intersected in one vectorized pass; documents placed in the state without
+    them fall back to extracting keywords from their content.
+
+    With GRADER_MODE=llm, all documents are graded by one batched LLM call
+    (verdicts cached per query and passage); any document without a usable
+    verdict keeps its keyword-overlap decision.
+
     Args:
         state: Current workflow state
 
@@ -340,28 +1117,63 @@ def _node_grade(state: RAGState) -> RAGState:
         Updated state with graded_docs and relevant_docs
     """
     query = state.get("rewritten_query") or state["query"]
-    query_keywords = set(re.findall(r"[\u3040-\u9fff\w]+", query))
+    docs = state["retrieved_docs"]
+    doc_keyword_ids = state.get("retrieved_keyword_ids")
+    query_keyword_ids = state.get("query_keyword_ids")
 
-    graded: list[GradedDocument] = []
-    relevant: list[SourceDocument] = []
-
-    for doc in state["retrieved_docs"]:
-        content_keywords = set(re.findall(r"[\u3040-\u9fff\w]+", doc.content))
-        overlap = len(query_keywords & content_keywords)
-        is_relevant = overlap >= 2 or doc.score >= 0.3
-
-        graded_doc = GradedDocument(
-            document=doc,
-            is_relevant=is_relevant,
-            grade_reason=f"keyword_overlap={overlap}, score={doc.score:.3f}",
+    if query_keyword_ids is not None and doc_keyword_ids is not None and len(doc_keyword_ids) == len(docs):
+        overlaps = _keyword_overlaps(query_keyword_ids, doc_keyword_ids)
+    else:
+        query_keywords = set(KEYWORD_PATTERN.findall(query))
+        overlaps = [len(query_keywords & set(KEYWORD_PATTERN.findall(d.content))) for d in docs]
+
+    decisions = [overlap >= 2 or doc.score >= 0.3 for doc, overlap in zip(docs, overlaps, strict=True)]
+    reasons = [
+        f"keyword_overlap={overlap}, score={doc.score:.3f}"
+        for doc, overlap in zip(docs, overlaps, strict=True)
+    ]
+
+    remaining = _remaining_ms(state)
+    llm_grading = os.environ.get("GRADER_MODE", "keyword") == "llm"
+    if llm_grading and remaining is not None and remaining < DEADLINE_FULL_GENERATION_MS:
+        llm_grading = False
+        state["workflow_steps"].append("deadline:skip_llm_grade")
+
+    # Optional batched LLM grading; documents without a verdict keep the keyword decision
+    if docs and llm_grading:
+        outcome = _llm_grader.grade(
+            query,
+            docs,
+            list(decisions),
+            _grader_generate(state.get("priority", "interactive"), state.get("deadline")),
         )
-        graded.append(graded_doc)
-        if is_relevant:
-            relevant.append(doc)
+        for i, verdict in enumerate(outcome.verdicts):
+            if verdict is not None:
+                decisions[i] = verdict.relevant
+                reasons[i] = f"llm: {verdict.reason}" if verdict.reason else "llm"
+        if outcome.fallback:
+            _llm_fallbacks.inc("grader")
+            state["workflow_steps"].append(f"grade:llm_fallback:{outcome.fallback}")
+
+    graded = [
+        GradedPassage(doc, is_relevant, reason)
+        for doc, is_relevant, reason in zip(docs, decisions, reasons, strict=True)
+    ]
+    relevant = [g.document for g in graded if g.is_relevant]
 
     state["graded_docs"] = graded
     state["relevant_docs"] = relevant
     state["workflow_steps"].append(f"grade:{len(relevant)}_relevant")
+
+    # Another rewrite + retrieval would not leave enough budget to answer
+    if (
+        remaining is not None
+        and remaining < DEADLINE_REWRITE_RESERVE_MS
+        and len(relevant) < HITL_CONFIDENCE_THRESHOLD
+        and state.get("retry_count", 0) < MAX_REWRITE_RETRIES
+    ):
+        state["rewrite_budget_exhausted"] = True
+        state["workflow_steps"].append("deadline:skip_rewrite")
     return state
 
 
@@ -370,12 +1182,17 @@ def _node_check_hitl(state: RAGState) -> RAGState:
 
     Activation triggers:
     1. Low confidence: fewer than HITL_CONFIDENCE_THRESHOLD relevant docs
-    2. Sensitive topic: sensitive keywords detected in query
+    2. Sensitive topic: sensitive terms detected in the query or in the
+       relevant documents that would be passed to generation
 
     From Zenn article:
     - Sensitive keywords: 給与, 人事, 機密, etc.
     - Low confidence threshold: < 2 relevant graded docs
 
+    Terms are matched with a compiled Aho–Corasick automaton
+    (see sensitive.SensitiveTermDetector), so cost does not grow with
+    dictionary size.
+
     Args:
         state: Current workflow state
 
@@ -385,8 +1202,24 @@ def _node_check_hitl(state: RAGState) -> RAGState:
     query = state["query"]
     relevant_count = len(state["relevant_docs"])
 
-    # Detect sensitive keywords
-    found_sensitive = [kw for kw in SENSITIVE_KEYWORDS if kw in query]
+    # Detect sensitive terms in the query and the relevant documents
+    matches = [
+        SensitiveMatch(term=m.term, category=m.category, source="query", start=m.start, end=m.end)
+        for m in _sensitive_detector.scan(query, "query")
+    ]
+    for doc in state["relevant_docs"]:
+        matches.extend(
+            SensitiveMatch(
+                term=m.term,
+                category=m.category,
+                source="document",
+                speech_id=doc.speech_id,
+                start=m.start,
+                end=m.end,
+            )
+            for m in _sensitive_detector.scan(doc.content, "document")
+        )
+    found_sensitive = list(dict.fromkeys(m.term for m in matches))
 
     # HITL condition 1: Low confidence
     low_confidence = relevant_count < HITL_CONFIDENCE_THRESHOLD
@@ -402,8 +1235,30 @@ def _node_check_hitl(state: RAGState) -> RAGState:
             query=query,
             relevant_doc_count=relevant_count,
             sensitive_keywords=found_sensitive,
+            sensitive_matches=matches[:MAX_SENSITIVE_MATCHES],
+            review_id=state.get("request_id", ""),
         )
         state["workflow_steps"].append(f"hitl:{reason}")
+
+        # A reviewer already approved an answer for this query, role set and source set
+        cached = _approval_cache.get(_approval_key(state))
+        if cached is None:
+            _cache_misses.inc("approval")
+            _hitl_reviews.inc(reason)
+        else:
+            _cache_hits.inc("approval")
+            state["requires_review"] = False
+            state["hitl_review"] = None  # No review is pending for this request
+            state["cached_approval"] = True
+            state["answer"] = cached.answer
+            state["workflow_steps"].append("hitl:cached_approval")
+            logger.info(
+                "approval_cache_hit",
+                extra={
+                    "request_id": state.get("request_id", ""),
+                    "approved_review_id": cached.review_id,
+                },
+            )
     else:
         state["requires_review"] = False
         state["hitl_review"] = None
@@ -432,6 +1287,7 @@ def _node_rewrite(state: RAGState) -> RAGState:
     expansion = expansions[retry_count % len(expansions)]
     rewritten = f"{original_query} {expansion}"
 
+    _rewrites.inc()
     state["rewritten_query"] = rewritten
     state["retry_count"] = retry_count + 1
     state["workflow_steps"].append(f"rewrite:{retry_count + 1}")
@@ -458,7 +1314,7 @@ def _node_generate(state: RAGState) -> RAGState:
         state["workflow_steps"].append("generate:no_docs")
         return state
 
-    # Build context from relevant documents (top 3 for token efficiency)
+    # Build context from relevant passages (top 3 for token efficiency)
     context_parts = []
     for i, doc in enumerate(relevant_docs[:3]):
         context_parts.append(
@@ -474,24 +1330,104 @@ def _node_generate(state: RAGState) -> RAGState:
 
     user_prompt = f"質問: {query}\n\n参考文書:\n{context}\n\n回答:"
 
-    answer = _call_ollama(prompt=user_prompt, system=system_prompt)
+    # Latency budget: cap tokens when short, answer extractively when nearly exhausted
+    deadline = state.get("deadline")
+    remaining = _remaining_ms(state)
+    num_predict: int | None = None
+    if remaining is not None and remaining < DEADLINE_MIN_GENERATION_MS:
+        state["answer"] = _extractive_answer(query, relevant_docs)
+        state["workflow_steps"].append("deadline:extractive")
+        return state
+    if remaining is not None and remaining < DEADLINE_FULL_GENERATION_MS:
+        num_predict = max(MIN_GENERATION_TOKENS, int(remaining / 1000 * GENERATION_TOKENS_PER_S))
+        state["workflow_steps"].append(f"deadline:cap_tokens:{num_predict}")
+
+    try:
+        answer = _call_ollama(
+            prompt=user_prompt,
+            system=system_prompt,
+            priority=state.get("priority", "interactive"),
+            deadline=deadline,
+            num_predict=num_predict,
+        )
+    except DeadlineExceededError:
+        if deadline is None:
+            raise
+        # The LLM queue cannot admit us within the budget
+        state["answer"] = _extractive_answer(query, relevant_docs)
+        state["workflow_steps"].append("deadline:extractive")
+        return state
 
     # Truncate very long answers
     if len(answer) > 1000:
         answer = answer[:1000] + "..."
 
     state["answer"] = answer
+    state["generation_ok"] = True
     state["workflow_steps"].append("generate:ok")
     return state
 
 
+def _node_hitl_pending(state: RAGState) -> RAGState:
+    """Mark the run as waiting for human review.
+
+    Args:
+        state: Current workflow state
+
+    Returns:
+        Updated state with the pending-review answer
+    """
+    state["answer"] = HITL_PENDING_ANSWER
+    state["workflow_steps"].append("hitl_pending")
+    return state
+
+
+def _node_await_review(state: RAGState) -> RAGState:
+    """Pause the workflow until a reviewer decides (LangGraph interrupt).
+
+    The first execution raises the interrupt; the paused state is persisted
+    by the checkpointer under thread_id = request_id. resume_review() re-enters
+    this node with the ReviewDecision as the interrupt's return value.
+
+    Args:
+        state: Current workflow state
+
+    Returns:
+        Updated state with review_decision (and the rejection answer if rejected)
+    """
+    hitl_review = state["hitl_review"]
+    raw = interrupt(
+        {
+            "request_id": state["request_id"],
+            "hitl_review": hitl_review.model_dump() if hitl_review else None,
+        }
+    )
+    decision = raw if isinstance(raw, ReviewDecision) else ReviewDecision.model_validate(raw)
+
+    state["review_decision"] = decision
+    state["requires_review"] = False
+    state["deadline"] = None  # The original latency budget does not apply to the resumed run
+    if decision.approved:
+        state["workflow_steps"].append("hitl:approved")
+    else:
+        state["answer"] = HITL_REJECTED_ANSWER
+        state["workflow_steps"].append("hitl:rejected")
+    return state
+
+
+def _graph_retrieve(state: RAGState, config: RunnableConfig) -> RAGState:
+    """Graph adapter for _node_retrieve; the retriever is passed per run via config."""
+    return _node_retrieve(state, config["configurable"]["retriever"])
+
+
 # --- Decision Functions ---
 
 def _should_rewrite(state: RAGState) -> str:
     """Decide whether to rewrite query or proceed to HITL check.
 
     From DeepRAG MDP: if document count < threshold and retry < max,
-    rewrite query for another retrieval attempt.
+    rewrite query for another retrieval attempt. Rewrites stop early when
+    _node_grade found the latency budget too short for another round.
 
     Args:
         state: Current workflow state
@@ -502,6 +1438,8 @@ def _should_rewrite(state: RAGState) -> str:
     relevant_count = len(state["relevant_docs"])
     retry_count = state.get("retry_count", 0)
 
+    if state.get("rewrite_budget_exhausted"):
+        return "check_hitl"
     if relevant_count < HITL_CONFIDENCE_THRESHOLD and retry_count < MAX_REWRITE_RETRIES:
         return "rewrite"
     return "check_hitl"
@@ -516,18 +1454,388 @@ def _should_generate(state: RAGState) -> str:
         state: Current workflow state
 
     Returns:
-        "generate" or "hitl_pending"
+        "generate", "hitl_pending", or "cached_approval" when a reviewer-approved
+        answer was served from the approval cache
     """
+    if state.get("cached_approval"):
+        return "cached_approval"
     if state.get("requires_review"):
         return "hitl_pending"
     return "generate"
 
 
+def _should_resume(state: RAGState) -> str:
+    """Decide whether a reviewed run proceeds to generation.
+
+    Args:
+        state: Workflow state after the review decision
+
+    Returns:
+        "generate" if approved, otherwise "end"
+    """
+    decision = state.get("review_decision")
+    if decision is not None and decision.approved:
+        return "generate"
+    return "end"
+
+
+# --- Compiled Workflow ---
+
+def _build_workflow() -> StateGraph:
+    """Build the RAG HITL StateGraph.
+
+    retrieve → grade → (rewrite → retrieve)* → check_hitl → generate, or
+    check_hitl → hitl_pending → await_review (interrupt) → generate | END.
+
+    Returns:
+        Uncompiled StateGraph over RAGState
+    """
+    graph = StateGraph(RAGState)
+    graph.add_node("retrieve", _timed_node("retrieve", _graph_retrieve))
+    graph.add_node("grade", _timed_node("grade", _node_grade))
+    graph.add_node("rewrite", _timed_node("rewrite", _node_rewrite))
+    graph.add_node("check_hitl", _timed_node("check_hitl", _node_check_hitl))
+    graph.add_node("generate", _timed_node("generate", _node_generate))
+    graph.add_node("hitl_pending", _node_hitl_pending)
+    graph.add_node("await_review", _node_await_review)
+
+    graph.add_edge(START, "retrieve")
+    graph.add_edge("retrieve", "grade")
+    graph.add_conditional_edges(
+        "grade", _should_rewrite, {"rewrite": "rewrite", "check_hitl": "check_hitl"}
+    )
+    graph.add_edge("rewrite", "retrieve")
+    graph.add_conditional_edges(
+        "check_hitl",
+        _should_generate,
+        {"generate": "generate", "hitl_pending": "hitl_pending", "cached_approval": END},
+    )
+    graph.add_edge("hitl_pending", "await_review")
+    graph.add_conditional_edges("await_review", _should_resume, {"generate": "generate", "end": END})
+    graph.add_edge("generate", END)
+    return graph
+
+
+# Checkpoint serializer: allow the repo's state models to round-trip through msgpack
+_checkpoint_serde = JsonPlusSerializer(
+    allowed_msgpack_modules=[
+        (model.__module__, model.__name__)
+        for model in (
+            GradedPassage,
+            HITLReviewRequest,
+            Passage,
+            ReviewDecision,
+            SensitiveMatch,
+            SourceDocument,
+        )
+    ]
+)
+_checkpointer: SQLiteCheckpointSaver = SQLiteCheckpointSaver.from_env(serde=_checkpoint_serde)
+_workflow = _build_workflow().compile(checkpointer=_checkpointer)
+
+
+# Durable queue of paused runs for reviewers
+_review_queue: ReviewQueue = ReviewQueue.from_env()
+
+# Reviewer-approved answers, served instead of another review for matching requests
+_approval_cache: ApprovedAnswerCache = ApprovedAnswerCache(
+    ttl_s=float(os.environ.get("APPROVAL_CACHE_TTL_S", DEFAULT_APPROVAL_TTL_S)),
+    max_entries=int(os.environ.get("APPROVAL_CACHE_SIZE", DEFAULT_APPROVAL_CACHE_SIZE)),
+)
+
+
+def _approval_key(state: RAGState) -> ApprovalKey:
+    """Approval-cache key of a run: query, roles, final sources and corpus version."""
+    return approval_key(
+        state["query"],
+        state.get("user_roles", []),
+        _final_sources(state),
+        state.get("corpus_version", ""),
+    )
+
+
+def _publish_approval(state: RAGState, decision: ReviewDecision) -> None:
+    """Publish the answer of an approved, generated run to the approval cache."""
+    sources = _final_sources(state)
+    _approval_cache.put(
+        _approval_key(state),
+        ApprovedAnswer(
+            answer=state["answer"],
+            review_id=state["request_id"],
+            reviewer=decision.reviewer,
+            approved_at=time.time(),
+            speech_ids=frozenset(doc.speech_id for doc in sources),
+        ),
+    )
+
+
+def invalidate_approvals(speech_ids: list[str]) -> int:
+    """Drop cached approvals generated from any of the given speeches.
+
+    Call when source documents are edited or removed.
+
+    Args:
+        speech_ids: Speech IDs whose content changed
+
+    Returns:
+        Number of cached approvals dropped
+    """
+    dropped = _approval_cache.invalidate_sources(speech_ids)
+    logger.info("approval_cache_invalidated", extra={"speeches": len(speech_ids), "dropped": dropped})
+    return dropped
+
+
+def approval_cache_stats() -> dict[str, Any]:
+    """Export approval-cache hit, miss, expiry and invalidation counters.
+
+    Returns:
+        Snapshot dict from the approval cache
+    """
+    return _approval_cache.stats()
+
+
+# --- Shared Index ---
+
+# Retriever reused by every request once set (Lambda init / warm start);
+# None keeps the per-request corpus load and index build
+_shared_retriever: PassageRetriever | None = None
+
+
+def set_shared_retriever(retriever: PassageRetriever | None) -> None:
+    """Serve all subsequent requests from one prebuilt retriever.
+
+    Args:
+        retriever: Retriever to share, or None to build one per request again
+    """
+    global _shared_retriever
+    _shared_retriever = retriever
+
+
+def warm_up(query: str) -> dict[str, Any]:
+    """Run the request hot path once on the shared retriever, without the LLM.
+
+    Retrieval (BM25 scoring, RRF fusion, keyword ids), the vectorized keyword
+    grade, sensitive-term scanning and response serialization all do one-off
+    work on first use (library lazy imports, NumPy dispatch, regex and
+    Pydantic serializer setup). Calling this during init moves that cost off
+    the first request. Metrics, caches and checkpoints are not touched.
+
+    Args:
+        query: Canned query to run
+
+    Returns:
+        Dict with the number of documents retrieved and judged relevant
+
+    Raises:
+        RuntimeError: If no shared retriever is set
+    """
+    if _shared_retriever is None:
+        raise RuntimeError("warm_up requires a shared retriever (set_shared_retriever)")
+    docs, keyword_ids = _shared_retriever.retrieve_with_keywords(query, TOP_K, ["public"])
+    overlaps = _keyword_overlaps(_shared_retriever.query_keyword_ids(query), keyword_ids)
+    _sensitive_detector.scan(query, "query")
+    for doc in docs:
+        _sensitive_detector.scan(doc.content, "document")
+    ExperimentResponse(
+        request_id="warmup",
+        answer="",
+        sources=[_source_document(d) for d in docs],
+        requires_review=False,
+        processing_time_ms=0.0,
+        workflow_steps=[],
+    ).model_dump_json()
+    return {"docs": len(docs), "relevant": sum(1 for n in overlaps if n >= 2)}
+
+
+class ReviewNotFoundError(LookupError):
+    """No workflow is paused for review under the given request ID."""
+
+
 # --- Main Experiment Runner ---
 
-def run_experiment(request: ExperimentRequest, request_id: str | None = None) -> ExperimentResponse:
+# Identical requests in flight at the same time share one workflow execution
+_inflight: SingleFlight[ExperimentResponse] = SingleFlight()
+
+# Opt-in per-request cProfile (request flag or X-RAG-Profile header when PROFILE_ALLOW_REQUESTS, or sampling)
+_profiler: RequestProfiler = RequestProfiler.from_env()
+
+
+def _coalesce_key(request: ExperimentRequest) -> tuple[str, tuple[str, ...], int, int | None, str]:
+    """Build the single-flight key for a request.
+
+    Queries are NFKC-normalized with whitespace collapsed, and roles are
+    order-insensitive, so trivially different submissions of the same
+    question coalesce. The priority class is part of the key: a follower
+    receives its leader's scheduler rejection, so an interactive request
+    must never wait on a batch leader that may be shed or evicted.
+
+    Args:
+        request: Incoming ExperimentRequest
+
+    Returns:
+        (normalized_query, sorted_roles, max_results, deadline_ms, priority) tuple
+    """
+    query = " ".join(unicodedata.normalize("NFKC", request.query).split())
+    roles = tuple(sorted(set(request.user_roles)))
+    return (query, roles, request.max_results, request.deadline_ms, request.priority)
+
+
+def _attach_shared(
+    response: ExperimentResponse, req_id: str, shared: bool, include_timings: bool = False
+) -> ExperimentResponse:
+    """Re-issue a coalesced result under the follower's own request ID.
+
+    Followers receive the leader's node timings only if they asked for them
+    (and the leader collected them). A paused result keeps the leader's
+    hitl_review.review_id: only the leader's run is checkpointed and queued.
+
+    Args:
+        response: Response produced by the leader request
+        req_id: Request ID of the caller
+        shared: Whether the caller joined another request's computation
+        include_timings: Whether the caller asked for the node timing breakdown
+
+    Returns:
+        The leader's response, or a copy carrying req_id for followers
+    """
+    if not shared:
+        return response
+    logger.info(
+        "experiment_coalesced",
+        extra={"request_id": req_id, "leader_request_id": response.request_id},
+    )
+    return response.model_copy(
+        update={
+            "request_id": req_id,
+            "workflow_steps": [*response.workflow_steps, "coalesced"],
+            "node_timings_ms": response.node_timings_ms if include_timings else None,
+        }
+    )
+
+
+def run_experiment(
+    request: ExperimentRequest, request_id: str | None = None, profile: bool = False
+) -> ExperimentResponse:
     """Run the LangGraph RAG HITL experiment.
 
+    Concurrent requests with the same normalized query, roles, max_results,
+    deadline and priority are coalesced: they wait for the single in-flight execution and receive
+    its result under their own request_id. Profiled requests run on their
+    own (never coalesced) so the profile describes exactly that request.
+
+    If the shared run pauses for HITL review, there is one paused run and
+    one queue entry for all of them. Every caller's hitl_review.review_id
+    names the leader's run; a follower's own request_id is not resumable.
+    The approved answer is returned to whoever calls resume_review with
+    that review_id, so followers must resume or poll through it.
+
+    Args:
+        request: ExperimentRequest with query and parameters
+        request_id: Optional request ID (generated if not provided)
+        profile: Profile this request (e.g. from the X-RAG-Profile header)
+
+    Returns:
+        ExperimentResponse with answer, sources, and HITL status
+    """
+    req_id = request_id or str(uuid.uuid4())
+    if _profiler.should_profile(profile or request.profile):
+        return _profiler.run(req_id, lambda: _run_workflow(request, req_id))
+    response, shared = _inflight.do(
+        _coalesce_key(request), lambda: _run_workflow(request, req_id)
+    )
+    return _attach_shared(response, req_id, shared, request.include_timings)
+
+
+async def run_experiment_async(
+    request: ExperimentRequest, request_id: str | None = None, profile: bool = False
+) -> ExperimentResponse:
+    """Async variant of run_experiment for the FastAPI server.
+
+    The workflow runs in the default executor so the event loop is never
+    blocked; coalesced followers await the leader without holding a thread.
+
+    Args:
+        request: ExperimentRequest with query and parameters
+        request_id: Optional request ID (generated if not provided)
+        profile: Profile this request (e.g. from the X-RAG-Profile header)
+
+    Returns:
+        ExperimentResponse with answer, sources, and HITL status
+    """
+    req_id = request_id or str(uuid.uuid4())
+    if _profiler.should_profile(profile or request.profile):
+        # The profiler is enabled on the executor thread that runs the workflow
+        return await asyncio.get_running_loop().run_in_executor(
+            None, _profiler.run, req_id, lambda: _run_workflow(request, req_id)
+        )
+    response, shared = await _inflight.do_async(
+        _coalesce_key(request), lambda: _run_workflow(request, req_id)
+    )
+    return _attach_shared(response, req_id, shared, request.include_timings)
+
+
+def _source_document(doc: Passage | SourceDocument) -> SourceDocument:
+    """API model of a workflow document (validated here, once per response)."""
+    return doc.to_source() if isinstance(doc, Passage) else doc
+
+
+def _final_sources(state: RAGState) -> list[Passage]:
+    """Sources reported for (and used to generate) the answer."""
+    return state["relevant_docs"] or state.get("retrieved_docs", [])[:3]
+
+
+def _rounded_timings(state: RAGState) -> dict[str, float]:
+    """Per-node milliseconds of a run, rounded for output."""
+    return {name: round(ms, 3) for name, ms in state.get("node_timings", {}).items()}
+
+
+def _build_experiment_response(
+    state: RAGState, req_id: str, start_time: float, event: str, include_timings: bool = False
+) -> ExperimentResponse:
+    """Log completion and build the API response from the final workflow state.
+
+    Args:
+        state: Workflow state at the end of (this leg of) the run
+        req_id: Request ID of the run
+        start_time: time.perf_counter() at the start of this leg
+        event: Log event name
+        include_timings: Attach the per-node duration breakdown
+
+    Returns:
+        ExperimentResponse with answer, sources, and HITL status
+    """
+    final_sources = _final_sources(state)
+
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    timings = _rounded_timings(state)
+
+    logger.info(
+        event,
+        extra={
+            "request_id": req_id,
+            "duration_ms": round(elapsed_ms, 2),
+            "relevant_docs": len(state["relevant_docs"]),
+            "requires_review": state["requires_review"],
+            "workflow_steps": state["workflow_steps"],
+            "node_timings_ms": timings,
+        },
+    )
+
+    return ExperimentResponse(
+        answer=state["answer"],
+        sources=[_source_document(d) for d in final_sources],
+        requires_review=state["requires_review"],
+        hitl_review=state["hitl_review"],
+        processing_time_ms=round(elapsed_ms, 2),
+        request_id=req_id,
+        workflow_steps=state["workflow_steps"],
+        node_timings_ms=timings if include_timings else None,
+    )
+
+
+def _run_workflow(request: ExperimentRequest, req_id: str) -> ExperimentResponse:
+    """Execute the workflow for one (possibly coalesced) request.
+
     Implements the full workflow from the Zenn article:
     Route → Retrieve → Grade → [Rewrite loop] → HITL check → Generate
 
@@ -535,12 +1843,11 @@ def run_experiment(request: ExperimentRequest, request_id: str | None = None) ->
 
     Args:
         request: ExperimentRequest with query and parameters
-        request_id: Optional request ID (generated if not provided)
+        req_id: Request ID of the leader request
 
     Returns:
         ExperimentResponse with answer, sources, and HITL status
     """
-    req_id = request_id or str(uuid.uuid4())
     start_time = time.perf_counter()
 
     logger.info(
@@ -553,9 +1860,8 @@ def run_experiment(request: ExperimentRequest, request_id: str | None = None) ->
     )
 
     try:
-        # Load corpus
-        speeches = _load_corpus()
-        retriever = HybridRetriever(speeches)
+        # Shared prebuilt index when set at init, else load the corpus for this request
+        retriever = _shared_retriever if _shared_retriever is not None else HybridRetriever(_load_corpus())
 
         # Initialize LangGraph state
         state: RAGState = {
@@ -564,66 +1870,64 @@ def run_experiment(request: ExperimentRequest, request_id: str | None = None) ->
             "max_results": request.max_results,
             "user_roles": request.user_roles,
             "retrieved_docs": [],
+            "retrieved_keyword_ids": [],
+            "query_keyword_ids": np.empty(0, dtype=np.int32),
             "graded_docs": [],
             "relevant_docs": [],
             "answer": "",
             "requires_review": False,
             "hitl_review": None,
+            "review_decision": None,
+            "cached_approval": False,
+            "generation_ok": False,
+            "corpus_version": "",
             "workflow_steps": ["start"],
             "retry_count": 0,
             "request_id": req_id,
+            "priority": request.priority,
+            "deadline": (
+                None if request.deadline_ms is None else time.time() + request.deadline_ms / 1000
+            ),
+            "rewrite_budget_exhausted": False,
+            "node_timings": {},
         }
 
-        # Execute workflow manually (LangGraph StateGraph pattern)
-        # Step 1: Retrieve
-        state = _node_retrieve(state, retriever)
-
-        # Step 2: Grade
-        state = _node_grade(state)
-
-        # Step 3: Rewrite loop (max MAX_REWRITE_RETRIES)
-        while _should_rewrite(state) == "rewrite":
-            state = _node_rewrite(state)
-            state = _node_retrieve(state, retriever)
-            state = _node_grade(state)
-
-        # Step 4: Check HITL
-        state = _node_check_hitl(state)
-
-        # Step 5: Generate (or mark as HITL pending)
-        if _should_generate(state) == "generate":
-            state = _node_generate(state)
+        # Execute the compiled graph; a HITL run stops at the await_review
+        # interrupt and its state is checkpointed under thread_id = req_id.
+        # durability="exit" writes the checkpoint once, when the run stops.
+        final: RAGState = _workflow.invoke(
+            state,
+            {"configurable": {"thread_id": req_id, "retriever": retriever}},
+            durability="exit",
+        )
+        if final["requires_review"] and final["hitl_review"] is not None:
+            _review_queue.enqueue(final["hitl_review"])
+            outcome = "review"
         else:
-            state["answer"] = "この質問は人間によるレビューが必要です。しばらくお待ちください。"
-            state["workflow_steps"].append("hitl_pending")
-
-        # Collect final relevant sources
-        final_sources = state["relevant_docs"] or state["retrieved_docs"][:3]
+            _checkpointer.delete_thread(req_id)  # Only paused runs need to stay resumable
+            outcome = "cached_approval" if final.get("cached_approval") else "answered"
+        _request_duration.observe(time.perf_counter() - start_time, outcome)
+        return _build_experiment_response(
+            final, req_id, start_time, "experiment_complete", request.include_timings
+        )
 
+    except SchedulerRejectedError as exc:
+        _request_duration.observe(time.perf_counter() - start_time, "rejected")
         elapsed_ms = (time.perf_counter() - start_time) * 1000
-
-        logger.info(
-            "experiment_complete",
+        logger.warning(
+            "experiment_rejected",
             extra={
                 "request_id": req_id,
                 "duration_ms": round(elapsed_ms, 2),
-                "relevant_docs": len(state["relevant_docs"]),
-                "requires_review": state["requires_review"],
-                "workflow_steps": state["workflow_steps"],
+                "status_code": exc.status_code,
+                "retry_after": exc.retry_after_header,
+                "error": str(exc),
             },
         )
-
-        return ExperimentResponse(
-            answer=state["answer"],
-            sources=final_sources,
-            requires_review=state["requires_review"],
-            hitl_review=state["hitl_review"],
-            processing_time_ms=round(elapsed_ms, 2),
-            request_id=req_id,
-            workflow_steps=state["workflow_steps"],
-        )
+        raise
 
     except Exception as exc:
+        _request_duration.observe(time.perf_counter() - start_time, "error")
         elapsed_ms = (time.perf_counter() - start_time) * 1000
         logger.error(
             "experiment_error",
@@ -635,3 +1939,152 @@ def run_experiment(request: ExperimentRequest, request_id: str | None = None) ->
             exc_info=True,
         )
         raise
+
+
+def resume_review(request_id: str, decision: ReviewDecision) -> ExperimentResponse:
+    """Resume a workflow paused for HITL review.
+
+    Loads the checkpointed state of request_id and continues from the
+    await_review interrupt: an approval runs _node_generate directly on the
+    already retrieved and graded documents, a rejection ends the run. A run
+    that failed after the decision (e.g. LLM queue rejection) is retried from
+    its last checkpoint.
+
+    Args:
+        request_id: Request ID (review_id) of the paused run
+        decision: Reviewer decision
+
+    Returns:
+        ExperimentResponse for the resumed run
+
+    Raises:
+        ReviewNotFoundError: No paused run exists for request_id
+    """
+    start_time = time.perf_counter()
+    config: RunnableConfig = {"configurable": {"thread_id": request_id}}
+    snapshot = _workflow.get_state(config)
+    if not snapshot.next:
+        raise ReviewNotFoundError(f"No workflow awaiting review for request {request_id}")
+
+    logger.info(
+        "review_resume",
+        extra={
+            "request_id": request_id,
+            "approved": decision.approved,
+            "reviewer": decision.reviewer,
+        },
+    )
+
+    resume_input = Command(resume=decision) if snapshot.interrupts else None
+    try:
+        final: RAGState = _workflow.invoke(resume_input, config, durability="exit")
+        _checkpointer.delete_thread(request_id)
+        _review_queue.mark_decided(request_id, decision)
+        if decision.approved and final.get("generation_ok"):
+            _publish_approval(final, decision)
+    except SchedulerRejectedError as exc:
+        logger.warning(
+            "review_rejected",
+            extra={
+                "request_id": request_id,
+                "status_code": exc.status_code,
+                "retry_after": exc.retry_after_header,
+                "error": str(exc),
+            },
+        )
+        raise
+    return _build_experiment_response(final, request_id, start_time, "review_complete")
+
+
+def list_reviews(
+    reason: str | None = None,
+    keyword: str | None = None,
+    min_age_s: float | None = None,
+    max_age_s: float | None = None,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> ReviewQueuePage:
+    """List pending HITL reviews, oldest first.
+
+    Args:
+        reason: Only items with this HITL reason
+        keyword: Only items that matched this sensitive keyword
+        min_age_s: Only items at least this many seconds old
+        max_age_s: Only items at most this many seconds old
+        limit: Page size
+        cursor: next_cursor of the previous page
+
+    Returns:
+        ReviewQueuePage with items, next_cursor and pending counts per reason
+
+    Raises:
+        ValueError: Malformed cursor
+    """
+    now = time.time()
+    items, next_cursor = _review_queue.list_pending(
+        reason=reason,
+        keyword=keyword,
+        min_age_s=min_age_s,
+        max_age_s=max_age_s,
+        limit=limit,
+        cursor=cursor,
+        now=now,
+    )
+    return ReviewQueuePage(
+        items=[
+            ReviewQueueItem(
+                review_id=item.review_id,
+                status=item.status,  # type: ignore[arg-type]
+                created_at=item.created_at,
+                age_s=round(max(0.0, now - item.created_at), 3),
+                hitl_review=item.hitl_review,
+            )
+            for item in items
+        ],
+        next_cursor=next_cursor,
+        pending_counts=_review_queue.pending_counts(),
+    )
+
+
+def bulk_review(request: BulkReviewRequest) -> BulkReviewResponse:
+    """Apply one reviewer decision to many paused runs.
+
+    Runs are resumed concurrently by at most REVIEW_BULK_WORKERS threads;
+    approved generations still pass through the LLM admission scheduler
+    with the priority of their original request.
+
+    Args:
+        request: Review IDs plus the decision to apply
+
+    Returns:
+        BulkReviewResponse with one result per distinct review_id
+    """
+    decision = ReviewDecision(
+        approved=request.approved, reviewer=request.reviewer, comment=request.comment
+    )
+    status = "approved" if decision.approved else "rejected"
+
+    def resume_one(review_id: str) -> BulkReviewResult:
+        try:
+            resume_review(review_id, decision)
+            return BulkReviewResult(review_id=review_id, status=status)
+        except ReviewNotFoundError:
+            return BulkReviewResult(review_id=review_id, status="not_found")
+        except Exception as e:  # noqa: BLE001 - one failed resume must not abort the batch
+            return BulkReviewResult(review_id=review_id, status="error", error=str(e))
+
+    review_ids = list(dict.fromkeys(request.review_ids))
+    with ThreadPoolExecutor(max_workers=max(1, REVIEW_BULK_WORKERS)) as pool:
+        results = list(pool.map(resume_one, review_ids))
+
+    succeeded = sum(1 for r in results if r.status == status)
+    logger.info(
+        "bulk_review_complete",
+        extra={
+            "reviews": len(results),
+            "succeeded": succeeded,
+            "approved": decision.approved,
+            "reviewer": decision.reviewer,
+        },
+    )
+    return BulkReviewResponse(results=results, succeeded=succeeded, failed=len(results) - succeeded)
@@ -0,0 +1,277 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : LLM による一括関連性判定（単一プロンプト・構造化出力）
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Batched single-call LLM relevance grader.
+
+Grades every retrieved document with one structured-output prompt instead of
+one LLM call per document. Verdicts are cached per
+(query, speech_id, passage_start), so grading the same query's passages
+again (repeated or concurrent requests) costs nothing. A rewrite retry
+grades under the rewritten query and so calls the LLM again. Any document
+without a usable verdict (parse failure, timeout, scheduler rejection)
+falls back to the caller's keyword-overlap decision.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+GRADER_DOC_CHARS: int = 400  # Passage characters shown to the grader per document
+GRADER_CACHE_SIZE: int = 4096
+
+GRADER_SYSTEM_PROMPT: str = (
+    "あなたは国会議事録検索の関連性判定器です。"
+    "各文書が質問への回答に役立つかを判定し、指定された JSON 形式のみで出力してください。"
+)
+
+_FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$", re.MULTILINE)
+_JSON_BLOCK_PATTERN = re.compile(r"\{.*\}|\[.*\]", re.DOTALL)
+_LINE_VERDICT_PATTERN = re.compile(
+    r"(?:文書|doc(?:ument)?)?\s*\[?(\d+)\]?\s*[:：\-=]\s*"
+    r"(true|false|yes|no|relevant|irrelevant|関連あり|関連なし|はい|いいえ)",
+    re.IGNORECASE,
+)
+_TRUE_WORDS = {"true", "yes", "relevant", "関連あり", "はい", "1"}
+_FALSE_WORDS = {"false", "no", "irrelevant", "関連なし", "いいえ", "0"}
+
+
+class GradableDocument(Protocol):
+    """Fields the grader reads from a retrieved document."""
+
+    speech_id: str
+    content: str
+    passage_start: int
+
+
+@dataclass(frozen=True, slots=True)
+class Verdict:
+    """A relevance verdict for one document."""
+
+    relevant: bool
+    reason: str
+
+
+@dataclass
+class GradeOutcome:
+    """Result of grading one batch of documents."""
+
+    verdicts: list[Verdict | None]  # None: use the keyword-overlap decision
+    latency_ms: float = 0.0
+    cached: int = 0
+    fallback: str | None = None  # Why (some) documents fell back, if they did
+    agreement: float | None = None  # Share of LLM verdicts equal to the heuristic
+
+
+def _as_bool(value: Any) -> bool | None:
+    """Interpret an LLM-produced relevance value."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int | float):
+        return bool(value)
+    if isinstance(value, str):
+        word = value.strip().lower()
+        if word in _TRUE_WORDS:
+            return True
+        if word in _FALSE_WORDS:
+            return False
+    return None
+
+
+def parse_verdicts(text: str, n_docs: int) -> dict[int, Verdict]:
+    """Parse per-document verdicts from grader output.
+
+    Accepts a JSON object with a "verdicts" list, a bare JSON list, JSON
+    wrapped in code fences or surrounded by prose, and as a last resort
+    "1: yes" style lines.
+
+    Args:
+        text: Raw LLM output
+        n_docs: Number of documents in the prompt (ids are 1-based)
+
+    Returns:
+        Mapping from 0-based document position to Verdict; may be partial or empty
+    """
+    verdicts: dict[int, Verdict] = {}
+    cleaned = _FENCE_PATTERN.sub("", text.strip())
+
+    data: Any = None
+    for candidate in (cleaned, *(m.group() for m in _JSON_BLOCK_PATTERN.finditer(cleaned))):
+        try:
+            data = json.loads(candidate)
+            break
+        except (json.JSONDecodeError, ValueError):
+            continue
+
+    items: list[Any] = []
+    if isinstance(data, dict):
+        items = data.get("verdicts") or data.get("results") or []
+    elif isinstance(data, list):
+        items = data
+
+    for pos, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        try:
+            doc_id = int(item.get("id", pos + 1))
+        except (TypeError, ValueError):
+            continue
+        relevant = _as_bool(item.get("relevant", item.get("is_relevant")))
+        if relevant is None or not 1 <= doc_id <= n_docs:
+            continue
+        verdicts[doc_id - 1] = Verdict(relevant, str(item.get("reason", ""))[:200])
+
+    if not verdicts:
+        for match in _LINE_VERDICT_PATTERN.finditer(cleaned):
+            doc_id = int(match.group(1))
+            relevant = _as_bool(match.group(2))
+            if relevant is not None and 1 <= doc_id <= n_docs:
+                verdicts.setdefault(doc_id - 1, Verdict(relevant, ""))
+
+    return verdicts
+
+
+def build_grader_prompt(query: str, docs: Sequence[GradableDocument]) -> str:
+    """Build the single batched grading prompt.
+
+    Args:
+        query: Query the documents were retrieved for
+        docs: Documents to grade
+
+    Returns:
+        User prompt listing every document with a 1-based id
+    """
+    parts = [f"質問: {query}", ""]
+    for i, doc in enumerate(docs, start=1):
+        parts.append(f"[文書{i}]\n{doc.content[:GRADER_DOC_CHARS]}")
+    parts.append(
+        "\n各文書について次の JSON で回答してください:\n"
+        '{"verdicts": [{"id": 1, "relevant": true, "reason": "短い理由"}, ...]}'
+    )
+    return "\n\n".join(parts)
+
+
+class BatchLLMGrader:
+    """Grades all retrieved documents with one LLM call and caches verdicts.
+
+    Thread-safe; one instance is shared by all requests.
+    """
+
+    def __init__(self, cache_size: int = GRADER_CACHE_SIZE) -> None:
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple[str, str, int], Verdict] = OrderedDict()
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._fallbacks = 0
+        self._latency_total_ms = 0.0
+        self._agreement_total = 0.0
+        self._agreement_samples = 0
+
+    def _cache_get(self, key: tuple[str, str, int]) -> Verdict | None:
+        with self._lock:
+            verdict = self._cache.get(key)
+            if verdict is not None:
+                self._cache.move_to_end(key)
+            return verdict
+
+    def _cache_put(self, key: tuple[str, str, int], verdict: Verdict) -> None:
+        with self._lock:
+            self._cache[key] = verdict
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def grade(
+        self,
+        query: str,
+        docs: Sequence[GradableDocument],
+        heuristic: Sequence[bool],
+        generate: Callable[[str, str], str],
+    ) -> GradeOutcome:
+        """Grade docs, calling the LLM once for all uncached documents.
+
+        Args:
+            query: Query the documents were retrieved for
+            docs: Retrieved documents
+            heuristic: Keyword-overlap decisions, used for agreement and fallback
+            generate: (prompt, system) -> text; may raise on timeout/HTTP errors
+
+        Returns:
+            GradeOutcome with per-document verdicts (None means fall back)
+        """
+        keys = [(query, d.speech_id, d.passage_start) for d in docs]
+        verdicts: list[Verdict | None] = [self._cache_get(k) for k in keys]
+        pending = [i for i, v in enumerate(verdicts) if v is None]
+        outcome = GradeOutcome(verdicts=verdicts, cached=len(docs) - len(pending))
+
+        if pending:
+            prompt = build_grader_prompt(query, [docs[i] for i in pending])
+            started = time.perf_counter()
+            try:
+                parsed = parse_verdicts(generate(prompt, GRADER_SYSTEM_PROMPT), len(pending))
+                if not parsed:
+                    outcome.fallback = "parse_error"
+                elif len(parsed) < len(pending):
+                    outcome.fallback = "partial_parse"
+            except Exception as e:  # noqa: BLE001 - any LLM failure degrades to the heuristic
+                parsed = {}
+                outcome.fallback = type(e).__name__
+            outcome.latency_ms = (time.perf_counter() - started) * 1000
+
+            for pos, verdict in parsed.items():
+                doc_idx = pending[pos]
+                verdicts[doc_idx] = verdict
+                self._cache_put(keys[doc_idx], verdict)
+
+        compared = [(v.relevant, h) for v, h in zip(verdicts, heuristic, strict=True) if v is not None]
+        if compared:
+            outcome.agreement = sum(a == b for a, b in compared) / len(compared)
+
+        with self._lock:
+            if pending:
+                self._calls += 1
+                self._latency_total_ms += outcome.latency_ms
+            if outcome.fallback:
+                self._fallbacks += 1
+            if outcome.agreement is not None:
+                self._agreement_total += outcome.agreement
+                self._agreement_samples += 1
+
+        logger.info(
+            "llm_grade",
+            extra={
+                "docs": len(docs),
+                "cached": outcome.cached,
+                "latency_ms": round(outcome.latency_ms, 2),
+                "fallback": outcome.fallback,
+                "agreement": None if outcome.agreement is None else round(outcome.agreement, 3),
+            },
+        )
+        return outcome
+
+    def stats(self) -> dict[str, Any]:
+        """Cumulative call, fallback, latency and heuristic-agreement counters."""
+        with self._lock:
+            return {
+                "llm_calls_total": self._calls,
+                "fallbacks_total": self._fallbacks,
+                "latency_ms_avg": round(self._latency_total_ms / self._calls, 3) if self._calls else 0.0,
+                "agreement_avg": (
+                    round(self._agreement_total / self._agreement_samples, 4)
+                    if self._agreement_samples
+                    else None
+                ),
+                "cache_entries": len(self._cache),
+            }
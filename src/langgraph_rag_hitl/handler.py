@@ -2,23 +2,46 @@
 # Agent   : backend_dev
 # Task    : Python Lambda + Pydantic + pytest 実装
 # Created : 2026-02-23T18:56:39
-# Updated : 2026-02-23
+# Updated : 2026-10-19
 # [/DEBUG] ===========================================================
 
-"""AWS Lambda handler for LangGraph RAG HITL experiment."""
+"""AWS Lambda handler for LangGraph RAG HITL experiment.
 
+Inside Lambda (or with LAMBDA_WARM_START=1) the index is opened once during
+the init phase, from INDEX_STORAGE_URL or INDEX_SNAPSHOT_PATH when set, and
+shared by all requests; see init_lambda.
+"""
+
+import gc
 import json
 import os
+import time
 from typing import Any
 
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 
-from .core import run_experiment
-from .logger import get_logger
-from .models import ExperimentRequest
+from . import _IMPORT_STARTED
+from .core import (
+    ReviewNotFoundError,
+    bulk_review,
+    list_reviews,
+    llm_scheduler_stats,
+    resume_review,
+    run_experiment,
+    set_shared_retriever,
+    warm_up,
+)
+from .logger import flush_logs, get_logger
+from .models import BulkReviewRequest, ExperimentRequest, ReviewDecision
+from .profiling import PROFILE_HEADER, header_requests_profile
+from .scheduler import SchedulerRejectedError
+from .snapshot import load_retriever
 
 logger = get_logger(__name__)
 
+REVIEW_PATH_PREFIX: str = "/api/review/"
+DEFAULT_WARMUP_QUERY: str = "予算委員会における教育予算の審議"
+
 # NOTE: Access-Control-Allow-Origin は API Gateway の cors_configuration（variables.tf の
 # cors_allowed_origins）で本番オリジンに制限すること。ここはフォールバック用ヘッダー。
 # 本番では ALLOWED_ORIGIN 環境変数に具体的なオリジンを設定すること。
@@ -27,7 +50,7 @@ _allowed_origin = os.environ.get("ALLOWED_ORIGIN", "")
 
 CORS_HEADERS: dict[str, str] = {
     "Access-Control-Allow-Origin": _allowed_origin,
-    "Access-Control-Allow-Headers": "Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Request-Id",
+    "Access-Control-Allow-Headers": "Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Request-Id,X-RAG-Profile",
     "Access-Control-Allow-Methods": "GET,POST,OPTIONS",
     "Content-Type": "application/json",
 }
@@ -35,24 +58,30 @@ CORS_HEADERS: dict[str, str] = {
 
 def _build_response(
     status_code: int,
-    body: dict[str, Any],
+    body: dict[str, Any] | BaseModel,
     request_id: str,
+    extra_headers: dict[str, str] | None = None,
 ) -> dict[str, Any]:
     """Build a Lambda proxy response with CORS headers.
 
     Args:
         status_code: HTTP status code
-        body: Response body dict
+        body: Response body dict, or a response model serialized directly
         request_id: Request ID for X-Request-Id header
+        extra_headers: Additional response headers (e.g. Retry-After)
 
     Returns:
         Lambda proxy response dict
     """
-    headers = {**CORS_HEADERS, "X-Request-Id": request_id}
+    headers = {**CORS_HEADERS, "X-Request-Id": request_id, **(extra_headers or {})}
     return {
         "statusCode": status_code,
         "headers": headers,
-        "body": json.dumps(body, ensure_ascii=False, default=str),
+        "body": (
+            body.model_dump_json()
+            if isinstance(body, BaseModel)
+            else json.dumps(body, ensure_ascii=False, default=str)
+        ),
     }
 
 
@@ -60,13 +89,15 @@ def _build_error_response(
     status_code: int,
     message: str,
     request_id: str,
+    extra_headers: dict[str, str] | None = None,
 ) -> dict[str, Any]:
     """Build a standardized error response.
 
     Args:
-        status_code: HTTP status code (400 for validation, 500 for internal)
+        status_code: HTTP status code (400 for validation, 429/503 for overload, 500 for internal)
         message: Human-readable error message
         request_id: Request ID for tracing
+        extra_headers: Additional response headers (e.g. Retry-After)
 
     Returns:
         Lambda proxy error response dict
@@ -75,6 +106,7 @@ def _build_error_response(
         status_code=status_code,
         body={"error": message, "request_id": request_id},
         request_id=request_id,
+        extra_headers=extra_headers,
     )
 
 
@@ -83,7 +115,11 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
 
     Handles:
     - OPTIONS: CORS preflight
+    - GET /api/scheduler: LLM queue depth and wait-time counters
     - POST /api/run: Run the RAG HITL experiment
+    - POST /api/review/{request_id}: Resume a run paused for HITL review
+    - GET /api/reviews: Paginated pending review queue
+    - POST /api/reviews/bulk: Approve/reject many paused runs
     - Other: 404
 
     Args:
@@ -93,6 +129,15 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     Returns:
         Lambda proxy response dict with statusCode/body/headers
     """
+    try:
+        return _route(event, context)
+    finally:
+        # With LOG_ASYNC, write queued records before Lambda freezes the container
+        flush_logs()
+
+
+def _route(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    """Dispatch one invocation by method and path (see handler)."""
     request_id: str = getattr(context, "aws_request_id", "unknown")
     http_method: str = event.get("httpMethod", "POST").upper()
     path: str = event.get("path", "/api/run")
@@ -114,7 +159,15 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     if path == "/health" and http_method == "GET":
         return _build_response(200, {"status": "ok", "version": "1.0.0"}, request_id)
 
-    # Only accept POST /api/run
+    # LLM scheduler counters
+    if path == "/api/scheduler" and http_method == "GET":
+        return _build_response(200, llm_scheduler_stats(), request_id)
+
+    # HITL review queue
+    if path == "/api/reviews" and http_method == "GET":
+        return _handle_list_reviews(event.get("queryStringParameters") or {}, request_id)
+
+    # Only accept POST /api/run and POST /api/review/{request_id}
     if http_method != "POST":
         return _build_error_response(405, "Method not allowed", request_id)
 
@@ -129,6 +182,12 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
         )
         return _build_error_response(400, f"Invalid JSON: {e}", request_id)
 
+    if path == "/api/reviews/bulk":
+        return _handle_bulk_review(body_dict, request_id)
+
+    if path.startswith(REVIEW_PATH_PREFIX):
+        return _handle_review(path.removeprefix(REVIEW_PATH_PREFIX), body_dict, request_id)
+
     try:
         request = ExperimentRequest(**body_dict)
     except ValidationError as e:
@@ -141,8 +200,92 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
 
     # Run experiment
     try:
-        response = run_experiment(request, request_id=request_id)
-        return _build_response(200, response.model_dump(), request_id)
+        headers = {k.lower(): v for k, v in (event.get("headers") or {}).items()}
+        response = run_experiment(
+            request,
+            request_id=request_id,
+            profile=header_requests_profile(headers.get(PROFILE_HEADER)),
+        )
+        return _build_response(200, response, request_id)
+    except SchedulerRejectedError as e:
+        return _build_error_response(
+            e.status_code,
+            str(e),
+            request_id,
+            extra_headers={"Retry-After": e.retry_after_header},
+        )
+    except Exception as e:
+        logger.error(
+            "internal_error",
+            extra={"request_id": request_id, "error": str(e)},
+            exc_info=True,
+        )
+        return _build_error_response(500, "Internal server error", request_id)
+
+
+def _handle_review(review_id: str, body_dict: dict[str, Any], request_id: str) -> dict[str, Any]:
+    """Resume a run paused for HITL review with the reviewer's decision.
+
+    Args:
+        review_id: Request ID of the paused run (from the URL path)
+        body_dict: Parsed ReviewDecision body
+        request_id: Request ID of this API call
+
+    Returns:
+        Lambda proxy response with the resumed ExperimentResponse
+    """
+    try:
+        decision = ReviewDecision(**body_dict)
+    except ValidationError as e:
+        errors = [f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()]
+        return _build_error_response(400, f"Validation error: {'; '.join(errors)}", request_id)
+
+    try:
+        response = resume_review(review_id, decision)
+        return _build_response(200, response, request_id)
+    except ReviewNotFoundError as e:
+        return _build_error_response(404, str(e), request_id)
+    except SchedulerRejectedError as e:
+        return _build_error_response(
+            e.status_code,
+            str(e),
+            request_id,
+            extra_headers={"Retry-After": e.retry_after_header},
+        )
+    except Exception as e:
+        logger.error(
+            "internal_error",
+            extra={"request_id": request_id, "review_id": review_id, "error": str(e)},
+            exc_info=True,
+        )
+        return _build_error_response(500, "Internal server error", request_id)
+
+
+def _handle_bulk_review(body_dict: dict[str, Any], request_id: str) -> dict[str, Any]:
+    """Apply one decision to many paused runs.
+
+    Args:
+        body_dict: Parsed BulkReviewRequest body
+        request_id: Request ID of this API call
+
+    Returns:
+        Lambda proxy response with the BulkReviewResponse
+    """
+    try:
+        bulk_request = BulkReviewRequest(**body_dict)
+    except ValidationError as e:
+        errors = [f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()]
+        return _build_error_response(400, f"Validation error: {'; '.join(errors)}", request_id)
+
+    try:
+        return _build_response(200, bulk_review(bulk_request), request_id)
+    except SchedulerRejectedError as e:
+        return _build_error_response(
+            e.status_code,
+            str(e),
+            request_id,
+            extra_headers={"Retry-After": e.retry_after_header},
+        )
     except Exception as e:
         logger.error(
             "internal_error",
@@ -150,3 +293,94 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
             exc_info=True,
         )
         return _build_error_response(500, "Internal server error", request_id)
+
+
+def _handle_list_reviews(params: dict[str, str], request_id: str) -> dict[str, Any]:
+    """List pending reviews from query-string filters.
+
+    Args:
+        params: reason, keyword, min_age_s, max_age_s, limit, cursor
+        request_id: Request ID of this API call
+
+    Returns:
+        Lambda proxy response with a ReviewQueuePage
+    """
+    try:
+        page = list_reviews(
+            reason=params.get("reason") or None,
+            keyword=params.get("keyword") or None,
+            min_age_s=float(params["min_age_s"]) if params.get("min_age_s") else None,
+            max_age_s=float(params["max_age_s"]) if params.get("max_age_s") else None,
+            limit=int(params.get("limit") or 50),
+            cursor=params.get("cursor") or None,
+        )
+    except ValueError as e:
+        return _build_error_response(400, f"Invalid query parameter: {e}", request_id)
+    return _build_response(200, page, request_id)
+
+
+# --- Lambda init phase ---
+
+
+def _warm_start_enabled() -> bool:
+    """LAMBDA_WARM_START if set, else on inside Lambda (AWS_LAMBDA_FUNCTION_NAME)."""
+    flag = os.environ.get("LAMBDA_WARM_START", "").strip().lower()
+    if flag:
+        return flag in ("1", "true", "yes", "on")
+    return bool(os.environ.get("AWS_LAMBDA_FUNCTION_NAME"))
+
+
+def init_lambda(
+    snapshot_path: str | None = None,
+    warmup_query: str | None = None,
+    index_url: str | None = None,
+) -> dict[str, Any]:
+    """Do the per-container work during the Lambda init phase.
+
+    Opens the index (blocked index in object storage, snapshot, or a corpus
+    build; see snapshot.load_retriever), shares it with all requests and
+    optionally runs a
+    canned query through the hot path. Objects allocated up to here are
+    then frozen out of garbage collection. Timings are logged as one
+    ``lambda_init`` event.
+
+    Args:
+        snapshot_path: Index snapshot file (see snapshot.py)
+        warmup_query: Canned query for warm_up, or None to skip it
+        index_url: Blocked index location (INDEX_STORAGE_URL), read lazily
+
+    Returns:
+        The logged init record
+    """
+    started = time.perf_counter()
+    record: dict[str, Any] = {"import_ms": round((started - _IMPORT_STARTED) * 1000, 2)}
+
+    retriever, record["index_source"] = load_retriever(snapshot_path, index_url)
+    set_shared_retriever(retriever)
+    loaded = time.perf_counter()
+    record["index_load_ms"] = round((loaded - started) * 1000, 2)
+    record["passages"] = len(retriever.passages)
+
+    if warmup_query:
+        record["warmup_docs"] = warm_up(warmup_query)["docs"]
+        record["warmup_ms"] = round((time.perf_counter() - loaded) * 1000, 2)
+
+    # Everything allocated so far lives as long as the container: move it out of
+    # the collector's generations so requests do not rescan the index
+    gc.freeze()
+    record["init_ms"] = round((time.perf_counter() - _IMPORT_STARTED) * 1000, 2)
+    logger.info("lambda_init", extra=record)
+    return record
+
+
+if _warm_start_enabled():
+    try:
+        init_lambda(
+            os.environ.get("INDEX_SNAPSHOT_PATH") or None,
+            os.environ.get("WARMUP_QUERY", DEFAULT_WARMUP_QUERY) or None,
+            os.environ.get("INDEX_STORAGE_URL") or None,
+        )
+    except Exception as e:
+        # A failed warm start must not fail the container: requests build the index instead
+        set_shared_retriever(None)
+        logger.error("lambda_init_failed", extra={"error": str(e)}, exc_info=True)
@@ -0,0 +1,114 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : ダウンロード中のストリーミング取り込みと索引構築
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Index building fed by a streaming download.
+
+The downloader (data/download.py --index-snapshot / --index-url) hands each
+batch of speech records to a StreamingIndexBuilder as it arrives. Passage
+splitting, tokenization and keyword interning run per batch while later
+batches are still in flight, so only the BM25 statistics (which need the
+whole corpus) are left for finish(). The resulting index is the one a
+rebuild from the downloaded files would produce.
+
+Batches arrive out of order when fetched concurrently. They are keyed by
+their start record and indexed in start order (a small reorder buffer holds
+batches that arrive early), which is the order _load_corpus reads the files.
+Pass the normalizer _load_corpus uses (IngestNormalizer.from_env()) so the
+two indexes agree when INGEST_NORMALIZE is on.
+"""
+
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from .core import PASSAGE_OVERLAP, PASSAGE_SIZE, HybridRetriever
+from .logger import get_logger
+from .normalize import IngestNormalizer
+
+logger = get_logger(__name__)
+
+
+class StreamingIndexBuilder:
+    """Incrementally indexes record batches; call finish() for the retriever."""
+
+    def __init__(
+        self,
+        passage_size: int = PASSAGE_SIZE,
+        passage_overlap: int = PASSAGE_OVERLAP,
+        first_start: int = 1,
+        normalizer: IngestNormalizer | None = None,
+    ) -> None:
+        self.retriever = HybridRetriever([], passage_size=passage_size, passage_overlap=passage_overlap)
+        self.normalizer = normalizer
+        self._next_start = first_start
+        self._pending: dict[int, Sequence[dict[str, Any]]] = {}
+
+    @property
+    def pending(self) -> int:
+        """Batches received ahead of the next expected start."""
+        return len(self._pending)
+
+    def add(self, start: int, records: Sequence[dict[str, Any]]) -> None:
+        """Index a batch, or hold it until the batches before it arrive.
+
+        Args:
+            start: 1-based position of the batch's first record
+            records: Speech records of the batch
+        """
+        self._pending[start] = records
+        while self._next_start in self._pending:
+            batch = self._pending.pop(self._next_start)
+            self._index(batch)
+            if not batch:
+                break
+            self._next_start += len(batch)
+
+    def _index(self, batch: Sequence[dict[str, Any]]) -> None:
+        self.retriever.add_speeches(self.normalizer.apply(batch) if self.normalizer else list(batch))
+
+    def finish(self) -> HybridRetriever:
+        """Index any held batches (in start order) and build BM25.
+
+        Returns:
+            The built HybridRetriever
+        """
+        for start in sorted(self._pending):
+            self._index(self._pending.pop(start))
+        self.retriever.finish_build()
+        return self.retriever
+
+    def write(self, snapshot_path: str | Path | None = None, index_url: str | None = None) -> HybridRetriever:
+        """Finish the build and write it as a snapshot and/or a blocked index.
+
+        Args:
+            snapshot_path: Snapshot file (INDEX_SNAPSHOT_PATH)
+            index_url: Blocked index location (INDEX_STORAGE_URL)
+
+        Returns:
+            The built HybridRetriever
+        """
+        retriever = self.finish()
+        if snapshot_path:
+            from .snapshot import save_snapshot
+
+            save_snapshot(retriever, snapshot_path)
+        if index_url:
+            from .blocked_index import write_blocked_index
+            from .storage import storage_from_url
+
+            write_blocked_index(retriever, storage_from_url(index_url))
+        logger.info(
+            "streaming_index_built",
+            extra={
+                "speeches": len(retriever.speeches),
+                "passages": len(retriever.passages),
+                "corpus_version": retriever.corpus_version,
+                "snapshot_path": str(snapshot_path) if snapshot_path else None,
+                "index_url": index_url,
+            },
+        )
+        return retriever
@@ -2,17 +2,89 @@
 # Agent   : backend_dev
 # Task    : Python Lambda + Pydantic + pytest 実装
 # Created : 2026-02-23T18:56:39
-# Updated : 2026-02-23T18:56:39
+# Updated : 2026-10-19
 # [/DEBUG] ===========================================================
 
-"""Structured JSON logger for LangGraph RAG HITL."""
+"""Structured JSON logger for LangGraph RAG HITL.
 
+By default every record is formatted and written to stdout on the calling
+thread. With LOG_ASYNC=1 all loggers share one BatchingHandler instead:
+the caller only enqueues the record, and a background thread formats the
+queued records and writes them to stdout in batches. The JSON lines are
+the same in both modes. Call flush_logs() before the process may be frozen
+(the Lambda handler does this after each invocation).
+
+LOG_SAMPLE_RATES (``event=rate,...``) keeps only a fraction of the named
+INFO/DEBUG events, in either mode. Warnings and errors are never sampled.
+orjson is used for encoding when installed.
+"""
+
+import atexit
 import json
 import logging
+import os
+import queue
+import random
 import sys
+import threading
 import traceback
 from datetime import UTC, datetime
-from typing import Any
+from typing import Any, TextIO
+
+try:
+    import orjson
+except ImportError:  # Optional: the standard library encoder is used instead
+    orjson = None
+
+DEFAULT_LOG_BATCH_SIZE: int = 256
+DEFAULT_LOG_QUEUE_SIZE: int = 10_000
+
+# LogRecord attributes that are not extra={} fields
+_RECORD_ATTRS: frozenset[str] = frozenset(
+    {
+        "name",
+        "msg",
+        "args",
+        "levelname",
+        "levelno",
+        "pathname",
+        "filename",
+        "module",
+        "exc_info",
+        "exc_text",
+        "stack_info",
+        "lineno",
+        "funcName",
+        "created",
+        "msecs",
+        "relativeCreated",
+        "thread",
+        "threadName",
+        "processName",
+        "process",
+        "message",
+        "taskName",
+    }
+)
+
+if orjson is not None:
+    # Datetimes and dataclasses go through the default hook, as with json.dumps
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+def _orjson_default(value: Any) -> Any:
+    # json.dumps writes float subclasses (numpy.float64) as numbers, not strings
+    return float(value) if isinstance(value, float) else str(value)
+
+
+def _dumps(data: dict[str, Any]) -> str:
+    """Encode one log line, with orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=_orjson_default, option=_ORJSON_OPTIONS).decode()
+        except TypeError:  # e.g. non-str keys or ints beyond 64 bits
+            pass
+    return json.dumps(data, ensure_ascii=False, default=str)
 
 
 class StructuredJsonFormatter(logging.Formatter):
@@ -22,41 +94,14 @@ class StructuredJsonFormatter(logging.Formatter):
         log_data: dict[str, Any] = {
             "event": record.getMessage(),
             "level": record.levelname,
-            "ts": datetime.now(tz=UTC).isoformat(),
+            "ts": datetime.fromtimestamp(record.created, tz=UTC).isoformat(),
             "logger": record.name,
         }
 
         # Include extra fields passed via extra={}
-        extra_fields = {
-            k: v
-            for k, v in record.__dict__.items()
-            if k
-            not in {
-                "name",
-                "msg",
-                "args",
-                "levelname",
-                "levelno",
-                "pathname",
-                "filename",
-                "module",
-                "exc_info",
-                "exc_text",
-                "stack_info",
-                "lineno",
-                "funcName",
-                "created",
-                "msecs",
-                "relativeCreated",
-                "thread",
-                "threadName",
-                "processName",
-                "process",
-                "message",
-                "taskName",
-            }
-        }
-        log_data.update(extra_fields)
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                log_data[key] = value
 
         # Include exception info if present
         if record.exc_info:
@@ -67,7 +112,183 @@ class StructuredJsonFormatter(logging.Formatter):
                 "stack": traceback.format_exception(exc_type, exc_value, exc_tb),
             }
 
-        return json.dumps(log_data, ensure_ascii=False, default=str)
+        return _dumps(log_data)
+
+
+def parse_sample_rates(spec: str) -> dict[str, float]:
+    """Parse ``event=rate,...`` (rates clamped to [0, 1]).
+
+    Raises:
+        ValueError: A malformed entry or rate
+    """
+    rates: dict[str, float] = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        event, sep, rate = item.partition("=")
+        if not sep or not event.strip():
+            raise ValueError(f"invalid sample rate entry: {item!r}")
+        rates[event.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+class EventSampler(logging.Filter):
+    """Keeps a fraction of high-volume events, by event name."""
+
+    def __init__(self, rates: dict[str, float]) -> None:
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(record.msg) if isinstance(record.msg, str) else None
+        return rate is None or (rate > 0.0 and random.random() < rate)
+
+
+class BatchingHandler(logging.Handler):
+    """Queues records for a background thread that writes them in batches.
+
+    emit() never blocks: when the queue is full the record is dropped and
+    counted, and the next batch carries a ``log_records_dropped`` warning.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        batch_size: int = DEFAULT_LOG_BATCH_SIZE,
+        queue_size: int = DEFAULT_LOG_QUEUE_SIZE,
+    ) -> None:
+        super().__init__()
+        self.stream = stream if stream is not None else sys.stdout
+        self.batch_size = max(1, batch_size)
+        self._queue: queue.Queue[logging.LogRecord | threading.Event | None] = queue.Queue(
+            max(1, queue_size)
+        )
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._writer = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._writer.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Resolve %-args now: they may change before the writer formats the record
+        record.msg = record.getMessage()
+        record.args = None
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _dropped_line(self) -> str | None:
+        dropped = self.dropped - self._reported_dropped
+        if dropped <= 0:
+            return None
+        self._reported_dropped += dropped
+        record = logging.LogRecord(__name__, logging.WARNING, __file__, 0, "log_records_dropped", None, None)
+        record.dropped = dropped
+        return self.format(record)
+
+    def _write(self, records: list[logging.LogRecord]) -> None:
+        lines: list[str] = []
+        for record in records:
+            try:
+                lines.append(self.format(record))
+            except Exception:
+                self.handleError(record)
+        dropped = self._dropped_line()
+        if dropped is not None:
+            lines.append(dropped)
+        if not lines:
+            return
+        try:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+        except Exception:
+            if records:
+                self.handleError(records[0])
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: list[logging.LogRecord] = []
+            markers: list[threading.Event] = []
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._write(batch)
+            for marker in markers:
+                marker.set()
+            if stop:
+                return
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Wait until every record queued so far has been written.
+
+        Returns:
+            False if the writer did not catch up within timeout
+        """
+        if not self._writer.is_alive():
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join(timeout=5.0)
+        super().close()
+
+
+_batching_handler: BatchingHandler | None = None
+_sampler: EventSampler | None = None
+_setup_lock = threading.Lock()
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _shared_batching_handler() -> BatchingHandler:
+    """One queue and writer thread for all loggers (LOG_BATCH_SIZE, LOG_QUEUE_SIZE)."""
+    global _batching_handler
+    if _batching_handler is None:
+        _batching_handler = BatchingHandler(
+            batch_size=int(os.environ.get("LOG_BATCH_SIZE", DEFAULT_LOG_BATCH_SIZE)),
+            queue_size=int(os.environ.get("LOG_QUEUE_SIZE", DEFAULT_LOG_QUEUE_SIZE)),
+        )
+        _batching_handler.setFormatter(StructuredJsonFormatter())
+        atexit.register(_batching_handler.close)
+    return _batching_handler
+
+
+def _shared_sampler() -> EventSampler | None:
+    global _sampler
+    if _sampler is None:
+        rates = parse_sample_rates(os.environ.get("LOG_SAMPLE_RATES", ""))
+        if rates:
+            _sampler = EventSampler(rates)
+    return _sampler
+
+
+def flush_logs(timeout: float = 5.0) -> None:
+    """Write out queued records (no-op unless LOG_ASYNC is on)."""
+    if _batching_handler is not None:
+        _batching_handler.flush(timeout)
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -81,11 +302,19 @@ def get_logger(name: str) -> logging.Logger:
     """
     logger = logging.getLogger(name)
 
-    if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setFormatter(StructuredJsonFormatter())
-        logger.addHandler(handler)
-        logger.setLevel(logging.INFO)
-        logger.propagate = False
+    with _setup_lock:
+        if not logger.handlers:
+            handler: logging.Handler
+            if _env_flag("LOG_ASYNC"):
+                handler = _shared_batching_handler()
+            else:
+                handler = logging.StreamHandler(sys.stdout)
+                handler.setFormatter(StructuredJsonFormatter())
+            logger.addHandler(handler)
+            sampler = _shared_sampler()
+            if sampler is not None:
+                logger.addFilter(sampler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
 
     return logger
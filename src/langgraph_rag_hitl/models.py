@@ -2,12 +2,18 @@
 # Agent   : backend_dev
 # Task    : Python Lambda + Pydantic + pytest 実装
 # Created : 2026-02-23T18:56:39
-# Updated : 2026-02-23T18:56:39
+# Updated : 2026-10-19
 # [/DEBUG] ===========================================================
 
-"""Pydantic v2 models for LangGraph RAG HITL experiment."""
+"""Pydantic v2 models for LangGraph RAG HITL experiment.
 
-from typing import Literal
+Passage is the exception: a plain slotted record that the retrievers and
+workflow nodes pass around without validation. It becomes a SourceDocument
+only when the response is built.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -21,6 +27,22 @@ class ExperimentRequest(BaseModel):
         default_factory=lambda: ["public"],
         description="User roles for permission-aware retrieval",
     )
+    priority: Literal["interactive", "batch"] = Field(
+        default="interactive",
+        description="LLM scheduling class; interactive requests are admitted before batch",
+    )
+    deadline_ms: int | None = Field(
+        default=None,
+        ge=100,
+        le=300_000,
+        description="Latency budget in milliseconds; nodes degrade to stay within it",
+    )
+    include_timings: bool = Field(
+        default=False, description="Include the per-node duration breakdown in the response"
+    )
+    profile: bool = Field(
+        default=False, description="Profile this request with cProfile (written to PROFILE_DIR; needs PROFILE_ALLOW_REQUESTS)"
+    )
 
 
 class SourceDocument(BaseModel):
@@ -33,6 +55,52 @@ class SourceDocument(BaseModel):
     score: float = Field(..., ge=0.0, le=1.0, description="Relevance score (0-1)")
     house: str = Field(default="", description="Name of house (衆議院/参議院)")
     meeting: str = Field(default="", description="Meeting name")
+    passage_start: int = Field(default=0, ge=0, description="Passage start offset within the speech")
+    passage_end: int = Field(default=0, ge=0, description="Passage end offset within the speech")
+
+
+@dataclass(slots=True)
+class Passage:
+    """A retrieved passage inside the workflow (unvalidated SourceDocument fields)."""
+
+    speech_id: str
+    speaker: str
+    date: str
+    content: str
+    score: float
+    house: str = ""
+    meeting: str = ""
+    passage_start: int = 0
+    passage_end: int = 0
+
+    def _asdict(self) -> dict[str, Any]:
+        # Checkpoint serde (JsonPlusSerializer) encodes objects with _asdict as keyword
+        # constructor calls before its much slower generic dataclass path
+        return {
+            "speech_id": self.speech_id,
+            "speaker": self.speaker,
+            "date": self.date,
+            "content": self.content,
+            "score": self.score,
+            "house": self.house,
+            "meeting": self.meeting,
+            "passage_start": self.passage_start,
+            "passage_end": self.passage_end,
+        }
+
+    def to_source(self) -> SourceDocument:
+        """Validated API model of this passage."""
+        return SourceDocument(
+            speech_id=self.speech_id,
+            speaker=self.speaker,
+            date=self.date,
+            content=self.content,
+            score=self.score,
+            house=self.house,
+            meeting=self.meeting,
+            passage_start=self.passage_start,
+            passage_end=self.passage_end,
+        )
 
 
 class GradedDocument(BaseModel):
@@ -43,6 +111,17 @@ class GradedDocument(BaseModel):
     grade_reason: str = Field(default="", description="Reason for grading decision")
 
 
+class SensitiveMatch(BaseModel):
+    """A sensitive dictionary term found in the query or a retrieved document."""
+
+    term: str = Field(..., description="Matched dictionary term")
+    category: str = Field(default="general", description="Dictionary category of the term")
+    source: Literal["query", "document"] = Field(..., description="Where the term was found")
+    speech_id: str = Field(default="", description="Speech ID when source is document")
+    start: int = Field(..., ge=0, description="Match start offset in the scanned text")
+    end: int = Field(..., ge=0, description="Match end offset in the scanned text")
+
+
 class HITLReviewRequest(BaseModel):
     """Request for Human-in-the-Loop review."""
 
@@ -54,6 +133,66 @@ class HITLReviewRequest(BaseModel):
     sensitive_keywords: list[str] = Field(
         default_factory=list, description="Sensitive keywords detected"
     )
+    sensitive_matches: list[SensitiveMatch] = Field(
+        default_factory=list, description="Positions and categories of sensitive term matches"
+    )
+    review_id: str = Field(
+        default="", description="ID of the paused workflow, passed to /api/review/{review_id}"
+    )
+
+
+class ReviewDecision(BaseModel):
+    """Reviewer decision that resumes a workflow paused for HITL review."""
+
+    approved: bool = Field(..., description="Whether the reviewer approves generating an answer")
+    reviewer: str = Field(default="", max_length=100, description="Reviewer identifier")
+    comment: str = Field(default="", max_length=1000, description="Optional reviewer comment")
+
+
+class ReviewQueueItem(BaseModel):
+    """An entry of the HITL review queue."""
+
+    review_id: str = Field(..., description="ID of the paused run")
+    status: Literal["pending", "approved", "rejected"] = Field(..., description="Review status")
+    created_at: float = Field(..., description="Enqueue time (UNIX seconds)")
+    age_s: float = Field(..., ge=0.0, description="Seconds since the item was enqueued")
+    hitl_review: HITLReviewRequest = Field(..., description="HITL review details")
+
+
+class ReviewQueuePage(BaseModel):
+    """One page of pending reviews, oldest first."""
+
+    items: list[ReviewQueueItem] = Field(default_factory=list, description="Pending reviews")
+    next_cursor: str | None = Field(default=None, description="Cursor for the next page, if any")
+    pending_counts: dict[str, int] = Field(
+        default_factory=dict, description="Pending items per HITL reason"
+    )
+
+
+class BulkReviewRequest(ReviewDecision):
+    """One decision applied to many paused runs."""
+
+    review_ids: list[str] = Field(
+        ..., min_length=1, max_length=1000, description="IDs of the paused runs to decide"
+    )
+
+
+class BulkReviewResult(BaseModel):
+    """Outcome of resuming one run in a bulk review."""
+
+    review_id: str = Field(..., description="ID of the paused run")
+    status: Literal["approved", "rejected", "not_found", "error"] = Field(
+        ..., description="Outcome of the resume"
+    )
+    error: str = Field(default="", description="Error message when status is error")
+
+
+class BulkReviewResponse(BaseModel):
+    """Per-item outcomes of a bulk review."""
+
+    results: list[BulkReviewResult] = Field(default_factory=list, description="Outcome per review_id")
+    succeeded: int = Field(default=0, description="Runs resumed successfully")
+    failed: int = Field(default=0, description="Runs not found or failed")
 
 
 class ExperimentResponse(BaseModel):
@@ -70,3 +209,7 @@ class ExperimentResponse(BaseModel):
     workflow_steps: list[str] = Field(
         default_factory=list, description="Steps executed in the LangGraph workflow"
     )
+    node_timings_ms: dict[str, float] | None = Field(
+        default=None,
+        description="Cumulative milliseconds per workflow node (when include_timings is set)",
+    )
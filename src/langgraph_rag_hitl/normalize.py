@@ -0,0 +1,155 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : 取り込み時のテキスト正規化と定型ブロック除去による索引縮小
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Text normalization of speech records at ingest.
+
+Kokkai records carry layout the retriever has no use for: ``\\r\\n`` line
+breaks, runs of full-width spaces used for alignment, ``─────`` separators,
+and the member rosters and attendance tables of the ``会議録情報``
+pseudo-speaker (speechOrder 0). Every character and bigram of that layout
+becomes a BM25 token. The normalizer runs before indexing:
+
+1. Roster and attendance blocks are removed from ``会議録情報`` records,
+   and separator lines from every record. A block is a section between
+   separators made up mostly of member rows (``井上　義行君``, aligned
+   ``委員長　　　横沢　高徳君``); its headings (``理　事``, ``事務局側``)
+   go with it and only full sentences are kept
+2. NFKC, matching the NFKC applied to queries at request time
+3. Whitespace runs collapse to a single space
+
+``会議録情報`` records can also be excluded entirely. Records left with no
+text are dropped. The corpus files are not changed; the index holds the
+normalized text (passage offsets refer to it).
+
+Enabled with INGEST_NORMALIZE=1 (INGEST_DROP_RECORD_INFO=1 also excludes
+``会議録情報``); applied by core._load_corpus and the streaming index builder.
+"""
+
+import os
+import re
+import unicodedata
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+RECORD_INFO_SPEAKER: str = "会議録情報"
+
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+_SEPARATOR_LINE = re.compile(r"[\s─━―‐－\-=＝]*[─━―]{3,}[\s─━―‐－\-=＝]*")
+_ALIGNED_COLUMNS = re.compile(r"\s{3,}")
+_SENTENCE_PUNCTUATION = re.compile(r"[。、]")
+MAX_ROSTER_LINE_CHARS: int = 40  # Non-space characters of a roster row
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def is_roster_line(line: str) -> bool:
+    """Whether a ``会議録情報`` line is a roster / attendance row.
+
+    Rows are short, have no sentence punctuation, and either end with a
+    member's 君 or lay out columns with runs of spaces (``委員長　　　横沢　高徳君``).
+    """
+    stripped = line.strip()
+    if not stripped or _SENTENCE_PUNCTUATION.search(stripped):
+        return False
+    compact = "".join(stripped.split())
+    if len(compact) > MAX_ROSTER_LINE_CHARS:
+        return False
+    return compact.endswith("君") or _ALIGNED_COLUMNS.search(stripped) is not None
+
+
+def strip_roster_blocks(lines: list[str]) -> list[str]:
+    """Drop the roster / attendance sections of ``会議録情報`` lines (and separators).
+
+    Args:
+        lines: Lines of one record
+
+    Returns:
+        Remaining lines
+    """
+    kept: list[str] = []
+    section: list[str] = []
+
+    def flush() -> None:
+        rows = [line for line in section if line.strip()]
+        roster_rows = sum(is_roster_line(line) for line in rows)
+        if roster_rows and roster_rows * 2 >= len(rows):
+            kept.extend(line for line in rows if _SENTENCE_PUNCTUATION.search(line))
+        else:
+            kept.extend(section)
+        section.clear()
+
+    for line in lines:
+        if _SEPARATOR_LINE.fullmatch(line):
+            flush()
+        else:
+            section.append(line)
+    flush()
+    return kept
+
+
+@dataclass(frozen=True, slots=True)
+class IngestNormalizer:
+    """Configurable normalization applied to speech records before indexing."""
+
+    nfkc: bool = True
+    collapse_whitespace: bool = True
+    strip_rosters: bool = True
+    drop_record_info: bool = False
+
+    @classmethod
+    def from_env(cls) -> "IngestNormalizer | None":
+        """Build from INGEST_NORMALIZE / INGEST_DROP_RECORD_INFO (None when disabled)."""
+        if not _env_flag("INGEST_NORMALIZE"):
+            return None
+        return cls(drop_record_info=_env_flag("INGEST_DROP_RECORD_INFO"))
+
+    def normalize_text(self, text: str, record_info: bool = False) -> str:
+        """Normalize one speech text.
+
+        Args:
+            text: Raw speech text
+            record_info: The text belongs to a ``会議録情報`` record (roster blocks are removed)
+
+        Returns:
+            Normalized text
+        """
+        if self.strip_rosters:
+            lines = _LINE_BREAK.split(text)
+            if record_info:
+                lines = strip_roster_blocks(lines)
+            else:
+                lines = [line for line in lines if not _SEPARATOR_LINE.fullmatch(line)]
+            text = "\n".join(lines)
+        if self.nfkc:
+            text = unicodedata.normalize("NFKC", text)
+        if self.collapse_whitespace:
+            text = " ".join(text.split())
+        return text
+
+    def normalize(self, record: dict[str, Any]) -> dict[str, Any] | None:
+        """Normalized copy of a speech record, or None if it is excluded.
+
+        Args:
+            record: Kokkai speech record
+
+        Returns:
+            A new record with the normalized speech (other fields unchanged)
+        """
+        record_info = record.get("speaker") == RECORD_INFO_SPEAKER
+        if record_info and self.drop_record_info:
+            return None
+        text = self.normalize_text(record.get("speech") or "", record_info)
+        if not text.strip():
+            return None
+        return {**record, "speech": text}
+
+    def apply(self, records: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Normalize records, dropping excluded and empty ones."""
+        return [normalized for r in records if (normalized := self.normalize(r)) is not None]
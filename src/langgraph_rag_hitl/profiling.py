@@ -0,0 +1,132 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : リクエスト単位のオプトイン cProfile プロファイラ
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Opt-in per-request profiling.
+
+A request is profiled when the caller asks for it (request flag or the
+X-RAG-Profile header) and PROFILE_ALLOW_REQUESTS is enabled, or when it is
+sampled at PROFILE_SAMPLE_RATE. Caller requests are ignored by default, so
+anonymous clients cannot make the server profile and write files. The
+workflow then runs under cProfile and the stats are written to
+``PROFILE_DIR/<request_id>.pstats`` (inspect with ``python -m pstats`` or
+snakeviz); only the newest PROFILE_MAX_FILES profiles are kept. Unprofiled
+requests never construct a profiler.
+
+cProfile records the thread it is enabled on, so the profiled call must
+run the workflow in that thread (run_experiment does).
+"""
+
+import cProfile
+import os
+import random
+import re
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import TypeVar
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_PROFILE_DIR: str = "/tmp/langgraph_rag_hitl_profiles"
+DEFAULT_PROFILE_MAX_FILES: int = 20  # Lambda /tmp is small
+PROFILE_HEADER: str = "x-rag-profile"
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def header_requests_profile(value: str | None) -> bool:
+    """Whether an X-RAG-Profile header value asks for profiling."""
+    return value is not None and value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class RequestProfiler:
+    """Decides which requests to profile and writes their stats."""
+
+    def __init__(
+        self,
+        output_dir: str = DEFAULT_PROFILE_DIR,
+        sample_rate: float = 0.0,
+        allow_requests: bool = False,
+        max_files: int = DEFAULT_PROFILE_MAX_FILES,
+    ) -> None:
+        self.output_dir = Path(output_dir)
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.allow_requests = allow_requests
+        self.max_files = max(max_files, 1)
+
+    @classmethod
+    def from_env(cls) -> "RequestProfiler":
+        """Build from PROFILE_DIR, PROFILE_SAMPLE_RATE, PROFILE_ALLOW_REQUESTS and PROFILE_MAX_FILES."""
+        return cls(
+            output_dir=os.environ.get("PROFILE_DIR", DEFAULT_PROFILE_DIR),
+            sample_rate=float(os.environ.get("PROFILE_SAMPLE_RATE", "0") or 0),
+            allow_requests=os.environ.get("PROFILE_ALLOW_REQUESTS", "").strip().lower() in ("1", "true", "yes", "on"),
+            max_files=int(os.environ.get("PROFILE_MAX_FILES", DEFAULT_PROFILE_MAX_FILES)),
+        )
+
+    def should_profile(self, requested: bool) -> bool:
+        """Profile if requested explicitly (when allowed) or sampled."""
+        if requested and self.allow_requests:
+            return True
+        return self.sample_rate > 0.0 and random.random() < self.sample_rate
+
+    def path_for(self, request_id: str) -> Path:
+        """Output file of a request's profile."""
+        return self.output_dir / f"{_UNSAFE_FILENAME.sub('_', request_id)}.pstats"
+
+    def run(self, request_id: str, fn: Callable[[], T]) -> T:
+        """Call fn under cProfile and write the stats keyed by request_id.
+
+        If another profiler is already active (e.g. a debugger's), fn runs
+        unprofiled.
+
+        Args:
+            request_id: Request identifier used as the file name
+            fn: Work to profile
+
+        Returns:
+            fn's result (exceptions propagate; the profile is still written)
+        """
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            logger.warning("profile_unavailable", extra={"request_id": request_id, "error": str(e)})
+            return fn()
+
+        start = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            profiler.disable()
+            path = self.path_for(request_id)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(path)
+                logger.info(
+                    "profile_written",
+                    extra={
+                        "request_id": request_id,
+                        "path": str(path),
+                        "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                    },
+                )
+            except OSError as e:
+                logger.warning("profile_write_failed", extra={"request_id": request_id, "error": str(e)})
+            self._prune()
+
+    def _prune(self) -> None:
+        """Delete the oldest profiles beyond max_files."""
+        try:
+            profiles = sorted(self.output_dir.glob("*.pstats"), key=lambda p: p.stat().st_mtime, reverse=True)
+            for stale in profiles[self.max_files :]:
+                stale.unlink(missing_ok=True)
+        except OSError as e:  # A file removed concurrently; the next write prunes again
+            logger.warning("profile_prune_failed", extra={"error": str(e)})
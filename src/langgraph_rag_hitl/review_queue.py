@@ -0,0 +1,293 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : HITL レビューキュー（索引付き永続キュー・一括承認）
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Durable HITL review queue.
+
+Every run paused for review is recorded in an embedded SQLite store so
+reviewers can work through the backlog. Pending items are indexed by
+(reason, created_at) and (keyword, created_at), and listing uses keyset
+pagination on (created_at, review_id), so each page costs O(log n + page)
+regardless of backlog size. Pending counts per reason are maintained in a
+counter table instead of being computed with COUNT(*).
+
+Database path: REVIEW_DB_PATH (default /tmp/langgraph_rag_hitl_reviews.sqlite).
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from .models import HITLReviewRequest, ReviewDecision
+
+DEFAULT_REVIEW_DB_PATH: str = "/tmp/langgraph_rag_hitl_reviews.sqlite"
+DEFAULT_PAGE_SIZE: int = 50
+MAX_PAGE_SIZE: int = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    review_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    decided_at REAL,
+    reviewer TEXT NOT NULL DEFAULT '',
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reviews_status_age ON reviews (status, created_at, review_id);
+CREATE INDEX IF NOT EXISTS reviews_status_reason_age
+    ON reviews (status, reason, created_at, review_id);
+CREATE TABLE IF NOT EXISTS pending_keywords (
+    keyword TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    review_id TEXT NOT NULL,
+    PRIMARY KEY (keyword, created_at, review_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS pending_keywords_review ON pending_keywords (review_id);
+CREATE TABLE IF NOT EXISTS pending_counts (
+    reason TEXT PRIMARY KEY,
+    pending INTEGER NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class QueuedReview:
+    """A review queue entry."""
+
+    review_id: str
+    status: str  # "pending", "approved" or "rejected"
+    created_at: float
+    hitl_review: HITLReviewRequest
+    decided_at: float | None = None
+    reviewer: str = ""
+
+
+def _encode_cursor(created_at: float, review_id: str) -> str:
+    return f"{created_at!r}|{review_id}"
+
+
+def _decode_cursor(cursor: str) -> tuple[float, str]:
+    created_at, _, review_id = cursor.partition("|")
+    try:
+        return float(created_at), review_id
+    except ValueError as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+class ReviewQueue:
+    """SQLite-backed queue of runs awaiting (or finished with) HITL review.
+
+    Thread-safe; the connection is opened lazily on first use.
+    """
+
+    def __init__(self, path: str = DEFAULT_REVIEW_DB_PATH) -> None:
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ReviewQueue":
+        """Build a queue from REVIEW_DB_PATH."""
+        return cls(os.environ.get("REVIEW_DB_PATH", DEFAULT_REVIEW_DB_PATH))
+
+    @contextmanager
+    def _cursor(self) -> Iterator[sqlite3.Cursor]:
+        """Yield a cursor inside a committed transaction, opening the database if needed."""
+        with self._lock:
+            if self._conn is None:
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                if self.path != ":memory:":
+                    conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                self._conn = conn
+            cur = self._conn.cursor()
+            try:
+                yield cur
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+            finally:
+                cur.close()
+
+    def close(self) -> None:
+        """Close the underlying connection (reopened on next use)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # --- Writes ---
+
+    @staticmethod
+    def _remove_pending(cur: sqlite3.Cursor, review_id: str) -> None:
+        """Drop a pending item's index rows and counter contribution."""
+        cur.execute(
+            "SELECT reason FROM reviews WHERE review_id = ? AND status = 'pending'", (review_id,)
+        )
+        row = cur.fetchone()
+        if row is None:
+            return
+        cur.execute("DELETE FROM pending_keywords WHERE review_id = ?", (review_id,))
+        cur.execute("UPDATE pending_counts SET pending = pending - 1 WHERE reason = ?", (row[0],))
+
+    def enqueue(self, review: HITLReviewRequest, created_at: float | None = None) -> None:
+        """Add (or replace) a pending review.
+
+        Args:
+            review: HITL review request; review.review_id is the queue key
+            created_at: Enqueue time (time.time()); defaults to now
+        """
+        created = time.time() if created_at is None else created_at
+        keywords = sorted(set(review.sensitive_keywords))
+        with self._cursor() as cur:
+            self._remove_pending(cur, review.review_id)
+            cur.execute(
+                "INSERT OR REPLACE INTO reviews (review_id, status, reason, created_at, payload) "
+                "VALUES (?, 'pending', ?, ?, ?)",
+                (review.review_id, review.reason, created, review.model_dump_json()),
+            )
+            cur.executemany(
+                "INSERT OR IGNORE INTO pending_keywords (keyword, created_at, review_id) VALUES (?, ?, ?)",
+                [(kw, created, review.review_id) for kw in keywords],
+            )
+            cur.execute(
+                "INSERT INTO pending_counts (reason, pending) VALUES (?, 1) "
+                "ON CONFLICT(reason) DO UPDATE SET pending = pending + 1",
+                (review.reason,),
+            )
+
+    def mark_decided(self, review_id: str, decision: ReviewDecision) -> bool:
+        """Record a reviewer decision and drop the item from the pending indexes.
+
+        Args:
+            review_id: Queue key
+            decision: Reviewer decision
+
+        Returns:
+            True if a pending item was updated
+        """
+        with self._cursor() as cur:
+            self._remove_pending(cur, review_id)
+            cur.execute(
+                "UPDATE reviews SET status = ?, decided_at = ?, reviewer = ? "
+                "WHERE review_id = ? AND status = 'pending'",
+                (
+                    "approved" if decision.approved else "rejected",
+                    time.time(),
+                    decision.reviewer,
+                    review_id,
+                ),
+            )
+            return cur.rowcount > 0
+
+    # --- Reads ---
+
+    @staticmethod
+    def _row_to_item(row: tuple[Any, ...]) -> QueuedReview:
+        review_id, status, created_at, decided_at, reviewer, payload = row
+        return QueuedReview(
+            review_id=review_id,
+            status=status,
+            created_at=created_at,
+            hitl_review=HITLReviewRequest.model_validate_json(payload),
+            decided_at=decided_at,
+            reviewer=reviewer,
+        )
+
+    def get(self, review_id: str) -> QueuedReview | None:
+        """Fetch one queue entry by ID."""
+        with self._cursor() as cur:
+            cur.execute(
+                "SELECT review_id, status, created_at, decided_at, reviewer, payload "
+                "FROM reviews WHERE review_id = ?",
+                (review_id,),
+            )
+            row = cur.fetchone()
+        return self._row_to_item(row) if row else None
+
+    def list_pending(
+        self,
+        reason: str | None = None,
+        keyword: str | None = None,
+        min_age_s: float | None = None,
+        max_age_s: float | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        now: float | None = None,
+    ) -> tuple[list[QueuedReview], str | None]:
+        """List pending reviews oldest first, one page at a time.
+
+        Args:
+            reason: Only items with this HITL reason
+            keyword: Only items that matched this sensitive keyword
+            min_age_s: Only items at least this old
+            max_age_s: Only items at most this old
+            limit: Page size (capped at MAX_PAGE_SIZE)
+            cursor: next_cursor from the previous page
+            now: Reference time for age filters (defaults to time.time())
+
+        Returns:
+            (items, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValueError: Malformed cursor
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        now = time.time() if now is None else now
+        after = _decode_cursor(cursor) if cursor else None
+
+        # Age bounds and the cursor become a range on the indexed created_at column
+        age_col = "k.created_at" if keyword is not None else "r.created_at"
+        id_col = "k.review_id" if keyword is not None else "r.review_id"
+        wheres = ["r.status = 'pending'"]
+        params: list[Any] = []
+        if keyword is not None:
+            source = "pending_keywords k JOIN reviews r ON r.review_id = k.review_id"
+            wheres.insert(0, "k.keyword = ?")
+            params.append(keyword)
+        else:
+            source = "reviews r"
+        if reason is not None:
+            wheres.append("r.reason = ?")
+            params.append(reason)
+        if min_age_s is not None:
+            wheres.append(f"{age_col} <= ?")
+            params.append(now - min_age_s)
+        if max_age_s is not None:
+            wheres.append(f"{age_col} >= ?")
+            params.append(now - max_age_s)
+        if after is not None:
+            wheres.append(f"({age_col}, {id_col}) > (?, ?)")
+            params.extend(after)
+
+        sql = (
+            "SELECT r.review_id, r.status, r.created_at, r.decided_at, r.reviewer, r.payload "
+            f"FROM {source} WHERE {' AND '.join(wheres)} "
+            f"ORDER BY {age_col}, {id_col} LIMIT ?"
+        )
+        params.append(limit + 1)
+        with self._cursor() as cur:
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+
+        items = [self._row_to_item(row) for row in rows[:limit]]
+        next_cursor = (
+            _encode_cursor(items[-1].created_at, items[-1].review_id) if len(rows) > limit else None
+        )
+        return items, next_cursor
+
+    def pending_counts(self) -> dict[str, int]:
+        """Pending items per HITL reason (from the counter table, O(reasons))."""
+        with self._cursor() as cur:
+            cur.execute("SELECT reason, pending FROM pending_counts WHERE pending > 0")
+            return dict(cur.fetchall())
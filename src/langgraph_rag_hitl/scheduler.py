@@ -0,0 +1,266 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : LLM 生成のアドミッション制御（同時実行数・待ち行列・優先度）
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Admission scheduler for LLM generations.
+
+A single Ollama instance can only serve a few generations at once. The
+scheduler admits at most ``max_concurrency`` generations, parks the rest in
+a bounded priority queue (interactive before batch, FIFO within a class) and
+fails fast instead of letting overload surface as client timeouts:
+
+- queue full → QueueFullError (HTTP 429)
+- deadline cannot be met, or passes while waiting → DeadlineExceededError (HTTP 503)
+
+Both carry a ``retry_after`` hint (seconds) for the ``Retry-After`` header.
+"""
+
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Literal
+
+Priority = Literal["interactive", "batch"]
+
+PRIORITY_RANK: dict[str, int] = {"interactive": 0, "batch": 1}
+
+DEFAULT_MAX_CONCURRENCY: int = 2
+DEFAULT_MAX_QUEUE: int = 32
+DEFAULT_QUEUE_TIMEOUT_S: float = 30.0
+INITIAL_SERVICE_TIME_S: float = 2.0  # Service-time estimate before any generation finished
+SERVICE_TIME_ALPHA: float = 0.2  # EWMA smoothing for observed service times
+
+
+class SchedulerRejectedError(Exception):
+    """Base class for generations refused by the scheduler."""
+
+    status_code: int = 503
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """Retry-After header value in whole seconds (at least 1)."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class QueueFullError(SchedulerRejectedError):
+    """The wait queue is full (or a batch ticket was evicted for interactive work)."""
+
+    status_code = 429
+
+
+class DeadlineExceededError(SchedulerRejectedError):
+    """The generation could not start before its deadline."""
+
+    status_code = 503
+
+
+class _Ticket:
+    """A queued admission request."""
+
+    __slots__ = ("rank", "seq", "priority", "deadline", "enqueued_at", "evicted")
+
+    def __init__(self, priority: str, seq: int, deadline: float | None) -> None:
+        self.rank = PRIORITY_RANK[priority]
+        self.seq = seq
+        self.priority = priority
+        self.deadline = deadline
+        self.enqueued_at = time.monotonic()
+        self.evicted = False
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return (self.rank, self.seq) < (other.rank, other.seq)
+
+
+class GenerationScheduler:
+    """Bounded, priority-aware admission control in front of the LLM client.
+
+    Thread-safe; callers block in ``slot()`` until admitted or rejected.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        queue_timeout_s: float = DEFAULT_QUEUE_TIMEOUT_S,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout_s = queue_timeout_s
+
+        self._cond = threading.Condition()
+        self._queue: list[_Ticket] = []
+        self._seq = itertools.count()
+        self._active = 0
+        self._service_time_s = INITIAL_SERVICE_TIME_S
+
+        # Exported counters
+        self._admitted = 0
+        self._rejected_queue_full = 0
+        self._dropped_deadline = 0
+        self._wait_total_s = 0.0
+        self._wait_max_s = 0.0
+
+    @classmethod
+    def from_env(cls) -> "GenerationScheduler":
+        """Build a scheduler from LLM_MAX_CONCURRENCY / LLM_MAX_QUEUE / LLM_QUEUE_TIMEOUT_S."""
+        return cls(
+            max_concurrency=int(os.environ.get("LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)),
+            max_queue=int(os.environ.get("LLM_MAX_QUEUE", DEFAULT_MAX_QUEUE)),
+            queue_timeout_s=float(os.environ.get("LLM_QUEUE_TIMEOUT_S", DEFAULT_QUEUE_TIMEOUT_S)),
+        )
+
+    # --- Admission ---
+
+    def _estimated_wait_s(self, position: int) -> float:
+        """Estimate the wait before the ticket at queue position (0-based) starts."""
+        return (position + 1) * self._service_time_s / self.max_concurrency
+
+    def _evict_newest_batch(self) -> bool:
+        """Drop the most recently queued batch ticket to make room. Caller holds the lock."""
+        batch = [t for t in self._queue if t.priority == "batch"]
+        if not batch:
+            return False
+        victim = max(batch, key=lambda t: t.seq)
+        victim.evicted = True
+        self._queue.remove(victim)
+        heapq.heapify(self._queue)
+        self._rejected_queue_full += 1
+        self._cond.notify_all()
+        return True
+
+    def acquire(self, priority: Priority = "interactive", deadline: float | None = None) -> float:
+        """Wait for a generation slot.
+
+        Args:
+            priority: "interactive" (served first) or "batch"
+            deadline: Absolute time.monotonic() deadline for starting; defaults to
+                now + queue_timeout_s
+
+        Returns:
+            Seconds spent waiting in the queue
+
+        Raises:
+            QueueFullError: Queue is at capacity (or this batch ticket was evicted)
+            DeadlineExceededError: The slot could not be obtained before the deadline
+        """
+        now = time.monotonic()
+        if deadline is None:
+            deadline = now + self.queue_timeout_s
+
+        with self._cond:
+            if self._active < self.max_concurrency and not self._queue:
+                self._active += 1
+                self._admitted += 1
+                return 0.0
+
+            if len(self._queue) >= self.max_queue and not (
+                priority == "interactive" and self._evict_newest_batch()
+            ):
+                self._rejected_queue_full += 1
+                raise QueueFullError(
+                    "LLM queue is full", retry_after=self._estimated_wait_s(len(self._queue))
+                )
+
+            expected = self._estimated_wait_s(len(self._queue))
+            if now + expected > deadline:
+                self._dropped_deadline += 1
+                raise DeadlineExceededError(
+                    "LLM queue wait would exceed the request deadline", retry_after=expected
+                )
+
+            ticket = _Ticket(priority, next(self._seq), deadline)
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    if ticket.evicted:
+                        raise QueueFullError(
+                            "Evicted from LLM queue by interactive traffic",
+                            retry_after=self._estimated_wait_s(len(self._queue)),
+                        )
+                    if self._queue[0] is ticket and self._active < self.max_concurrency:
+                        heapq.heappop(self._queue)
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._queue.remove(ticket)
+                        heapq.heapify(self._queue)
+                        self._dropped_deadline += 1
+                        raise DeadlineExceededError(
+                            "LLM queue wait exceeded the request deadline",
+                            retry_after=self._estimated_wait_s(len(self._queue)),
+                        )
+                    self._cond.wait(remaining)
+            finally:
+                # Wake the next head of queue whenever this ticket leaves it
+                self._cond.notify_all()
+
+            waited = time.monotonic() - ticket.enqueued_at
+            self._active += 1
+            self._admitted += 1
+            self._wait_total_s += waited
+            self._wait_max_s = max(self._wait_max_s, waited)
+            return waited
+
+    def release(self, service_time_s: float | None = None) -> None:
+        """Return a generation slot.
+
+        Args:
+            service_time_s: Observed generation time, used for wait estimates
+        """
+        with self._cond:
+            self._active -= 1
+            if service_time_s is not None:
+                self._service_time_s += SERVICE_TIME_ALPHA * (service_time_s - self._service_time_s)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: Priority = "interactive", deadline: float | None = None) -> Iterator[float]:
+        """Hold a generation slot for the duration of the with-block.
+
+        Yields:
+            Seconds spent waiting in the queue
+        """
+        waited = self.acquire(priority, deadline)
+        started = time.monotonic()
+        try:
+            yield waited
+        finally:
+            self.release(time.monotonic() - started)
+
+    # --- Export ---
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of queue depth, concurrency and wait-time counters."""
+        with self._cond:
+            depth_by_priority = {p: 0 for p in PRIORITY_RANK}
+            for t in self._queue:
+                depth_by_priority[t.priority] += 1
+            waited = self._admitted or 1
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queue_depth": len(self._queue),
+                "queue_depth_by_priority": depth_by_priority,
+                "admitted_total": self._admitted,
+                "rejected_queue_full_total": self._rejected_queue_full,
+                "dropped_deadline_total": self._dropped_deadline,
+                "wait_seconds_total": round(self._wait_total_s, 6),
+                "wait_ms_avg": round(self._wait_total_s / waited * 1000, 3),
+                "wait_ms_max": round(self._wait_max_s * 1000, 3),
+                "service_time_ms_estimate": round(self._service_time_s * 1000, 3),
+            }
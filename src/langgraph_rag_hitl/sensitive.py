@@ -0,0 +1,261 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : 機密語辞書の Aho–Corasick 照合（クエリ・取得文書）
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Multi-pattern sensitive-term detection for the HITL check.
+
+An Aho–Corasick automaton is compiled once from the term dictionary and
+scans text in a single pass regardless of dictionary size. Each term has a
+category and a scope:
+
+- ``query``: matched against the user query only
+- ``document``: matched against retrieved document contents only
+- ``both``: matched against both
+
+Dictionary file format (UTF-8, one entry per line, ``#`` comments)::
+
+    term<TAB>category<TAB>scope
+
+category defaults to "general" and scope to "both". The file is reloaded
+when its mtime changes (checked at most every ``reload_interval_s``).
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+Scope = Literal["query", "document", "both"]
+
+DEFAULT_CATEGORY: str = "general"
+DEFAULT_RELOAD_INTERVAL_S: float = 5.0
+_SCOPES: frozenset[str] = frozenset({"query", "document", "both"})
+
+
+@dataclass(frozen=True, slots=True)
+class SensitiveTerm:
+    """A dictionary entry."""
+
+    term: str
+    category: str = DEFAULT_CATEGORY
+    scope: Scope = "both"
+
+
+@dataclass(frozen=True, slots=True)
+class TermMatch:
+    """One occurrence of a dictionary term in scanned text."""
+
+    term: str
+    category: str
+    start: int
+    end: int
+
+
+class AhoCorasick:
+    """Aho–Corasick automaton over a fixed set of terms.
+
+    Immutable after construction, so it can be shared across threads and
+    swapped atomically on reload.
+    """
+
+    def __init__(self, terms: Iterable[SensitiveTerm]) -> None:
+        self.terms: list[SensitiveTerm] = []
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[int, ...]] = [()]
+
+        outputs: list[list[int]] = [[]]
+        for entry in terms:
+            if not entry.term:
+                continue
+            node = 0
+            for ch in entry.term:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append([])
+                node = nxt
+            outputs[node].append(len(self.terms))
+            self.terms.append(entry)
+
+        # BFS to set failure links; outputs inherit those of the failure target
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                outputs[child].extend(outputs[self._fail[child]])
+        self._out = [tuple(o) for o in outputs]
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, SensitiveTerm]]:
+        """Yield every (possibly overlapping) term occurrence in text.
+
+        Args:
+            text: Text to scan
+
+        Yields:
+            (start, end, term) with text[start:end] == term.term
+        """
+        goto, fail, out, terms = self._goto, self._fail, self._out, self.terms
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for idx in out[node]:
+                entry = terms[idx]
+                yield i + 1 - len(entry.term), i + 1, entry
+
+
+def load_terms(path: Path) -> list[SensitiveTerm]:
+    """Load a term dictionary file.
+
+    Args:
+        path: Path to a TSV dictionary (term, category, scope)
+
+    Returns:
+        Parsed entries; malformed scopes fall back to "both"
+    """
+    entries: list[SensitiveTerm] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        cols = [c.strip() for c in line.split("\t")]
+        category = cols[1] if len(cols) > 1 and cols[1] else DEFAULT_CATEGORY
+        scope = cols[2] if len(cols) > 2 and cols[2] in _SCOPES else "both"
+        entries.append(SensitiveTerm(cols[0], category, scope))  # type: ignore[arg-type]
+    return entries
+
+
+class SensitiveTermDetector:
+    """Hot-reloadable sensitive-term detector.
+
+    Combines built-in terms with an optional dictionary file and keeps one
+    compiled automaton per scan scope.
+    """
+
+    def __init__(
+        self,
+        builtin: Iterable[SensitiveTerm] = (),
+        path: Path | None = None,
+        reload_interval_s: float = DEFAULT_RELOAD_INTERVAL_S,
+    ) -> None:
+        self.builtin = list(builtin)
+        self.path = path
+        self.reload_interval_s = reload_interval_s
+        self._lock = threading.Lock()
+        self._mtime: float | None = None
+        self._checked_at = 0.0
+        self._automata: dict[str, AhoCorasick] = {}
+        self.reload()
+
+    @classmethod
+    def from_env(cls, builtin: Iterable[SensitiveTerm] = ()) -> "SensitiveTermDetector":
+        """Build a detector from SENSITIVE_TERMS_PATH / SENSITIVE_TERMS_RELOAD_S."""
+        raw_path = os.environ.get("SENSITIVE_TERMS_PATH", "")
+        return cls(
+            builtin=builtin,
+            path=Path(raw_path) if raw_path else None,
+            reload_interval_s=float(
+                os.environ.get("SENSITIVE_TERMS_RELOAD_S", DEFAULT_RELOAD_INTERVAL_S)
+            ),
+        )
+
+    def reload(self) -> None:
+        """Recompile the automata from the built-in terms and the dictionary file.
+
+        A file that cannot be read or parsed (missing, bad encoding, malformed
+        line) is logged; the previously loaded automata stay in use until the
+        file changes again (built-in terms only if nothing was loaded yet).
+        """
+        entries = list(self.builtin)
+        mtime: float | None = None
+        if self.path is not None:
+            try:
+                mtime = self.path.stat().st_mtime
+                entries.extend(load_terms(self.path))
+            except (OSError, ValueError) as e:
+                logger.warning(
+                    "sensitive_terms_load_failed", extra={"path": str(self.path), "error": str(e)}
+                )
+                with self._lock:
+                    if self._automata:
+                        self._mtime = mtime
+                        self._checked_at = time.monotonic()
+                        return
+        automata = {
+            scope: AhoCorasick(e for e in entries if e.scope in (scope, "both"))
+            for scope in ("query", "document")
+        }
+        with self._lock:
+            self._automata = automata
+            self._mtime = mtime
+            self._checked_at = time.monotonic()
+        logger.info(
+            "sensitive_terms_loaded",
+            extra={
+                "path": str(self.path) if self.path else None,
+                "terms": len(entries),
+            },
+        )
+
+    def _maybe_reload(self) -> None:
+        """Reload if the dictionary file changed since the last check."""
+        if self.path is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at < self.reload_interval_s:
+                return
+            self._checked_at = now
+            known_mtime = self._mtime
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return
+        if mtime != known_mtime:
+            self.reload()
+
+    def scan(self, text: str, scope: Literal["query", "document"]) -> list[TermMatch]:
+        """Find all dictionary terms applicable to scope in text.
+
+        Args:
+            text: Query or document content
+            scope: Which kind of text is being scanned
+
+        Returns:
+            Matches in order of end position
+        """
+        self._maybe_reload()
+        automaton = self._automata[scope]
+        return [
+            TermMatch(entry.term, entry.category, start, end)
+            for start, end, entry in automaton.iter_matches(text)
+        ]
+
+    def term_count(self) -> int:
+        """Number of distinct entries across scopes."""
+        return len({t for a in self._automata.values() for t in a.terms})
@@ -2,19 +2,39 @@
 # Agent   : backend_dev
 # Task    : Python Lambda + Pydantic + pytest 実装
 # Created : 2026-02-23T18:56:39
-# Updated : 2026-02-23
+# Updated : 2026-10-19
 # [/DEBUG] ===========================================================
 
 """FastAPI local development server for docker compose."""
 
 import os
+from typing import Any
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-
-from .core import run_experiment
+from fastapi.responses import PlainTextResponse
+
+from .core import (
+    ReviewNotFoundError,
+    bulk_review,
+    list_reviews,
+    llm_scheduler_stats,
+    metrics_text,
+    resume_review,
+    run_experiment_async,
+)
 from .logger import get_logger
-from .models import ExperimentRequest, ExperimentResponse
+from .metrics import PROMETHEUS_CONTENT_TYPE
+from .models import (
+    BulkReviewRequest,
+    BulkReviewResponse,
+    ExperimentRequest,
+    ExperimentResponse,
+    ReviewDecision,
+    ReviewQueuePage,
+)
+from .profiling import header_requests_profile
+from .scheduler import SchedulerRejectedError
 
 logger = get_logger(__name__)
 
@@ -48,21 +68,133 @@ def health() -> dict[str, str]:
     return {"status": "ok", "version": "1.0.0"}
 
 
+@app.get("/api/scheduler")
+def scheduler() -> dict[str, Any]:
+    """LLM scheduler queue depth and wait-time counters.
+
+    Returns:
+        Scheduler stats snapshot
+    """
+    return llm_scheduler_stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Prometheus scrape endpoint: node duration histograms and workflow counters.
+
+    Returns:
+        Text exposition format 0.0.4
+    """
+    return PlainTextResponse(metrics_text(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 @app.post("/api/run", response_model=ExperimentResponse)
-async def run(request: ExperimentRequest) -> ExperimentResponse:
+async def run(
+    request: ExperimentRequest,
+    x_rag_profile: str | None = Header(default=None),
+) -> ExperimentResponse:
     """Run the RAG HITL experiment.
 
     Args:
         request: ExperimentRequest with query and parameters
+        x_rag_profile: "1"/"true" to profile this request (X-RAG-Profile header)
 
     Returns:
         ExperimentResponse with answer and sources
 
     Raises:
-        HTTPException: 500 on internal error
+        HTTPException: 429/503 with Retry-After when the LLM queue rejects, 500 on internal error
+    """
+    try:
+        return await run_experiment_async(request, profile=header_requests_profile(x_rag_profile))
+    except SchedulerRejectedError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": e.retry_after_header},
+        ) from e
+    except Exception as e:
+        logger.error("server_error", extra={"error": str(e)}, exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error") from e
+
+
+@app.post("/api/review/{request_id}", response_model=ExperimentResponse)
+def review(request_id: str, decision: ReviewDecision) -> ExperimentResponse:
+    """Resume a run paused for HITL review.
+
+    Sync route: FastAPI runs it in the threadpool, so the resumed generation
+    does not block the event loop.
+
+    Args:
+        request_id: Request ID (review_id) of the paused run
+        decision: Reviewer decision
+
+    Returns:
+        ExperimentResponse of the resumed run
+
+    Raises:
+        HTTPException: 404 if nothing is awaiting review, 429/503 on LLM queue rejection,
+            500 on internal error
+    """
+    try:
+        return resume_review(request_id, decision)
+    except ReviewNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    except SchedulerRejectedError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": e.retry_after_header},
+        ) from e
+    except Exception as e:
+        logger.error("server_error", extra={"error": str(e)}, exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error") from e
+
+
+@app.get("/api/reviews", response_model=ReviewQueuePage)
+def reviews(
+    reason: str | None = None,
+    keyword: str | None = None,
+    min_age_s: float | None = Query(default=None, ge=0),
+    max_age_s: float | None = Query(default=None, ge=0),
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = None,
+) -> ReviewQueuePage:
+    """Pending HITL reviews, oldest first, with keyset pagination.
+
+    Returns:
+        One page of the review queue
+
+    Raises:
+        HTTPException: 400 on a malformed cursor
+    """
+    try:
+        return list_reviews(reason, keyword, min_age_s, max_age_s, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@app.post("/api/reviews/bulk", response_model=BulkReviewResponse)
+def reviews_bulk(request: BulkReviewRequest) -> BulkReviewResponse:
+    """Approve or reject many paused runs at once.
+
+    Args:
+        request: Review IDs and the decision to apply
+
+    Returns:
+        Per-item outcomes
+
+    Raises:
+        HTTPException: 429/503 with Retry-After when the LLM queue rejects, 500 on internal error
     """
     try:
-        return run_experiment(request)
+        return bulk_review(request)
+    except SchedulerRejectedError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": e.retry_after_header},
+        ) from e
     except Exception as e:
         logger.error("server_error", extra={"error": str(e)}, exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error") from e
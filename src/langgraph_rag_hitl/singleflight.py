@@ -0,0 +1,114 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : 同一クエリのリクエスト合流（single-flight）
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Single-flight coalescing of identical in-flight computations.
+
+Concurrent callers that present the same key attach to the one computation
+already running for that key and all receive its result (or its exception).
+Works from plain threads (``do``) and from asyncio code (``do_async``); both
+paths share the same in-flight table, so a thread and a coroutine asking for
+the same key also coalesce.
+"""
+
+import asyncio
+import threading
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    """An in-flight computation and the number of callers that joined it."""
+
+    __slots__ = ("future", "dups")
+
+    def __init__(self) -> None:
+        self.future: Future[T] = Future()
+        self.dups = 0
+
+
+class SingleFlight(Generic[T]):
+    """Deduplicate concurrent calls that share a key.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running wait for the leader's result instead of
+    starting their own computation. The key is released as soon as the
+    leader finishes, so later calls compute afresh.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call[T]] = {}
+
+    def _join(self, key: Hashable) -> tuple[_Call[T], bool]:
+        """Register interest in key.
+
+        Returns:
+            (call, is_leader) tuple
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.dups += 1
+                return call, False
+            call = _Call()
+            self._calls[key] = call
+            return call, True
+
+    def _run(self, key: Hashable, call: _Call[T], fn: Callable[[], T]) -> None:
+        """Run fn as leader and publish its outcome to every waiter."""
+        try:
+            result = fn()
+        except BaseException as exc:  # noqa: BLE001 - re-raised to every waiter
+            with self._lock:
+                self._calls.pop(key, None)
+            call.future.set_exception(exc)
+        else:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> tuple[T, bool]:
+        """Run fn once per concurrent key from a synchronous caller.
+
+        Args:
+            key: Coalescing key
+            fn: Zero-argument function computing the result
+
+        Returns:
+            (result, shared) where shared is False only for the leader
+        """
+        call, is_leader = self._join(key)
+        if is_leader:
+            self._run(key, call, fn)
+        return call.future.result(), not is_leader
+
+    async def do_async(self, key: Hashable, fn: Callable[[], T]) -> tuple[T, bool]:
+        """Run blocking fn once per concurrent key from a coroutine.
+
+        The leader executes fn in the default executor so the event loop stays
+        free; followers await the shared future without occupying a thread.
+
+        Args:
+            key: Coalescing key
+            fn: Zero-argument blocking function computing the result
+
+        Returns:
+            (result, shared) where shared is False only for the leader
+        """
+        call, is_leader = self._join(key)
+        if is_leader:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._run, key, call, fn)
+        return await asyncio.wrap_future(call.future), not is_leader
+
+    def in_flight(self) -> int:
+        """Return the number of keys currently being computed."""
+        with self._lock:
+            return len(self._calls)
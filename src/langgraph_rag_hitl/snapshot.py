@@ -0,0 +1,179 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : Lambda コールドスタート最適化（索引スナップショット）
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Prebuilt HybridRetriever index snapshots.
+
+Building the passage index (tokenization, BM25 statistics, keyword ids) is
+the dominant cold-start cost once the corpus grows. A snapshot stores the
+built retriever so a Lambda container only deserializes it during init.
+
+File layout: ``SNAPSHOT_MAGIC``, a pickled header dict (format version,
+corpus version, counts, passage settings) and the pickled retriever. The
+header can be read without loading the index.
+
+Snapshots are pickles: load only files produced by your own build (e.g.
+baked into the container image), never user-supplied ones.
+
+Usage:
+    python -m src.langgraph_rag_hitl.snapshot --output /var/task/index.snapshot
+"""
+
+import argparse
+import gc
+import pickle
+import platform
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from . import core
+from .core import HybridRetriever, PassageRetriever
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+SNAPSHOT_MAGIC: bytes = b"RAGIDX\x00"
+SNAPSHOT_FORMAT_VERSION: int = 1
+
+
+class SnapshotError(ValueError):
+    """The file is not a snapshot of a supported format version."""
+
+
+def save_snapshot(retriever: HybridRetriever, path: str | Path) -> dict[str, Any]:
+    """Write a built retriever to path.
+
+    Args:
+        retriever: Built HybridRetriever
+        path: Destination file (written atomically via a temp file)
+
+    Returns:
+        The header stored with the snapshot
+    """
+    header = {
+        "format": SNAPSHOT_FORMAT_VERSION,
+        "corpus_version": retriever.corpus_version,  # Also cached in the pickled retriever
+        "speeches": len(retriever.speeches),
+        "passages": len(retriever.passages),
+        "passage_size": retriever.passage_size,
+        "passage_overlap": retriever.passage_overlap,
+        "pruned_tokens": len(retriever.pruned_tokens),
+        "created_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(retriever, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(path)
+    return header
+
+
+def _read_header(f: Any) -> dict[str, Any]:
+    if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+        raise SnapshotError("not an index snapshot")
+    header = pickle.load(f)
+    if header.get("format") != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotError(
+            f"unsupported snapshot format {header.get('format')} (expected {SNAPSHOT_FORMAT_VERSION})"
+        )
+    return header
+
+
+def read_snapshot_header(path: str | Path) -> dict[str, Any]:
+    """Read a snapshot's header without loading the index.
+
+    Raises:
+        SnapshotError: Wrong magic or format version
+    """
+    with Path(path).open("rb") as f:
+        return _read_header(f)
+
+
+def load_snapshot(path: str | Path) -> HybridRetriever:
+    """Load a retriever written by save_snapshot.
+
+    Args:
+        path: Snapshot file
+
+    Returns:
+        The built HybridRetriever
+
+    Raises:
+        SnapshotError: Wrong magic or format version
+        OSError: File cannot be read
+    """
+    with Path(path).open("rb") as f:
+        _read_header(f)
+        # The index is millions of small containers; collector passes over
+        # them while unpickling only cost time (nothing is garbage yet)
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            retriever = pickle.load(f)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+    if not isinstance(retriever, HybridRetriever):
+        raise SnapshotError(f"snapshot holds {type(retriever).__name__}, not HybridRetriever")
+    return retriever
+
+
+def load_retriever(
+    snapshot_path: str | Path | None, index_url: str | None = None
+) -> tuple[PassageRetriever, str]:
+    """Open the configured index, falling back to a corpus build.
+
+    Preference: the blocked index at index_url (read lazily from object
+    storage, see blocked_index.py), then the snapshot, then the corpus. An
+    index that cannot be opened is logged and the next option is tried, so
+    a bad artifact degrades start-up time rather than failing it.
+
+    Args:
+        snapshot_path: Snapshot file, or None
+        index_url: Blocked index location (``s3://...``, ``file://...``), or None
+
+    Returns:
+        (retriever, source) with source "object_storage", "snapshot" or "corpus"
+    """
+    if index_url:
+        from .blocked_index import BlockedIndexError, BlockedIndexRetriever
+
+        try:
+            return BlockedIndexRetriever.from_url(index_url), "object_storage"
+        except (OSError, KeyError, ValueError, BlockedIndexError, ImportError) as e:
+            logger.warning("blocked_index_open_failed", extra={"url": index_url, "error": str(e)})
+    if snapshot_path:
+        try:
+            return load_snapshot(snapshot_path), "snapshot"
+        except (OSError, SnapshotError, pickle.UnpicklingError) as e:
+            logger.warning("snapshot_load_failed", extra={"path": str(snapshot_path), "error": str(e)})
+    return HybridRetriever(core._load_corpus()), "corpus"
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Build a HybridRetriever index snapshot from the corpus")
+    parser.add_argument("--output", type=Path, required=True, help="Snapshot file to write")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    retriever = HybridRetriever(core._load_corpus())
+    build_s = time.perf_counter() - start
+    header = save_snapshot(retriever, args.output)
+    print(
+        f"{args.output}: {header['speeches']} speeches, {header['passages']} passages, "
+        f"corpus {header['corpus_version']}, built in {build_s:.2f}s, "
+        f"{args.output.stat().st_size / (1024 * 1024):.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
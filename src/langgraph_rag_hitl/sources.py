@@ -0,0 +1,356 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : 複数検索ソースの並列ファンアウト（ソース別期限・ヘッジ・RRF 融合）
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Pluggable retrieval sources and concurrent fan-out.
+
+A RetrievalSource returns ranked Passages for a query. FanOutRetriever
+queries every source concurrently; each source has its own timeout and an
+optional hedge delay after which a duplicate request is sent (first answer
+wins). Whatever arrived before the deadlines is fused with weighted RRF, so
+a slow or failing source only drops its own results. A call abandoned at its
+deadline keeps its worker until it returns, so SourceSlots caps the running
+calls per source across requests; a source at its cap is skipped
+("saturated") instead of taking the rest of the shared pool.
+
+Sources:
+- LocalCorpusSource: the in-process HybridRetriever
+- OpenSearchSource: any OpenSearch-compatible ``POST /{index}/_search`` endpoint
+  (OPENSEARCH_ENDPOINT, OPENSEARCH_INDEX, OPENSEARCH_TIMEOUT_S, OPENSEARCH_HEDGE_AFTER_S).
+  Remote speeches are cut to the local index's passages (PASSAGE_SIZE with
+  PASSAGE_OVERLAP); the passage sharing most query characters is returned.
+"""
+
+import os
+import threading
+import time
+from collections.abc import Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from typing import Any, Protocol
+
+from .logger import get_logger
+from .models import Passage
+
+logger = get_logger(__name__)
+
+FANOUT_RRF_K: int = 60
+DEFAULT_SOURCE_TIMEOUT_S: float = 2.0
+DEFAULT_OPENSEARCH_INDEX: str = "kokkai-speeches"
+FANOUT_MAX_WORKERS: int = 8
+FANOUT_MAX_INFLIGHT_PER_SOURCE: int = FANOUT_MAX_WORKERS // 2  # Running calls one source may hold
+
+
+class RetrievalSource(Protocol):
+    """A ranked document source."""
+
+    name: str
+    timeout_s: float
+    hedge_after_s: float | None
+    weight: float
+
+    def search(self, query: str, top_k: int, user_roles: list[str]) -> list[Passage]:
+        """Return up to top_k documents, best first."""
+        ...
+
+
+class _Retriever(Protocol):
+    def retrieve(
+        self, query: str, top_k: int, user_roles: list[str] | None = None
+    ) -> list[Passage]: ...
+
+
+@dataclass
+class LocalCorpusSource:
+    """The in-process HybridRetriever as a retrieval source."""
+
+    retriever: _Retriever
+    name: str = "local"
+    timeout_s: float = 5.0
+    hedge_after_s: float | None = None
+    weight: float = 1.0
+
+    def search(self, query: str, top_k: int, user_roles: list[str]) -> list[Passage]:
+        return self.retriever.retrieve(query, top_k=top_k, user_roles=user_roles)
+
+
+@dataclass
+class OpenSearchSource:
+    """OpenSearch-compatible HTTP search over indexed speech records.
+
+    Documents are expected to carry the Kokkai API speech fields
+    (speechID, speaker, date, speech, nameOfHouse, nameOfMeeting) and an
+    optional allowed_roles keyword field used for permission filtering.
+    """
+
+    endpoint: str
+    index: str = DEFAULT_OPENSEARCH_INDEX
+    name: str = "opensearch"
+    timeout_s: float = DEFAULT_SOURCE_TIMEOUT_S
+    hedge_after_s: float | None = None
+    weight: float = 1.0
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_env(cls) -> "OpenSearchSource | None":
+        """Build a source from OPENSEARCH_* variables; None when no endpoint is set."""
+        endpoint = os.environ.get("OPENSEARCH_ENDPOINT", "")
+        if not endpoint:
+            return None
+        hedge = os.environ.get("OPENSEARCH_HEDGE_AFTER_S", "")
+        return cls(
+            endpoint=endpoint,
+            index=os.environ.get("OPENSEARCH_INDEX", DEFAULT_OPENSEARCH_INDEX),
+            timeout_s=float(os.environ.get("OPENSEARCH_TIMEOUT_S", DEFAULT_SOURCE_TIMEOUT_S)),
+            hedge_after_s=float(hedge) if hedge else None,
+        )
+
+    def _body(self, query: str, top_k: int, user_roles: list[str]) -> dict[str, Any]:
+        match = {"multi_match": {"query": query, "fields": ["speech", "speaker"]}}
+        if "public" in user_roles:
+            return {"size": top_k, "query": match}
+        role_filter = {
+            "bool": {
+                "should": [
+                    {"terms": {"allowed_roles": user_roles}},
+                    {"bool": {"must_not": {"exists": {"field": "allowed_roles"}}}},
+                ]
+            }
+        }
+        return {"size": top_k, "query": {"bool": {"must": match, "filter": role_filter}}}
+
+    def search(self, query: str, top_k: int, user_roles: list[str]) -> list[Passage]:
+        import httpx  # Deferred: only deployments with OpenSearch configured need it
+
+        url = f"{self.endpoint.rstrip('/')}/{self.index}/_search"
+        with httpx.Client(timeout=self.timeout_s) as client:
+            response = client.post(url, json=self._body(query, top_k, user_roles), headers=self.headers)
+            response.raise_for_status()
+            hits = response.json().get("hits", {}).get("hits", [])
+
+        # Deferred: core imports this module
+        from .core import PASSAGE_OVERLAP, PASSAGE_SIZE, _split_passages
+
+        max_score = max((float(h.get("_score") or 0.0) for h in hits), default=0.0) or 1.0
+        query_chars = set(query)
+        docs: list[Passage] = []
+        for hit in hits[:top_k]:
+            src = hit.get("_source", {})
+            text = str(src.get("speech") or "")
+            # Same passages as the local index; keep the one sharing most query characters
+            start, end = max(
+                _split_passages(text, PASSAGE_SIZE, PASSAGE_OVERLAP),
+                key=lambda span: len(query_chars & set(text[span[0] : span[1]])),
+            )
+            # Passages skip validation, so coerce the remote fields here
+            docs.append(
+                Passage(
+                    speech_id=str(src.get("speechID", hit.get("_id", ""))),
+                    speaker=str(src.get("speaker") or ""),
+                    date=str(src.get("date") or ""),
+                    content=text[start:end],
+                    score=min(max(float(hit.get("_score") or 0.0) / max_score, 0.0), 1.0),
+                    house=str(src.get("nameOfHouse") or ""),
+                    meeting=str(src.get("meetingName") or src.get("nameOfMeeting") or ""),
+                    passage_start=start,
+                    passage_end=end,
+                )
+            )
+        return docs
+
+
+class SourceSlots:
+    """Thread-safe cap on the running calls per source name, shared across requests.
+
+    A slot is held until the call's worker finishes, not until the request
+    stops waiting for it.
+    """
+
+    def __init__(self, per_source: int = FANOUT_MAX_INFLIGHT_PER_SOURCE) -> None:
+        self.per_source = max(per_source, 1)
+        self._lock = threading.Lock()
+        self._running: dict[str, int] = {}
+
+    def try_acquire(self, name: str) -> bool:
+        """Take a slot for name; False if the source is at its cap."""
+        with self._lock:
+            if self._running.get(name, 0) >= self.per_source:
+                return False
+            self._running[name] = self._running.get(name, 0) + 1
+            return True
+
+    def release(self, name: str) -> None:
+        """Return a slot taken by try_acquire."""
+        with self._lock:
+            self._running[name] -= 1
+
+    def running(self, name: str) -> int:
+        """Calls of name still occupying a worker."""
+        with self._lock:
+            return self._running.get(name, 0)
+
+
+@dataclass
+class FanOutResult:
+    """Fused documents plus per-source outcome."""
+
+    docs: list[Passage]
+    statuses: dict[str, str]  # name -> ok | hedged | timeout | saturated | error:<Type>
+    per_source: dict[str, list[Passage]]
+    latency_ms: dict[str, float]
+
+
+def rrf_fuse(
+    ranked_lists: Sequence[tuple[float, list[Passage]]], top_k: int
+) -> list[Passage]:
+    """Fuse ranked lists with weighted RRF, keeping the best-ranked copy per speech.
+
+    Args:
+        ranked_lists: (weight, documents best-first) per source
+        top_k: Number of documents to return
+
+    Returns:
+        Fused documents with scores normalized to 0-1
+    """
+    scores: dict[str, float] = {}
+    best: dict[str, tuple[int, Passage]] = {}
+    for weight, docs in ranked_lists:
+        for rank, doc in enumerate(docs):
+            scores[doc.speech_id] = scores.get(doc.speech_id, 0.0) + weight / (FANOUT_RRF_K + rank + 1)
+            if doc.speech_id not in best or rank < best[doc.speech_id][0]:
+                best[doc.speech_id] = (rank, doc)
+    ranked = sorted(scores, key=lambda sid: scores[sid], reverse=True)[:top_k]
+    max_score = max((scores[sid] for sid in ranked), default=1.0) or 1.0
+    return [replace(best[sid][1], score=scores[sid] / max_score) for sid in ranked]
+
+
+class FanOutRetriever:
+    """Queries several sources concurrently under per-source deadlines."""
+
+    def __init__(
+        self,
+        sources: Sequence[RetrievalSource],
+        executor: ThreadPoolExecutor,
+        slots: SourceSlots | None = None,
+    ) -> None:
+        self.sources = list(sources)
+        self.executor = executor
+        # Share one SourceSlots with every retriever using the same executor
+        self.slots = slots if slots is not None else SourceSlots()
+
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        user_roles: list[str],
+        deadline: float | None = None,
+    ) -> FanOutResult:
+        """Query every source and fuse what arrives in time.
+
+        A single responding source is returned as-is (no re-scoring).
+
+        Args:
+            query: Search query
+            top_k: Number of documents to return
+            user_roles: Roles for permission filtering
+            deadline: Overall time.monotonic() deadline capping every source's timeout
+
+        Returns:
+            FanOutResult with fused documents and per-source statuses
+        """
+        start = time.monotonic()
+        by_name = {s.name: s for s in self.sources}
+        deadline_at = {
+            s.name: min(start + s.timeout_s, deadline if deadline is not None else float("inf"))
+            for s in self.sources
+        }
+        hedge_at = {
+            s.name: start + s.hedge_after_s for s in self.sources if s.hedge_after_s is not None
+        }
+        pending: dict[Future[list[Passage]], str] = {}
+        attempts: dict[str, int] = {}
+
+        def launch(name: str) -> bool:
+            if not self.slots.try_acquire(name):
+                return False
+            source = by_name[name]
+            fut = self.executor.submit(source.search, query, top_k, user_roles)
+            # Runs on completion or cancellation, after this request may have stopped waiting
+            fut.add_done_callback(lambda _: self.slots.release(name))
+            pending[fut] = name
+            attempts[name] = attempts.get(name, 0) + 1
+            return True
+
+        results: dict[str, list[Passage]] = {}
+        statuses: dict[str, str] = {}
+        latency_ms: dict[str, float] = {}
+
+        for source in self.sources:
+            if not launch(source.name):
+                statuses[source.name] = "saturated"
+                latency_ms[source.name] = 0.0
+                hedge_at.pop(source.name, None)
+                logger.warning("retrieval_source_saturated", extra={"source": source.name})
+
+        def settle(name: str, status: str) -> None:
+            statuses[name] = status
+            latency_ms[name] = round((time.monotonic() - start) * 1000, 2)
+            for fut in [f for f, n in pending.items() if n == name]:
+                fut.cancel()
+                del pending[fut]
+
+        while pending:
+            now = time.monotonic()
+            for name in [n for n in hedge_at if n not in statuses and attempts[n] == 1]:
+                if now >= hedge_at[name] and not launch(name):
+                    del hedge_at[name]  # No slot for a hedge; keep waiting on the first attempt
+            for name in {n for n in pending.values() if now >= deadline_at[n]}:
+                settle(name, "timeout")
+            if not pending:
+                break
+
+            open_names = set(pending.values())
+            events = [deadline_at[n] for n in open_names]
+            events += [hedge_at[n] for n in open_names if n in hedge_at and attempts[n] == 1]
+            done, _ = wait(list(pending), timeout=max(0.0, min(events) - now), return_when=FIRST_COMPLETED)
+
+            for fut in done:
+                name = pending.pop(fut, None)
+                if name is None or name in statuses:
+                    continue
+                exc = fut.exception()
+                if exc is None:
+                    results[name] = fut.result()
+                    settle(name, "ok" if attempts[name] == 1 else "hedged")
+                elif name not in pending.values():
+                    settle(name, f"error:{type(exc).__name__}")
+                    logger.warning(
+                        "retrieval_source_error", extra={"source": name, "error": str(exc)}
+                    )
+
+        for source in self.sources:
+            if source.name not in statuses:  # Every attempt failed before its deadline
+                statuses[source.name] = "error"
+
+        responded = [(by_name[n].weight, docs) for n, docs in results.items()]
+        if len(responded) == 1:
+            fused = responded[0][1][:top_k]
+        else:
+            fused = rrf_fuse(responded, top_k)
+
+        logger.info(
+            "retrieval_fanout",
+            extra={"statuses": statuses, "latency_ms": latency_ms, "docs": len(fused)},
+        )
+        return FanOutResult(docs=fused, statuses=statuses, per_source=results, latency_ms=latency_ms)
+
+
+def external_sources_from_env() -> list[RetrievalSource]:
+    """External sources configured through the environment (may be empty)."""
+    sources: list[RetrievalSource] = []
+    if (opensearch := OpenSearchSource.from_env()) is not None:
+        sources.append(opensearch)
+    return sources
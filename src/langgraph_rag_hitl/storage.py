@@ -0,0 +1,280 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : オブジェクトストレージからの範囲読み出しによる索引の遅延ロード
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Object storage with byte-range reads and a local block cache.
+
+Backends implement ObjectStorage (``get_range`` / ``put`` / ``size``):
+
+- LocalFileStorage: a directory (``file:///path`` or a plain path)
+- InMemoryStorage: a dict, for tests; counts requests and bytes served
+- S3Storage: an S3 bucket (``s3://bucket/prefix``) via boto3, which the
+  Lambda runtime provides; imported only when used
+
+BlockCache sits in front of a backend and keeps fixed-size, aligned blocks
+of objects as files in a local directory (``/tmp`` on Lambda), so repeated
+reads of the same region cost one remote request. Adjacent missing blocks
+are fetched with a single range request. The cache is bounded (LRU by
+bytes) and namespaced, so a rebuilt index never reads stale blocks.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Protocol
+
+DEFAULT_CACHE_DIR: str = "/tmp/langgraph_rag_hitl_index_cache"
+DEFAULT_CACHE_BLOCK_SIZE: int = 256 * 1024
+DEFAULT_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # Lambda /tmp defaults to 512 MB
+
+
+class ObjectStorage(Protocol):
+    """Key/value object store with byte-range reads."""
+
+    def get_range(self, key: str, start: int, length: int) -> bytes:
+        """Return up to length bytes of key from start (fewer at the end of the object)."""
+        ...
+
+    def put(self, key: str, data: bytes) -> None:
+        """Create or replace key."""
+        ...
+
+    def size(self, key: str) -> int:
+        """Object size in bytes."""
+        ...
+
+
+class LocalFileStorage:
+    """Objects as files under a root directory."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def get_range(self, key: str, start: int, length: int) -> bytes:
+        with self._path(key).open("rb") as f:
+            f.seek(start)
+            return f.read(length)
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+
+    def size(self, key: str) -> int:
+        return self._path(key).stat().st_size
+
+
+class InMemoryStorage:
+    """Objects in a dict; records every range request for tests."""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.requests = 0
+        self.bytes_served = 0
+
+    def get_range(self, key: str, start: int, length: int) -> bytes:
+        data = self.objects[key][start : start + length]
+        self.requests += 1
+        self.bytes_served += len(data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        self.objects[key] = bytes(data)
+
+    def size(self, key: str) -> int:
+        return len(self.objects[key])
+
+
+class S3Storage:
+    """Objects in an S3 bucket under a key prefix."""
+
+    def __init__(self, bucket: str, prefix: str = "", client: Any = None) -> None:
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self._client = client
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            try:
+                import boto3
+            except ImportError as e:
+                raise ImportError("S3Storage requires boto3 (included in the AWS Lambda runtime)") from e
+            self._client = boto3.client("s3")
+        return self._client
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def get_range(self, key: str, start: int, length: int) -> bytes:
+        response = self.client.get_object(
+            Bucket=self.bucket, Key=self._key(key), Range=f"bytes={start}-{start + length - 1}"
+        )
+        return response["Body"].read()
+
+    def put(self, key: str, data: bytes) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=self._key(key), Body=data)
+
+    def size(self, key: str) -> int:
+        return int(self.client.head_object(Bucket=self.bucket, Key=self._key(key))["ContentLength"])
+
+
+def storage_from_url(url: str) -> ObjectStorage:
+    """Backend for ``s3://bucket/prefix``, ``file:///path`` or a plain directory path.
+
+    Raises:
+        ValueError: Unsupported URL scheme
+    """
+    if url.startswith("s3://"):
+        bucket, _, prefix = url.removeprefix("s3://").partition("/")
+        return S3Storage(bucket, prefix)
+    if url.startswith("file://"):
+        return LocalFileStorage(url.removeprefix("file://"))
+    if "://" in url:
+        raise ValueError(f"unsupported storage URL: {url}")
+    return LocalFileStorage(url)
+
+
+class BlockCache:
+    """Read-through cache of aligned object blocks in a local directory.
+
+    Thread-safe. Blocks are immutable once written (files are renamed into
+    place), so concurrent readers never see partial blocks; two threads
+    missing the same block may both fetch it.
+    """
+
+    def __init__(
+        self,
+        storage: ObjectStorage,
+        cache_dir: str | Path = DEFAULT_CACHE_DIR,
+        namespace: str = "",
+        block_size: int = DEFAULT_CACHE_BLOCK_SIZE,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ) -> None:
+        self.storage = storage
+        self.block_size = block_size
+        self.max_bytes = max_bytes
+        self.dir = Path(cache_dir) / (namespace or "default")
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._lru: OrderedDict[str, int] = OrderedDict()  # Block file name -> size
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.remote_requests = 0
+        self.remote_bytes = 0
+        # Blocks left by an earlier process in the same container
+        for path in sorted(self.dir.glob("*.blk"), key=lambda p: p.stat().st_mtime):
+            size = path.stat().st_size
+            self._lru[path.name] = size
+            self._bytes += size
+
+    @classmethod
+    def from_env(cls, storage: ObjectStorage, namespace: str = "") -> "BlockCache":
+        """Configure from INDEX_CACHE_DIR, INDEX_CACHE_MAX_MB and INDEX_CACHE_BLOCK_KB."""
+        return cls(
+            storage,
+            cache_dir=os.environ.get("INDEX_CACHE_DIR", DEFAULT_CACHE_DIR),
+            namespace=namespace,
+            block_size=int(os.environ.get("INDEX_CACHE_BLOCK_KB", DEFAULT_CACHE_BLOCK_SIZE // 1024)) * 1024,
+            max_bytes=int(os.environ.get("INDEX_CACHE_MAX_MB", DEFAULT_CACHE_MAX_BYTES // (1024 * 1024)))
+            * 1024
+            * 1024,
+        )
+
+    def _name(self, key: str, block: int) -> str:
+        return f"{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}-{block}.blk"
+
+    def _cached(self, name: str) -> bytes | None:
+        with self._lock:
+            if name not in self._lru:
+                return None
+            self._lru.move_to_end(name)
+        try:
+            return (self.dir / name).read_bytes()
+        except FileNotFoundError:  # Evicted by another thread meanwhile
+            return None
+
+    def _store(self, name: str, data: bytes) -> None:
+        tmp = self.dir / f"{name}.{threading.get_ident()}.tmp"
+        tmp.write_bytes(data)
+        tmp.replace(self.dir / name)
+        with self._lock:
+            if name in self._lru:
+                return
+            self._lru[name] = len(data)
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes and len(self._lru) > 1:
+                old, size = self._lru.popitem(last=False)
+                self._bytes -= size
+                (self.dir / old).unlink(missing_ok=True)
+
+    def read(self, key: str, start: int, length: int) -> bytes:
+        """Read length bytes of key from start through the cache.
+
+        Args:
+            key: Object key
+            start: First byte
+            length: Bytes to read
+
+        Returns:
+            The bytes (fewer only at the end of the object)
+        """
+        if length <= 0:
+            return b""
+        first, last = start // self.block_size, (start + length - 1) // self.block_size
+        blocks: dict[int, bytes] = {}
+        missing: list[int] = []
+        for block in range(first, last + 1):
+            data = self._cached(self._name(key, block))
+            if data is None:
+                missing.append(block)
+            else:
+                blocks[block] = data
+        with self._lock:
+            self.hits += len(blocks)
+            self.misses += len(missing)
+
+        # One range request per run of adjacent missing blocks
+        runs: list[list[int]] = []
+        for block in missing:
+            if runs and runs[-1][-1] == block - 1:
+                runs[-1].append(block)
+            else:
+                runs.append([block])
+        for run in runs:
+            offset = run[0] * self.block_size
+            data = self.storage.get_range(key, offset, len(run) * self.block_size)
+            with self._lock:
+                self.remote_requests += 1
+                self.remote_bytes += len(data)
+            for i, block in enumerate(run):
+                chunk = data[i * self.block_size : (i + 1) * self.block_size]
+                blocks[block] = chunk
+                self._store(self._name(key, block), chunk)
+
+        joined = b"".join(blocks[b] for b in range(first, last + 1))
+        offset = start - first * self.block_size
+        return joined[offset : offset + length]
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss and remote transfer counters."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "remote_requests": self.remote_requests,
+                "remote_bytes": self.remote_bytes,
+                "cached_bytes": self._bytes,
+                "cached_blocks": len(self._lru),
+            }
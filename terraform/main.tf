@@ -2,7 +2,7 @@
 # Agent   : architect
 # Task    : Terraform + Docker + docker-compose 設定
 # Created : 2026-02-23T18:56:02
-# Updated : 2026-02-23
+# Updated : 2026-10-19
 # [/DEBUG] ===========================================================
 
 # ---------------------------------------------------------------------------
@@ -267,6 +267,8 @@ resource "aws_lambda_function" "api" {
       OPENSEARCH_ENDPOINT       = aws_opensearchserverless_collection.rag.collection_endpoint
       OPENSEARCH_COLLECTION_ARN = aws_opensearchserverless_collection.rag.arn
       PROJECT_NAME              = var.project_name
+      # 分割索引（python -m src.langgraph_rag_hitl.blocked_index で作成）。範囲読み出しで遅延ロード
+      INDEX_STORAGE_URL         = "s3://${aws_s3_bucket.experiments.id}/index/kokkai"
     }
   }
 
@@ -2,7 +2,7 @@
 # Agent   : backend_dev
 # Task    : Python Lambda + Pydantic + pytest 実装
 # Created : 2026-02-23T18:56:39
-# Updated : 2026-02-23T18:56:39
+# Updated : 2026-10-19
 # [/DEBUG] ===========================================================
 
 """pytest fixtures for LangGraph RAG HITL tests.
@@ -10,6 +10,7 @@
 All fixtures mock external dependencies (Ollama) so tests pass without API keys.
 """
 
+from pathlib import Path
 from typing import Any
 from unittest.mock import MagicMock, patch
 
@@ -153,3 +154,44 @@ def lambda_context() -> MagicMock:
     context = MagicMock()
     context.aws_request_id = "test-request-id-12345"
     return context
+
+
+@pytest.fixture(autouse=True)
+def workflow_checkpointer(tmp_path: Path):
+    """Give each test its own SQLite checkpoint database.
+
+    Keeps paused HITL runs from leaking between tests that reuse request IDs.
+    """
+    from src.langgraph_rag_hitl import core
+    from src.langgraph_rag_hitl.checkpoint import SQLiteCheckpointSaver
+
+    saver = SQLiteCheckpointSaver(str(tmp_path / "checkpoints.sqlite"), serde=core._checkpoint_serde)
+    with (
+        patch.object(core, "_checkpointer", saver),
+        patch.object(core._workflow, "checkpointer", saver),
+    ):
+        yield saver
+    saver.close()
+
+
+@pytest.fixture(autouse=True)
+def review_queue(tmp_path: Path):
+    """Give each test its own HITL review queue database."""
+    from src.langgraph_rag_hitl import core
+    from src.langgraph_rag_hitl.review_queue import ReviewQueue
+
+    queue = ReviewQueue(str(tmp_path / "reviews.sqlite"))
+    with patch.object(core, "_review_queue", queue):
+        yield queue
+    queue.close()
+
+
+@pytest.fixture(autouse=True)
+def approval_cache():
+    """Give each test an empty approved-answer cache."""
+    from src.langgraph_rag_hitl import core
+    from src.langgraph_rag_hitl.approval_cache import ApprovedAnswerCache
+
+    cache = ApprovedAnswerCache()
+    with patch.object(core, "_approval_cache", cache):
+        yield cache
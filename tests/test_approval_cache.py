@@ -0,0 +1,130 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : HITL 承認済み回答キャッシュ
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for the reviewer-approved answer cache."""
+
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from src.langgraph_rag_hitl.approval_cache import ApprovedAnswer, ApprovedAnswerCache, approval_key
+from src.langgraph_rag_hitl.core import invalidate_approvals, resume_review, run_experiment
+from src.langgraph_rag_hitl.models import ExperimentRequest, ReviewDecision, SourceDocument
+
+SENSITIVE_QUERY = "予算の配分について"
+APPROVED_ANSWER = "予算の配分について審議が行われました。"
+
+
+def _doc(speech_id: str, content: str = "予算の審議") -> SourceDocument:
+    return SourceDocument(speech_id=speech_id, speaker="A", date="2026-01-01", content=content, score=0.5)
+
+
+def _approve(query: str, request_id: str, roles: list[str] | None = None) -> None:
+    """Run a sensitive query into review and approve it."""
+    request = ExperimentRequest(query=query, user_roles=roles or ["public"])
+    assert run_experiment(request, request_id).requires_review
+    with patch("src.langgraph_rag_hitl.core._call_ollama", return_value=APPROVED_ANSWER):
+        resume_review(request_id, ReviewDecision(approved=True, reviewer="r1"))
+
+
+class TestApprovedAnswerCache:
+    """Tests for ApprovedAnswerCache keys, expiry and invalidation."""
+
+    def test_key_normalizes_query_and_roles(self) -> None:
+        """Width, whitespace and role order do not change the key; content does."""
+        docs = [_doc("s1"), _doc("s2")]
+        a = approval_key(" 予算　について ", ["b", "a"], docs, "v1")
+        b = approval_key("予算 について", ["a", "b"], list(reversed(docs)), "v1")
+        assert a == b
+        assert a != approval_key("予算 について", ["a"], docs, "v1")
+        assert a != approval_key("予算 について", ["a", "b"], docs, "v2")
+        assert a != approval_key("予算 について", ["a", "b"], [_doc("s1", "改訂"), _doc("s2")], "v1")
+
+    def test_expiry(self) -> None:
+        """Entries older than the TTL miss and are dropped."""
+        cache = ApprovedAnswerCache(ttl_s=10.0)
+        key = approval_key("q", ["public"], [_doc("s1")], "v1")
+        cache.put(key, ApprovedAnswer("a", "r", "", approved_at=100.0, speech_ids=frozenset({"s1"})))
+        assert cache.get(key, now=105.0) is not None
+        assert cache.get(key, now=111.0) is None
+        assert cache.stats()["expired_total"] == 1
+
+    def test_invalidate_sources(self) -> None:
+        """Invalidating a speech drops every approval built on it."""
+        cache = ApprovedAnswerCache()
+        key = approval_key("q", ["public"], [_doc("s1"), _doc("s2")], "v1")
+        cache.put(key, ApprovedAnswer("a", "r", "", 0.0, frozenset({"s1", "s2"})))
+        assert cache.invalidate_sources(["s2"]) == 1
+        assert cache.get(key, now=0.0) is None
+
+
+class TestApprovalFlow:
+    """Approvals published by reviewers are reused by later matching requests."""
+
+    def test_approved_answer_served_from_cache(self, mock_load_corpus: MagicMock) -> None:
+        """A matching request skips review and generation after an approval."""
+        _approve(SENSITIVE_QUERY, "first")
+
+        with patch("src.langgraph_rag_hitl.core._call_ollama") as generation:
+            response = run_experiment(ExperimentRequest(query=f" {SENSITIVE_QUERY} "), "second")
+
+        generation.assert_not_called()
+        assert not response.requires_review
+        assert response.answer == APPROVED_ANSWER
+        assert response.workflow_steps[-1] == "hitl:cached_approval"
+        assert response.hitl_review is None
+
+    def test_publishing_ignores_later_workflow_steps(self, mock_load_corpus: MagicMock) -> None:
+        """Publishing keys off the generation flag, not the last workflow step."""
+        from src.langgraph_rag_hitl import core
+
+        generate = core._node_generate
+
+        def generate_then_mark(state: Any) -> Any:
+            state = generate(state)
+            state["workflow_steps"].append("metrics:recorded")
+            return state
+
+        request = ExperimentRequest(query=SENSITIVE_QUERY)
+        assert run_experiment(request, "first").requires_review
+        with (
+            patch.object(core, "_node_generate", generate_then_mark),
+            patch.object(core, "_workflow", core._build_workflow().compile(checkpointer=core._checkpointer)),
+            patch("src.langgraph_rag_hitl.core._call_ollama", return_value=APPROVED_ANSWER),
+        ):
+            resumed = resume_review("first", ReviewDecision(approved=True, reviewer="r1"))
+        assert resumed.workflow_steps[-1] == "metrics:recorded"
+        assert run_experiment(request, "second").answer == APPROVED_ANSWER
+
+    def test_rejection_is_not_cached(self, mock_load_corpus: MagicMock) -> None:
+        """Rejected runs do not publish anything."""
+        run_experiment(ExperimentRequest(query=SENSITIVE_QUERY), "first")
+        resume_review("first", ReviewDecision(approved=False))
+        assert run_experiment(ExperimentRequest(query=SENSITIVE_QUERY), "second").requires_review
+
+    def test_roles_do_not_share_approvals(self, mock_load_corpus: MagicMock) -> None:
+        """An approval for one role set does not serve another."""
+        _approve(SENSITIVE_QUERY, "first", roles=["public"])
+        request = ExperimentRequest(query=SENSITIVE_QUERY, user_roles=["public", "admin"])
+        assert run_experiment(request, "second").requires_review
+
+    def test_changed_source_documents_miss(
+        self, mock_load_corpus: MagicMock, sample_speeches: list[dict[str, Any]]
+    ) -> None:
+        """Editing a source speech (new corpus version) sends the query back to review."""
+        _approve(SENSITIVE_QUERY, "first")
+        edited = [dict(s) for s in sample_speeches]
+        edited[0]["speech"] += " 追記があります。"
+        mock_load_corpus.return_value = edited
+        assert run_experiment(ExperimentRequest(query=SENSITIVE_QUERY), "second").requires_review
+
+    def test_explicit_invalidation(
+        self, mock_load_corpus: MagicMock, sample_speeches: list[dict[str, Any]]
+    ) -> None:
+        """invalidate_approvals drops approvals built on the given speeches."""
+        _approve(SENSITIVE_QUERY, "first")
+        assert invalidate_approvals([s["speechID"] for s in sample_speeches]) == 1
+        assert run_experiment(ExperimentRequest(query=SENSITIVE_QUERY), "second").requires_review
@@ -0,0 +1,74 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : 合成コーパスによる検索・索引ベンチマーク
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for the synthetic corpus generator, benchmark comparison and cold-start modes."""
+
+import json
+from pathlib import Path
+
+from benchmarks.cold_start import mode_env, write_corpus
+from benchmarks.retrieval import compare, run_size
+from benchmarks.synthetic import generate_queries, generate_speeches
+
+
+class TestSyntheticCorpus:
+    """The generator is deterministic and shaped like Kokkai records."""
+
+    def test_deterministic(self) -> None:
+        """Same size and seed give identical records; another seed differs."""
+        first = list(generate_speeches(50, seed=1))
+        assert first == list(generate_speeches(50, seed=1))
+        assert first != list(generate_speeches(50, seed=2))
+        assert len({s["speechID"] for s in first}) == 50
+
+    def test_record_shape(self) -> None:
+        """Records carry the keys the retriever and loaders read."""
+        record = next(generate_speeches(1))
+        for key in ("speechID", "speaker", "date", "speech", "nameOfHouse", "nameOfMeeting"):
+            assert record[key]
+
+    def test_query_lengths(self) -> None:
+        """Length classes are ordered by size."""
+        short, medium, long = (generate_queries(5, n) for n in ("short", "medium", "long"))
+        assert max(map(len, short)) < min(map(len, long))
+        assert medium != short
+
+
+class TestBenchmark:
+    """The benchmark runs at small scale and detects regressions."""
+
+    def test_run_size_reports_metrics(self) -> None:
+        """A small in-process run produces every metric group."""
+        result = run_size(200, queries_per_length=3)
+        assert result["documents"] == 200
+        assert set(result["retrieve"]) == {"short", "medium", "long"}
+        assert result["rewrite_round"]["p50_ms"] > 0
+
+    def test_compare_flags_regressions_beyond_slack(self) -> None:
+        """Only increases beyond both the tolerance and the noise slack fail."""
+        baseline = {"results": {"100": {"build_s": 1.0, "retrieve": {"short": {"p95_ms": 10.0}}}}}
+        slower = {"results": {"100": {"build_s": 1.0, "retrieve": {"short": {"p95_ms": 20.0}}}}}
+        noisy = {"results": {"100": {"build_s": 1.04, "retrieve": {"short": {"p95_ms": 10.9}}}}}
+        assert compare(slower, baseline) == ["100:retrieve.short.p95_ms 10 -> 20 (+100%)"]
+        assert compare(noisy, baseline) == []
+
+
+class TestColdStart:
+    """Cold-start modes differ only in their init environment."""
+
+    def test_mode_env(self, tmp_path: Path) -> None:
+        """Only the snapshot mode points at the snapshot; before disables init work."""
+        snapshot = tmp_path / "index.snapshot"
+        base = {"AWS_LAMBDA_FUNCTION_NAME": "fn", "INDEX_SNAPSHOT_PATH": "/stale"}
+        assert mode_env("before", base, snapshot) == {"LAMBDA_WARM_START": "0"}
+        assert mode_env("init_build", base, snapshot) == {"LAMBDA_WARM_START": "1"}
+        assert mode_env("init_snapshot", base, snapshot)["INDEX_SNAPSHOT_PATH"] == str(snapshot)
+
+    def test_write_corpus_is_loadable(self, tmp_path: Path) -> None:
+        """The synthetic corpus file has the Kokkai speechRecord layout."""
+        path = write_corpus(tmp_path, 10)
+        assert len(json.loads(path.read_text(encoding="utf-8"))["speechRecord"]) == 10
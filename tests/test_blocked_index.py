@@ -0,0 +1,211 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : オブジェクトストレージからの範囲読み出しによる索引の遅延ロード
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for the blocked index, storage backends and the block cache."""
+
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import generate_queries, generate_speeches
+from src.langgraph_rag_hitl.blocked_index import (
+    DENSE_ABSENT_TERM_PREFIX,
+    DOCS_OBJECT,
+    INDEX_OBJECT,
+    BlockedIndexError,
+    BlockedIndexRetriever,
+    write_blocked_index,
+)
+from src.langgraph_rag_hitl.core import HybridRetriever, set_shared_retriever
+from src.langgraph_rag_hitl.snapshot import load_retriever
+from src.langgraph_rag_hitl.storage import (
+    BlockCache,
+    InMemoryStorage,
+    LocalFileStorage,
+    S3Storage,
+    storage_from_url,
+)
+
+QUERIES: list[str] = [
+    *generate_queries(8, "short"),
+    *generate_queries(8, "long"),
+    "国会 審議",  # Space: dense overlap of the separator
+    "存在しない語句",
+]
+
+
+@pytest.fixture(scope="module")
+def synthetic() -> HybridRetriever:
+    return HybridRetriever(list(generate_speeches(400, seed=3)))
+
+
+@pytest.fixture
+def storage(synthetic: HybridRetriever) -> InMemoryStorage:
+    backend = InMemoryStorage()
+    write_blocked_index(synthetic, backend, terms_per_block=64, doc_block_bytes=8 * 1024)
+    backend.requests = backend.bytes_served = 0
+    return backend
+
+
+@pytest.fixture
+def opened(storage: InMemoryStorage, tmp_path: Path) -> BlockedIndexRetriever:
+    return BlockedIndexRetriever(storage, BlockCache(storage, tmp_path / "cache", block_size=4096))
+
+
+@pytest.fixture(autouse=True)
+def no_shared_retriever() -> Iterator[None]:
+    yield
+    set_shared_retriever(None)
+
+
+class TestBlockedIndexRetriever:
+    """Rankings, documents and keyword ids match the in-memory retriever."""
+
+    @pytest.mark.parametrize("collapse", [True, False])
+    def test_same_results_as_hybrid(
+        self, synthetic: HybridRetriever, opened: BlockedIndexRetriever, collapse: bool
+    ) -> None:
+        for query in QUERIES:
+            expected_docs, expected_ids = synthetic.retrieve_with_keywords(query, 5, collapse=collapse)
+            docs, ids = opened.retrieve_with_keywords(query, 5, collapse=collapse)
+            assert docs == expected_docs, query
+            assert all(np.array_equal(a, b) for a, b in zip(ids, expected_ids, strict=True))
+
+    def test_pruned_vocabulary_same_results(self, tmp_path: Path) -> None:
+        """Characters pruned from BM25 keep their dense overlap through dense-only postings."""
+        pruned = HybridRetriever(list(generate_speeches(200, seed=5)), max_df=0.3, min_df=2, stop_tokens=["の"])
+        backend = InMemoryStorage()
+        header = write_blocked_index(pruned, backend, terms_per_block=64)
+        assert header["vocabulary"]["pruned_terms"] == len(pruned.pruned_tokens) > 0
+        opened = BlockedIndexRetriever(backend, BlockCache(backend, tmp_path / "cache"))
+        assert any(opened._postings(DENSE_ABSENT_TERM_PREFIX + c) for c in pruned.pruned_tokens)
+        for query in [*QUERIES, "のの"]:
+            assert opened.retrieve(query, 5, collapse=False) == pruned.retrieve(query, 5, collapse=False), query
+
+    def test_fully_pruned_vocabulary_same_results(self, tmp_path: Path) -> None:
+        """An index without BM25 vocabulary ranks by the dense score, like the in-memory one."""
+        dense_only = HybridRetriever(list(generate_speeches(50, seed=5)), max_df=0.01)
+        assert dense_only._bm25 is None
+        backend = InMemoryStorage()
+        write_blocked_index(dense_only, backend, terms_per_block=64)
+        opened = BlockedIndexRetriever(backend, BlockCache(backend, tmp_path / "cache"))
+        for query in QUERIES:
+            assert opened.retrieve(query, 5, collapse=False) == dense_only.retrieve(query, 5, collapse=False), query
+
+    def test_keyword_ids_match(self, synthetic: HybridRetriever, opened: BlockedIndexRetriever) -> None:
+        for query in QUERIES:
+            assert np.array_equal(opened.query_keyword_ids(query), synthetic.query_keyword_ids(query))
+        docs = synthetic.retrieve(QUERIES[0])
+        for a, b in zip(opened.keyword_ids_for(docs), synthetic.keyword_ids_for(docs), strict=True):
+            assert np.array_equal(a, b)
+
+    def test_corpus_metadata(self, synthetic: HybridRetriever, opened: BlockedIndexRetriever) -> None:
+        assert opened.corpus_version == synthetic.corpus_version
+        assert len(opened.passages) == len(synthetic.passages)
+
+    def test_reads_only_needed_blocks(self, storage: InMemoryStorage, opened: BlockedIndexRetriever) -> None:
+        """Opening and one query transfer a fraction of the stored bytes."""
+        total = sum(len(data) for data in storage.objects.values())
+        opened_bytes = storage.bytes_served
+        assert opened_bytes < total / 4
+
+        opened.retrieve("年金")
+        assert storage.bytes_served < total / 2
+
+    def test_empty_corpus(self, tmp_path: Path) -> None:
+        backend = InMemoryStorage()
+        write_blocked_index(HybridRetriever([]), backend)
+        retriever = BlockedIndexRetriever(backend, BlockCache(backend, tmp_path))
+        assert retriever.retrieve("教育") == []
+
+    def test_rejects_foreign_object(self, tmp_path: Path) -> None:
+        backend = InMemoryStorage()
+        backend.put(INDEX_OBJECT, b"not an index")
+        with pytest.raises(BlockedIndexError):
+            BlockedIndexRetriever(backend, BlockCache(backend, tmp_path))
+
+    def test_load_retriever_prefers_object_storage(
+        self, synthetic: HybridRetriever, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("INDEX_CACHE_DIR", str(tmp_path / "cache"))
+        write_blocked_index(synthetic, LocalFileStorage(tmp_path / "index"))
+
+        retriever, source = load_retriever(None, f"file://{tmp_path / 'index'}")
+
+        assert source == "object_storage"
+        assert retriever.corpus_version == synthetic.corpus_version
+
+    def test_unreadable_index_falls_back(self, tmp_path: Path, mock_load_corpus: MagicMock) -> None:
+        _, source = load_retriever(None, f"file://{tmp_path / 'missing'}")
+        assert source == "corpus"
+
+
+class TestBlockCache:
+    """Blocks are fetched once, coalesced, reused across opens and bounded."""
+
+    def test_second_reader_served_from_disk(self, storage: InMemoryStorage, tmp_path: Path) -> None:
+        first = BlockedIndexRetriever(storage, BlockCache(storage, tmp_path, "ns", block_size=4096))
+        first.retrieve("年金")
+        after_first = storage.requests
+
+        # A new process in the same container: same cache directory, empty memory
+        second = BlockedIndexRetriever(storage, BlockCache(storage, tmp_path, "ns", block_size=4096))
+        second.retrieve("年金")
+        assert storage.requests == after_first + 1  # Only the uncached header probe
+
+    def test_adjacent_blocks_in_one_request(self, tmp_path: Path) -> None:
+        backend = InMemoryStorage()
+        backend.put("obj", bytes(range(256)) * 64)
+        cache = BlockCache(backend, tmp_path, block_size=1024)
+
+        assert cache.read("obj", 100, 5000) == (bytes(range(256)) * 64)[100:5100]
+        assert backend.requests == 1
+        assert cache.read("obj", 2000, 10) == (bytes(range(256)) * 64)[2000:2010]
+        assert backend.requests == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        backend = InMemoryStorage()
+        backend.put("obj", b"x" * 10_000)
+        cache = BlockCache(backend, tmp_path, block_size=1000, max_bytes=3000)
+        for block in range(5):
+            cache.read("obj", block * 1000, 1000)
+
+        assert cache.stats()["cached_bytes"] <= 3000
+        assert len(list(cache.dir.glob("*.blk"))) == 3
+        cache.read("obj", 0, 10)  # Evicted: fetched again
+        assert backend.requests == 6
+
+
+class TestStorage:
+    """Backends resolve from URLs and serve byte ranges."""
+
+    def test_local_file_range(self, tmp_path: Path) -> None:
+        backend = LocalFileStorage(tmp_path)
+        backend.put("a/b.bin", b"0123456789")
+        assert backend.get_range("a/b.bin", 3, 4) == b"3456"
+        assert backend.get_range("a/b.bin", 8, 10) == b"89"
+        assert backend.size("a/b.bin") == 10
+
+    def test_storage_from_url(self, tmp_path: Path) -> None:
+        s3 = storage_from_url("s3://bucket/index/kokkai")
+        assert isinstance(s3, S3Storage)
+        assert (s3.bucket, s3.prefix) == ("bucket", "index/kokkai")
+        assert isinstance(storage_from_url(f"file://{tmp_path}"), LocalFileStorage)
+        with pytest.raises(ValueError):
+            storage_from_url("gs://bucket/x")
+
+    def test_s3_range_request(self) -> None:
+        client = MagicMock()
+        client.get_object.return_value = {"Body": MagicMock(read=MagicMock(return_value=b"abc"))}
+        backend = S3Storage("bucket", "index", client=client)
+
+        assert backend.get_range(DOCS_OBJECT, 10, 3) == b"abc"
+        client.get_object.assert_called_once_with(Bucket="bucket", Key="index/docs.bin", Range="bytes=10-12")
@@ -15,13 +15,17 @@ import json
 from typing import Any
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 
 from src.langgraph_rag_hitl.core import (
     HITL_CONFIDENCE_THRESHOLD,
     MAX_REWRITE_RETRIES,
+    PASSAGE_OVERLAP,
+    PASSAGE_SIZE,
     HybridRetriever,
     RAGState,
+    _keyword_overlaps,
     _node_check_hitl,
     _node_generate,
     _node_grade,
@@ -29,11 +33,13 @@ from src.langgraph_rag_hitl.core import (
     _node_rewrite,
     _should_generate,
     _should_rewrite,
+    _split_passages,
     run_experiment,
 )
 from src.langgraph_rag_hitl.models import (
     ExperimentRequest,
     ExperimentResponse,
+    Passage,
     SourceDocument,
 )
 
@@ -48,13 +54,14 @@ class TestHybridRetriever:
         results = retriever.retrieve("国会 審議", top_k=3)
         assert len(results) <= 3
 
-    def test_retrieve_returns_source_documents(self, sample_speeches: list[dict[str, Any]]) -> None:
-        """HybridRetriever returns SourceDocument instances with valid fields."""
+    def test_retrieve_returns_passages(self, sample_speeches: list[dict[str, Any]]) -> None:
+        """HybridRetriever returns Passage records that convert to valid SourceDocuments."""
         retriever = HybridRetriever(sample_speeches)
         results = retriever.retrieve("教育 政策")
         assert len(results) > 0
         for doc in results:
-            assert isinstance(doc, SourceDocument)
+            assert isinstance(doc, Passage)
+            assert isinstance(doc.to_source(), SourceDocument)
             assert 0.0 <= doc.score <= 1.0
             assert doc.speech_id
             assert doc.date
@@ -89,6 +96,106 @@ class TestHybridRetriever:
         # Top result should have reasonable content
         assert len(results[0].content) > 0
 
+    def test_split_passages_overlap_and_cover(self) -> None:
+        """Passages overlap by PASSAGE_OVERLAP and cover the whole speech."""
+        text = "あ" * (PASSAGE_SIZE * 3)
+        spans = _split_passages(text)
+        assert spans[0] == (0, PASSAGE_SIZE)
+        assert spans[1][0] == PASSAGE_SIZE - PASSAGE_OVERLAP
+        assert spans[-1][1] == len(text)
+        assert all(end - start <= PASSAGE_SIZE for start, end in spans)
+        assert _split_passages("短い発言") == [(0, 4)]
+
+    def test_long_speech_searchable_beyond_opening(
+        self, sample_speeches: list[dict[str, Any]]
+    ) -> None:
+        """Content deep inside a long speech is retrieved as a passage with offsets."""
+        speech = {
+            **sample_speeches[0],
+            "speechID": "long_001",
+            "speech": "ただいまから会議を開きます。" * 60 + "半導体産業への補助金について質問します。",
+        }
+        retriever = HybridRetriever([speech, *sample_speeches[1:]])
+        top = retriever.retrieve("半導体 補助金", top_k=1)[0]
+        assert top.speech_id == "long_001"
+        assert "半導体" in top.content
+        assert top.passage_start > 0
+        assert speech["speech"][top.passage_start : top.passage_end] == top.content
+
+    def test_collapse_returns_one_passage_per_speech(
+        self, sample_speeches: list[dict[str, Any]]
+    ) -> None:
+        """Collapsed retrieval keeps the best passage per speech; uncollapsed may repeat speeches."""
+        long_speech = {**sample_speeches[0], "speech": "教育予算の拡充について。" * 120}
+        retriever = HybridRetriever([long_speech, *sample_speeches[1:]])
+        collapsed = retriever.retrieve("教育予算", top_k=5)
+        assert len({d.speech_id for d in collapsed}) == len(collapsed)
+        passages = retriever.retrieve("教育予算", top_k=5, collapse=False)
+        assert [d.speech_id for d in passages].count("test_001") > 1
+
+    def test_keyword_ids_for_follows_added_speeches(self, sample_speeches: list[dict[str, Any]]) -> None:
+        """The passage lookup is reused across calls and rebuilt after add_speeches."""
+        retriever = HybridRetriever(sample_speeches[:5])
+        docs, ids = retriever.retrieve_with_keywords("国会 審議", 3)
+        assert all(np.array_equal(a, b) for a, b in zip(retriever.keyword_ids_for(docs), ids, strict=True))
+        lookup = retriever._passage_lookup
+        retriever.keyword_ids_for(docs)
+        assert retriever._passage_lookup is lookup
+
+        retriever.add_speeches(sample_speeches[5:])
+        retriever.finish_build()
+        docs, ids = retriever.retrieve_with_keywords("国会 審議", 10)
+        assert all(np.array_equal(a, b) for a, b in zip(retriever.keyword_ids_for(docs), ids, strict=True))
+
+    def test_vocabulary_pruning(self, sample_speeches: list[dict[str, Any]]) -> None:
+        """DF-pruned and stop tokens leave BM25; queries of only pruned tokens rank by dense overlap."""
+        full = HybridRetriever(sample_speeches)
+        pruned = HybridRetriever(sample_speeches, max_df=0.5, stop_tokens=["教育"])
+        assert full.pruned_tokens == frozenset()
+        assert {" ", "教育"} <= pruned.pruned_tokens
+        assert not pruned.pruned_tokens & pruned._bm25.idf.keys()
+        assert pruned.passages == full.passages
+        assert sum(map(len, pruned._bm25.doc_freqs)) < sum(map(len, full._bm25.doc_freqs))
+        assert pruned._bm25.get_scores(pruned._tokenize("教育")).any()  # Unigrams 教 / 育 remain
+        assert len(pruned.retrieve(" ", top_k=3)) == 3
+
+    def test_pruning_same_when_streamed(self, sample_speeches: list[dict[str, Any]]) -> None:
+        """Pruning is decided on the whole corpus, not per batch."""
+        streamed = HybridRetriever([], max_df=0.4, min_df=2)
+        streamed.add_speeches(sample_speeches[:2])
+        streamed.add_speeches(sample_speeches[2:])
+        streamed.finish_build()
+        built = HybridRetriever(sample_speeches, max_df=0.4, min_df=2)
+        assert streamed.pruned_tokens == built.pruned_tokens
+        assert streamed.retrieve("教育 政策") == built.retrieve("教育 政策")
+
+    def test_streamed_add_after_build_prunes_like_one_shot(self, sample_speeches: list[dict[str, Any]]) -> None:
+        """A later batch is pruned on the unpruned tokens of the whole corpus."""
+        streamed = HybridRetriever(sample_speeches[:3], max_df=0.4, min_df=2)
+        streamed.add_speeches(sample_speeches[3:])
+        streamed.finish_build()
+        built = HybridRetriever(sample_speeches, max_df=0.4, min_df=2)
+        assert streamed.pruned_tokens == built.pruned_tokens
+        assert streamed._bm25.idf == built._bm25.idf
+        assert streamed.retrieve("教育 政策") == built.retrieve("教育 政策")
+
+    @pytest.mark.parametrize("kwargs", [{"max_df": 0.01}, {"min_df": 10**6}])
+    def test_fully_pruned_vocabulary_ranks_by_dense(
+        self, sample_speeches: list[dict[str, Any]], kwargs: dict[str, Any]
+    ) -> None:
+        """Cutoffs that prune every token fall back to the dense score instead of failing."""
+        retriever = HybridRetriever(sample_speeches, **kwargs)
+        assert retriever._bm25 is None
+        hits = retriever._search("教育 政策", 3, None, collapse=False)
+        dense = [retriever._dense_score("教育 政策", i) for i in range(len(retriever.passages))]
+        assert [dense[i] for i, _ in hits] == sorted(dense, reverse=True)[:3]
+        assert len(retriever.retrieve("教育 政策", top_k=3)) == 3
+
+    @pytest.mark.parametrize("kwargs", [{"max_df": 0.0}, {"max_df": 1.5}, {"min_df": 0}])
+    def test_invalid_pruning_cutoffs(self, kwargs: dict[str, Any]) -> None:
+        with pytest.raises(ValueError):
+            HybridRetriever([], **kwargs)
+
 
 # --- Workflow Node tests ---
 
@@ -145,6 +252,34 @@ class TestWorkflowNodes:
         # relevant_docs is a subset of retrieved_docs
         assert len(state["relevant_docs"]) <= len(state["retrieved_docs"])
 
+    def test_node_grade_vectorized_matches_regex_grading(self) -> None:
+        """Precomputed keyword-id grading gives the same decisions and reasons as regex grading."""
+        from src.langgraph_rag_hitl.core import DATA_SAMPLE_PATH
+
+        speeches = json.loads(DATA_SAMPLE_PATH.read_text(encoding="utf-8"))["speechRecord"]
+        retriever = HybridRetriever(speeches)
+        for query in ["委員長 予算", "沖縄 北方 問題", "委員長 理事 開会 本日", "これより会議を開きます 委員長"]:
+            state = _node_retrieve(self._make_state(query), retriever)
+            vectorized = _node_grade(dict(state))["graded_docs"]  # type: ignore[arg-type]
+            state.pop("retrieved_keyword_ids")
+            state.pop("query_keyword_ids")
+            regex = _node_grade(dict(state))["graded_docs"]  # type: ignore[arg-type]
+            assert [(g.is_relevant, g.grade_reason) for g in vectorized] == [
+                (g.is_relevant, g.grade_reason) for g in regex
+            ]
+
+    def test_keyword_overlaps_with_shared_ids(self) -> None:
+        """Ids repeated across documents are counted per document, like a set intersection."""
+        rng = np.random.default_rng(0)
+        # Sparse ids and a long query: numpy's sort-based isin path
+        vocab = rng.choice(2_000_000, size=60, replace=False).astype(np.int32)
+        query_ids = np.sort(vocab[:30])
+        doc_ids = [np.sort(rng.choice(vocab[20:], size=8, replace=False)) for _ in range(10)]
+        doc_ids.append(np.empty(0, dtype=np.int32))
+        expected = [len(set(query_ids.tolist()) & set(ids.tolist())) for ids in doc_ids]
+        assert _keyword_overlaps(query_ids, doc_ids) == expected
+        assert _keyword_overlaps(np.empty(0, dtype=np.int32), doc_ids) == [0] * len(doc_ids)
+
     def test_node_rewrite_increments_retry(self) -> None:
         """_node_rewrite increments retry_count and sets rewritten_query."""
         state = self._make_state("教育")
@@ -524,3 +659,28 @@ class TestModels:
         data = response.model_dump()
         assert data["answer"] == "テスト回答"
         assert data["requires_review"] is False
+
+    def test_passage_converts_and_checkpoints(self) -> None:
+        """Passage converts to a validated SourceDocument and survives the checkpoint serde."""
+        from src.langgraph_rag_hitl.core import GradedPassage, _checkpoint_serde
+
+        passage = Passage(speech_id="s1", speaker="A", date="2026-01-01", content="予算", score=0.4)
+        assert passage.to_source() == SourceDocument(
+            speech_id="s1", speaker="A", date="2026-01-01", content="予算", score=0.4
+        )
+        graded = [GradedPassage(passage, True, "keyword_overlap=2")]
+        assert _checkpoint_serde.loads_typed(_checkpoint_serde.dumps_typed(graded)) == graded
+
+    def test_response_body_serialized_from_model(self) -> None:
+        """Lambda response bodies built from models match their JSON dump."""
+        from src.langgraph_rag_hitl.handler import _build_response
+
+        response = ExperimentResponse(
+            answer="回答",
+            sources=[Passage(speech_id="s1", speaker="A", date="d", content="本文", score=1.0).to_source()],
+            processing_time_ms=1.0,
+            request_id="req-001",
+        )
+        body = _build_response(200, response, "req-001")["body"]
+        assert json.loads(body) == response.model_dump()
+        assert "本文" in body  # Not ASCII-escaped
@@ -0,0 +1,140 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : リクエスト単位のレイテンシ予算（deadline_ms）による段階的縮退
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for the per-request latency budget and node degradation."""
+
+import time
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydantic import ValidationError
+
+from src.langgraph_rag_hitl.core import (
+    HybridRetriever,
+    _extractive_answer,
+    _node_generate,
+    _node_grade,
+    _node_retrieve,
+    _should_rewrite,
+    run_experiment,
+)
+from src.langgraph_rag_hitl.models import ExperimentRequest, SourceDocument
+from src.langgraph_rag_hitl.scheduler import DeadlineExceededError, GenerationScheduler
+
+
+def _state(remaining_s: float | None, **extra: Any) -> dict[str, Any]:
+    state: dict[str, Any] = {
+        "query": "教育予算について",
+        "rewritten_query": "",
+        "max_results": 4,
+        "user_roles": ["public"],
+        "workflow_steps": [],
+        "retry_count": 0,
+        "deadline": None if remaining_s is None else time.time() + remaining_s,
+    }
+    state.update(extra)
+    return state
+
+
+def _doc(speech_id: str, content: str) -> SourceDocument:
+    return SourceDocument(speech_id=speech_id, speaker="議員", date="2026-01-01", content=content, score=0.5)
+
+
+class TestDegradation:
+    """Each node degrades according to the remaining budget."""
+
+    def test_deadline_ms_is_bounded(self) -> None:
+        """Budgets below 100 ms are rejected."""
+        with pytest.raises(ValidationError):
+            ExperimentRequest(query="q", deadline_ms=10)
+
+    def test_retrieve_shrinks_depth(self, sample_speeches: list[dict[str, Any]]) -> None:
+        """A nearly spent budget halves the candidate depth."""
+        result = _node_retrieve(_state(0.5), HybridRetriever(sample_speeches))  # type: ignore[arg-type]
+        assert "deadline:shrink_top_k:2" in result["workflow_steps"]
+        assert len(result["retrieved_docs"]) <= 2
+
+    def test_grade_skips_rewrite_when_budget_short(self) -> None:
+        """Too few relevant docs with a short budget goes straight to HITL check."""
+        state = _state(1.0, retrieved_docs=[_doc("s1", "無関係な内容")], retrieved_keyword_ids=[])
+        result = _node_grade(state)  # type: ignore[arg-type]
+        assert "deadline:skip_rewrite" in result["workflow_steps"]
+        assert _should_rewrite(result) == "check_hitl"  # type: ignore[arg-type]
+
+    def test_no_budget_keeps_rewrite_loop(self) -> None:
+        """Without a deadline the rewrite loop is unchanged."""
+        state = _state(None, retrieved_docs=[_doc("s1", "無関係な内容")], retrieved_keyword_ids=[])
+        assert _should_rewrite(_node_grade(state)) == "rewrite"  # type: ignore[arg-type]
+
+    def test_generate_caps_tokens(self) -> None:
+        """A short budget caps num_predict and passes the deadline to the LLM call."""
+        state = _state(4.0, relevant_docs=[_doc("s1", "教育予算の拡充が重要です。")])
+        with patch("src.langgraph_rag_hitl.core._call_ollama", return_value="回答") as call:
+            result = _node_generate(state)  # type: ignore[arg-type]
+        kwargs = call.call_args.kwargs
+        assert kwargs["deadline"] == state["deadline"]
+        assert 32 <= kwargs["num_predict"] <= 80
+        assert f"deadline:cap_tokens:{kwargs['num_predict']}" in result["workflow_steps"]
+
+    def test_generate_extractive_when_nearly_exhausted(self) -> None:
+        """Under the minimum generation budget the LLM is not called."""
+        state = _state(0.2, relevant_docs=[_doc("s1", "前置きです。教育予算の拡充が重要です。")])
+        with patch("src.langgraph_rag_hitl.core._call_ollama") as call:
+            result = _node_generate(state)  # type: ignore[arg-type]
+        call.assert_not_called()
+        assert "教育予算の拡充が重要です。" in result["answer"]
+        assert result["workflow_steps"][-1] == "deadline:extractive"
+
+    def test_generate_extractive_when_queue_misses_deadline(self) -> None:
+        """A scheduler deadline rejection falls back to the extractive answer."""
+        state = _state(30.0, relevant_docs=[_doc("s1", "教育予算の拡充が重要です。")])
+        with patch(
+            "src.langgraph_rag_hitl.core._call_ollama", side_effect=DeadlineExceededError("late", retry_after=1.0)
+        ):
+            result = _node_generate(state)  # type: ignore[arg-type]
+        assert result["workflow_steps"][-1] == "deadline:extractive"
+
+    def test_llm_grade_timeout_leaves_generation_budget(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """With 10.5 s left, the grader's HTTP timeout is what remains after the generation reserve."""
+        monkeypatch.setenv("GRADER_MODE", "llm")
+        state = _state(10.5, query="審議の行方", retrieved_docs=[_doc("grade-budget", "予算の審議")])
+        with patch("src.langgraph_rag_hitl.core._ollama_request", return_value='{"0": true}') as request:
+            result = _node_grade(state)  # type: ignore[arg-type]
+        assert 0 < request.call_args.kwargs["timeout"] <= 0.5
+        assert "deadline:skip_llm_grade" not in result["workflow_steps"]
+
+    def test_llm_grade_queue_wait_bounded(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A busy LLM queue makes the grader fall back instead of eating the generation budget."""
+        monkeypatch.setenv("GRADER_MODE", "llm")
+        scheduler = GenerationScheduler(max_concurrency=1, queue_timeout_s=3.0)
+        monkeypatch.setattr("src.langgraph_rag_hitl.core._llm_scheduler", scheduler)
+        state = _state(10.3, query="審議の行方", retrieved_docs=[_doc("grade-queue", "予算の審議")])
+        with scheduler.slot(), patch("src.langgraph_rag_hitl.core._ollama_request") as request:
+            started = time.monotonic()
+            result = _node_grade(state)  # type: ignore[arg-type]
+            elapsed = time.monotonic() - started
+        request.assert_not_called()
+        assert elapsed < 1.0
+        assert "grade:llm_fallback:DeadlineExceededError" in result["workflow_steps"]
+
+    def test_extractive_answer_picks_overlapping_sentence(self) -> None:
+        """The quoted sentence is the one sharing most query keywords."""
+        answer = _extractive_answer("教育予算", [_doc("s1", "外交の話です。教育予算を増やします。")])
+        assert "教育予算を増やします。" in answer and "外交" not in answer
+
+
+class TestEndToEnd:
+    """deadline_ms flows from the request into the workflow."""
+
+    def test_tight_budget_is_recorded(self, mock_load_corpus: MagicMock) -> None:
+        """A tight budget produces an answer with degradation steps."""
+        with patch("src.langgraph_rag_hitl.core._call_ollama") as call:
+            response = run_experiment(ExperimentRequest(query="教育政策について", deadline_ms=200))
+        call.assert_not_called()
+        assert any(step.startswith("deadline:") for step in response.workflow_steps)
+        assert response.answer
@@ -0,0 +1,255 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : 国会会議録 API の並行・再開可能ダウンロード
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for the concurrent, rate-limited, resumable downloader and incremental sync."""
+
+import asyncio
+import json
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from benchmarks.fake_kokkai import FakeKokkai, generate_records
+from data.download import (
+    CORPUS_FILE_SUFFIXES,
+    MANIFEST_NAME,
+    SYNC_STAGING_DIR,
+    SYNC_STATE_NAME,
+    DownloadManifest,
+    RateLimiter,
+    SyncResult,
+    date_windows,
+    download_corpus,
+    read_corpus_file,
+    sync_corpus,
+)
+from src.langgraph_rag_hitl import core
+
+
+def _download(fake: FakeKokkai, output_dir: Path, **kwargs: Any) -> list[dict[str, Any]]:
+    options: dict[str, Any] = {
+        "total": 0,
+        "batch_size": 20,
+        "concurrency": 4,
+        "rate": 1000.0,
+        "base_url": fake.url,
+        "sample_file": None,
+        "retry_base_delay": 0.01,
+    }
+    options.update(kwargs)
+    return asyncio.run(download_corpus(output_dir=output_dir, **options))
+
+
+def _sync(fake: FakeKokkai, output_dir: Path, lookback_days: int = 0) -> SyncResult:
+    return asyncio.run(
+        sync_corpus(
+            output_dir,
+            from_date="2024-01-01",
+            until_date="2024-02-20",
+            window_days=7,
+            lookback_days=lookback_days,
+            batch_size=20,
+            rate=1000.0,
+            base_url=fake.url,
+            retry_base_delay=0.01,
+        )
+    )
+
+
+def _ids(records: list[dict[str, Any]]) -> list[str]:
+    return [r["speechID"] for r in records]
+
+
+@pytest.fixture
+def records() -> list[dict[str, Any]]:
+    return generate_records(200, seed=1)
+
+
+class TestDownloadCorpus:
+    """Every record exactly once, in order, within the in-flight bound."""
+
+    def test_concurrent_download(self, records: list[dict[str, Any]], tmp_path: Path) -> None:
+        with FakeKokkai(records, latency_s=0.02) as fake:
+            got = _download(fake, tmp_path, concurrency=3)
+
+        assert _ids(got) == _ids(fake.search({}))
+        assert sorted(fake.starts) == list(range(1, 201, 20))
+        assert 1 < fake.max_inflight <= 3
+        assert len(list(tmp_path.glob("kokkai_*.json"))) == 10
+
+    def test_total_and_sample(self, records: list[dict[str, Any]], tmp_path: Path) -> None:
+        with FakeKokkai(records, latency_s=0.0) as fake:
+            got = _download(fake, tmp_path / "corpus", total=50, sample_file=tmp_path / "sample.json")
+
+        assert len(got) == 50
+        assert len(json.loads((tmp_path / "sample.json").read_text())["speechRecord"]) == 10
+
+    def test_resume_fetches_only_missing_batches(self, records: list[dict[str, Any]], tmp_path: Path) -> None:
+        with FakeKokkai(records, latency_s=0.0, fail_starts={61, 141}) as fake:
+            with pytest.raises(RuntimeError, match="2 batches failed"):
+                _download(fake, tmp_path)
+            manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+            assert manifest["completed"] == [[1, 61], [81, 141], [161, 201]]
+
+            fake.fail_starts.clear()
+            fake.starts.clear()
+            got = _download(fake, tmp_path)
+
+        assert sorted(fake.starts) == [61, 141]
+        assert _ids(got) == _ids(fake.search({}))
+
+    def test_completed_run_makes_no_requests(self, records: list[dict[str, Any]], tmp_path: Path) -> None:
+        with FakeKokkai(records, latency_s=0.0) as fake:
+            _download(fake, tmp_path)
+            before = fake.requests
+            assert len(_download(fake, tmp_path)) == 200
+        assert fake.requests == before
+
+    def test_resume_streams_cached_batches(self, records: list[dict[str, Any]], tmp_path: Path) -> None:
+        with FakeKokkai(records, latency_s=0.0) as fake:
+            _download(fake, tmp_path, output_format="jsonl", keep_records=False)
+            before = fake.requests
+            batches: dict[int, list[dict[str, Any]]] = {}
+            kept = _download(
+                fake, tmp_path, output_format="jsonl", keep_records=False, on_batch=batches.__setitem__
+            )
+        assert kept == [] and fake.requests == before
+        assert _ids([r for start in sorted(batches) for r in batches[start]]) == _ids(fake.search({}))
+
+    def test_resume_in_another_format(
+        self, records: list[dict[str, Any]], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Batches saved as .json are reused, not re-fetched as .jsonl next to them."""
+        with FakeKokkai(records, latency_s=0.0) as fake:
+            _download(fake, tmp_path)
+            before = fake.requests
+            got = _download(fake, tmp_path, output_format="jsonl")
+
+        assert fake.requests == before
+        assert _ids(got) == _ids(fake.search({}))
+        assert not list(tmp_path.glob("kokkai_*.jsonl"))
+        monkeypatch.setattr(core, "DATA_CORPUS_DIR", tmp_path)
+        assert len(core._load_corpus()) == 200
+
+    def test_corpus_readers_agree(self, records: list[dict[str, Any]], tmp_path: Path) -> None:
+        """The script's reader and the app's reader stay in step."""
+        assert CORPUS_FILE_SUFFIXES == core.CORPUS_FILE_SUFFIXES
+        with FakeKokkai(records[:40], latency_s=0.0) as fake:
+            for fmt in ("json", "jsonl", "jsonl.gz"):
+                _download(fake, tmp_path / fmt, output_format=fmt)
+        for path in sorted(tmp_path.glob("*/kokkai_*")):
+            assert read_corpus_file(path) == core._read_corpus_file(path)
+
+    def test_slows_down_on_429(self, records: list[dict[str, Any]], tmp_path: Path) -> None:
+        with FakeKokkai(records, latency_s=0.02, max_concurrent=2, retry_after_s=0.02) as fake:
+            got = _download(fake, tmp_path, concurrency=6)
+
+        assert len(got) == 200
+        assert fake.throttled > 0
+
+
+class TestRateLimiter:
+    """Token bucket pacing and adaptive slowdown."""
+
+    def test_paces_requests(self) -> None:
+        async def run() -> float:
+            limiter = RateLimiter(rate=50.0)
+            started = time.monotonic()
+            await asyncio.gather(*(limiter.acquire() for _ in range(11)))
+            return time.monotonic() - started
+
+        assert asyncio.run(run()) >= 0.18  # 10 refills at 50/s
+
+    def test_penalize_and_recover(self) -> None:
+        limiter = RateLimiter(rate=8.0, min_rate=1.0)
+        for _ in range(5):
+            limiter.penalize(0.0)
+        assert limiter.rate == 1.0 and limiter.slowdowns == 5
+        for _ in range(1000):
+            limiter.reward()
+        assert limiter.rate == 8.0
+
+class TestDownloadManifest:
+    """Completed ranges merge; a different query starts over."""
+
+    def test_merge_and_reload(self, tmp_path: Path) -> None:
+        query = {"keyword": "", "from": "2024-01-01", "until": "2024-12-31", "batch_size": 10}
+        manifest = DownloadManifest(tmp_path / MANIFEST_NAME, query)
+        for start in (21, 1, 11):
+            manifest.mark_done(start, 10)
+
+        reloaded = DownloadManifest(tmp_path / MANIFEST_NAME, query)
+        assert reloaded.completed == [[1, 31]]
+        assert reloaded.is_done(11, 10) and not reloaded.is_done(25, 10)
+        assert DownloadManifest(tmp_path / MANIFEST_NAME, {**query, "batch_size": 20}).completed == []
+
+
+class TestSyncCorpus:
+    """Only speeches newer than the last sync are fetched and emitted."""
+
+    def test_initial_then_incremental(self, records: list[dict[str, Any]], tmp_path: Path) -> None:
+        with FakeKokkai(records, latency_s=0.0) as fake:
+            first = _sync(fake, tmp_path)
+            assert sorted(_ids(first.records)) == sorted(_ids(records))
+            assert first.latest_date == "2024-02-02" and first.windows == 8
+            assert not (tmp_path / SYNC_STAGING_DIR).exists()
+
+            # Later speeches on the last synced day and after it
+            added = generate_records(11, seed=2, start=date(2024, 2, 2))
+            fake.records.extend(added)
+            before = fake.requests
+            second = _sync(fake, tmp_path)
+
+        assert sorted(_ids(second.records)) == sorted(_ids(added))
+        assert second.windows == 3  # From 2024-02-02 only
+        assert fake.requests - before == 3
+        assert second.latest_date == "2024-02-03"
+        state = json.loads((tmp_path / SYNC_STATE_NAME).read_text())
+        assert state["latest_speech_id"] == max(r["speechID"] for r in added if r["date"] == "2024-02-03")
+
+        delta = json.loads(second.files[0].read_text())["speechRecord"]
+        assert _ids(delta) == _ids(second.records)
+
+    def test_late_published_older_meeting(self, records: list[dict[str, Any]], tmp_path: Path) -> None:
+        """A meeting dated before the last sync but published after it is still fetched."""
+        with FakeKokkai(records, latency_s=0.0) as fake:
+            _sync(fake, tmp_path, lookback_days=10)
+            late = generate_records(3, seed=3, start=date(2024, 1, 25))
+            fake.records.extend(late)
+            second = _sync(fake, tmp_path, lookback_days=10)
+            third = _sync(fake, tmp_path, lookback_days=10)
+
+        assert sorted(_ids(second.records)) == sorted(_ids(late))  # Dedupe against the lookback span
+        assert second.latest_date == "2024-02-02"
+        assert third.records == []
+        state = json.loads((tmp_path / SYNC_STATE_NAME).read_text())
+        assert min(state["recent_ids"].values()) == "2024-01-23"
+
+    def test_no_changes_emits_nothing(self, records: list[dict[str, Any]], tmp_path: Path) -> None:
+        with FakeKokkai(records, latency_s=0.0) as fake:
+            _sync(fake, tmp_path)
+            again = _sync(fake, tmp_path)
+        assert again.records == [] and again.files == []
+
+    def test_lost_state_is_rebuilt_from_files(self, records: list[dict[str, Any]], tmp_path: Path) -> None:
+        """Delta files written before a crash are not emitted twice."""
+        with FakeKokkai(records, latency_s=0.0) as fake:
+            _sync(fake, tmp_path)
+            (tmp_path / SYNC_STATE_NAME).unlink()
+            assert _sync(fake, tmp_path).records == []
+
+    def test_starts_after_downloaded_corpus(self, records: list[dict[str, Any]], tmp_path: Path) -> None:
+        with FakeKokkai(records, latency_s=0.0) as fake:
+            _download(fake, tmp_path, total=40)  # The newest 40 speeches
+            assert _sync(fake, tmp_path).records == []
+
+    def test_date_windows(self) -> None:
+        windows = date_windows(date(2024, 1, 30), date(2024, 2, 5), 3)
+        assert [(lo.day, hi.day) for lo, hi in windows] == [(30, 1), (2, 4), (5, 5)]
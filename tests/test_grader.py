@@ -0,0 +1,142 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : LLM による一括関連性判定（単一プロンプト・構造化出力）
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for the batched single-call LLM grader."""
+
+import json
+import os
+from typing import Any
+from unittest.mock import patch
+
+import httpx
+
+from src.langgraph_rag_hitl.core import HybridRetriever, _node_grade, _node_retrieve
+from src.langgraph_rag_hitl.grader import BatchLLMGrader, parse_verdicts
+from src.langgraph_rag_hitl.models import SourceDocument
+
+
+def _docs(n: int) -> list[SourceDocument]:
+    return [
+        SourceDocument(speech_id=f"s{i}", speaker="A", date="2026-01-01", content=f"文書{i}", score=0.1)
+        for i in range(n)
+    ]
+
+
+class _FakeLLM:
+    """Records grader prompts and answers with a canned response."""
+
+    def __init__(self, response: str | Exception) -> None:
+        self.response = response
+        self.prompts: list[str] = []
+
+    def __call__(self, prompt: str, system: str) -> str:
+        self.prompts.append(prompt)
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+class TestParseVerdicts:
+    """parse_verdicts tolerates the usual LLM output variations."""
+
+    def test_json_object(self) -> None:
+        text = '{"verdicts": [{"id": 1, "relevant": true, "reason": "予算"}, {"id": 2, "relevant": false}]}'
+        verdicts = parse_verdicts(text, 2)
+        assert verdicts[0].relevant is True and verdicts[0].reason == "予算"
+        assert verdicts[1].relevant is False
+
+    def test_fenced_json_with_prose_and_string_booleans(self) -> None:
+        text = '判定結果です:\n```json\n[{"id": 2, "relevant": "yes"}, {"id": 1, "relevant": "いいえ"}]\n```'
+        verdicts = parse_verdicts(text, 2)
+        assert verdicts[1].relevant is True
+        assert verdicts[0].relevant is False
+
+    def test_line_format_fallback(self) -> None:
+        verdicts = parse_verdicts("文書1: yes\n文書2: no\n文書9: yes", 2)
+        assert {k: v.relevant for k, v in verdicts.items()} == {0: True, 1: False}
+
+    def test_garbage_returns_empty(self) -> None:
+        assert parse_verdicts("I cannot help with that.", 3) == {}
+
+
+class TestBatchLLMGrader:
+    """BatchLLMGrader makes one call per batch, caches verdicts and falls back."""
+
+    def test_single_call_for_all_documents(self) -> None:
+        llm = _FakeLLM(json.dumps({"verdicts": [{"id": i, "relevant": i % 2 == 1} for i in (1, 2, 3)]}))
+        outcome = BatchLLMGrader().grade("予算", _docs(3), [True, True, True], llm)
+        assert len(llm.prompts) == 1
+        assert [v.relevant for v in outcome.verdicts] == [True, False, True]  # type: ignore[union-attr]
+        assert outcome.fallback is None
+        assert outcome.agreement == 2 / 3
+
+    def test_verdicts_cached_per_query_and_document(self) -> None:
+        grader = BatchLLMGrader()
+        llm = _FakeLLM('{"verdicts": [{"id": 1, "relevant": true}, {"id": 2, "relevant": true}]}')
+        grader.grade("予算", _docs(2), [False, False], llm)
+        outcome = grader.grade("予算", _docs(2), [False, False], llm)
+        assert len(llm.prompts) == 1
+        assert outcome.cached == 2
+        grader.grade("教育", _docs(2), [False, False], llm)
+        assert len(llm.prompts) == 2
+
+    def test_timeout_falls_back(self) -> None:
+        llm = _FakeLLM(httpx.ReadTimeout("timed out"))
+        outcome = BatchLLMGrader().grade("予算", _docs(2), [True, False], llm)
+        assert outcome.verdicts == [None, None]
+        assert outcome.fallback == "ReadTimeout"
+
+    def test_partial_parse_falls_back_per_document(self) -> None:
+        llm = _FakeLLM('{"verdicts": [{"id": 2, "relevant": true}]}')
+        outcome = BatchLLMGrader().grade("予算", _docs(2), [False, False], llm)
+        assert outcome.verdicts[0] is None
+        assert outcome.verdicts[1] is not None
+        assert outcome.fallback == "partial_parse"
+
+
+class TestLLMGradeNode:
+    """_node_grade integrates the LLM grader behind GRADER_MODE=llm."""
+
+    def _state(self, retriever: HybridRetriever) -> Any:
+        state = {
+            "query": "教育 政策",
+            "rewritten_query": "",
+            "max_results": 3,
+            "user_roles": ["public"],
+            "workflow_steps": [],
+        }
+        return _node_retrieve(state, retriever)  # type: ignore[arg-type]
+
+    def test_llm_verdicts_override_keyword_grades(self, sample_speeches: list[dict[str, Any]]) -> None:
+        retriever = HybridRetriever(sample_speeches)
+        response = '{"verdicts": [{"id": 1, "relevant": true, "reason": "教育政策"}, {"id": 2, "relevant": false}, {"id": 3, "relevant": false}]}'
+        with (
+            patch.dict(os.environ, {"GRADER_MODE": "llm"}),
+            patch("src.langgraph_rag_hitl.core._llm_grader", BatchLLMGrader()),
+            patch("src.langgraph_rag_hitl.core._ollama_request", return_value=response) as request,
+        ):
+            state = _node_grade(self._state(retriever))
+
+        assert request.call_count == 1
+        assert request.call_args.kwargs["json_format"] is True
+        assert [g.is_relevant for g in state["graded_docs"]] == [True, False, False]
+        assert state["graded_docs"][0].grade_reason == "llm: 教育政策"
+
+    def test_parse_failure_keeps_keyword_grades(self, sample_speeches: list[dict[str, Any]]) -> None:
+        retriever = HybridRetriever(sample_speeches)
+        keyword = _node_grade(self._state(retriever))
+        with (
+            patch.dict(os.environ, {"GRADER_MODE": "llm"}),
+            patch("src.langgraph_rag_hitl.core._llm_grader", BatchLLMGrader()),
+            patch("src.langgraph_rag_hitl.core._ollama_request", return_value="not json"),
+        ):
+            state = _node_grade(self._state(retriever))
+
+        assert [g.grade_reason for g in state["graded_docs"]] == [
+            g.grade_reason for g in keyword["graded_docs"]
+        ]
+        assert "grade:llm_fallback:parse_error" in state["workflow_steps"]
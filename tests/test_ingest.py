@@ -0,0 +1,109 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : ダウンロード中のストリーミング取り込みと索引構築
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for streaming ingest: the index builder and JSONL corpus files."""
+
+import asyncio
+import gzip
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from benchmarks.fake_kokkai import FakeKokkai, generate_records
+from benchmarks.synthetic import generate_queries
+from data.download import download_corpus
+from src.langgraph_rag_hitl import core
+from src.langgraph_rag_hitl.core import HybridRetriever
+from src.langgraph_rag_hitl.ingest import StreamingIndexBuilder
+from src.langgraph_rag_hitl.snapshot import load_snapshot
+
+QUERIES: list[str] = [*generate_queries(6, "short"), *generate_queries(6, "long")]
+
+
+@pytest.fixture
+def records() -> list[dict[str, Any]]:
+    return generate_records(120, seed=4)
+
+
+def _same_results(a: HybridRetriever, b: HybridRetriever) -> bool:
+    return all(a.retrieve(q) == b.retrieve(q) for q in QUERIES)
+
+
+class TestStreamingIndexBuilder:
+    """Batches indexed as they arrive give the index of a one-shot build."""
+
+    def test_out_of_order_batches(self, records: list[dict[str, Any]]) -> None:
+        batches = {start: records[start - 1 : start + 19] for start in range(1, 121, 20)}
+        builder = StreamingIndexBuilder()
+        for start in (21, 1, 61, 41, 101, 81):
+            builder.add(start, batches[start])
+        assert builder.pending == 0
+
+        streamed = builder.finish()
+        built = HybridRetriever(records)
+        assert streamed.corpus_version == built.corpus_version
+        assert streamed.passages == built.passages
+        assert _same_results(streamed, built)
+
+    def test_no_results_until_finished(self, records: list[dict[str, Any]]) -> None:
+        retriever = HybridRetriever([])
+        retriever.add_speeches(records)
+        assert retriever.retrieve(QUERIES[0]) == []
+        retriever.finish_build()
+        assert retriever.retrieve(QUERIES[0])
+
+    def test_write_snapshot(self, records: list[dict[str, Any]], tmp_path: Path) -> None:
+        builder = StreamingIndexBuilder()
+        builder.add(1, records)
+        built = builder.write(snapshot_path=tmp_path / "index.snapshot")
+        assert _same_results(load_snapshot(tmp_path / "index.snapshot"), built)
+
+
+class TestStreamingDownload:
+    """A streamed download leaves JSONL files and a query-ready index."""
+
+    @pytest.mark.parametrize("output_format", ["jsonl", "jsonl.gz"])
+    def test_index_matches_rebuild_from_files(
+        self,
+        records: list[dict[str, Any]],
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        output_format: str,
+    ) -> None:
+        builder = StreamingIndexBuilder()
+        with FakeKokkai(records, latency_s=0.01) as fake:
+            kept = asyncio.run(
+                download_corpus(
+                    total=0,
+                    batch_size=20,
+                    output_dir=tmp_path,
+                    concurrency=4,
+                    rate=1000.0,
+                    base_url=fake.url,
+                    sample_file=None,
+                    output_format=output_format,
+                    on_batch=builder.add,
+                    keep_records=False,
+                )
+            )
+        assert kept == []
+        streamed = builder.finish()
+
+        files = sorted(tmp_path.glob(f"kokkai_*.{output_format}"))
+        assert len(files) == 6
+        opener = gzip.open if output_format.endswith(".gz") else open
+        with opener(files[0], "rt", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 20 and ": " not in lines[0]  # Compact, one record per line
+        assert json.loads(lines[0])["speechID"] == fake.search({})[0]["speechID"]
+
+        monkeypatch.setattr(core, "DATA_CORPUS_DIR", tmp_path)
+        rebuilt = HybridRetriever(core._load_corpus())
+        assert streamed.corpus_version == rebuilt.corpus_version
+        assert _same_results(streamed, rebuilt)
@@ -0,0 +1,69 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : 疑似 Ollama サーバーによる負荷試験ハーネス
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for the fake Ollama server and the load-test driver."""
+
+import time
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from benchmarks.fake_ollama import FakeOllama
+from benchmarks.load import Sample, handler_target, is_saturated, run_open, summarize
+
+
+class TestFakeOllama:
+    """The stand-in honours latency, token rate and error rate."""
+
+    def test_generate_timing_follows_num_predict(self) -> None:
+        """Service time is latency plus tokens / rate."""
+        with FakeOllama(latency_s=0.05, tokens_per_s=200.0) as fake:
+            started = time.monotonic()
+            response = httpx.post(
+                f"{fake.url}/api/generate",
+                json={"model": "m", "prompt": "q", "options": {"num_predict": 20}},
+            )
+            elapsed = time.monotonic() - started
+        assert response.status_code == 200
+        assert response.json()["eval_count"] == 20
+        assert 0.15 <= elapsed < 0.5
+
+    def test_error_rate(self) -> None:
+        """error_rate=1 fails every request with 500."""
+        with FakeOllama(latency_s=0.0, tokens_per_s=1e6, error_rate=1.0) as fake:
+            response = httpx.post(f"{fake.url}/api/generate", json={"prompt": "q"})
+        assert response.status_code == 500
+        assert fake.errors == fake.requests == 1
+
+
+class TestLoadDriver:
+    """The open-loop driver reports throughput, latency and queueing."""
+
+    def test_open_loop_against_handler(
+        self, mock_load_corpus: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Requests through the in-process handler hit the fake Ollama."""
+        with FakeOllama(latency_s=0.01, tokens_per_s=1e5) as fake:
+            monkeypatch.setenv("OLLAMA_HOST", fake.url)
+            samples = run_open(
+                handler_target(), ["教育政策について"], rate=40.0, duration_s=0.5, concurrency=4
+            )
+        summary = summarize(samples)
+        assert summary["requests"] == len(samples) > 0
+        assert summary["error_rate"] == 0.0
+        assert summary["llm_fallback_rate"] == 0.0
+        assert fake.requests > 0
+        assert {"latency", "service_time", "client_queue_wait"} <= set(summary)
+
+    def test_saturation_rules(self) -> None:
+        """Falling behind the offered rate or erroring marks a step saturated."""
+        samples = [Sample(scheduled=i * 0.1, started=i * 0.1, finished=i * 0.1 + 0.05, status=200) for i in range(10)]
+        summary = summarize(samples)
+        assert not is_saturated(10.0, summary, slo_p95_ms=None)
+        assert is_saturated(20.0, summary, slo_p95_ms=None)
+        assert is_saturated(10.0, summary, slo_p95_ms=10.0)
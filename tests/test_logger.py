@@ -0,0 +1,170 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : ノンブロッキング・バッチ書き出しの構造化ログ
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for the structured JSON logger and its batching mode."""
+
+import io
+import json
+import logging
+import sys
+import threading
+from collections.abc import Iterator
+from typing import Any, cast
+
+import numpy as np
+import pytest
+
+from src.langgraph_rag_hitl import logger as logger_module
+from src.langgraph_rag_hitl.logger import (
+    BatchingHandler,
+    EventSampler,
+    StructuredJsonFormatter,
+    flush_logs,
+    get_logger,
+    parse_sample_rates,
+)
+
+
+def _record(msg: str = "retrieve_done", level: int = logging.INFO, **extra: Any) -> logging.LogRecord:
+    record = logging.LogRecord("test", level, __file__, 1, msg, None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def _events(handler: logging.Handler) -> list[dict[str, Any]]:
+    stream = cast(io.StringIO, cast(BatchingHandler, handler).stream)
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+class _BlockingStream(io.StringIO):
+    """Stream whose writes wait until released."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, s: str) -> int:
+        self.release.wait(5.0)
+        return super().write(s)
+
+
+@pytest.fixture
+def handler() -> Iterator[BatchingHandler]:
+    batching = BatchingHandler(io.StringIO(), batch_size=16)
+    batching.setFormatter(StructuredJsonFormatter())
+    yield batching
+    batching.close()
+
+
+class TestStructuredJsonFormatter:
+    """One JSON line with the required fields, extras and error details."""
+
+    def test_schema(self) -> None:
+        line = StructuredJsonFormatter().format(_record(request_id="r1", duration_ms=1.5))
+        data = json.loads(line)
+        assert list(data) == ["event", "level", "ts", "logger", "request_id", "duration_ms"]
+        assert data["event"] == "retrieve_done"
+        assert data["ts"].endswith("+00:00")
+
+    def test_exception(self) -> None:
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord("test", logging.ERROR, __file__, 1, "failed", None, True)
+            record.exc_info = sys.exc_info()
+        error = json.loads(StructuredJsonFormatter().format(record))["error"]
+        assert (error["type"], error["message"]) == ("ValueError", "boom")
+        assert error["stack"]
+
+    def test_same_values_without_orjson(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        record = _record(
+            query="教育", score=np.float64(0.5), count=np.int64(3), steps=("a", "b"), ids={1: "x"}
+        )
+        fast = json.loads(StructuredJsonFormatter().format(record))
+        monkeypatch.setattr(logger_module, "orjson", None)
+        plain = json.loads(StructuredJsonFormatter().format(record))
+        assert fast == plain
+        assert plain["score"] == 0.5 and plain["count"] == "3"
+
+
+class TestBatchingHandler:
+    """Records are written by the background thread, in order, in batches."""
+
+    def test_writes_all_records_in_order(self, handler: BatchingHandler) -> None:
+        for i in range(100):
+            handler.handle(_record(f"event_{i}", i=i))
+        assert handler.flush()
+
+        assert [e["i"] for e in _events(handler)] == list(range(100))
+
+    def test_formats_args_on_the_calling_thread(self, handler: BatchingHandler) -> None:
+        items = ["a"]
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "items=%s", (items,), None)
+        handler.handle(record)
+        items.append("b")
+        handler.flush()
+        assert _events(handler)[0]["event"] == "items=['a']"
+
+    def test_drops_when_full_and_reports(self) -> None:
+        stream = _BlockingStream()
+        batching = BatchingHandler(stream, batch_size=1, queue_size=2)
+        batching.setFormatter(StructuredJsonFormatter())
+        try:
+            for i in range(6):
+                batching.handle(_record(f"event_{i}"))  # Never blocks
+            assert batching.dropped >= 1
+            stream.release.set()
+            assert batching.flush()
+        finally:
+            batching.close()
+        events = _events(batching)
+        reported = [e for e in events if e["event"] == "log_records_dropped"]
+        assert sum(e["dropped"] for e in reported) == batching.dropped
+        assert len(events) - len(reported) == 6 - batching.dropped
+
+
+class TestSampling:
+    """Only named INFO events are sampled; warnings always pass."""
+
+    def test_parse(self) -> None:
+        assert parse_sample_rates(" a=0.1, b=2 ,") == {"a": 0.1, "b": 1.0}
+        with pytest.raises(ValueError):
+            parse_sample_rates("a")
+
+    def test_filter(self) -> None:
+        sampler = EventSampler({"retrieve_done": 0.0, "request_received": 1.0})
+        assert not sampler.filter(_record("retrieve_done"))
+        assert sampler.filter(_record("retrieve_done", level=logging.WARNING))
+        assert sampler.filter(_record("request_received"))
+        assert sampler.filter(_record("experiment_start"))
+
+
+class TestGetLogger:
+    """LOG_ASYNC switches every logger to one shared batching handler."""
+
+    def test_async_mode(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("LOG_ASYNC", "1")
+        monkeypatch.setenv("LOG_SAMPLE_RATES", "noisy=0")
+        monkeypatch.setattr(logger_module, "_batching_handler", None)
+        monkeypatch.setattr(logger_module, "_sampler", None)
+        first, second = get_logger("test_logger.async.a"), get_logger("test_logger.async.b")
+        shared = first.handlers[0]
+        try:
+            assert isinstance(shared, BatchingHandler)
+            assert second.handlers == [shared]
+            shared.stream = io.StringIO()
+
+            first.info("noisy")
+            first.info("kept", extra={"n": 1})
+            flush_logs()
+
+            assert [e["event"] for e in _events(shared)] == ["kept"]
+        finally:
+            for logger in (first, second):
+                logger.handlers.clear()
+                logger.filters.clear()
+            shared.close()
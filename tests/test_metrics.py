@@ -0,0 +1,97 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : ノード別レイテンシ計測と Prometheus /metrics
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for node timing histograms, workflow counters and /metrics."""
+
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from src.langgraph_rag_hitl import core
+from src.langgraph_rag_hitl.core import run_experiment
+from src.langgraph_rag_hitl.metrics import MetricsRegistry
+from src.langgraph_rag_hitl.models import ExperimentRequest
+
+
+class TestMetricsRegistry:
+    """Tests for the Prometheus text exposition."""
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        """Buckets count observations <= le, ending with +Inf, sum and count."""
+        registry = MetricsRegistry()
+        hist = registry.histogram("t_seconds", "Test", ["node"], buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            hist.observe(value, "grade")
+
+        text = registry.render()
+        assert "# TYPE t_seconds histogram" in text
+        assert 't_seconds_bucket{node="grade",le="0.1"} 1' in text
+        assert 't_seconds_bucket{node="grade",le="1"} 2' in text
+        assert 't_seconds_bucket{node="grade",le="+Inf"} 3' in text
+        assert 't_seconds_count{node="grade"} 3' in text
+
+    def test_counter_labels_are_escaped(self) -> None:
+        """Label values are escaped and unlabelled counters render bare."""
+        registry = MetricsRegistry()
+        registry.counter("c_total", "Labelled", ["reason"]).inc('a"b')
+        registry.counter("d_total", "Bare").inc(amount=2)
+        text = registry.render()
+        assert 'c_total{reason="a\\"b"} 1' in text
+        assert "d_total 2" in text
+
+
+class TestWorkflowMetrics:
+    """The workflow records node durations and counters."""
+
+    def test_nodes_are_timed(self, mock_load_corpus: MagicMock, mock_ollama: MagicMock) -> None:
+        """Every executed node adds an observation and a per-request entry."""
+        before = core._node_duration.snapshot("generate")[0]
+        response = run_experiment(
+            ExperimentRequest(query="教育政策について", include_timings=True)
+        )
+
+        assert core._node_duration.snapshot("generate")[0] == before + 1
+        assert response.node_timings_ms is not None
+        assert {"retrieve", "grade", "check_hitl", "generate"} <= set(response.node_timings_ms)
+
+    def test_breakdown_is_opt_in(self, mock_load_corpus: MagicMock, mock_ollama: MagicMock) -> None:
+        """Without include_timings the response carries no breakdown."""
+        assert run_experiment(ExperimentRequest(query="教育政策について")).node_timings_ms is None
+
+    def test_hitl_and_rewrite_counters(
+        self, mock_load_corpus: MagicMock, sample_speeches: list[dict[str, Any]]
+    ) -> None:
+        """A low-confidence query counts its rewrites and its HITL reason."""
+        mock_load_corpus.return_value = sample_speeches[:1]  # At most one relevant document
+        rewrites = core._rewrites.value()
+        reviews = core._hitl_reviews.value("low_confidence")
+        response = run_experiment(ExperimentRequest(query="教育政策について"))
+
+        assert response.requires_review
+        assert core._rewrites.value() == rewrites + core.MAX_REWRITE_RETRIES
+        assert core._hitl_reviews.value("low_confidence") == reviews + 1
+
+    def test_llm_fallback_counter(self, mock_load_corpus: MagicMock) -> None:
+        """An unreachable Ollama is counted as a generation fallback."""
+        fallbacks = core._llm_fallbacks.value("generate")
+        with patch("src.langgraph_rag_hitl.core._ollama_request", side_effect=OSError("down")):
+            run_experiment(ExperimentRequest(query="教育政策について"))
+        assert core._llm_fallbacks.value("generate") == fallbacks + 1
+
+    def test_metrics_endpoint(self, mock_load_corpus: MagicMock, mock_ollama: MagicMock) -> None:
+        """GET /metrics serves the Prometheus exposition."""
+        from fastapi.testclient import TestClient
+
+        from src.langgraph_rag_hitl.server import app
+
+        client = TestClient(app)
+        client.post("/api/run", json={"query": "教育政策について"})
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'rag_node_duration_seconds_count{node="retrieve"}' in response.text
+        assert "# TYPE rag_hitl_reviews_total counter" in response.text
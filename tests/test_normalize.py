@@ -0,0 +1,109 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : 取り込み時のテキスト正規化と定型ブロック除去による索引縮小
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for ingest normalization on the sample corpus."""
+
+import json
+from typing import Any
+
+import pytest
+
+from benchmarks.retrieval_eval import DEFAULT_QUERIES, evaluate_config, load_queries
+from src.langgraph_rag_hitl import core
+from src.langgraph_rag_hitl.core import DATA_SAMPLE_PATH, HybridRetriever
+from src.langgraph_rag_hitl.normalize import RECORD_INFO_SPEAKER, IngestNormalizer, is_roster_line
+
+
+@pytest.fixture(scope="module")
+def sample() -> list[dict[str, Any]]:
+    return json.loads(DATA_SAMPLE_PATH.read_text(encoding="utf-8"))["speechRecord"]
+
+
+def _record_info(records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [r for r in records if r["speaker"] == RECORD_INFO_SPEAKER]
+
+
+class TestIngestNormalizer:
+    """Layout and rosters go; sentences and record fields stay."""
+
+    def test_roster_blocks_removed(self, sample: list[dict[str, Any]]) -> None:
+        raw = _record_info(sample)[0]
+        text = IngestNormalizer().normalize(raw)["speech"]
+
+        assert "井上" not in text and "有安" not in text and "事務局側" not in text
+        assert text.startswith("令和八年二月十八日(水曜日) 午前十時二十分開会 ")
+        assert "本委員を左のとおり指名した。" in text and "出席者は左のとおり。" in text
+        assert "○特別委員長互選" in text
+        assert "\r" not in text and "　" not in text and "  " not in text and "─" not in text
+        assert "井上" in raw["speech"]  # The input record is not modified
+
+    def test_speeches_keep_their_words(self, sample: list[dict[str, Any]]) -> None:
+        normalizer = IngestNormalizer()
+        for raw in sample:
+            if raw["speaker"] == RECORD_INFO_SPEAKER:
+                continue
+            normalized = normalizer.normalize(raw)
+            assert normalized["speechID"] == raw["speechID"]
+            kept = "".join(raw["speech"].replace("─", "").split())
+            assert "".join(normalized["speech"].split()) == kept.replace("（", "(").replace("）", ")")
+
+    def test_roster_rows(self) -> None:
+        assert is_roster_line("　" * 16 + "江島　　潔君")
+        assert is_roster_line("　　　　委員長　　　　横沢　高徳君")
+        assert not is_roster_line("　それでは、委員長に横沢高徳君を指名いたします。")
+        assert not is_roster_line("　　　〔「異議なし」と呼ぶ者あり〕")
+
+    def test_drop_record_info(self, sample: list[dict[str, Any]]) -> None:
+        kept = IngestNormalizer(drop_record_info=True).apply(sample)
+        assert len(kept) == len(sample) - len(_record_info(sample)) == 8
+        assert not _record_info(kept)
+
+    def test_steps_configurable(self) -> None:
+        text = "ＡＢＣ\r\n　　１２３"
+        assert IngestNormalizer().normalize_text(text) == "ABC 123"
+        assert IngestNormalizer(nfkc=False).normalize_text(text) == "ＡＢＣ １２３"
+        assert IngestNormalizer(collapse_whitespace=False).normalize_text(text) == "ABC\n  123"
+
+    def test_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("INGEST_NORMALIZE", raising=False)
+        assert IngestNormalizer.from_env() is None
+        monkeypatch.setenv("INGEST_NORMALIZE", "1")
+        monkeypatch.setenv("INGEST_DROP_RECORD_INFO", "true")
+        assert IngestNormalizer.from_env() == IngestNormalizer(drop_record_info=True)
+
+
+class TestIndexEffect:
+    """Normalization shrinks the index without losing judged speeches."""
+
+    def test_smaller_index(self, sample: list[dict[str, Any]]) -> None:
+        raw = HybridRetriever(sample)
+        normalized = HybridRetriever(IngestNormalizer().apply(sample))
+
+        def postings(r: HybridRetriever) -> int:
+            return sum(len(freqs) for freqs in r._bm25.doc_freqs)
+
+        assert len(normalized.passages) < len(raw.passages)
+        assert postings(normalized) < postings(raw) * 0.7
+
+    def test_eval_reports_normalized_config(self) -> None:
+        queries, qrels = load_queries(DEFAULT_QUERIES)
+        speeches = json.loads(DATA_SAMPLE_PATH.read_text(encoding="utf-8"))["speechRecord"]
+        raw = evaluate_config({"name": "raw"}, speeches, queries, qrels, repeats=1)
+        normalized = evaluate_config({"name": "n", "normalize": True}, speeches, queries, qrels, repeats=1)
+
+        assert normalized["postings"] < raw["postings"]
+        assert normalized["recall@5"] >= raw["recall@5"]
+        assert normalized["params"] == {"normalize": True}
+
+    def test_load_corpus_applies_normalizer(
+        self, sample: list[dict[str, Any]], monkeypatch: pytest.MonkeyPatch, tmp_path: Any
+    ) -> None:
+        monkeypatch.setattr(core, "DATA_CORPUS_DIR", tmp_path)  # Empty: sample fallback
+        monkeypatch.setattr(core, "_ingest_normalizer", IngestNormalizer(drop_record_info=True))
+        loaded = core._load_corpus()
+        assert len(loaded) == 8
+        assert all("\r\n" not in r["speech"] for r in loaded)
@@ -0,0 +1,118 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : リクエスト単位のオプトイン cProfile プロファイラ
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for opt-in per-request profiling."""
+
+import json
+import os
+import pstats
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.langgraph_rag_hitl.core import run_experiment
+from src.langgraph_rag_hitl.models import ExperimentRequest
+from src.langgraph_rag_hitl.profiling import RequestProfiler
+
+
+@pytest.fixture
+def profiler(tmp_path: Path) -> Iterator[RequestProfiler]:
+    """Route profiles to a temporary directory."""
+    instance = RequestProfiler(output_dir=str(tmp_path / "profiles"), allow_requests=True)
+    with patch("src.langgraph_rag_hitl.core._profiler", instance):
+        yield instance
+
+
+class TestRequestProfiler:
+    """Profiles are written only for opted-in or sampled requests."""
+
+    def test_flag_writes_pstats(
+        self, profiler: RequestProfiler, mock_load_corpus: MagicMock, mock_ollama: MagicMock
+    ) -> None:
+        """A flagged request writes loadable stats covering the workflow nodes."""
+        run_experiment(ExperimentRequest(query="教育政策について", profile=True), "req-1")
+
+        stats = pstats.Stats(str(profiler.path_for("req-1")))
+        functions = {name for _, _, name in stats.stats}  # type: ignore[attr-defined]
+        assert {"_node_retrieve", "_node_generate"} <= functions
+
+    def test_unprofiled_request_builds_no_profiler(
+        self, profiler: RequestProfiler, mock_load_corpus: MagicMock, mock_ollama: MagicMock
+    ) -> None:
+        """Without a flag or sampling no profiler is constructed."""
+        with patch("src.langgraph_rag_hitl.profiling.cProfile.Profile") as profile_cls:
+            run_experiment(ExperimentRequest(query="教育政策について"), "req-2")
+        profile_cls.assert_not_called()
+        assert not profiler.output_dir.exists()
+
+    def test_requests_ignored_unless_allowed(
+        self, tmp_path: Path, mock_load_corpus: MagicMock, mock_ollama: MagicMock
+    ) -> None:
+        """A client flag profiles nothing unless PROFILE_ALLOW_REQUESTS is set."""
+        locked = RequestProfiler(output_dir=str(tmp_path / "profiles"))
+        with patch("src.langgraph_rag_hitl.core._profiler", locked):
+            run_experiment(ExperimentRequest(query="教育政策について", profile=True), "req-3")
+        assert not locked.output_dir.exists()
+
+    def test_from_env_gates_requests(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("PROFILE_ALLOW_REQUESTS", raising=False)
+        assert not RequestProfiler.from_env().should_profile(True)
+        monkeypatch.setenv("PROFILE_ALLOW_REQUESTS", "1")
+        assert RequestProfiler.from_env().should_profile(True)
+
+    def test_keeps_newest_profiles(self, tmp_path: Path) -> None:
+        """Profiles beyond max_files are deleted oldest first."""
+        profiler = RequestProfiler(output_dir=str(tmp_path), allow_requests=True, max_files=2)
+        for i in range(4):
+            profiler.run(f"req-{i}", lambda: None)
+            os.utime(profiler.path_for(f"req-{i}"), (i, i))  # Distinct mtimes on coarse filesystems
+        assert sorted(p.name for p in tmp_path.glob("*.pstats")) == ["req-2.pstats", "req-3.pstats"]
+
+    def test_sampling_rate(self) -> None:
+        """Rate 1 always samples, rate 0 never does."""
+        assert RequestProfiler(sample_rate=1.0).should_profile(False)
+        assert not RequestProfiler(sample_rate=0.0).should_profile(False)
+
+    def test_request_id_is_sanitized(self, tmp_path: Path) -> None:
+        """Path separators in request IDs cannot escape the output directory."""
+        path = RequestProfiler(output_dir=str(tmp_path)).path_for("../../etc/x")
+        assert path.parent == tmp_path
+
+    def test_handler_header(
+        self,
+        profiler: RequestProfiler,
+        mock_load_corpus: MagicMock,
+        mock_ollama: MagicMock,
+        lambda_context: MagicMock,
+    ) -> None:
+        """The X-RAG-Profile header profiles a Lambda request."""
+        from src.langgraph_rag_hitl.handler import handler
+
+        event = {
+            "httpMethod": "POST",
+            "path": "/api/run",
+            "headers": {"X-RAG-Profile": "1"},
+            "body": json.dumps({"query": "教育政策について"}),
+        }
+        assert handler(event, lambda_context)["statusCode"] == 200
+        assert profiler.path_for(lambda_context.aws_request_id).exists()
+
+    def test_server_header(
+        self, profiler: RequestProfiler, mock_load_corpus: MagicMock, mock_ollama: MagicMock
+    ) -> None:
+        """The FastAPI route profiles on the executor thread running the workflow."""
+        from fastapi.testclient import TestClient
+
+        from src.langgraph_rag_hitl.server import app
+
+        response = TestClient(app).post(
+            "/api/run", json={"query": "教育政策について"}, headers={"X-RAG-Profile": "true"}
+        )
+        stats = pstats.Stats(str(profiler.path_for(response.json()["request_id"])))
+        assert "_node_generate" in {name for _, _, name in stats.stats}  # type: ignore[attr-defined]
@@ -0,0 +1,88 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : qrels による検索品質とレイテンシのトレードオフ評価
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for the retrieval quality versus latency evaluation."""
+
+from pathlib import Path
+
+import pytest
+
+from benchmarks.retrieval_eval import (
+    DEFAULT_CORPUS,
+    DEFAULT_QUERIES,
+    compare_to_baseline,
+    evaluate_config,
+    load_corpus,
+    load_queries,
+    ndcg_at_k,
+    pareto_front,
+    ranked_speech_ids,
+    recall_at_k,
+    reciprocal_rank,
+)
+
+
+class TestMetrics:
+    """Ranking metrics on hand-computed cases."""
+
+    def test_recall_mrr_and_dedup(self) -> None:
+        """Passages of one speech count once, at their best rank."""
+        ranked = ranked_speech_ids(["a", "a", "x", "b"])
+        assert ranked == ["a", "x", "b"]
+        relevant = {"b": 1, "c": 2}
+        assert recall_at_k(ranked, relevant, 3) == 0.5
+        assert reciprocal_rank(ranked, relevant) == pytest.approx(1 / 3)
+
+    def test_ndcg(self) -> None:
+        """Ideal order scores 1; a relevant document lower down scores less."""
+        relevant = {"a": 2, "b": 1}
+        assert ndcg_at_k(["a", "b"], relevant, 2) == pytest.approx(1.0)
+        assert 0 < ndcg_at_k(["b", "a"], relevant, 2) < 1
+
+    def test_pareto_front(self) -> None:
+        """Dominated configurations are excluded."""
+        rows = [
+            {"name": "fast", "ndcg@5": 0.7, "p95_ms": 1.0, "index_mb": 10.0},
+            {"name": "good", "ndcg@5": 0.9, "p95_ms": 5.0, "index_mb": 10.0},
+            {"name": "worse", "ndcg@5": 0.6, "p95_ms": 6.0, "index_mb": 12.0},
+        ]
+        assert pareto_front(rows, "ndcg@5") == {"fast", "good"}
+
+
+class TestEvaluation:
+    """The bundled query set evaluates against the sample corpus."""
+
+    def test_trec_qrels_override(self, tmp_path: Path) -> None:
+        """A TREC qrels file replaces inline judgments."""
+        qrels_file = tmp_path / "qrels.txt"
+        qrels_file.write_text("q02 0 doc-x 1\n", encoding="utf-8")
+        queries, qrels = load_queries(DEFAULT_QUERIES, qrels_file)
+        assert [qid for qid, _ in queries] == ["q02"]
+        assert qrels["q02"] == {"doc-x": 1}
+
+    def test_default_config_on_sample(self) -> None:
+        """The default retriever finds judged speeches on the sample query set."""
+        queries, qrels = load_queries(DEFAULT_QUERIES)
+        row = evaluate_config({"name": "default"}, load_corpus(DEFAULT_CORPUS), queries, qrels, repeats=1)
+        assert row["recall@5"] > 0.5
+        assert row["mrr"] > 0.5
+        assert row["index_mb"] > 0
+        assert row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"]
+
+    def test_pruning_compared_to_baseline(self) -> None:
+        """Pruned rows report postings saved and top-k overlap against their baseline."""
+        queries, qrels = load_queries(DEFAULT_QUERIES)
+        speeches = load_corpus(DEFAULT_CORPUS)
+        configs = [{"name": "default"}, {"name": "pruned", "max_df": 0.5}, {"name": "same", "baseline": "pruned", "max_df": 0.5}]
+        rows = [evaluate_config(c, speeches, queries, qrels, repeats=1) for c in configs]
+        compare_to_baseline(rows, 5)
+        default, pruned, same = rows
+        assert default["postings_saved"] == 0.0 and default["overlap@5"] == 1.0
+        assert pruned["pruned_terms"] > 0 and pruned["postings_saved"] > 0.1
+        assert 0 < pruned["overlap@5"] <= 1.0
+        assert same["baseline"] == "pruned" and same["overlap@5"] == 1.0
+        assert "baseline" not in same["params"]
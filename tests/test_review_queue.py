@@ -0,0 +1,222 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : HITL レビューキュー（索引付き永続キュー・一括承認）
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for the durable HITL review queue and bulk review."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.langgraph_rag_hitl.core import bulk_review, list_reviews, run_experiment
+from src.langgraph_rag_hitl.models import (
+    BulkReviewRequest,
+    ExperimentRequest,
+    HITLReviewRequest,
+    ReviewDecision,
+)
+from src.langgraph_rag_hitl.review_queue import ReviewQueue
+from src.langgraph_rag_hitl.scheduler import QueueFullError
+
+
+def _review(review_id: str, reason: str = "sensitive_topic", keywords: tuple[str, ...] = ("予算",)) -> HITLReviewRequest:
+    return HITLReviewRequest(
+        reason=reason,  # type: ignore[arg-type]
+        query="予算について",
+        relevant_doc_count=3,
+        sensitive_keywords=list(keywords),
+        review_id=review_id,
+    )
+
+
+class TestReviewQueue:
+    """Tests for ReviewQueue indexing and pagination."""
+
+    def test_pagination_is_oldest_first_and_complete(self, review_queue: ReviewQueue) -> None:
+        """Keyset pages cover every pending item exactly once, oldest first."""
+        for i in range(7):
+            review_queue.enqueue(_review(f"r{i}"), created_at=1000.0 + i)
+
+        seen: list[str] = []
+        cursor = None
+        while True:
+            items, cursor = review_queue.list_pending(limit=3, cursor=cursor)
+            seen.extend(item.review_id for item in items)
+            if cursor is None:
+                break
+        assert seen == [f"r{i}" for i in range(7)]
+
+    def test_filters_by_reason_keyword_and_age(self, review_queue: ReviewQueue) -> None:
+        """Reason, keyword and age filters select the matching pending items."""
+        review_queue.enqueue(_review("a", keywords=("予算",)), created_at=100.0)
+        review_queue.enqueue(_review("b", keywords=("人事", "給与")), created_at=200.0)
+        review_queue.enqueue(_review("c", reason="low_confidence", keywords=()), created_at=300.0)
+
+        def ids(**kwargs: object) -> list[str]:
+            items, _ = review_queue.list_pending(now=400.0, **kwargs)  # type: ignore[arg-type]
+            return [item.review_id for item in items]
+
+        assert ids(reason="low_confidence") == ["c"]
+        assert ids(keyword="給与") == ["b"]
+        assert ids(min_age_s=150.0) == ["a", "b"]
+        assert ids(max_age_s=150.0) == ["c"]
+        assert ids(keyword="予算", reason="sensitive_topic") == ["a"]
+
+    def test_decided_items_leave_pending_indexes(self, review_queue: ReviewQueue) -> None:
+        """Decisions remove items from listings and counters but keep the record."""
+        review_queue.enqueue(_review("a"))
+        review_queue.enqueue(_review("b", reason="low_confidence", keywords=()))
+        assert review_queue.pending_counts() == {"sensitive_topic": 1, "low_confidence": 1}
+
+        assert review_queue.mark_decided("a", ReviewDecision(approved=True, reviewer="r1"))
+        assert not review_queue.mark_decided("a", ReviewDecision(approved=True))
+        assert [i.review_id for i in review_queue.list_pending(keyword="予算")[0]] == []
+        assert review_queue.pending_counts() == {"low_confidence": 1}
+        record = review_queue.get("a")
+        assert record is not None and record.status == "approved" and record.reviewer == "r1"
+
+    def test_listing_uses_indexes(self, review_queue: ReviewQueue) -> None:
+        """Filtered listings are index range scans, not full table scans."""
+        review_queue.enqueue(_review("a"))
+        conn = review_queue._conn
+        assert conn is not None
+        plans = [
+            " ".join(
+                row[-1]
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT r.review_id FROM reviews r "
+                    "WHERE r.status = 'pending' AND r.reason = ? AND (r.created_at, r.review_id) > (?, ?) "
+                    "ORDER BY r.created_at, r.review_id LIMIT 10",
+                    ("sensitive_topic", 0.0, ""),
+                )
+            ),
+            " ".join(
+                row[-1]
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT r.review_id FROM pending_keywords k "
+                    "JOIN reviews r ON r.review_id = k.review_id "
+                    "WHERE k.keyword = ? AND r.status = 'pending' ORDER BY k.created_at, k.review_id LIMIT 10",
+                    ("予算",),
+                )
+            ),
+        ]
+        for plan in plans:
+            assert "USING" in plan and "TEMP B-TREE" not in plan
+
+    def test_invalid_cursor_raises(self, review_queue: ReviewQueue) -> None:
+        """A malformed cursor is rejected."""
+        with pytest.raises(ValueError):
+            review_queue.list_pending(cursor="not-a-cursor")
+
+
+class TestBulkReview:
+    """Paused runs are enqueued and can be decided in bulk."""
+
+    def test_paused_runs_are_enqueued(self, mock_load_corpus: MagicMock) -> None:
+        """A run paused for review appears in the pending listing."""
+        run_experiment(ExperimentRequest(query="予算の配分について"), "q-1")
+        page = list_reviews(keyword="予算")
+        assert [item.review_id for item in page.items] == ["q-1"]
+        assert page.pending_counts == {"sensitive_topic": 1}
+
+    def test_bulk_approval_resumes_all(self, mock_load_corpus: MagicMock) -> None:
+        """Bulk approval resumes every paused run and reports unknown IDs."""
+        for i in range(5):
+            run_experiment(ExperimentRequest(query=f"予算の配分について {i}"), f"q-{i}")
+
+        with patch("src.langgraph_rag_hitl.core._call_ollama", return_value="承認済みの回答"):
+            response = bulk_review(
+                BulkReviewRequest(
+                    review_ids=[f"q-{i}" for i in range(5)] + ["missing"],
+                    approved=True,
+                    reviewer="r1",
+                )
+            )
+
+        assert response.succeeded == 5
+        assert response.failed == 1
+        assert {r.review_id: r.status for r in response.results}["missing"] == "not_found"
+        assert list_reviews().items == []
+
+    def test_handler_lists_and_bulk_rejects(
+        self, mock_load_corpus: MagicMock, lambda_context: MagicMock
+    ) -> None:
+        """GET /api/reviews and POST /api/reviews/bulk on the Lambda handler."""
+        from src.langgraph_rag_hitl.handler import handler
+
+        run_experiment(ExperimentRequest(query="予算の配分について"), "q-h")
+        listed = handler(
+            {
+                "httpMethod": "GET",
+                "path": "/api/reviews",
+                "queryStringParameters": {"reason": "sensitive_topic", "limit": "10"},
+            },
+            lambda_context,
+        )
+        assert [i["review_id"] for i in json.loads(listed["body"])["items"]] == ["q-h"]
+
+        bulk = handler(
+            {
+                "httpMethod": "POST",
+                "path": "/api/reviews/bulk",
+                "body": json.dumps({"review_ids": ["q-h"], "approved": False}),
+            },
+            lambda_context,
+        )
+        assert json.loads(bulk["body"])["results"] == [
+            {"review_id": "q-h", "status": "rejected", "error": ""}
+        ]
+
+    @pytest.mark.parametrize(
+        ("error", "status"),
+        [(QueueFullError("queue full", retry_after=2.5), 429), (RuntimeError("checkpoint store down"), 500)],
+    )
+    def test_handler_bulk_errors_are_json(
+        self, lambda_context: MagicMock, error: Exception, status: int
+    ) -> None:
+        """Scheduler and storage failures in bulk review map to JSON error responses."""
+        from src.langgraph_rag_hitl.handler import handler
+
+        with patch("src.langgraph_rag_hitl.handler.bulk_review", side_effect=error):
+            response = handler(
+                {
+                    "httpMethod": "POST",
+                    "path": "/api/reviews/bulk",
+                    "body": json.dumps({"review_ids": ["q-1"], "approved": True}),
+                },
+                lambda_context,
+            )
+        assert response["statusCode"] == status
+        assert "error" in json.loads(response["body"])
+        if status == 429:
+            assert response["headers"]["Retry-After"] == "3"
+
+    @pytest.mark.parametrize(
+        ("error", "status"),
+        [(QueueFullError("queue full", retry_after=2.5), 429), (RuntimeError("checkpoint store down"), 500)],
+    )
+    def test_server_bulk_errors(self, error: Exception, status: int) -> None:
+        """The FastAPI bulk route maps failures like the single-review route."""
+        from fastapi.testclient import TestClient
+
+        from src.langgraph_rag_hitl.server import app
+
+        with patch("src.langgraph_rag_hitl.server.bulk_review", side_effect=error):
+            response = TestClient(app).post("/api/reviews/bulk", json={"review_ids": ["q-1"], "approved": True})
+        assert response.status_code == status
+        if status == 429:
+            assert response.headers["Retry-After"] == "3"
+
+    def test_handler_rejects_bad_cursor(self, lambda_context: MagicMock) -> None:
+        """A malformed cursor returns 400."""
+        from src.langgraph_rag_hitl.handler import handler
+
+        response = handler(
+            {"httpMethod": "GET", "path": "/api/reviews", "queryStringParameters": {"cursor": "x"}},
+            lambda_context,
+        )
+        assert response["statusCode"] == 400
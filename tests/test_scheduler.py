@@ -0,0 +1,202 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : LLM 生成のアドミッション制御（同時実行数・待ち行列・優先度）
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for the LLM admission scheduler and its 429/503 API mapping."""
+
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.langgraph_rag_hitl.scheduler import (
+    DeadlineExceededError,
+    GenerationScheduler,
+    QueueFullError,
+)
+
+
+def _wait_for_depth(scheduler: GenerationScheduler, depth: int, timeout: float = 2.0) -> None:
+    """Block until the scheduler queue reaches the given depth."""
+    end = time.monotonic() + timeout
+    while scheduler.stats()["queue_depth"] < depth:
+        if time.monotonic() > end:
+            raise AssertionError(f"queue never reached depth {depth}")
+        time.sleep(0.005)
+
+
+class TestGenerationScheduler:
+    """Tests for GenerationScheduler admission control."""
+
+    def test_concurrency_limit_respected(self) -> None:
+        """No more than max_concurrency slots are held at once."""
+        scheduler = GenerationScheduler(max_concurrency=2, max_queue=10)
+        peak = 0
+        active = 0
+        lock = threading.Lock()
+
+        def work() -> None:
+            nonlocal peak, active
+            with scheduler.slot():
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.02)
+                with lock:
+                    active -= 1
+
+        threads = [threading.Thread(target=work) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert peak <= 2
+        stats = scheduler.stats()
+        assert stats["admitted_total"] == 6
+        assert stats["active"] == 0
+        assert stats["queue_depth"] == 0
+
+    def test_queue_full_fails_fast_with_retry_after(self) -> None:
+        """A full queue raises QueueFullError immediately with a Retry-After hint."""
+        scheduler = GenerationScheduler(max_concurrency=1, max_queue=1)
+        scheduler.acquire()
+        waiter = threading.Thread(target=lambda: (scheduler.acquire(), scheduler.release()))
+        waiter.start()
+        _wait_for_depth(scheduler, 1)
+
+        started = time.monotonic()
+        with pytest.raises(QueueFullError) as exc_info:
+            scheduler.acquire()
+        assert time.monotonic() - started < 0.5
+        assert exc_info.value.status_code == 429
+        assert int(exc_info.value.retry_after_header) >= 1
+        assert scheduler.stats()["rejected_queue_full_total"] == 1
+
+        scheduler.release()
+        waiter.join()
+
+    def test_interactive_admitted_before_batch(self) -> None:
+        """Queued interactive work is admitted ahead of earlier batch work."""
+        scheduler = GenerationScheduler(max_concurrency=1, max_queue=10)
+        order: list[str] = []
+        scheduler.acquire()
+
+        def work(priority: str) -> None:
+            with scheduler.slot(priority):  # type: ignore[arg-type]
+                order.append(priority)
+
+        batch = threading.Thread(target=work, args=("batch",))
+        batch.start()
+        _wait_for_depth(scheduler, 1)
+        interactive = threading.Thread(target=work, args=("interactive",))
+        interactive.start()
+        _wait_for_depth(scheduler, 2)
+
+        scheduler.release()
+        batch.join()
+        interactive.join()
+        assert order == ["interactive", "batch"]
+
+    def test_interactive_evicts_batch_when_full(self) -> None:
+        """Interactive arrivals displace queued batch work instead of being rejected."""
+        scheduler = GenerationScheduler(max_concurrency=1, max_queue=1)
+        scheduler.acquire()
+        errors: list[Exception] = []
+
+        def batch_work() -> None:
+            try:
+                scheduler.acquire("batch")
+                scheduler.release()
+            except QueueFullError as e:
+                errors.append(e)
+
+        batch = threading.Thread(target=batch_work)
+        batch.start()
+        _wait_for_depth(scheduler, 1)
+
+        interactive = threading.Thread(target=lambda: (scheduler.acquire(), scheduler.release()))
+        interactive.start()
+        batch.join(timeout=2.0)
+        assert len(errors) == 1
+
+        scheduler.release()
+        interactive.join()
+
+    def test_deadline_drop_while_waiting(self) -> None:
+        """A queued request whose deadline passes is dropped with 503."""
+        scheduler = GenerationScheduler(max_concurrency=1, max_queue=5)
+        scheduler._service_time_s = 0.001  # Admit into the queue despite the short deadline
+        scheduler.acquire()
+        with pytest.raises(DeadlineExceededError) as exc_info:
+            scheduler.acquire(deadline=time.monotonic() + 0.05)
+        assert exc_info.value.status_code == 503
+        stats = scheduler.stats()
+        assert stats["dropped_deadline_total"] == 1
+        assert stats["queue_depth"] == 0
+        scheduler.release()
+
+    def test_unmeetable_deadline_rejected_at_admission(self) -> None:
+        """Requests that cannot start before their deadline are refused without queueing."""
+        scheduler = GenerationScheduler(max_concurrency=1, max_queue=5)
+        scheduler.acquire()
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceededError):
+            scheduler.acquire(deadline=time.monotonic() + 0.5)  # Estimate is 2 s
+        assert time.monotonic() - started < 0.1
+        scheduler.release()
+
+
+class TestSchedulerApi:
+    """Queue rejections surface as 429/503 with Retry-After."""
+
+    def test_handler_returns_429_with_retry_after(
+        self,
+        mock_load_corpus: MagicMock,
+        lambda_context: MagicMock,
+    ) -> None:
+        """A full LLM queue returns 429 instead of timing out."""
+        from src.langgraph_rag_hitl.handler import handler
+
+        rejecting = GenerationScheduler(max_concurrency=1, max_queue=0)
+        rejecting.acquire()
+        event = {
+            "httpMethod": "POST",
+            "path": "/api/run",
+            "body": json.dumps({"query": "国会の審議について"}),
+        }
+        with patch("src.langgraph_rag_hitl.core._llm_scheduler", rejecting):
+            response = handler(event, lambda_context)
+
+        assert response["statusCode"] == 429
+        assert int(response["headers"]["Retry-After"]) >= 1
+        assert json.loads(response["body"])["request_id"] == "test-request-id-12345"
+
+    def test_handler_exports_scheduler_stats(self, lambda_context: MagicMock) -> None:
+        """GET /api/scheduler exports queue depth and wait time."""
+        from src.langgraph_rag_hitl.handler import handler
+
+        response = handler({"httpMethod": "GET", "path": "/api/scheduler"}, lambda_context)
+        body = json.loads(response["body"])
+        assert response["statusCode"] == 200
+        assert {"queue_depth", "wait_ms_avg", "active"} <= body.keys()
+
+    def test_server_returns_503_on_deadline(self, mock_load_corpus: MagicMock) -> None:
+        """The FastAPI route maps DeadlineExceededError to 503 with Retry-After."""
+        from fastapi.testclient import TestClient
+
+        from src.langgraph_rag_hitl.server import app
+
+        def reject(*args: object, **kwargs: object) -> str:
+            raise DeadlineExceededError("deadline", retry_after=3.2)
+
+        with patch("src.langgraph_rag_hitl.core._call_ollama", reject):
+            response = TestClient(app).post("/api/run", json={"query": "国会の審議について"})
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "4"
@@ -0,0 +1,142 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : 機密語辞書の Aho–Corasick 照合（クエリ・取得文書）
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for the Aho–Corasick sensitive-term detector and its HITL integration."""
+
+import os
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from src.langgraph_rag_hitl.core import SENSITIVE_KEYWORDS, _node_check_hitl
+from src.langgraph_rag_hitl.models import SourceDocument
+from src.langgraph_rag_hitl.sensitive import (
+    AhoCorasick,
+    SensitiveTerm,
+    SensitiveTermDetector,
+    load_terms,
+)
+
+
+def _naive_matches(terms: list[str], text: str) -> set[tuple[int, int, str]]:
+    found = set()
+    for term in terms:
+        start = text.find(term)
+        while start != -1:
+            found.add((start, start + len(term), term))
+            start = text.find(term, start + 1)
+    return found
+
+
+class TestAhoCorasick:
+    """Tests for the compiled automaton."""
+
+    def test_overlapping_matches_with_positions(self) -> None:
+        """All overlapping occurrences are reported with exact offsets."""
+        terms = ["he", "she", "his", "hers"]
+        automaton = AhoCorasick(SensitiveTerm(t) for t in terms)
+        found = {(s, e, t.term) for s, e, t in automaton.iter_matches("ushers")}
+        assert found == {(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")}
+
+    def test_matches_naive_scan_on_japanese_terms(self) -> None:
+        """Results agree with a brute-force scan, including terms nested in others."""
+        terms = [*SENSITIVE_KEYWORDS, "情報", "人事院", "予算委員会"]
+        text = "予算委員会で人事院の給与勧告と個人情報の扱い、機密指定について内部で議論した。"
+        automaton = AhoCorasick(SensitiveTerm(t) for t in terms)
+        found = {(s, e, t.term) for s, e, t in automaton.iter_matches(text)}
+        assert found == _naive_matches(terms, text)
+
+
+class TestSensitiveTermDetector:
+    """Tests for dictionary loading, scopes and hot reload."""
+
+    def test_load_terms_parses_categories_and_scopes(self, tmp_path: Path) -> None:
+        path = tmp_path / "terms.tsv"
+        path.write_text("# comment\n\n人事評価\tpersonnel\tboth\n口座番号\tpii\n極秘\t\tquery\n", encoding="utf-8")
+        assert load_terms(path) == [
+            SensitiveTerm("人事評価", "personnel", "both"),
+            SensitiveTerm("口座番号", "pii", "both"),
+            SensitiveTerm("極秘", "general", "query"),
+        ]
+
+    def test_scopes_separate_query_and_document_terms(self) -> None:
+        detector = SensitiveTermDetector(
+            builtin=[SensitiveTerm("予算", scope="query"), SensitiveTerm("口座番号", scope="document")]
+        )
+        assert [m.term for m in detector.scan("予算と口座番号", "query")] == ["予算"]
+        assert [m.term for m in detector.scan("予算と口座番号", "document")] == ["口座番号"]
+
+    def test_hot_reload_on_file_change(self, tmp_path: Path) -> None:
+        path = tmp_path / "terms.tsv"
+        path.write_text("旧語\told\n", encoding="utf-8")
+        detector = SensitiveTermDetector(path=path, reload_interval_s=0.0)
+        assert [m.term for m in detector.scan("旧語と新語", "document")] == ["旧語"]
+
+        path.write_text("新語\tnew\n", encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+        matches = detector.scan("旧語と新語", "document")
+        assert [(m.term, m.category, m.start) for m in matches] == [("新語", "new", 3)]
+
+
+    def test_bad_dictionary_keeps_previous_terms(self, tmp_path: Path) -> None:
+        """A broken file on reload is logged and the last good terms stay in use."""
+        path = tmp_path / "terms.tsv"
+        path.write_text("旧語\told\n", encoding="utf-8")
+        detector = SensitiveTermDetector(path=path, reload_interval_s=0.0)
+
+        def touch(offset: int) -> None:
+            stat = path.stat()
+            os.utime(path, (stat.st_atime, stat.st_mtime + offset))
+
+        path.write_bytes("新語\tnew\n".encode("shift_jis"))  # Not UTF-8
+        touch(10)
+        assert [m.term for m in detector.scan("旧語と新語", "document")] == ["旧語"]
+
+        path.unlink()
+        assert [m.term for m in detector.scan("旧語と新語", "document")] == ["旧語"]
+
+        path.write_text("新語\tnew\n", encoding="utf-8")
+        touch(20)
+        assert [m.term for m in detector.scan("旧語と新語", "document")] == ["新語"]
+
+class TestHITLSensitiveDetection:
+    """_node_check_hitl scans the query and relevant documents."""
+
+    def _state(self, query: str, contents: list[str]) -> Any:
+        docs = [
+            SourceDocument(speech_id=f"s{i}", speaker="A", date="2026-01-01", content=c, score=0.9)
+            for i, c in enumerate(contents)
+        ]
+        return {
+            "query": query,
+            "relevant_docs": docs,
+            "workflow_steps": [],
+        }
+
+    def test_document_match_triggers_review_with_positions(self, tmp_path: Path) -> None:
+        path = tmp_path / "terms.tsv"
+        path.write_text("口座番号\tpii\tdocument\n", encoding="utf-8")
+        detector = SensitiveTermDetector(
+            builtin=[SensitiveTerm(kw, "builtin", "query") for kw in SENSITIVE_KEYWORDS], path=path
+        )
+        state = self._state("年金の振込について", ["本人の口座番号を確認した。", "年金制度の説明。"])
+        with patch("src.langgraph_rag_hitl.core._sensitive_detector", detector):
+            result = _node_check_hitl(state)
+
+        review = result["hitl_review"]
+        assert review.reason == "sensitive_topic"
+        assert review.sensitive_keywords == ["口座番号"]
+        match = review.sensitive_matches[0]
+        assert (match.source, match.speech_id, match.category) == ("document", "s0", "pii")
+        assert state["relevant_docs"][0].content[match.start : match.end] == "口座番号"
+
+    def test_builtin_keywords_stay_query_only(self) -> None:
+        """Built-in keywords such as 予算 in documents alone do not trigger review."""
+        state = self._state("教育政策について", ["予算の配分を議論した。", "教育予算の拡充。"])
+        result = _node_check_hitl(state)
+        assert result["requires_review"] is False
@@ -0,0 +1,191 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : 同一クエリのリクエスト合流（single-flight）
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for single-flight coalescing of identical in-flight requests."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.langgraph_rag_hitl import core
+from src.langgraph_rag_hitl.core import (
+    ReviewNotFoundError,
+    _coalesce_key,
+    list_reviews,
+    resume_review,
+    run_experiment,
+    run_experiment_async,
+)
+from src.langgraph_rag_hitl.models import ExperimentRequest, ReviewDecision
+from src.langgraph_rag_hitl.scheduler import GenerationScheduler, QueueFullError
+from src.langgraph_rag_hitl.singleflight import SingleFlight
+
+N_CONCURRENT = 8
+
+
+class _SlowGeneration:
+    """Stand-in for _call_ollama that counts calls and holds the request in flight."""
+
+    def __init__(self, delay: float = 0.3) -> None:
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt: str, system: str = "", **kwargs: object) -> str:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return "国会では予算と教育政策が議論されました。"
+
+
+class TestSingleFlight:
+    """Tests for the SingleFlight primitive."""
+
+    def test_concurrent_callers_share_one_call(self) -> None:
+        """Callers with the same key run the function once and share the result."""
+        flight: SingleFlight[int] = SingleFlight()
+        slow = _SlowGeneration(delay=0.2)
+        barrier = threading.Barrier(N_CONCURRENT)
+
+        def call() -> tuple[int, bool]:
+            barrier.wait()
+            return flight.do("k", lambda: (slow("q"), 42)[1])
+
+        with ThreadPoolExecutor(max_workers=N_CONCURRENT) as pool:
+            results = list(pool.map(lambda _: call(), range(N_CONCURRENT)))
+
+        assert slow.calls == 1
+        assert all(value == 42 for value, _ in results)
+        assert sum(1 for _, shared in results if not shared) == 1
+        assert flight.in_flight() == 0
+
+    def test_exception_propagates_to_all_waiters(self) -> None:
+        """A failing leader raises the same exception in every coalesced caller."""
+        flight: SingleFlight[int] = SingleFlight()
+
+        def boom() -> int:
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            flight.do("k", boom)
+        assert flight.in_flight() == 0
+
+    def test_sequential_calls_recompute(self) -> None:
+        """The key is released once the leader finishes."""
+        flight: SingleFlight[int] = SingleFlight()
+        counter = iter(range(10))
+        first, _ = flight.do("k", lambda: next(counter))
+        second, shared = flight.do("k", lambda: next(counter))
+        assert (first, second, shared) == (0, 1, False)
+
+
+class TestRequestCoalescing:
+    """run_experiment coalesces identical concurrent requests."""
+
+    def test_coalesce_key_normalizes_query_and_roles(self) -> None:
+        """Width, whitespace and role order do not split the coalescing key."""
+        a = ExperimentRequest(query=" 国会の審議　について ", user_roles=["b", "a"])
+        b = ExperimentRequest(query="国会の審議 について", user_roles=["a", "b"])
+        c = ExperimentRequest(query="国会の審議 について", user_roles=["a", "b"], max_results=3)
+        assert _coalesce_key(a) == _coalesce_key(b)
+        assert _coalesce_key(a) != _coalesce_key(c)
+        assert _coalesce_key(a) != _coalesce_key(a.model_copy(update={"priority": "batch"}))
+
+    def test_follower_review_resolves_through_leader(self, mock_load_corpus: MagicMock) -> None:
+        """A follower of a paused run carries the leader's review_id; its own ID is not resumable."""
+        run_workflow = core._run_workflow
+        barrier = threading.Barrier(2)
+
+        def slow_run(request: ExperimentRequest, req_id: str) -> object:
+            time.sleep(0.3)  # Keep the leader in flight while the follower joins
+            return run_workflow(request, req_id)
+
+        def call(i: int):
+            barrier.wait()
+            return run_experiment(ExperimentRequest(query="予算の配分について"), f"req-{i}")
+
+        with patch.object(core, "_run_workflow", slow_run), ThreadPoolExecutor(max_workers=2) as pool:
+            responses = list(pool.map(call, range(2)))
+
+        follower = next(r for r in responses if "coalesced" in r.workflow_steps)
+        leader = next(r for r in responses if r is not follower)
+        assert follower.requires_review and follower.hitl_review is not None
+        assert follower.hitl_review.review_id == leader.request_id != follower.request_id
+        assert [item.review_id for item in list_reviews().items] == [leader.request_id]
+
+        with pytest.raises(ReviewNotFoundError):
+            resume_review(follower.request_id, ReviewDecision(approved=True))
+        with patch("src.langgraph_rag_hitl.core._call_ollama", return_value="承認済みの回答"):
+            resumed = resume_review(follower.hitl_review.review_id, ReviewDecision(approved=True))
+        assert resumed.answer == "承認済みの回答"
+
+    def test_interactive_not_coalesced_onto_evicted_batch(self, mock_load_corpus: MagicMock) -> None:
+        """An interactive request under a full queue evicts a batch twin instead of sharing its 429."""
+        scheduler = GenerationScheduler(max_concurrency=1, max_queue=1)
+        scheduler.acquire()  # The only slot is busy
+        errors: list[Exception] = []
+
+        def batch() -> None:
+            try:
+                run_experiment(ExperimentRequest(query="国会の審議について", priority="batch"), "batch")
+            except QueueFullError as exc:
+                errors.append(exc)
+
+        with (
+            patch("src.langgraph_rag_hitl.core._llm_scheduler", scheduler),
+            patch("src.langgraph_rag_hitl.core._ollama_request", return_value="国会では予算が議論されました。"),
+            ThreadPoolExecutor(max_workers=2) as pool,
+        ):
+            leader = pool.submit(batch)
+            while scheduler.stats()["queue_depth"] < 1:
+                time.sleep(0.005)
+            follower = pool.submit(run_experiment, ExperimentRequest(query="国会の審議について"), "interactive")
+            leader.result(timeout=5)
+            scheduler.release()
+            response = follower.result(timeout=5)
+
+        assert len(errors) == 1  # The batch leader was evicted
+        assert response.request_id == "interactive"
+        assert "coalesced" not in response.workflow_steps
+
+    def test_threaded_requests_trigger_one_generation(self, mock_load_corpus: MagicMock) -> None:
+        """N identical concurrent requests produce exactly one Ollama generation."""
+        slow = _SlowGeneration()
+        barrier = threading.Barrier(N_CONCURRENT)
+        request = ExperimentRequest(query="国会の審議について")
+
+        def call(i: int):
+            barrier.wait()
+            return run_experiment(request, request_id=f"req-{i}")
+
+        with patch("src.langgraph_rag_hitl.core._call_ollama", slow):
+            with ThreadPoolExecutor(max_workers=N_CONCURRENT) as pool:
+                responses = list(pool.map(call, range(N_CONCURRENT)))
+
+        assert slow.calls == 1
+        assert sorted(r.request_id for r in responses) == sorted(
+            f"req-{i}" for i in range(N_CONCURRENT)
+        )
+        assert len({r.answer for r in responses}) == 1
+        assert sum(1 for r in responses if "coalesced" in r.workflow_steps) == N_CONCURRENT - 1
+
+    async def test_async_requests_trigger_one_generation(self, mock_load_corpus: MagicMock) -> None:
+        """The async server path coalesces identical requests as well."""
+        slow = _SlowGeneration()
+        request = ExperimentRequest(query="国会の審議について")
+
+        with patch("src.langgraph_rag_hitl.core._call_ollama", slow):
+            responses = await asyncio.gather(
+                *(run_experiment_async(request, request_id=f"req-{i}") for i in range(N_CONCURRENT))
+            )
+
+        assert slow.calls == 1
+        assert len({r.request_id for r in responses}) == N_CONCURRENT
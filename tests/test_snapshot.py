@@ -0,0 +1,158 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : Lambda コールドスタート最適化（索引スナップショット）
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for index snapshots and the Lambda init phase."""
+
+import gc
+import logging
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.langgraph_rag_hitl import core
+from src.langgraph_rag_hitl.core import (
+    HybridRetriever,
+    run_experiment,
+    set_shared_retriever,
+    warm_up,
+)
+from src.langgraph_rag_hitl.handler import init_lambda
+from src.langgraph_rag_hitl.models import ExperimentRequest
+from src.langgraph_rag_hitl.snapshot import (
+    SnapshotError,
+    load_retriever,
+    load_snapshot,
+    read_snapshot_header,
+    save_snapshot,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_shared_retriever() -> Iterator[None]:
+    """Leave the per-request retriever build in place after each test."""
+    yield
+    set_shared_retriever(None)
+    gc.unfreeze()  # init_lambda freezes the heap
+
+
+class TestSnapshot:
+    """A snapshot restores a retriever that ranks exactly like the original."""
+
+    def test_round_trip(self, tmp_path: Path, sample_speeches: list[dict[str, Any]]) -> None:
+        retriever = HybridRetriever(sample_speeches)
+        path = tmp_path / "index.snapshot"
+        header = save_snapshot(retriever, path)
+
+        loaded = load_snapshot(path)
+
+        assert header["corpus_version"] == loaded.corpus_version == retriever.corpus_version
+        assert header["passages"] == len(loaded.passages)
+        assert loaded._tokenized_corpus == []  # Build-time only, not stored
+        assert len(loaded._keyword_ids) == len(retriever._keyword_ids)
+        assert all(np.array_equal(a, b) for a, b in zip(loaded._keyword_ids, retriever._keyword_ids, strict=True))
+        for query in ("教育予算", "外交と安全保障", "雇用"):
+            assert loaded.retrieve(query) == retriever.retrieve(query)
+
+    def test_add_after_load_rebuilds_whole_corpus(self, tmp_path: Path, sample_speeches: list[dict[str, Any]]) -> None:
+        """Passages whose tokens the snapshot dropped are re-tokenized before a rebuild."""
+        path = tmp_path / "index.snapshot"
+        save_snapshot(HybridRetriever(sample_speeches[:-2], max_df=0.5), path)
+        loaded = load_snapshot(path)
+        loaded.add_speeches(sample_speeches[-2:])
+        loaded.finish_build()
+
+        built = HybridRetriever(sample_speeches, max_df=0.5)
+        assert loaded._bm25.corpus_size == len(loaded.passages) == len(built.passages)
+        assert loaded.pruned_tokens == built.pruned_tokens
+        assert loaded.retrieve("教育 政策") == built.retrieve("教育 政策")
+
+        rebuilt = load_snapshot(path)
+        rebuilt.finish_build()
+        assert rebuilt._bm25 is not None and rebuilt._bm25.corpus_size == len(rebuilt.passages)
+
+    def test_empty_corpus(self, tmp_path: Path) -> None:
+        save_snapshot(HybridRetriever([]), tmp_path / "empty.snapshot")
+        assert load_snapshot(tmp_path / "empty.snapshot").retrieve("教育") == []
+
+    def test_rejects_foreign_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"not a snapshot")
+        with pytest.raises(SnapshotError):
+            load_snapshot(path)
+
+    def test_rejects_other_format_version(self, tmp_path: Path, sample_speeches: list[dict[str, Any]]) -> None:
+        path = tmp_path / "index.snapshot"
+        save_snapshot(HybridRetriever(sample_speeches), path)
+        with patch("src.langgraph_rag_hitl.snapshot.SNAPSHOT_FORMAT_VERSION", 99), pytest.raises(SnapshotError):
+            read_snapshot_header(path)
+
+    def test_missing_snapshot_falls_back_to_corpus(
+        self, tmp_path: Path, mock_load_corpus: MagicMock
+    ) -> None:
+        retriever, source = load_retriever(tmp_path / "missing.snapshot")
+        assert source == "corpus"
+        assert len(retriever.speeches) == len(mock_load_corpus.return_value)
+
+
+class TestSharedRetriever:
+    """Requests use the shared retriever instead of rebuilding the index."""
+
+    def test_run_skips_corpus_load(
+        self, sample_speeches: list[dict[str, Any]], mock_load_corpus: MagicMock, mock_ollama: MagicMock
+    ) -> None:
+        set_shared_retriever(HybridRetriever(sample_speeches))
+        response = run_experiment(ExperimentRequest(query="教育政策について"), "shared-1")
+
+        mock_load_corpus.assert_not_called()
+        assert response.sources
+
+    def test_warm_up_requires_retriever(self) -> None:
+        with pytest.raises(RuntimeError):
+            warm_up("教育")
+
+    def test_warm_up_leaves_metrics_untouched(self, sample_speeches: list[dict[str, Any]]) -> None:
+        set_shared_retriever(HybridRetriever(sample_speeches))
+        before = core.metrics_text()
+        assert warm_up("教育政策について")["docs"] > 0
+        assert core.metrics_text() == before
+
+
+class TestInitLambda:
+    """The init phase loads the index once and logs its timings."""
+
+    def test_init_from_snapshot(
+        self,
+        tmp_path: Path,
+        sample_speeches: list[dict[str, Any]],
+        mock_load_corpus: MagicMock,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        path = tmp_path / "index.snapshot"
+        save_snapshot(HybridRetriever(sample_speeches), path)
+
+        with caplog.at_level(logging.INFO, logger="src.langgraph_rag_hitl.handler"):
+            record = init_lambda(str(path), "教育政策について")
+
+        mock_load_corpus.assert_not_called()
+        assert core._shared_retriever is not None
+        assert record["index_source"] == "snapshot"
+        assert record["warmup_docs"] > 0
+        for key in ("import_ms", "index_load_ms", "warmup_ms", "init_ms"):
+            assert record[key] >= 0
+        logged = next(r for r in caplog.records if r.getMessage() == "lambda_init")
+        assert logged.__dict__["index_source"] == "snapshot"
+
+    def test_init_without_snapshot_builds_from_corpus(self, mock_load_corpus: MagicMock) -> None:
+        record = init_lambda(None, None)
+
+        mock_load_corpus.assert_called_once()
+        assert record["index_source"] == "corpus"
+        assert "warmup_ms" not in record
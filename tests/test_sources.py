@@ -0,0 +1,278 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : 複数検索ソースの並列ファンアウト（ソース別期限・ヘッジ・RRF 融合）
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for retrieval sources and the concurrent fan-out.
+
+OpenSearchSource is exercised against a local stand-in HTTP server that
+implements ``POST /{index}/_search``.
+"""
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from src.langgraph_rag_hitl.core import PASSAGE_SIZE, HybridRetriever, _node_retrieve
+from src.langgraph_rag_hitl.models import Passage
+from src.langgraph_rag_hitl.sources import (
+    FanOutRetriever,
+    LocalCorpusSource,
+    OpenSearchSource,
+    SourceSlots,
+    rrf_fuse,
+)
+
+REMOTE_HITS = [
+    {
+        "_id": "os_001",
+        "_score": 8.0,
+        "_source": {
+            "speechID": "os_001",
+            "speaker": "リモート議員",
+            "date": "2026-03-01",
+            "speech": "国会の審議について外部インデックスから取得した発言です。",
+            "nameOfHouse": "衆議院",
+            "nameOfMeeting": "予算委員会",
+        },
+    },
+    {
+        "_id": "test_002",
+        "_score": 4.0,
+        "_source": {
+            "speechID": "test_002",
+            "speaker": "テスト議員B",
+            "date": "2026-02-19",
+            "speech": "教育政策について議論しました。",
+        },
+    },
+]
+
+
+class _StandInSearch:
+    """Behaviour of the stand-in server: per-request delays and failures."""
+
+    def __init__(self) -> None:
+        self.delays: list[float] = []  # Consumed per request; default 0
+        self.fail = False
+        self.hits: list[dict[str, Any]] = REMOTE_HITS
+        self.requests: list[dict[str, Any]] = []
+        self.lock = threading.Lock()
+
+
+@pytest.fixture
+def search_server() -> Iterator[tuple[str, _StandInSearch]]:
+    """Run an OpenSearch-compatible stand-in on a free local port."""
+    behaviour = _StandInSearch()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:  # noqa: N802 - http.server API
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with behaviour.lock:
+                behaviour.requests.append({"path": self.path, "body": body})
+                delay = behaviour.delays.pop(0) if behaviour.delays else 0.0
+            time.sleep(delay)
+            if behaviour.fail:
+                self.send_response(500)
+                self.end_headers()
+                return
+            payload = json.dumps({"hits": {"hits": behaviour.hits[: body.get("size", 10)]}}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.block_on_close = False  # Do not wait for deliberately slow handlers
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", behaviour
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def executor() -> Iterator[ThreadPoolExecutor]:
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        yield pool
+
+
+class TestOpenSearchSource:
+    """Tests for the OpenSearch-compatible HTTP source."""
+
+    def test_parses_hits_and_normalizes_scores(
+        self, search_server: tuple[str, _StandInSearch]
+    ) -> None:
+        """Hits map to Passages with scores scaled by the top score."""
+        url, behaviour = search_server
+        docs = OpenSearchSource(url, index="speeches").search("国会の審議", 5, ["public"])
+        assert [d.speech_id for d in docs] == ["os_001", "test_002"]
+        assert [d.score for d in docs] == [1.0, 0.5]
+        assert behaviour.requests[0]["path"] == "/speeches/_search"
+        assert behaviour.requests[0]["body"]["size"] == 5
+
+    def test_long_remote_speech_cut_to_passage(self, search_server: tuple[str, _StandInSearch]) -> None:
+        """A long remote speech is returned as its best local-sized passage, with offsets."""
+        url, behaviour = search_server
+        text = "ただいまから会議を開きます。" * 40 + "半導体産業への補助金について質問します。" + "以上です。" * 40
+        behaviour.hits = [{"_id": "os_long", "_score": 1.0, "_source": {"speechID": "os_long", "speech": text}}]
+        (doc,) = OpenSearchSource(url).search("半導体 補助金", 5, ["public"])
+        assert doc.passage_end - doc.passage_start <= PASSAGE_SIZE
+        assert doc.passage_start > 0
+        assert doc.content == text[doc.passage_start : doc.passage_end]
+        assert "半導体" in doc.content
+
+    def test_non_public_roles_add_filter(self, search_server: tuple[str, _StandInSearch]) -> None:
+        """Restricted roles are sent as an allowed_roles filter."""
+        url, behaviour = search_server
+        OpenSearchSource(url).search("q", 3, ["member"])
+        query = behaviour.requests[0]["body"]["query"]
+        assert query["bool"]["filter"]["bool"]["should"][0] == {"terms": {"allowed_roles": ["member"]}}
+
+
+class TestFanOutRetriever:
+    """Tests for concurrent fan-out with deadlines and hedging."""
+
+    def test_fuses_local_and_remote(
+        self,
+        sample_speeches: list[dict[str, Any]],
+        search_server: tuple[str, _StandInSearch],
+        executor: ThreadPoolExecutor,
+    ) -> None:
+        """Both sources contribute; a speech found by both is kept once."""
+        url, _ = search_server
+        fanout = FanOutRetriever(
+            [LocalCorpusSource(HybridRetriever(sample_speeches)), OpenSearchSource(url)], executor
+        )
+        result = fanout.search("国会の審議について", 5, ["public"])
+        ids = [d.speech_id for d in result.docs]
+        assert result.statuses == {"local": "ok", "opensearch": "ok"}
+        assert "os_001" in ids
+        assert len(ids) == len(set(ids)) == 5
+        assert max(d.score for d in result.docs) == 1.0
+
+    def test_slow_source_does_not_hold_response(
+        self,
+        sample_speeches: list[dict[str, Any]],
+        search_server: tuple[str, _StandInSearch],
+        executor: ThreadPoolExecutor,
+    ) -> None:
+        """A source past its deadline is dropped and the local results are returned."""
+        url, behaviour = search_server
+        behaviour.delays = [0.5]
+        local = LocalCorpusSource(HybridRetriever(sample_speeches))
+        fanout = FanOutRetriever([local, OpenSearchSource(url, timeout_s=0.2)], executor)
+
+        started = time.monotonic()
+        result = fanout.search("国会の審議について", 3, ["public"])
+        assert time.monotonic() - started < 0.4
+        assert result.statuses["opensearch"] == "timeout"
+        assert [d.speech_id for d in result.docs] == [
+            d.speech_id for d in local.search("国会の審議について", 3, ["public"])
+        ]
+
+    def test_hedged_request_wins(
+        self, search_server: tuple[str, _StandInSearch], executor: ThreadPoolExecutor
+    ) -> None:
+        """A hedge sent after hedge_after_s answers before the slow first attempt."""
+        url, behaviour = search_server
+        behaviour.delays = [0.5, 0.0]
+        source = OpenSearchSource(url, timeout_s=0.4, hedge_after_s=0.05)
+        result = FanOutRetriever([source], executor).search("q", 2, ["public"])
+        assert result.statuses == {"opensearch": "hedged"}
+        assert [d.speech_id for d in result.docs] == ["os_001", "test_002"]
+        assert len(behaviour.requests) == 2
+
+    def test_failing_source_is_reported(
+        self,
+        sample_speeches: list[dict[str, Any]],
+        search_server: tuple[str, _StandInSearch],
+        executor: ThreadPoolExecutor,
+    ) -> None:
+        """HTTP errors mark the source failed without failing the search."""
+        url, behaviour = search_server
+        behaviour.fail = True
+        fanout = FanOutRetriever(
+            [LocalCorpusSource(HybridRetriever(sample_speeches)), OpenSearchSource(url)], executor
+        )
+        result = fanout.search("教育", 3, ["public"])
+        assert result.statuses["opensearch"] == "error:HTTPStatusError"
+        assert result.docs
+
+    def test_abandoned_calls_capped_per_source(
+        self, sample_speeches: list[dict[str, Any]], executor: ThreadPoolExecutor
+    ) -> None:
+        """Timed-out calls still running hold their slots; the source is then skipped, not queued."""
+        release = threading.Event()
+
+        class _Stuck:
+            name = "stuck"
+            timeout_s = 0.05
+            hedge_after_s = None
+            weight = 1.0
+
+            def search(self, query: str, top_k: int, user_roles: list[str]) -> list[Passage]:
+                release.wait(5)
+                return []
+
+        slots = SourceSlots(per_source=2)
+        local = LocalCorpusSource(HybridRetriever(sample_speeches))
+        fanout = FanOutRetriever([local, _Stuck()], executor, slots)
+        try:
+            statuses = [fanout.search("教育", 3, ["public"]).statuses for _ in range(4)]
+            assert [s["stuck"] for s in statuses] == ["timeout", "timeout", "saturated", "saturated"]
+            assert all(s["local"] == "ok" for s in statuses)  # Two of four workers stay free
+            assert slots.running("stuck") == 2
+        finally:
+            release.set()
+        deadline = time.monotonic() + 2
+        while slots.running("stuck") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert slots.running("stuck") == 0
+
+    def test_rrf_fuse_weights(self) -> None:
+        """Higher-weighted sources win ties in fused rank."""
+
+        def doc(sid: str) -> Passage:
+            return Passage(speech_id=sid, speaker="", date="", content="", score=1.0)
+
+        fused = rrf_fuse([(1.0, [doc("a")]), (2.0, [doc("b")])], top_k=2)
+        assert [d.speech_id for d in fused] == ["b", "a"]
+
+
+class TestRetrieveNodeFanOut:
+    """_node_retrieve fans out when external sources are configured."""
+
+    def test_node_records_source_statuses(
+        self,
+        sample_speeches: list[dict[str, Any]],
+        search_server: tuple[str, _StandInSearch],
+    ) -> None:
+        """The node fuses sources and records each source's status."""
+        url, _ = search_server
+        state: dict[str, Any] = {
+            "query": "国会の審議について",
+            "rewritten_query": "",
+            "max_results": 5,
+            "user_roles": ["public"],
+            "workflow_steps": [],
+        }
+        with patch("src.langgraph_rag_hitl.core._external_sources", [OpenSearchSource(url)]):
+            result = _node_retrieve(state, HybridRetriever(sample_speeches))  # type: ignore[arg-type]
+
+        assert "sources:local=ok,opensearch=ok" in result["workflow_steps"]
+        assert "os_001" in [d.speech_id for d in result["retrieved_docs"]]
+        assert result["retrieved_keyword_ids"] == []  # Remote docs are graded from content
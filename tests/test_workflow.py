@@ -0,0 +1,183 @@
+# [DEBUG] ============================================================
+# Agent   : backend_dev
+# Task    : LangGraph ワークフローの永続チェックポイント（HITL 再開）
+# Created : 2026-10-19
+# Updated : 2026-10-19
+# [/DEBUG] ===========================================================
+
+"""Tests for the compiled StateGraph, SQLite checkpointing and HITL resume."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.langgraph_rag_hitl.checkpoint import SQLiteCheckpointSaver
+from src.langgraph_rag_hitl.core import (
+    ReviewNotFoundError,
+    _workflow,
+    resume_review,
+    run_experiment,
+)
+from src.langgraph_rag_hitl.models import ExperimentRequest, ReviewDecision
+from src.langgraph_rag_hitl.scheduler import DeadlineExceededError
+
+SENSITIVE_QUERY = "予算の配分について"
+
+
+class _CountingGeneration:
+    """Stand-in for _call_ollama that records calls."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, prompt: str, system: str = "", **kwargs: object) -> str:
+        self.calls += 1
+        return "予算の配分について審議が行われました。"
+
+
+class TestCompiledWorkflow:
+    """The graph is compiled once and checkpoints only paused runs."""
+
+    def test_graph_has_conditional_routes(self) -> None:
+        """Rewrite and HITL decisions are conditional edges of the compiled graph."""
+        graph = _workflow.get_graph()
+        edges = {(e.source, e.target) for e in graph.edges}
+        assert {("grade", "rewrite"), ("grade", "check_hitl"), ("rewrite", "retrieve")} <= edges
+        assert {("check_hitl", "generate"), ("check_hitl", "hitl_pending")} <= edges
+
+    def test_completed_run_leaves_no_checkpoint(
+        self, mock_load_corpus: MagicMock, workflow_checkpointer: SQLiteCheckpointSaver
+    ) -> None:
+        """Runs that need no review are not kept in the checkpoint store."""
+        with patch("src.langgraph_rag_hitl.core._call_ollama", _CountingGeneration()):
+            response = run_experiment(ExperimentRequest(query="国会の審議について"), "run-1")
+        assert not response.requires_review
+        assert list(workflow_checkpointer.list({"configurable": {"thread_id": "run-1"}})) == []
+
+    def test_hitl_run_is_checkpointed(
+        self, mock_load_corpus: MagicMock, workflow_checkpointer: SQLiteCheckpointSaver
+    ) -> None:
+        """A run paused for review persists its state under the request ID."""
+        response = run_experiment(ExperimentRequest(query=SENSITIVE_QUERY), "run-2")
+        assert response.requires_review
+        assert response.hitl_review is not None
+        assert response.hitl_review.review_id == "run-2"
+        assert response.workflow_steps[-1] == "hitl_pending"
+
+        saved = workflow_checkpointer.get_tuple({"configurable": {"thread_id": "run-2"}})
+        assert saved is not None
+        assert saved.checkpoint["channel_values"]["relevant_docs"]
+
+
+class TestResumeReview:
+    """resume_review continues a paused run from its checkpoint."""
+
+    def test_approval_resumes_into_generate(self, mock_load_corpus: MagicMock) -> None:
+        """Approval generates from the checkpointed documents without re-retrieving."""
+        run_experiment(ExperimentRequest(query=SENSITIVE_QUERY), "run-3")
+        generation = _CountingGeneration()
+        with patch("src.langgraph_rag_hitl.core._call_ollama", generation):
+            response = resume_review("run-3", ReviewDecision(approved=True, reviewer="r1"))
+
+        assert generation.calls == 1
+        assert mock_load_corpus.call_count == 1
+        assert not response.requires_review
+        assert response.answer == "予算の配分について審議が行われました。"
+        steps = response.workflow_steps
+        assert steps[steps.index("hitl_pending") + 1 :] == ["hitl:approved", "generate:ok"]
+        assert sum(s.startswith("retrieve:") for s in steps) == 1
+
+    def test_rejection_ends_without_generation(self, mock_load_corpus: MagicMock) -> None:
+        """Rejection finishes the run without calling the LLM."""
+        run_experiment(ExperimentRequest(query=SENSITIVE_QUERY), "run-4")
+        generation = _CountingGeneration()
+        with patch("src.langgraph_rag_hitl.core._call_ollama", generation):
+            response = resume_review("run-4", ReviewDecision(approved=False))
+
+        assert generation.calls == 0
+        assert response.workflow_steps[-1] == "hitl:rejected"
+
+    def test_unknown_or_finished_review_raises(self, mock_load_corpus: MagicMock) -> None:
+        """Only runs still waiting for review can be resumed."""
+        with pytest.raises(ReviewNotFoundError):
+            resume_review("missing", ReviewDecision(approved=True))
+
+        run_experiment(ExperimentRequest(query=SENSITIVE_QUERY), "run-5")
+        with patch("src.langgraph_rag_hitl.core._call_ollama", _CountingGeneration()):
+            resume_review("run-5", ReviewDecision(approved=True))
+        with pytest.raises(ReviewNotFoundError):
+            resume_review("run-5", ReviewDecision(approved=True))
+
+    def test_failed_generation_can_be_retried(self, mock_load_corpus: MagicMock) -> None:
+        """A resume rejected by the LLM scheduler can be retried from its checkpoint."""
+        run_experiment(ExperimentRequest(query=SENSITIVE_QUERY), "run-6")
+
+        def reject(*args: object, **kwargs: object) -> str:
+            raise DeadlineExceededError("deadline", retry_after=1.0)
+
+        with patch("src.langgraph_rag_hitl.core._call_ollama", reject):
+            with pytest.raises(DeadlineExceededError):
+                resume_review("run-6", ReviewDecision(approved=True))
+        with patch("src.langgraph_rag_hitl.core._call_ollama", _CountingGeneration()):
+            response = resume_review("run-6", ReviewDecision(approved=True))
+        assert response.workflow_steps[-1] == "generate:ok"
+
+    def test_resume_from_another_saver_instance(
+        self, mock_load_corpus: MagicMock, workflow_checkpointer: SQLiteCheckpointSaver
+    ) -> None:
+        """State survives a reconnect to the same database file (e.g. a restart)."""
+        run_experiment(ExperimentRequest(query=SENSITIVE_QUERY), "run-7")
+        workflow_checkpointer.close()
+        with patch("src.langgraph_rag_hitl.core._call_ollama", _CountingGeneration()):
+            response = resume_review("run-7", ReviewDecision(approved=True))
+        assert response.workflow_steps[-1] == "generate:ok"
+
+
+class TestReviewApi:
+    """POST /api/review/{request_id} on the Lambda handler and FastAPI server."""
+
+    def test_handler_resumes_review(
+        self, mock_load_corpus: MagicMock, lambda_context: MagicMock
+    ) -> None:
+        """The handler resumes a paused run and returns the generated answer."""
+        from src.langgraph_rag_hitl.handler import handler
+
+        run_experiment(ExperimentRequest(query=SENSITIVE_QUERY), "run-8")
+        event = {
+            "httpMethod": "POST",
+            "path": "/api/review/run-8",
+            "body": json.dumps({"approved": True, "reviewer": "r1"}),
+        }
+        with patch("src.langgraph_rag_hitl.core._call_ollama", _CountingGeneration()):
+            response = handler(event, lambda_context)
+
+        body = json.loads(response["body"])
+        assert response["statusCode"] == 200
+        assert body["request_id"] == "run-8"
+        assert "hitl:approved" in body["workflow_steps"]
+
+    def test_handler_unknown_review_returns_404(self, lambda_context: MagicMock) -> None:
+        """Resuming a request that is not paused returns 404."""
+        from src.langgraph_rag_hitl.handler import handler
+
+        event = {"httpMethod": "POST", "path": "/api/review/nope", "body": '{"approved": true}'}
+        assert handler(event, lambda_context)["statusCode"] == 404
+
+    def test_server_review_endpoint(self, mock_load_corpus: MagicMock) -> None:
+        """The FastAPI route resumes a run paused by /api/run."""
+        from fastapi.testclient import TestClient
+
+        from src.langgraph_rag_hitl.server import app
+
+        client = TestClient(app)
+        paused = client.post("/api/run", json={"query": SENSITIVE_QUERY}).json()
+        assert paused["requires_review"]
+
+        with patch("src.langgraph_rag_hitl.core._call_ollama", _CountingGeneration()):
+            resumed = client.post(
+                f"/api/review/{paused['hitl_review']['review_id']}", json={"approved": False}
+            )
+        assert resumed.status_code == 200
+        assert resumed.json()["workflow_steps"][-1] == "hitl:rejected"
+        assert client.post("/api/review/nope", json={"approved": True}).status_code == 404